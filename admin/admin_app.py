@@ -24,6 +24,7 @@ from datetime import datetime
 import re
 
 from hardware.interfaces.hardware_factory import get_hardware_interface
+from hardware.implementations.real.arduino_grbl.grbl_settings import format_setting, setting_number
 from core.logger import get_logger
 from core.translations import t, t_title, t_raw, HEBREW_TRANSLATIONS
 
@@ -552,6 +553,22 @@ class AdminToolGUI:
 
             self.piston_widgets[key] = state_label
 
+        # Piston actuation times and sensor bounces (rolling histograms, see hardware_health.py)
+        health_frame = ttk.LabelFrame(left_frame, text=t("Hardware Health"), padding="10")
+        health_frame.pack(fill="both", expand=True, pady=(5, 0))
+
+        columns = ('item', 'samples', 'p50', 'p95', 'baseline', 'faults', 'status')
+        headings = (t("Item"), t("Samples"), t("p50 (ms)"), t("p95 (ms)"), t("Baseline p95 (ms)"),
+                    t("Timeouts / Glitches"), t("Status"))
+        self.health_tree = ttk.Treeview(health_frame, columns=columns, show='headings', height=8)
+        for column, heading in zip(columns, headings):
+            self.health_tree.heading(column, text=heading)
+            self.health_tree.column(column, width=170 if column == 'item' else 80, anchor=tk.CENTER)
+        self.health_tree.tag_configure('alert', background="#F5B7B1")
+        self.health_tree.pack(fill="both", expand=True)
+
+        ttk.Button(health_frame, text=t("Refresh"), command=self.refresh_health_display).pack(side=tk.RIGHT, pady=(5, 0))
+
         # Right - Sensor monitoring
         right_frame = ttk.Frame(self.pistons_tab)
         right_frame.grid(row=0, column=0, sticky="nsew", padx=5, pady=5)
@@ -639,6 +656,30 @@ class AdminToolGUI:
             state_label.grid(row=i, column=0, padx=5, pady=2)
             self.sensor_widgets[sensor_id] = state_label
 
+    def refresh_health_display(self):
+        """Fill the hardware health table from the hardware's actuation/bounce histograms"""
+        if not hasattr(self.hardware, 'get_hardware_health'):
+            return
+        health = self.hardware.get_hardware_health()
+        self.health_tree.delete(*self.health_tree.get_children())
+
+        def fmt(value):
+            return '-' if value is None else f"{value:.0f}"
+
+        for name, piston in health.get('pistons', {}).items():
+            self.health_tree.insert('', tk.END, tags=('alert',) if piston['alert'] else (), values=(
+                name, piston['samples'], fmt(piston['p50_ms']), fmt(piston['p95_ms']),
+                fmt(piston['baseline_p95_ms']), piston['timeouts'],
+                t("SLOWING") if piston['alert'] else t("HEALTHY")))
+        for name, sensor in health.get('sensors', {}).items():
+            self.health_tree.insert('', tk.END, values=(
+                name, sensor['transitions'] + sensor['glitches'], '-', '-', '-', sensor['glitches'],
+                t("BOUNCING") if sensor['bounces'] else t("HEALTHY")))
+        for alert in health.get('alerts', []):
+            self.log("WARNING", t("{piston} ({state}) is slowing down: p95 {p95} ms, baseline {baseline} ms",
+                                  piston=alert['piston'], state=alert['state'],
+                                  p95=fmt(alert['p95_ms']), baseline=fmt(alert['baseline_p95_ms'])))
+
     def _load_grbl_config_from_settings(self):
         """Load GRBL configuration values from settings.json"""
         try:
@@ -660,7 +701,7 @@ class AdminToolGUI:
         control_frame = ttk.Frame(self.grbl_tab)
         control_frame.grid(row=0, column=0, columnspan=2, sticky="ew", padx=5, pady=5)
 
-        ttk.Button(control_frame, text=t("Read Settings ($$)"), command=self.read_grbl_settings).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(control_frame, text=t("Read Settings ($$)"), command=lambda: self.read_grbl_settings(refresh=True)).pack(side=tk.RIGHT, padx=5)
         self.save_grbl_btn = ttk.Button(control_frame, text=t("Save to Settings"), command=self.save_grbl_to_settings)
         self.save_grbl_btn.pack(side=tk.RIGHT, padx=5)
         self.apply_grbl_btn = ttk.Button(control_frame, text=t("Apply (Session)"), command=self.write_grbl_settings)
@@ -1360,7 +1401,41 @@ class AdminToolGUI:
             self.log("SUCCESS", t("{name} lowered", name=t_raw(name)))
 
     # GRBL methods
-    def read_grbl_settings(self):
+    def _show_grbl_settings(self, settings):
+        """Fill the GRBL entries and response view from a typed settings map"""
+        lines = [format_setting(param, settings[param]) for param in sorted(settings, key=setting_number)]
+        self.grbl_response_text.delete(1.0, tk.END)
+        self.grbl_response_text.insert(tk.END, "\n".join(lines))
+        for line in lines:
+            param, value = line.split('=', 1)
+            if param in self.grbl_entries:
+                self.grbl_entries[param].delete(0, tk.END)
+                self.grbl_entries[param].insert(0, value)
+            self.grbl_settings[param] = value
+
+    def _write_grbl_entries(self):
+        """Write changed GRBL entries to the controller; returns True if all were accepted"""
+        grbl = getattr(self.hardware, 'grbl', None)
+        values = {param: entry.get().strip() for param, entry in self.grbl_entries.items()
+                  if entry.get().strip() and param in self.grbl_settings}
+        if grbl is not None and hasattr(grbl, 'write_settings'):
+            result = grbl.write_settings(values)
+            for param, error in result.failed.items():
+                self.log("ERROR", t("Error applying settings: {error}", error=f"{param}: {error}"))
+            # The cache was updated from the acknowledgements - no re-read needed
+            self.read_grbl_settings()
+            return result.ok
+        ok = True
+        for param, new_value in values.items():
+            if new_value != self.grbl_settings[param] and grbl is not None and hasattr(grbl, '_send_command'):
+                response = grbl._send_command(f"{param}={new_value}")
+                if response and "ok" in response.lower():
+                    self.grbl_settings[param] = new_value
+                else:
+                    ok = False
+        return ok
+
+    def read_grbl_settings(self, refresh=False):
         """Read GRBL settings"""
         if not self.grbl_connected:
             return
@@ -1368,7 +1443,13 @@ class AdminToolGUI:
         self.log("INFO", t("Reading GRBL settings..."))
 
         try:
-            if hasattr(self.hardware, 'grbl') and hasattr(self.hardware.grbl, '_send_command'):
+            if hasattr(self.hardware, 'grbl') and hasattr(self.hardware.grbl, 'read_device_settings'):
+                # Served from the cached '$$' snapshot unless GRBL was reset
+                settings = self.hardware.grbl.read_device_settings(refresh=refresh)
+                if settings is not None:
+                    self._show_grbl_settings(settings)
+                    self.log("SUCCESS", t("GRBL settings loaded"))
+            elif hasattr(self.hardware, 'grbl') and hasattr(self.hardware.grbl, '_send_command'):
                 response = self.hardware.grbl._send_command("$$")
 
                 if response:
@@ -1399,18 +1480,8 @@ class AdminToolGUI:
         self.log("INFO", t("Applying GRBL settings..."))
 
         try:
-            for param, entry in self.grbl_entries.items():
-                new_value = entry.get().strip()
-                if new_value and param in self.grbl_settings:
-                    if new_value != self.grbl_settings[param]:
-                        command = f"{param}={new_value}"
-                        if hasattr(self.hardware.grbl, '_send_command'):
-                            response = self.hardware.grbl._send_command(command)
-                            if response and "ok" in response.lower():
-                                self.grbl_settings[param] = new_value
-
+            self._write_grbl_entries()
             self.log("SUCCESS", t("Settings applied (session only)"))
-            self.root.after(500, self.read_grbl_settings)
         except Exception as e:
             self.log("ERROR", t("Error applying settings: {error}", error=str(e)))
 
@@ -1466,17 +1537,8 @@ class AdminToolGUI:
             # Apply to GRBL hardware if connected
             if self.grbl_connected:
                 self.log("INFO", t("Applying settings to GRBL hardware..."))
-                for param, entry in self.grbl_entries.items():
-                    new_value = entry.get().strip()
-                    if new_value and param in self.grbl_settings:
-                        if new_value != self.grbl_settings[param]:
-                            command = f"{param}={new_value}"
-                            if hasattr(self.hardware, 'grbl') and hasattr(self.hardware.grbl, '_send_command'):
-                                response = self.hardware.grbl._send_command(command)
-                                if response and "ok" in response.lower():
-                                    self.grbl_settings[param] = new_value
+                self._write_grbl_entries()
                 self.log("SUCCESS", t("Settings applied to GRBL hardware"))
-                self.root.after(500, self.read_grbl_settings)
 
             # Refresh the System Config tab to reflect updated settings
             if hasattr(self, 'config_tab') and self.config_tab:
@@ -1496,7 +1558,11 @@ class AdminToolGUI:
             return
 
         try:
-            if hasattr(self.hardware.grbl, '_send_command'):
+            if hasattr(self.hardware.grbl, 'settings_sync'):
+                if self.hardware.grbl.settings_sync.restore_defaults("$"):
+                    self.log("SUCCESS", t("GRBL reset to defaults"))
+                self.read_grbl_settings(refresh=True)
+            elif hasattr(self.hardware.grbl, '_send_command'):
                 self.hardware.grbl._send_command("$RST=$")
                 self.log("SUCCESS", t("GRBL reset to defaults"))
                 self.root.after(500, self.read_grbl_settings)
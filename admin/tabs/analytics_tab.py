@@ -25,7 +25,6 @@ class AnalyticsTab:
     def __init__(self, parent_frame, admin_app):
         self.parent_frame = parent_frame
         self.admin_app = admin_app
-        self.runs_data = []
         self.filtered_data = []
 
         self.create_ui()
@@ -446,9 +445,13 @@ class AnalyticsTab:
             self.admin_app.log("ERROR", f"SMTP test failed: {e}")
 
     def send_report_now(self):
-        """Send analytics report immediately using the current UI date filter"""
+        """Queue an analytics report for the current UI date filter.
+
+        Rendering and SMTP delivery (with retries) happen on the report
+        outbox thread; the status label shows pending retries and the
+        final outcome.
+        """
         self.email_status_label.config(text=t("Sending..."), foreground="blue")
-        self.parent_frame.update_idletasks()
 
         try:
             from core.email_reporter import get_email_reporter
@@ -458,39 +461,55 @@ class AnalyticsTab:
             date_from, date_to = self._get_filter_dates()
             period = None
             if date_from and date_to:
-                period_start = datetime.strptime(date_from, '%Y-%m-%d')
-                period_end = datetime.strptime(date_to, '%Y-%m-%d').replace(
-                    hour=23, minute=59, second=59
-                )
-                period = (period_start, period_end)
-
-            success, error = reporter.send_report(period=period)
-
-            if success:
-                self.email_status_label.config(text=t("Report sent!"), foreground="green")
-                self.admin_app.log("SUCCESS", t("Analytics report sent"))
-                self._load_email_settings()
-            else:
-                self.email_status_label.config(text=t("Failed: {error}", error=error[:50]), foreground="red")
-                self.admin_app.log("ERROR", t("Report send failed: {error}", error=error))
+                period = self._get_filter_period()
+
+            def on_done(success, error):
+                self.parent_frame.after(0, lambda: self._on_report_sent(success, error))
+
+            def on_retry(error, delay):
+                self.parent_frame.after(0, lambda: self._on_report_retry(error, delay))
+
+            queued, error = reporter.queue_report(period=period, on_done=on_done, on_retry=on_retry)
+            if not queued:
+                self._on_report_sent(False, error)
         except Exception as e:
             self.email_status_label.config(text=t("Error: {error}", error=str(e)[:50]), foreground="red")
 
+    def _on_report_retry(self, error, delay):
+        """Show that a failed send is still pending (runs on the Tk thread)"""
+        self.email_status_label.config(
+            text=t("Send failed, retrying in {seconds}s: {error}", seconds=int(delay), error=error[:50]),
+            foreground="orange")
+        self.admin_app.log("WARNING", t("Report send failed: {error}", error=error))
+
+    def _on_report_sent(self, success, error):
+        """Show the outcome of a queued report (runs on the Tk thread)"""
+        if success:
+            self.email_status_label.config(text=t("Report sent!"), foreground="green")
+            self.admin_app.log("SUCCESS", t("Analytics report sent"))
+            self._load_email_settings()
+        else:
+            self.email_status_label.config(text=t("Failed: {error}", error=error[:50]), foreground="red")
+            self.admin_app.log("ERROR", t("Report send failed: {error}", error=error))
+
     def load_data(self):
-        """Load analytics data from CSV and refresh displays"""
+        """Load the runs in the date filter from CSV and refresh displays.
+
+        Only the filtered period is read: the aggregate cache's day index
+        lets the reader seek straight to it instead of parsing every run.
+        """
+        from core.analytics_aggregates import AnalyticsAggregates
+
         csv_path = self._get_csv_path()
-        self.runs_data = []
+        self.filtered_data = []
 
         if os.path.exists(csv_path):
             try:
-                with open(csv_path, 'r', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    for row in reader:
-                        self.runs_data.append(row)
+                aggregates = AnalyticsAggregates(csv_path)
+                self.filtered_data = list(aggregates.iter_rows(self._get_filter_period()))
             except Exception as e:
                 self.admin_app.log("ERROR", t("Failed to load analytics: {error}", error=str(e)))
 
-        self._apply_filter()
         self._update_summary()
         self._update_table()
 
@@ -519,68 +538,47 @@ class AnalyticsTab:
 
         return df, dt
 
-    def _apply_filter(self):
-        """Apply date range filter to runs data"""
+    def _get_filter_period(self):
+        """Return the date filter as a (start, end) datetime tuple (either may be None)"""
         date_from, date_to = self._get_filter_dates()
+        period_start = datetime.strptime(date_from, '%Y-%m-%d') if date_from else None
+        period_end = (
+            datetime.strptime(date_to, '%Y-%m-%d').replace(hour=23, minute=59, second=59)
+            if date_to else None
+        )
+        return period_start, period_end
 
-        self.filtered_data = self.runs_data[:]
-
-        if date_from:
-            self.filtered_data = [
-                r for r in self.filtered_data
-                if r.get('timestamp_start', '') >= date_from
-            ]
+    def _update_summary(self):
+        """Update summary labels for the current date filter.
 
-        if date_to:
-            date_to_full = date_to + 'T23:59:59'
-            self.filtered_data = [
-                r for r in self.filtered_data
-                if r.get('timestamp_start', '') <= date_to_full
-            ]
+        Uses the pre-aggregated hourly/daily buckets, so changing the
+        filter does not rescan every run.
+        """
+        from core.analytics_aggregates import AnalyticsAggregates
 
-    def _update_summary(self):
-        """Update summary labels from filtered data"""
-        data = self.filtered_data
-        total = len(data)
+        summary = None
+        try:
+            summary = AnalyticsAggregates(self._get_csv_path()).summarize(self._get_filter_period())
+        except Exception as e:
+            self.admin_app.log("ERROR", t("Failed to load analytics: {error}", error=str(e)))
 
-        if total == 0:
+        if not summary:
             for key in self.summary_labels:
                 self.summary_labels[key].config(text="-")
             return
 
-        from collections import Counter
-        status_counts = Counter(r.get('completion_status', 'unknown') for r in data)
-
-        success_count = status_counts.get('success', 0)
-        success_rate = (success_count / total * 100) if total > 0 else 0
-
-        # Average duration
-        durations = []
-        for r in data:
-            try:
-                d = float(r.get('duration_seconds', 0))
-                if d > 0:
-                    durations.append(d)
-            except (ValueError, TypeError):
-                pass
-        avg_duration = sum(durations) / len(durations) if durations else 0
-
-        # Most-run program
-        prog_counts = Counter(r.get('program_name', '') for r in data if r.get('program_name'))
-        most_run = prog_counts.most_common(1)[0] if prog_counts else ('N/A', 0)
-
-        # Most common safety code
-        safety_counts = Counter(r.get('safety_code', '') for r in data if r.get('safety_code'))
-        most_safety = safety_counts.most_common(1)[0] if safety_counts else ('N/A', 0)
+        status_counts = summary['status_counts']
+        most_run = summary['most_run_program']
+        most_safety = summary['most_common_safety']
 
-        self.summary_labels['total_runs'].config(text=str(total))
-        self.summary_labels['success_rate'].config(text=f"{success_rate:.1f}%")
-        self.summary_labels['success_count'].config(text=str(success_count))
+        self.summary_labels['total_runs'].config(text=str(summary['total_runs']))
+        self.summary_labels['success_rate'].config(text=f"{summary['success_rate']:.1f}%")
+        self.summary_labels['success_count'].config(text=str(summary['success_count']))
         self.summary_labels['user_stop_count'].config(text=str(status_counts.get('user_stop', 0)))
         self.summary_labels['safety_violation_count'].config(text=str(status_counts.get('safety_violation', 0)))
         self.summary_labels['emergency_stop_count'].config(text=str(status_counts.get('emergency_stop', 0)))
         self.summary_labels['error_count'].config(text=str(status_counts.get('error', 0)))
-        self.summary_labels['avg_duration'].config(text=f"{avg_duration:.1f}s")
+        self.summary_labels['avg_duration'].config(text=f"{summary['avg_duration']:.1f}s")
         self.summary_labels['most_run_program'].config(text=f"{most_run[0]} ({most_run[1]})")
         self.summary_labels['most_common_safety'].config(text=f"{most_safety[0]} ({most_safety[1]})")
 
@@ -809,6 +809,7 @@ class ConfigTab:
             mh.MIN_X_POSITION = hw_limits.get("min_x_position", 0.0)
             mh.MIN_Y_POSITION = hw_limits.get("min_y_position", 0.0)
             mh.PAPER_START_X = hw_limits.get("paper_start_x", 15.0)
+            mh.get_default_desk().apply_settings(fresh)
         except Exception:
             pass
 
@@ -896,8 +897,16 @@ class ConfigTab:
                 grbl.position_tolerance = grbl.grbl_config.get("position_tolerance_cm", 0.1)
                 grbl.movement_timeout = grbl.grbl_config.get("movement_timeout", 60.0)
                 grbl.movement_poll_interval = grbl.grbl_config.get("movement_poll_interval", 0.1)
+                grbl.streaming_enabled = grbl.grbl_config.get("streaming_enabled", True)
+                grbl.rapid_travel = grbl.grbl_config.get("rapid_travel", True)
+                grbl.skip_homing_when_homed = grbl.grbl_config.get("skip_homing_when_homed", False)
+                grbl.rx_buffer_size = grbl.grbl_config.get("rx_buffer_size", 128)
+                grbl.status_report_rate = grbl.grbl_config.get("status_report_rate_hz", 10.0)
+                grbl.status_report_rate_run = grbl.grbl_config.get("status_report_rate_run_hz", 20.0)
+                if grbl.status_scheduler:
+                    grbl.status_scheduler.idle_rate_hz = grbl.status_report_rate
+                    grbl.status_scheduler.run_rate_hz = grbl.status_report_rate_run
                 grbl._grbl_init_delay = timing.get("grbl_initialization_delay", 2)
-                grbl._grbl_serial_poll_delay = timing.get("grbl_serial_poll_delay", 0.01)
                 grbl._grbl_reset_delay = timing.get("grbl_reset_delay", 2)
                 hw_limits = fresh.get("hardware_limits", {})
                 grbl._max_x = hw_limits.get("max_x_position", 120.0)
@@ -910,13 +919,35 @@ class ConfigTab:
                 gpio._piston_settling_time = timing.get("piston_gpio_settling_delay", 0.05)
                 gpio._gpio_cleanup_delay = timing.get("gpio_cleanup_delay", 0.1)
                 gpio._gpio_busy_recovery_delay = timing.get("gpio_busy_recovery_delay", 0.05)
-                gpio._gpio_debounce_samples = timing.get("gpio_debounce_samples", 3)
-                gpio._gpio_debounce_delay = timing.get("gpio_debounce_delay_ms", 1) / 1000.0
                 gpio._gpio_test_read_delay = timing.get("gpio_test_read_delay_ms", 1) / 1000.0
                 gpio._polling_thread_join_timeout = timing.get("polling_thread_join_timeout", 1.0)
                 gpio._switch_polling_interval = timing.get("switch_polling_interval_ms", 10) / 1000.0
                 gpio._polling_status_update_freq = timing.get("polling_status_update_frequency", 1000)
                 gpio._polling_error_recovery_delay = timing.get("polling_error_recovery_delay", 0.1)
+                rs485 = getattr(gpio, 'rs485', None)
+                if rs485 is not None and hasattr(rs485, 'sampler_interval'):
+                    rs485_config = fresh.get("hardware_config", {}).get("raspberry_pi", {}).get("rs485", {})
+                    rs485.sampler_interval = rs485_config.get("sampler_interval_ms", 10) / 1000.0
+                    rs485.bulk_read_max_age = rs485_config.get("bulk_read_cache_age_ms", 10) / 1000.0
+                if hasattr(gpio, 'actuation_monitor'):
+                    gpio.actuation_monitor.configure(
+                        settling_time=gpio._piston_settling_time,
+                        timeout=timing.get("piston_confirm_timeout", 0.5),
+                        adaptive=timing.get("adaptive_piston_settling", True),
+                    )
+                if hasattr(gpio, 'health_monitor'):
+                    gpio.health_monitor.configure(
+                        window=timing.get("health_histogram_window", 200),
+                        drift_ratio=timing.get("piston_p95_drift_ratio", 1.5),
+                    )
+                if hasattr(gpio, 'poll_scheduler'):
+                    gpio._piston_boost_duration = timing.get("piston_sensor_boost_duration", 2.0)
+                    gpio.poll_scheduler.configure(
+                        gpio._poll_group_intervals(timing),
+                        idle_interval=timing.get("idle_switch_poll_interval_ms", 100) / 1000.0,
+                        adaptive=timing.get("adaptive_switch_polling", True),
+                        idle_intervals=gpio._poll_group_idle_intervals(timing),
+                    )
 
         if hasattr(self.app, 'log'):
             self.app.log("INFO", t("Settings applied live to all modules"))
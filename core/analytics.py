@@ -7,6 +7,11 @@ Collects execution run data and persists to CSV.
 Hooks into the execution engine's status callback chain
 without modifying the engine itself.
 
+Status events arrive on the execution thread, so the collector only
+snapshots run state there; all file I/O (CSV row, aggregate cache,
+step telemetry, hardware health) is handed to the background analytics
+writer.
+
 Usage:
     from core.analytics import get_analytics_collector
     collector = get_analytics_collector()
@@ -21,17 +26,36 @@ import time
 import uuid
 from datetime import datetime
 
+from core.analytics_aggregates import AnalyticsAggregates
+from core.analytics_health import health_records, write_health
+from core.analytics_telemetry import RunTelemetry, write_telemetry
+from core.analytics_writer import get_analytics_writer
 from core.logger import get_logger
 
 
+SETTINGS_PATH = 'config/settings.json'
+
+_settings_cache = {'mtime': None, 'data': {}}
+_settings_cache_lock = threading.Lock()
+
+
 def _load_settings():
-    """Load settings from config/settings.json"""
+    """Load settings from config/settings.json (cached until the file's mtime changes)"""
     try:
-        with open('config/settings.json', 'r') as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
+        mtime = os.stat(SETTINGS_PATH).st_mtime_ns
+    except OSError:
         return {}
 
+    with _settings_cache_lock:
+        if _settings_cache['mtime'] != mtime:
+            try:
+                with open(SETTINGS_PATH, 'r') as f:
+                    _settings_cache['data'] = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                _settings_cache['data'] = {}
+            _settings_cache['mtime'] = mtime
+        return _settings_cache['data']
+
 
 _collector_instance = None
 _collector_lock = threading.Lock()
@@ -68,6 +92,61 @@ CSV_COLUMNS = [
 ]
 
 
+def _detect_hardware_mode(engine):
+    """Return 'real' or 'mock' from settings + the engine's hardware type"""
+    hardware_mode = 'mock'
+    try:
+        settings = _load_settings()
+        if settings.get('hardware_config', {}).get('use_real_hardware', False):
+            hardware_mode = 'real'
+    except Exception:
+        pass
+    # Also verify via runtime type if possible
+    try:
+        from hardware.implementations.real.real_hardware import RealHardware
+        if engine and isinstance(engine.hardware, RealHardware):
+            hardware_mode = 'real'
+    except ImportError:
+        pass
+    return hardware_mode
+
+
+def _write_run_row(csv_path, row):
+    """Append a run row to the CSV and fold it into the aggregate cache.
+
+    Runs on the analytics writer thread.
+    """
+    csv_dir = os.path.dirname(csv_path)
+    if csv_dir and not os.path.exists(csv_dir):
+        os.makedirs(csv_dir, exist_ok=True)
+
+    logger = get_logger()
+    if not os.path.exists(csv_path):
+        with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+            csv.writer(f).writerow(CSV_COLUMNS)
+        logger.info(f"Created analytics CSV: {csv_path}", category="execution")
+
+    aggregates = AnalyticsAggregates(csv_path)
+    previous_signature = aggregates.csv_signature()
+    with open(csv_path, 'a', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS)
+        writer.writerow(row)
+
+    # Keep the period-summary cache in step with the CSV
+    try:
+        aggregates.record_run(row, previous_signature)
+    except Exception as e:
+        logger.warning(f"Failed to update analytics aggregates: {e}", category="execution")
+
+    logger.info(
+        f"Analytics: Run {row['run_id'][:8]} recorded - "
+        f"status={row['completion_status']}, "
+        f"steps={row['completed_steps']}/{row['total_steps']}, "
+        f"duration={row['duration_seconds']:.1f}s",
+        category="execution"
+    )
+
+
 class AnalyticsCollector:
     """Collects execution analytics and writes to CSV"""
 
@@ -86,6 +165,8 @@ class AnalyticsCollector:
         self._safety_code = ''
         self._safety_message = ''
         self._finalized = False
+        self._telemetry = None
+        self._hardware_mode = 'mock'
 
     def _get_settings(self):
         """Get analytics settings"""
@@ -102,19 +183,20 @@ class AnalyticsCollector:
         analytics_settings = self._get_settings()
         return analytics_settings.get('enabled', True)
 
-    def _ensure_csv_exists(self):
-        """Create CSV file with headers if it doesn't exist"""
-        csv_path = self._get_csv_path()
-        csv_dir = os.path.dirname(csv_path)
+    def _is_telemetry_enabled(self):
+        """Check if per-step telemetry capture is enabled (opt-in)"""
+        analytics_settings = self._get_settings()
+        return analytics_settings.get('telemetry_enabled', False)
 
-        if csv_dir and not os.path.exists(csv_dir):
-            os.makedirs(csv_dir, exist_ok=True)
+    def _get_telemetry_path(self):
+        """Get per-step telemetry CSV path from settings"""
+        analytics_settings = self._get_settings()
+        return analytics_settings.get('telemetry_file_path', 'data/analytics/step_telemetry.csv')
 
-        if not os.path.exists(csv_path):
-            with open(csv_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(CSV_COLUMNS)
-            self.logger.info(f"Created analytics CSV: {csv_path}", category="execution")
+    def _get_health_path(self):
+        """Get hardware health CSV path from settings"""
+        analytics_settings = self._get_settings()
+        return analytics_settings.get('health_file_path', 'data/analytics/hardware_health.csv')
 
     def attach_to_engine(self, engine, program):
         """Attach collector to an execution engine for the upcoming run.
@@ -130,6 +212,10 @@ class AnalyticsCollector:
         if not self._is_enabled():
             return
 
+        # Resolved here (GUI thread) so the execution thread never pays for it
+        hardware_mode = _detect_hardware_mode(engine)
+        telemetry_enabled = self._is_telemetry_enabled()
+
         with self._lock:
             self._engine = engine
             self._program = program
@@ -140,6 +226,8 @@ class AnalyticsCollector:
             self._safety_code = ''
             self._safety_message = ''
             self._finalized = False
+            self._hardware_mode = hardware_mode
+            self._telemetry = RunTelemetry(self._run_id) if telemetry_enabled else None
 
             # Save original callback and insert ourselves in the chain
             self._original_callback = engine.status_callback
@@ -162,6 +250,10 @@ class AnalyticsCollector:
 
     def _process_status(self, status, info):
         """Process a status event for analytics"""
+        telemetry = self._telemetry
+        if telemetry:
+            telemetry.on_status(status, info, self._engine)
+
         if status == 'started':
             self._start_time = time.time()
 
@@ -179,7 +271,13 @@ class AnalyticsCollector:
             if info:
                 self._safety_code = info.get('safety_code', '')
                 self._safety_message = info.get('violation_message', '')
-            self._finalize_run()
+            # Real-time monitor stops only pause the run - it ends on a later stopped/error/completed
+            if not (info and info.get('monitor_type')):
+                self._finalize_run()
+
+        elif status == 'safety_recovered':
+            if self._completion_status == 'emergency_stop':
+                self._completion_status = None
 
         elif status == 'safety_violation':
             self._completion_status = 'safety_violation'
@@ -194,7 +292,11 @@ class AnalyticsCollector:
             self._finalize_run()
 
     def _finalize_run(self):
-        """Write the completed run data to CSV"""
+        """Snapshot the completed run and queue it for writing.
+
+        Runs on the execution thread: only in-memory work happens here,
+        the CSV/aggregate/telemetry writes go to the analytics writer.
+        """
         with self._lock:
             if self._finalized:
                 return
@@ -203,9 +305,10 @@ class AnalyticsCollector:
             if not self._run_id or not self._start_time:
                 return
 
+            row = None
+            telemetry_records = None
+            health = None
             try:
-                self._ensure_csv_exists()
-
                 end_time = time.time()
                 duration = end_time - self._start_time
 
@@ -228,22 +331,6 @@ class AnalyticsCollector:
                     total_steps = len(self._engine.steps)
                     completed_steps = len(self._engine.step_results)
 
-                # Determine hardware mode from settings + runtime check
-                hardware_mode = 'mock'
-                try:
-                    settings = _load_settings()
-                    if settings.get('hardware_config', {}).get('use_real_hardware', False):
-                        hardware_mode = 'real'
-                except Exception:
-                    pass
-                # Also verify via runtime type if possible
-                try:
-                    from hardware.implementations.real.real_hardware import RealHardware
-                    if self._engine and isinstance(self._engine.hardware, RealHardware):
-                        hardware_mode = 'real'
-                except ImportError:
-                    pass
-
                 # If program didn't complete all steps and status is not already
                 # set to an error/stop status, mark as 'error' (unexpected stop)
                 if (self._completion_status == 'success'
@@ -281,28 +368,24 @@ class AnalyticsCollector:
                     'error_message': self._error_message,
                     'safety_code': self._safety_code,
                     'safety_message': self._safety_message,
-                    'hardware_mode': hardware_mode,
+                    'hardware_mode': self._hardware_mode,
                     'repeat_rows': repeat_rows,
                     'repeat_lines': repeat_lines,
                 }
 
-                csv_path = self._get_csv_path()
-                with open(csv_path, 'a', newline='', encoding='utf-8') as f:
-                    writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS)
-                    writer.writerow(row)
+                if self._telemetry:
+                    telemetry_records = self._telemetry.close()
 
-                self.logger.info(
-                    f"Analytics: Run {self._run_id[:8]} recorded - "
-                    f"status={self._completion_status}, "
-                    f"steps={completed_steps}/{total_steps}, "
-                    f"duration={duration:.1f}s",
-                    category="execution"
-                )
+                hardware = getattr(self._engine, 'hardware', None)
+                if hasattr(hardware, 'get_hardware_health'):
+                    health = health_records(self._run_id, hardware.get_hardware_health())
 
             except Exception as e:
-                self.logger.warning(f"Failed to write analytics: {e}", category="execution")
+                self.logger.warning(f"Failed to collect analytics: {e}", category="execution")
 
             finally:
+                self._telemetry = None
+
                 # Restore original callback on engine
                 if self._engine and self._engine.status_callback == self._on_status:
                     self._engine.status_callback = self._original_callback
@@ -311,3 +394,20 @@ class AnalyticsCollector:
                 self._engine = None
                 self._program = None
                 self._original_callback = None
+
+        # Hand all file I/O to the background writer (never blocks)
+        writer = get_analytics_writer()
+        if row is not None:
+            csv_path = self._get_csv_path()
+            writer.submit(lambda: _write_run_row(csv_path, row), description="analytics run")
+        if telemetry_records:
+            telemetry_path = self._get_telemetry_path()
+            writer.submit(lambda: write_telemetry(telemetry_path, telemetry_records),
+                          description="step telemetry")
+        if health:
+            health_path = self._get_health_path()
+            writer.submit(lambda: write_health(health_path, health), description="hardware health")
+
+    def flush(self, timeout=None):
+        """Wait until queued analytics writes reach disk (e.g. on shutdown)"""
+        return get_analytics_writer().flush(timeout)
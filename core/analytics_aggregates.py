@@ -0,0 +1,575 @@
+#!/usr/bin/env python3
+"""
+Analytics Aggregate Cache for Scratch-Desk CNC
+===============================================
+
+Materialised hourly and daily aggregates of the analytics CSV, so
+period summaries (email reports, admin dashboard) are computed from a
+few hundred pre-aggregated buckets instead of re-reading every run.
+
+The cache lives next to the CSV (runs.csv -> runs_aggregates.json) and
+records the CSV size/mtime it was built from. Whenever the CSV changes
+behind its back (cleared from the admin tool, edited by hand, deleted)
+the cache is rebuilt from the CSV with a single pass.
+
+Bucket resolution is one hour: a period boundary that falls inside an
+hour includes that whole hour.
+
+The cache also keeps the byte range of each day's rows in the CSV, so
+iter_rows() can seek straight to a period and stream just its rows.
+summarize_rows() computes the same summary from any row iterator in a
+single pass (used when the cache itself is unavailable).
+
+Usage:
+    from core.analytics_aggregates import AnalyticsAggregates
+    aggregates = AnalyticsAggregates('data/analytics/runs.csv')
+    summary = aggregates.summarize(period=(start_dt, end_dt))
+    for row in aggregates.iter_rows(period=(start_dt, end_dt)):
+        ...
+"""
+
+import csv
+import io
+import json
+import os
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
+
+from core.logger import get_logger
+
+
+CACHE_VERSION = 2
+
+# Upper bounds (seconds) of the duration histogram bins; the last bin is open-ended
+DURATION_HISTOGRAM_BOUNDS = [30, 60, 120, 300, 600, 1200, 1800, 3600]
+
+UNNAMED_PROGRAM = 'ללא שם'
+
+_file_lock = threading.Lock()
+
+
+def get_aggregates_path(csv_path):
+    """Return the aggregate cache path that belongs to an analytics CSV"""
+    base, _ = os.path.splitext(csv_path)
+    return f"{base}_aggregates.json"
+
+
+def _csv_signature(csv_path):
+    """Return [size, mtime_ns] of the CSV, or None if it does not exist"""
+    try:
+        st = os.stat(csv_path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def _to_int(value):
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return 0
+
+
+def _histogram_index(duration):
+    for i, bound in enumerate(DURATION_HISTOGRAM_BOUNDS):
+        if duration < bound:
+            return i
+    return len(DURATION_HISTOGRAM_BOUNDS)
+
+
+def _new_bucket():
+    return {
+        'run_count': 0,
+        'status_counts': {},
+        'hardware_counts': {},
+        'safety_codes': {},
+        'duration_sum': 0.0,
+        'duration_count': 0,
+        'duration_min': None,
+        'duration_max': None,
+        'duration_histogram': [0] * (len(DURATION_HISTOGRAM_BOUNDS) + 1),
+        'total_steps': 0,
+        'completed_steps': 0,
+        'successful_steps': 0,
+        'failed_steps': 0,
+        'first_timestamp': None,
+        'last_timestamp': None,
+        'programs': {},
+        'failed_runs': [],
+    }
+
+
+def _add_row_to_bucket(bucket, row):
+    """Fold a single CSV row (dict) into a bucket"""
+    status = row.get('completion_status', 'unknown')
+    bucket['run_count'] += 1
+    bucket['status_counts'][status] = bucket['status_counts'].get(status, 0) + 1
+
+    hardware_mode = row.get('hardware_mode', 'unknown')
+    bucket['hardware_counts'][hardware_mode] = bucket['hardware_counts'].get(hardware_mode, 0) + 1
+
+    safety_code = row.get('safety_code', '')
+    if safety_code:
+        bucket['safety_codes'][safety_code] = bucket['safety_codes'].get(safety_code, 0) + 1
+
+    duration = _to_float(row.get('duration_seconds', 0))
+    if duration is not None and duration > 0:
+        bucket['duration_sum'] += duration
+        bucket['duration_count'] += 1
+        if bucket['duration_min'] is None or duration < bucket['duration_min']:
+            bucket['duration_min'] = duration
+        if bucket['duration_max'] is None or duration > bucket['duration_max']:
+            bucket['duration_max'] = duration
+        bucket['duration_histogram'][_histogram_index(duration)] += 1
+
+    for key in ('total_steps', 'completed_steps', 'successful_steps', 'failed_steps'):
+        bucket[key] += _to_int(row.get(key, 0))
+
+    timestamp = row.get('timestamp_start', '')
+    if timestamp:
+        if bucket['first_timestamp'] is None or timestamp < bucket['first_timestamp']:
+            bucket['first_timestamp'] = timestamp
+        if bucket['last_timestamp'] is None or timestamp > bucket['last_timestamp']:
+            bucket['last_timestamp'] = timestamp
+
+    # Programs are keyed by the raw name ('' kept separate from the
+    # display fallback so "most run program" ignores unnamed runs)
+    name = row.get('program_name', '') or ''
+    program = bucket['programs'].get(name)
+    if program is None:
+        program = bucket['programs'][name] = {
+            'run_count': 0,
+            'success_count': 0,
+            'fail_count': 0,
+            'total_duration': 0.0,
+            'duration_sum': 0.0,
+            'duration_count': 0,
+        }
+    program['run_count'] += 1
+    if status == 'success':
+        program['success_count'] += 1
+    else:
+        program['fail_count'] += 1
+    if duration is not None:
+        program['total_duration'] += duration
+        if duration > 0:
+            program['duration_sum'] += duration
+            program['duration_count'] += 1
+
+    if status != 'success':
+        bucket['failed_runs'].append({
+            'timestamp': row.get('timestamp_start', 'N/A'),
+            'program_name': row.get('program_name', 'N/A'),
+            'status': status,
+            'completed_steps': str(row.get('completed_steps', '0')),
+            'total_steps': str(row.get('total_steps', '0')),
+            'error_message': row.get('error_message', ''),
+            'safety_code': row.get('safety_code', ''),
+            'safety_message': row.get('safety_message', ''),
+            'hardware_mode': row.get('hardware_mode', 'unknown'),
+        })
+
+
+def iter_csv_records(csv_path, start_offset=None, end_offset=None):
+    """Stream data rows of an analytics CSV with their byte offsets.
+
+    Reads the header, then seeks to start_offset (if given) and yields
+    (offset, next_offset, row_dict) until end_offset is reached. Rows are
+    read as raw lines so offsets stay exact; quoted fields containing
+    newlines are reassembled before parsing.
+    """
+    with open(csv_path, 'rb') as f:
+        header_line = f.readline()
+        if not header_line:
+            return
+        header = next(csv.reader([header_line.decode('utf-8-sig')]), [])
+        data_start = f.tell()
+
+        pos = data_start if start_offset is None else max(start_offset, data_start)
+        f.seek(pos)
+        pending = b''
+        record_offset = pos
+
+        while end_offset is None or pos < end_offset or pending:
+            line = f.readline()
+            if not line:
+                break
+            if not pending:
+                record_offset = pos
+            pos += len(line)
+            pending += line
+            if pending.count(b'"') % 2:
+                continue  # newline inside a quoted field - keep reading
+
+            text = pending.decode('utf-8')
+            pending = b''
+            row = next(csv.DictReader(io.StringIO(text), fieldnames=header), None)
+            if row is not None:
+                yield record_offset, pos, row
+
+
+def _period_bounds(period):
+    """Normalise a period tuple to (start, end) datetimes, or None for 'all'"""
+    if not period or (not period[0] and not period[1]):
+        return None
+    return period[0] or datetime.min, period[1] or datetime.max
+
+
+def _row_in_period(row, start, end):
+    try:
+        ts = datetime.fromisoformat(row.get('timestamp_start', ''))
+    except (ValueError, TypeError):
+        return False
+    return start <= ts <= end
+
+
+def iter_rows(csv_path, period=None, start_offset=None, end_offset=None):
+    """Yield CSV rows (dicts) lazily, optionally limited to a period and byte range"""
+    bounds = _period_bounds(period)
+    for _, _, row in iter_csv_records(csv_path, start_offset, end_offset):
+        if bounds is None or _row_in_period(row, *bounds):
+            yield row
+
+
+def summarize_rows(rows):
+    """Single-pass summary over an iterable of CSV rows.
+
+    Folds rows into one bucket as they stream by, so memory does not
+    grow with the number of runs (apart from the failed-run details).
+    Returns the same dict as AnalyticsAggregates.summarize, or None.
+    """
+    bucket = _new_bucket()
+    for row in rows:
+        _add_row_to_bucket(bucket, row)
+    return summarize_buckets([bucket])
+
+
+def _bucket_keys(timestamp):
+    """Return (hour_key, day_key) for an ISO timestamp, or (None, None)"""
+    try:
+        dt = datetime.fromisoformat(timestamp)
+    except (ValueError, TypeError):
+        return None, None
+    return dt.strftime('%Y-%m-%dT%H'), dt.strftime('%Y-%m-%d')
+
+
+class AnalyticsAggregates:
+    """Hourly/daily aggregate cache for one analytics CSV file"""
+
+    # In-process copy of the last loaded cache per path: (file mtime_ns, data)
+    _memory_cache = {}
+
+    def __init__(self, csv_path):
+        self.logger = get_logger()
+        self.csv_path = csv_path
+        self.path = get_aggregates_path(csv_path)
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _empty(self):
+        return {
+            'version': CACHE_VERSION,
+            'source': None,
+            'hourly': {},
+            'daily': {},
+            'day_offsets': {},     # day -> [first row offset, end of last row]
+            'undated': _new_bucket(),
+        }
+
+    def _load(self):
+        """Load the cache file (memoised on its mtime)"""
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            return self._empty()
+
+        cached = self._memory_cache.get(self.path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return self._empty()
+
+        if data.get('version') != CACHE_VERSION:
+            return self._empty()
+
+        self._memory_cache[self.path] = (mtime, data)
+        return data
+
+    def _save(self, data):
+        """Atomically write the cache file"""
+        cache_dir = os.path.dirname(self.path)
+        if cache_dir and not os.path.exists(cache_dir):
+            os.makedirs(cache_dir, exist_ok=True)
+
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+
+        try:
+            self._memory_cache[self.path] = (os.stat(self.path).st_mtime_ns, data)
+        except OSError:
+            self._memory_cache.pop(self.path, None)
+
+    @staticmethod
+    def _apply_row(data, row, offset, next_offset):
+        hour_key, day_key = _bucket_keys(row.get('timestamp_start', ''))
+        if hour_key is None:
+            _add_row_to_bucket(data['undated'], row)
+            return
+        for table, key in (('hourly', hour_key), ('daily', day_key)):
+            bucket = data[table].get(key)
+            if bucket is None:
+                bucket = data[table][key] = _new_bucket()
+            _add_row_to_bucket(bucket, row)
+
+        span = data['day_offsets'].get(day_key)
+        if span is None:
+            data['day_offsets'][day_key] = [offset, next_offset]
+        else:
+            span[0] = min(span[0], offset)
+            span[1] = max(span[1], next_offset)
+
+    def rebuild(self):
+        """Rebuild the whole cache from the CSV. Returns the new cache data."""
+        data = self._empty()
+        signature = _csv_signature(self.csv_path)
+
+        if signature is not None:
+            try:
+                for offset, next_offset, row in iter_csv_records(self.csv_path):
+                    self._apply_row(data, row, offset, next_offset)
+            except Exception as e:
+                self.logger.warning(f"Failed to read analytics CSV: {e}", category="execution")
+
+        # Keep buckets in chronological order so merges preserve first-seen order
+        data['hourly'] = dict(sorted(data['hourly'].items()))
+        data['daily'] = dict(sorted(data['daily'].items()))
+        data['day_offsets'] = dict(sorted(data['day_offsets'].items()))
+        data['source'] = signature
+
+        try:
+            self._save(data)
+        except Exception as e:
+            self.logger.warning(f"Failed to write analytics aggregates: {e}", category="execution")
+        return data
+
+    def _current(self):
+        """Return cache data that matches the CSV, rebuilding if stale"""
+        data = self._load()
+        if data.get('source') != _csv_signature(self.csv_path):
+            data = self.rebuild()
+        return data
+
+    def record_run(self, row, previous_signature):
+        """Fold a freshly appended CSV row into the cache.
+
+        Args:
+            row: The row dict that was just appended to the CSV
+            previous_signature: CSV signature taken *before* the append
+                (from csv_signature()); if the cache was not built from
+                exactly that file state, it is rebuilt instead.
+        """
+        with _file_lock:
+            data = self._load()
+            if data.get('source') != previous_signature or previous_signature is None:
+                self.rebuild()
+                return
+
+            # The row starts where the file ended before the append
+            signature = _csv_signature(self.csv_path)
+            self._apply_row(data, row, previous_signature[0], signature[0])
+            data['source'] = signature
+            self._save(data)
+
+    def csv_signature(self):
+        """Return the current CSV signature (size, mtime)"""
+        return _csv_signature(self.csv_path)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def iter_rows(self, period=None):
+        """Yield the CSV rows of a period lazily, seeking via the day index"""
+        bounds = _period_bounds(period)
+        if bounds is None:
+            yield from iter_rows(self.csv_path)
+            return
+
+        with _file_lock:
+            data = self._current()
+
+        start, end = bounds
+        start_day = start.strftime('%Y-%m-%d')
+        end_day = end.strftime('%Y-%m-%d')
+        spans = [
+            span for day, span in data['day_offsets'].items()
+            if start_day <= day <= end_day
+        ]
+        if not spans:
+            return
+
+        start_offset = min(span[0] for span in spans)
+        end_offset = max(span[1] for span in spans)
+        yield from iter_rows(self.csv_path, bounds, start_offset, end_offset)
+
+    def _select_buckets(self, data, period):
+        """Return the buckets covering period, coarsest first"""
+        bounds = _period_bounds(period)
+        if bounds is None:
+            buckets = list(data['daily'].values())
+            if data['undated']['run_count']:
+                buckets.append(data['undated'])
+            return buckets
+
+        start, end = bounds
+        buckets = []
+        start_day = start.strftime('%Y-%m-%d')
+        end_day = end.strftime('%Y-%m-%d')
+
+        for day_key, day_bucket in data['daily'].items():
+            if day_key < start_day or day_key > end_day:
+                continue
+            day_start = datetime.strptime(day_key, '%Y-%m-%d')
+            day_end = day_start + timedelta(days=1) - timedelta(microseconds=1)
+            if start <= day_start and day_end <= end:
+                buckets.append(day_bucket)
+                continue
+
+            # Partially covered day - use hourly buckets that overlap the period
+            for hour in range(24):
+                hour_key = f"{day_key}T{hour:02d}"
+                hour_bucket = data['hourly'].get(hour_key)
+                if hour_bucket is None:
+                    continue
+                hour_start = day_start + timedelta(hours=hour)
+                hour_end = hour_start + timedelta(hours=1) - timedelta(microseconds=1)
+                if hour_end >= start and hour_start <= end:
+                    buckets.append(hour_bucket)
+
+        return buckets
+
+    def summarize(self, period=None):
+        """Compute a period summary from the aggregate buckets.
+
+        Args:
+            period: Optional (start_datetime, end_datetime) tuple; either
+                    end may be None for an open-ended range
+
+        Returns:
+            dict with the same keys as EmailReporter.generate_summary,
+            or None if there are no runs in the period
+        """
+        with _file_lock:
+            data = self._current()
+        return summarize_buckets(self._select_buckets(data, period))
+
+
+def summarize_buckets(buckets):
+    """Merge aggregate buckets into a summary dict (None if no runs)"""
+    total_runs = sum(b['run_count'] for b in buckets)
+    if total_runs == 0:
+        return None
+
+    status_counts = Counter()
+    hardware_counts = Counter()
+    safety_codes = Counter()
+    histogram = [0] * (len(DURATION_HISTOGRAM_BOUNDS) + 1)
+    duration_sum = 0.0
+    duration_count = 0
+    duration_min = None
+    duration_max = None
+    steps = Counter()
+    first_ts = None
+    last_ts = None
+    programs = {}
+    failed_runs = []
+
+    for b in buckets:
+        status_counts.update(b['status_counts'])
+        hardware_counts.update(b['hardware_counts'])
+        safety_codes.update(b['safety_codes'])
+        for i, count in enumerate(b['duration_histogram']):
+            histogram[i] += count
+        duration_sum += b['duration_sum']
+        duration_count += b['duration_count']
+        if b['duration_min'] is not None and (duration_min is None or b['duration_min'] < duration_min):
+            duration_min = b['duration_min']
+        if b['duration_max'] is not None and (duration_max is None or b['duration_max'] > duration_max):
+            duration_max = b['duration_max']
+        for key in ('total_steps', 'completed_steps', 'successful_steps', 'failed_steps'):
+            steps[key] += b[key]
+        if b['first_timestamp'] and (first_ts is None or b['first_timestamp'] < first_ts):
+            first_ts = b['first_timestamp']
+        if b['last_timestamp'] and (last_ts is None or b['last_timestamp'] > last_ts):
+            last_ts = b['last_timestamp']
+        for name, p in b['programs'].items():
+            merged = programs.setdefault(name, Counter())
+            merged.update(p)
+        failed_runs.extend(b['failed_runs'])
+
+    success_count = status_counts.get('success', 0)
+    success_rate = success_count / total_runs * 100
+    avg_duration = duration_sum / duration_count if duration_count else 0
+
+    program_counts = Counter({name: p['run_count'] for name, p in programs.items() if name})
+    most_run_program = program_counts.most_common(1)[0] if program_counts else ('N/A', 0)
+    most_common_safety = safety_codes.most_common(1)[0] if safety_codes else ('N/A', 0)
+
+    # Per-program breakdown ('' folds into the unnamed display label)
+    breakdown = {}
+    for name, p in programs.items():
+        display = name or UNNAMED_PROGRAM
+        breakdown.setdefault(display, Counter()).update(p)
+
+    program_breakdown = []
+    for name, p in breakdown.items():
+        program_breakdown.append({
+            'name': name,
+            'run_count': p['run_count'],
+            'success_count': p['success_count'],
+            'fail_count': p['fail_count'],
+            'total_duration': round(p['total_duration'], 1),
+            'avg_duration': (
+                round(p['duration_sum'] / p['duration_count'], 1)
+                if p['duration_count'] else 0
+            ),
+        })
+    program_breakdown.sort(key=lambda x: x['run_count'], reverse=True)
+
+    return {
+        'total_runs': total_runs,
+        'success_count': success_count,
+        'success_rate': round(success_rate, 1),
+        'status_counts': dict(status_counts),
+        'avg_duration': round(avg_duration, 1),
+        'duration_min': duration_min,
+        'duration_max': duration_max,
+        'duration_histogram': histogram,
+        'most_run_program': most_run_program,
+        'most_common_safety': most_common_safety,
+        'date_from': first_ts or 'N/A',
+        'date_to': last_ts or 'N/A',
+        'hardware_counts': dict(hardware_counts),
+        'total_steps_all': steps['total_steps'],
+        'completed_steps_all': steps['completed_steps'],
+        'successful_steps_all': steps['successful_steps'],
+        'failed_steps_all': steps['failed_steps'],
+        'failed_runs': failed_runs,
+        'program_breakdown': program_breakdown,
+    }
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Hardware Health Records for Scratch-Desk CNC
+============================================
+
+Turns the hardware health snapshot (piston actuation-time and sensor
+bounce histograms, see hardware_health.py) into rows of a CSV table
+(hardware_health.csv) linked to runs.csv by run_id. One row is written
+per piston direction and per sensor at the end of every run, so p95
+drift can be followed across days even though the live histograms
+start over when the application restarts. load_baselines() reads the
+last recorded baseline of each piston back, so a restart does not reset
+the reference the drift alerts compare against.
+
+Usage:
+    from core.analytics_health import health_records, write_health
+    records = health_records(run_id, hardware.get_hardware_health())
+    get_analytics_writer().submit(lambda: write_health(csv_path, records))
+    health_monitor.seed_baselines(load_baselines(csv_path))
+"""
+
+import csv
+import os
+from datetime import datetime
+
+from core.logger import get_logger
+
+
+HEALTH_COLUMNS = [
+    'run_id',
+    'timestamp',
+    'kind',
+    'name',
+    'samples',
+    'p50_ms',
+    'p95_ms',
+    'baseline_p95_ms',
+    'timeouts',
+    'transitions',
+    'glitches',
+    'bounces',
+    'alert',
+]
+
+
+def health_records(run_id, health):
+    """CSV rows for one health snapshot ('piston' and 'sensor' rows)"""
+    if not health:
+        return []
+    timestamp = datetime.now().isoformat()
+    records = []
+    for name, piston in health.get('pistons', {}).items():
+        records.append({
+            'run_id': run_id, 'timestamp': timestamp, 'kind': 'piston', 'name': name,
+            'samples': piston['samples'], 'p50_ms': piston['p50_ms'], 'p95_ms': piston['p95_ms'],
+            'baseline_p95_ms': piston['baseline_p95_ms'], 'timeouts': piston['timeouts'],
+            'transitions': '', 'glitches': '', 'bounces': '', 'alert': piston['alert'],
+        })
+    for name, sensor in health.get('sensors', {}).items():
+        records.append({
+            'run_id': run_id, 'timestamp': timestamp, 'kind': 'sensor', 'name': name,
+            'samples': sensor['transitions'] + sensor['glitches'], 'p50_ms': '', 'p95_ms': '',
+            'baseline_p95_ms': '', 'timeouts': '', 'transitions': sensor['transitions'],
+            'glitches': sensor['glitches'], 'bounces': sensor['bounces'], 'alert': False,
+        })
+    return records
+
+
+def load_baselines(csv_path):
+    """Last recorded baseline p95 (ms) per 'piston:state' in the health CSV"""
+    baselines = {}
+    if not os.path.exists(csv_path):
+        return baselines
+    try:
+        with open(csv_path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                if row.get('kind') == 'piston' and row.get('baseline_p95_ms'):
+                    baselines[row['name']] = float(row['baseline_p95_ms'])
+    except (OSError, ValueError, csv.Error) as e:
+        get_logger().warning(f"Could not read piston baselines from {csv_path}: {e}", category="hardware")
+    return baselines
+
+
+def write_health(csv_path, records):
+    """Append health rows to the health CSV (runs on the analytics writer thread)"""
+    if not records:
+        return
+
+    csv_dir = os.path.dirname(csv_path)
+    if csv_dir and not os.path.exists(csv_dir):
+        os.makedirs(csv_dir, exist_ok=True)
+
+    write_header = not os.path.exists(csv_path)
+    with open(csv_path, 'a', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=HEALTH_COLUMNS)
+        if write_header:
+            writer.writeheader()
+        writer.writerows(records)
+
+    get_logger().debug(
+        f"Hardware health: {len(records)} rows written for run {records[0]['run_id'][:8]}",
+        category="execution"
+    )
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Per-Step Execution Telemetry for Scratch-Desk CNC
+==================================================
+
+Opt-in companion to the run-level analytics collector. While a run is
+executing, RunTelemetry timestamps the engine's status events and turns
+them into spans:
+
+    step          step_executing -> step_completed (every step)
+    sensor_wait   waiting_sensor -> step_completed (operator latency)
+    safety_wait   safety_waiting -> running / step end (pre-step rule wait)
+    safety_pause  emergency_stop -> safety_recovered (real-time monitor pause)
+    transition    transition_alert -> transition_complete (door dialog)
+    pause         paused -> resumed (manual pause)
+
+Recording only appends to an in-memory list, so the status callback
+path stays cheap. When the run ends the spans are handed to the
+analytics writer thread, which appends them to a single CSV table
+(step_telemetry.csv) linked to runs.csv by run_id.
+
+Usage:
+    from core.analytics_telemetry import RunTelemetry, write_telemetry
+    telemetry = RunTelemetry(run_id)
+    telemetry.on_status(status, info, engine)   # from the status callback
+    records = telemetry.close()
+    get_analytics_writer().submit(lambda: write_telemetry(csv_path, records))
+"""
+
+import csv
+import os
+import threading
+import time
+from datetime import datetime
+
+from core.logger import get_logger
+
+
+TELEMETRY_COLUMNS = [
+    'run_id',
+    'timestamp',
+    'step_index',
+    'operation',
+    'event',
+    'duration_seconds',
+    'detail',
+]
+
+# Status that opens a span -> (span event, statuses that close it)
+_SPAN_CLOSERS = {
+    'sensor_wait': ('step_completed', 'stopped', 'error', 'sensor_timeout'),
+    'safety_wait': ('running', 'step_completed', 'stopped', 'error', 'emergency_stop'),
+    'safety_pause': ('safety_recovered', 'stopped', 'error'),
+    'transition': ('transition_complete', 'stopped', 'error'),
+    'pause': ('resumed', 'stopped', 'error'),
+}
+
+
+def _step_detail(step):
+    """Short, operation-specific description of a step"""
+    if not step:
+        return ''
+    parameters = step.get('parameters', {})
+    operation = step.get('operation', '')
+    if operation in ('move_x', 'move_y'):
+        return str(parameters.get('position', ''))
+    if operation == 'wait_sensor':
+        return parameters.get('sensor', '')
+    if operation == 'tool_action':
+        return f"{parameters.get('tool', '')}:{parameters.get('action', '')}"
+    if operation == 'tool_group':
+        return ','.join(f"{item.get('tool', '')}:{item.get('action', '')}" for item in parameters.get('actions', []))
+    if operation == 'tool_positioning':
+        return parameters.get('action', '')
+    return ''
+
+
+class RunTelemetry:
+    """Collects timing spans for a single execution run"""
+
+    def __init__(self, run_id):
+        self.run_id = run_id
+        self._lock = threading.Lock()
+        self._records = []
+        self._open_spans = {}      # event -> (start_monotonic, start_wall, step_index, operation, detail)
+        self._step_start = None    # (start_monotonic, start_wall, step_index, operation, detail)
+        self._current_step = (None, '')  # (step_index, operation)
+
+    def _record(self, start_wall, step_index, operation, event, duration, detail):
+        self._records.append({
+            'run_id': self.run_id,
+            'timestamp': datetime.fromtimestamp(start_wall).isoformat(),
+            'step_index': '' if step_index is None else step_index,
+            'operation': operation,
+            'event': event,
+            'duration_seconds': round(duration, 3),
+            'detail': detail,
+        })
+
+    def _open(self, event, detail=''):
+        if event in self._open_spans:
+            return
+        step_index, operation = self._current_step
+        self._open_spans[event] = (time.monotonic(), time.time(), step_index, operation, detail)
+
+    def _close_matching(self, status):
+        now = time.monotonic()
+        for event, closers in _SPAN_CLOSERS.items():
+            if status in closers and event in self._open_spans:
+                start, wall, step_index, operation, detail = self._open_spans.pop(event)
+                self._record(wall, step_index, operation, event, now - start, detail)
+
+    def on_status(self, status, info, engine=None):
+        """Record a status event (called from the analytics status callback)"""
+        info = info or {}
+        with self._lock:
+            # Close spans first so a status can both end and start spans
+            self._close_matching(status)
+
+            if status == 'step_executing':
+                step_index = info.get('step_index')
+                step = None
+                if engine is not None and step_index is not None and step_index < len(engine.steps):
+                    step = engine.steps[step_index]
+                operation = step.get('operation', '') if step else ''
+                self._current_step = (step_index, operation)
+                self._step_start = (time.monotonic(), time.time(), step_index, operation, _step_detail(step))
+
+            elif status == 'step_completed':
+                if self._step_start is not None:
+                    start, wall, step_index, operation, detail = self._step_start
+                    self._record(wall, step_index, operation, 'step', time.monotonic() - start, detail)
+                    self._step_start = None
+
+            elif status == 'waiting_sensor':
+                self._open('sensor_wait', info.get('sensor', ''))
+
+            elif status == 'safety_waiting':
+                self._open('safety_wait', info.get('safety_code', ''))
+
+            elif status == 'emergency_stop' and info.get('monitor_type'):
+                self._open('safety_pause', info.get('safety_code', ''))
+
+            elif status == 'transition_alert':
+                self._open('transition')
+
+            elif status == 'paused':
+                self._open('pause')
+
+    def close(self):
+        """Close any spans still open and return all recorded rows"""
+        with self._lock:
+            now = time.monotonic()
+            for event, (start, wall, step_index, operation, detail) in self._open_spans.items():
+                self._record(wall, step_index, operation, event, now - start, detail)
+            self._open_spans = {}
+            if self._step_start is not None:
+                start, wall, step_index, operation, detail = self._step_start
+                self._record(wall, step_index, operation, 'step', now - start, detail)
+                self._step_start = None
+            records = self._records
+            self._records = []
+        return records
+
+
+def write_telemetry(csv_path, records):
+    """Append telemetry rows to the telemetry CSV (runs on the analytics writer thread)"""
+    if not records:
+        return
+
+    csv_dir = os.path.dirname(csv_path)
+    if csv_dir and not os.path.exists(csv_dir):
+        os.makedirs(csv_dir, exist_ok=True)
+
+    write_header = not os.path.exists(csv_path)
+    with open(csv_path, 'a', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=TELEMETRY_COLUMNS)
+        if write_header:
+            writer.writeheader()
+        writer.writerows(records)
+
+    get_logger().debug(
+        f"Telemetry: {len(records)} spans written for run {records[0]['run_id'][:8]}",
+        category="execution"
+    )
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Background Writer for Scratch-Desk Analytics
+=============================================
+
+Single daemon thread that performs all analytics file I/O (run rows,
+aggregate cache, step telemetry) off the execution thread. Jobs are
+plain callables placed on a bounded queue; submitting never blocks, so
+finishing a run can't delay the engine's final state transition. If the
+queue is full (disk stalled), the job is dropped with a warning rather
+than stalling the machine.
+
+Call flush() on shutdown so queued runs reach disk before exit.
+
+Usage:
+    from core.analytics_writer import get_analytics_writer
+    get_analytics_writer().submit(lambda: write_row(path, row))
+    get_analytics_writer().flush(timeout=2.0)
+"""
+
+import queue
+import threading
+
+from core.logger import get_logger
+
+
+DEFAULT_QUEUE_SIZE = 64
+
+_writer_instance = None
+_writer_lock = threading.Lock()
+
+
+def get_analytics_writer():
+    """Get singleton AnalyticsWriter instance"""
+    global _writer_instance
+    if _writer_instance is None:
+        with _writer_lock:
+            if _writer_instance is None:
+                _writer_instance = AnalyticsWriter()
+    return _writer_instance
+
+
+class AnalyticsWriter:
+    """Runs analytics persistence jobs on a background thread"""
+
+    def __init__(self, max_queue_size=DEFAULT_QUEUE_SIZE):
+        self.logger = get_logger()
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._thread = None
+        self._thread_lock = threading.Lock()
+
+    def _ensure_thread(self):
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._writer_loop, daemon=True, name="AnalyticsWriter"
+                )
+                self._thread.start()
+
+    def submit(self, job, description="analytics"):
+        """Queue a callable for the writer thread. Never blocks.
+
+        Returns:
+            bool: True if queued, False if the queue was full and the job dropped
+        """
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait((job, description))
+            return True
+        except queue.Full:
+            self.logger.warning(
+                f"Analytics writer queue full - dropping {description} write",
+                category="execution"
+            )
+            return False
+
+    def flush(self, timeout=None):
+        """Block until every job queued so far has run.
+
+        Returns:
+            bool: True if the queue drained within timeout
+        """
+        if self._thread is None or not self._thread.is_alive():
+            if self._queue.empty():
+                return True
+            self._ensure_thread()
+
+        done = threading.Event()
+        try:
+            self._queue.put((done.set, None), timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def pending(self):
+        """Approximate number of queued jobs"""
+        return self._queue.qsize()
+
+    def _writer_loop(self):
+        while True:
+            job, description = self._queue.get()
+            try:
+                job()
+            except Exception as e:
+                self.logger.warning(f"Failed to write {description}: {e}", category="execution")
+            finally:
+                self._queue.task_done()
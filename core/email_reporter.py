@@ -7,26 +7,33 @@ Generates summary reports from analytics CSV data and sends
 via SMTP with CSV attachment. Includes a cron-like scheduler
 for automatic periodic reports.
 
+Rendered reports are cached per period (core.report_cache); the
+scheduler pre-renders each period as soon as it closes, and
+queue_report() hands delivery to the retrying outbox
+(core.report_outbox) so callers never wait on SMTP.
+
 Usage:
     from core.email_reporter import get_email_reporter
     reporter = get_email_reporter()
     success, error = reporter.send_report()
+    queued, error = reporter.queue_report(on_done=callback)
 """
 
-import csv
 import json
 import os
 import smtplib
 import threading
 import time
-from collections import Counter
 from datetime import datetime, timedelta
 from email.mime.base import MIMEBase
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email import encoders
 
+from core.analytics_aggregates import AnalyticsAggregates, iter_rows, summarize_rows
 from core.logger import get_logger
+from core.report_cache import ReportCache, report_key
+from core.report_outbox import get_report_outbox
 
 
 def _load_settings():
@@ -68,6 +75,8 @@ class EmailReporter:
         self.logger = get_logger()
         self._scheduler_thread = None
         self._scheduler_stop = threading.Event()
+        self._scheduled_in_flight = threading.Event()
+        self._prerendered = None
 
     def _get_email_settings(self):
         """Get email configuration from settings"""
@@ -151,6 +160,11 @@ class EmailReporter:
     def generate_summary(self, csv_path=None, period=None):
         """Generate a summary dict from the analytics CSV.
 
+        Statistics come from the hourly/daily aggregate cache next to the
+        CSV (see core.analytics_aggregates), which is rebuilt automatically
+        if the CSV changed outside the collector. If the cache cannot be
+        used, the period's rows are streamed from the CSV in a single pass.
+
         Args:
             csv_path: Path to the CSV file (uses settings default if None)
             period: Optional (start_datetime, end_datetime) tuple to filter rows
@@ -164,187 +178,47 @@ class EmailReporter:
         if not os.path.exists(csv_path):
             return None
 
-        rows = []
+        if not (period and period[0] and period[1]):
+            period = None
+
         try:
-            with open(csv_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    rows.append(row)
+            return AnalyticsAggregates(csv_path).summarize(period)
         except Exception as e:
-            self.logger.warning(f"Failed to read analytics CSV: {e}", category="execution")
+            self.logger.warning(f"Aggregate summary failed, scanning CSV: {e}", category="execution")
 
-        # Filter rows by period if provided
-        if period and period[0] and period[1]:
-            period_start, period_end = period
-            start_iso = period_start.isoformat()
-            end_iso = period_end.isoformat()
-            rows = [
-                r for r in rows
-                if start_iso <= r.get('timestamp_start', '') <= end_iso
-            ]
-
-        if not rows:
+        try:
+            return summarize_rows(iter_rows(csv_path, period))
+        except Exception as e:
+            self.logger.warning(f"Failed to summarize analytics: {e}", category="execution")
             return None
 
-        total_runs = len(rows)
-
-        # Count by status
-        status_counts = Counter(r.get('completion_status', 'unknown') for r in rows)
-        success_count = status_counts.get('success', 0)
-        success_rate = (success_count / total_runs * 100) if total_runs > 0 else 0
+    def _check_email_settings(self, email_settings):
+        """Return an error message if email sending is not configured, else ''"""
+        if not email_settings.get('enabled', False):
+            return 'Email reporting is disabled'
+        if (not email_settings.get('smtp_server', '')
+                or not email_settings.get('recipient_email', '')
+                or not email_settings.get('sender_email', '')):
+            return 'Missing email configuration (server, sender, or recipient)'
+        return ''
 
-        # Average duration
-        durations = []
-        for r in rows:
-            try:
-                d = float(r.get('duration_seconds', 0))
-                if d > 0:
-                    durations.append(d)
-            except (ValueError, TypeError):
-                pass
-        avg_duration = sum(durations) / len(durations) if durations else 0
+    def render_report(self, csv_path=None, period=None):
+        """Return the report HTML body for a period.
 
-        # Most-run program
-        program_counts = Counter(r.get('program_name', '') for r in rows if r.get('program_name'))
-        most_run_program = program_counts.most_common(1)[0] if program_counts else ('N/A', 0)
-
-        # Most common safety code
-        safety_codes = Counter(
-            r.get('safety_code', '') for r in rows
-            if r.get('safety_code')
-        )
-        most_common_safety = safety_codes.most_common(1)[0] if safety_codes else ('N/A', 0)
-
-        # Date range
-        timestamps = [r.get('timestamp_start', '') for r in rows if r.get('timestamp_start')]
-        date_from = min(timestamps) if timestamps else 'N/A'
-        date_to = max(timestamps) if timestamps else 'N/A'
-
-        # Hardware mode breakdown
-        hardware_counts = Counter(r.get('hardware_mode', 'unknown') for r in rows)
-
-        # Total steps across all runs
-        total_steps_all = 0
-        completed_steps_all = 0
-        successful_steps_all = 0
-        failed_steps_all = 0
-        for r in rows:
-            try:
-                total_steps_all += int(r.get('total_steps', 0))
-                completed_steps_all += int(r.get('completed_steps', 0))
-                successful_steps_all += int(r.get('successful_steps', 0))
-                failed_steps_all += int(r.get('failed_steps', 0))
-            except (ValueError, TypeError):
-                pass
-
-        # Per-program breakdown: runs, durations, success/fail
-        program_stats = {}
-        for r in rows:
-            name = r.get('program_name', '') or 'ללא שם'
-            if name not in program_stats:
-                program_stats[name] = {
-                    'run_count': 0,
-                    'success_count': 0,
-                    'fail_count': 0,
-                    'total_duration': 0.0,
-                    'durations': [],
-                }
-            ps = program_stats[name]
-            ps['run_count'] += 1
-            status = r.get('completion_status', 'unknown')
-            if status == 'success':
-                ps['success_count'] += 1
-            else:
-                ps['fail_count'] += 1
-            try:
-                d = float(r.get('duration_seconds', 0))
-                ps['total_duration'] += d
-                if d > 0:
-                    ps['durations'].append(d)
-            except (ValueError, TypeError):
-                pass
-
-        # Calculate averages and sort by run_count descending
-        program_breakdown = []
-        for name, ps in program_stats.items():
-            avg_dur = (
-                round(sum(ps['durations']) / len(ps['durations']), 1)
-                if ps['durations'] else 0
-            )
-            program_breakdown.append({
-                'name': name,
-                'run_count': ps['run_count'],
-                'success_count': ps['success_count'],
-                'fail_count': ps['fail_count'],
-                'total_duration': round(ps['total_duration'], 1),
-                'avg_duration': avg_dur,
-            })
-        program_breakdown.sort(key=lambda x: x['run_count'], reverse=True)
-
-        # Failed/incomplete runs (anything not 'success')
-        failed_runs = []
-        for r in rows:
-            status = r.get('completion_status', 'unknown')
-            if status != 'success':
-                failed_runs.append({
-                    'timestamp': r.get('timestamp_start', 'N/A'),
-                    'program_name': r.get('program_name', 'N/A'),
-                    'status': status,
-                    'completed_steps': r.get('completed_steps', '0'),
-                    'total_steps': r.get('total_steps', '0'),
-                    'error_message': r.get('error_message', ''),
-                    'safety_code': r.get('safety_code', ''),
-                    'safety_message': r.get('safety_message', ''),
-                    'hardware_mode': r.get('hardware_mode', 'unknown'),
-                })
-
-        return {
-            'total_runs': total_runs,
-            'success_count': success_count,
-            'success_rate': round(success_rate, 1),
-            'status_counts': dict(status_counts),
-            'avg_duration': round(avg_duration, 1),
-            'most_run_program': most_run_program,
-            'most_common_safety': most_common_safety,
-            'date_from': date_from,
-            'date_to': date_to,
-            'hardware_counts': dict(hardware_counts),
-            'total_steps_all': total_steps_all,
-            'completed_steps_all': completed_steps_all,
-            'successful_steps_all': successful_steps_all,
-            'failed_steps_all': failed_steps_all,
-            'failed_runs': failed_runs,
-            'program_breakdown': program_breakdown,
-        }
-
-    def send_report(self, csv_path=None, period=None):
-        """Build and send an HTML summary email with CSV attachment.
+        The rendered HTML is cached on disk keyed by the period and its
+        data (see core.report_cache), so sending the same period again -
+        or sending a period pre-rendered by the scheduler - only computes
+        the summary from the aggregate cache.
 
         Args:
             csv_path: Path to analytics CSV (uses settings default if None)
-            period: Optional (start_datetime, end_datetime) tuple. When provided,
-                    the report only includes data within this range. When None,
+            period: Optional (start_datetime, end_datetime) tuple. When None,
                     the period is auto-calculated from the configured schedule_frequency.
 
         Returns:
-            tuple: (success: bool, error_message: str)
+            tuple: (html or None, error_message)
         """
         email_settings = self._get_email_settings()
-        if not email_settings.get('enabled', False):
-            return False, 'Email reporting is disabled'
-
-        smtp_server = email_settings.get('smtp_server', '')
-        smtp_port = email_settings.get('smtp_port', 587)
-        smtp_use_tls = email_settings.get('smtp_use_tls', True)
-        smtp_username = email_settings.get('smtp_username', '')
-        smtp_password = email_settings.get('smtp_password', '')
-        sender_email = email_settings.get('sender_email', '')
-        recipient_email = email_settings.get('recipient_email', '')
-        subject_prefix = email_settings.get('subject_prefix', 'Scratch-Desk Analytics Report')
-
-        if not smtp_server or not recipient_email or not sender_email:
-            return False, 'Missing email configuration (server, sender, or recipient)'
-
         if csv_path is None:
             csv_path = self._get_csv_path()
 
@@ -360,7 +234,7 @@ class EmailReporter:
         # Generate summary filtered to the relevant period
         summary = self.generate_summary(csv_path, period=effective_period)
         if summary is None:
-            return False, 'No analytics data available'
+            return None, 'No analytics data available'
 
         # Inject period metadata for the HTML builder
         freq_label = self.FREQUENCY_HEBREW.get(frequency, frequency)
@@ -373,14 +247,47 @@ class EmailReporter:
             summary['period_from'] = period_start.strftime('%Y-%m-%d')
             summary['period_to'] = period_end.strftime('%Y-%m-%d')
 
-        # Build email
+        cache = ReportCache.for_csv(csv_path)
+        key = report_key(summary)
+        html_body = cache.get(key)
+        if html_body is None:
+            html_body = self._build_hebrew_html(summary)
+            cache.put(key, html_body)
+        return html_body, ''
+
+    def prerender_report(self, csv_path=None):
+        """Render the last closed scheduled period ahead of its send time.
+
+        Called from the scheduler loop; skips work while neither the
+        period nor the CSV has changed since the last pre-render.
+        """
+        if csv_path is None:
+            csv_path = self._get_csv_path()
+        if not os.path.exists(csv_path):
+            return
+
+        frequency = self._get_email_settings().get('schedule_frequency', 'daily')
+        period_start, period_end, _ = self._get_period_range(frequency)
+        st = os.stat(csv_path)
+        state = (csv_path, frequency, period_start, period_end, st.st_size, st.st_mtime_ns)
+        if state == self._prerendered:
+            return
+
+        html_body, _ = self.render_report(csv_path)
+        self._prerendered = state
+        if html_body is not None:
+            self.logger.debug(f"Pre-rendered {frequency} analytics report", category="execution")
+
+    def _build_message(self, html_body, csv_path, email_settings):
+        """Assemble the MIME message: HTML body plus the CSV attachment"""
+        frequency = email_settings.get('schedule_frequency', 'daily')
+        freq_label = self.FREQUENCY_HEBREW.get(frequency, frequency)
+        subject_prefix = email_settings.get('subject_prefix', 'Scratch-Desk Analytics Report')
+
         msg = MIMEMultipart()
-        msg['From'] = sender_email
-        msg['To'] = recipient_email
+        msg['From'] = email_settings.get('sender_email', '')
+        msg['To'] = email_settings.get('recipient_email', '')
         msg['Subject'] = f"{subject_prefix} ({freq_label}) - {datetime.now().strftime('%Y-%m-%d')}"
-
-        # Build Hebrew HTML body
-        html_body = self._build_hebrew_html(summary)
         msg.attach(MIMEText(html_body, 'html'))
 
         # Attach CSV file
@@ -395,14 +302,23 @@ class EmailReporter:
                     msg.attach(part)
             except Exception as e:
                 self.logger.warning(f"Failed to attach CSV: {e}", category="execution")
+        return msg
+
+    def _deliver(self, msg, email_settings):
+        """Send a built message over SMTP.
+
+        Returns:
+            tuple: (success: bool, error_message: str, retryable: bool)
+        """
+        smtp_server = email_settings.get('smtp_server', '')
+        smtp_port = email_settings.get('smtp_port', 587)
+        smtp_username = email_settings.get('smtp_username', '')
+        smtp_password = email_settings.get('smtp_password', '')
 
-        # Send email
         try:
-            if smtp_use_tls:
-                server = smtplib.SMTP(smtp_server, smtp_port, timeout=30)
+            server = smtplib.SMTP(smtp_server, smtp_port, timeout=30)
+            if email_settings.get('smtp_use_tls', True):
                 server.starttls()
-            else:
-                server = smtplib.SMTP(smtp_server, smtp_port, timeout=30)
 
             if smtp_username and smtp_password:
                 server.login(smtp_username, smtp_password)
@@ -414,21 +330,84 @@ class EmailReporter:
             self._update_last_sent()
 
             self.logger.info("Analytics report sent successfully", category="execution")
-            return True, ''
+            return True, '', False
 
         except smtplib.SMTPAuthenticationError:
             error = 'SMTP authentication failed - check username/password'
             self.logger.error(f"Email send failed: {error}", category="execution")
-            return False, error
+            return False, error, False
         except smtplib.SMTPConnectError:
             error = f'Could not connect to SMTP server {smtp_server}:{smtp_port}'
             self.logger.error(f"Email send failed: {error}", category="execution")
-            return False, error
+            return False, error, True
         except Exception as e:
             error = str(e)
             self.logger.error(f"Email send failed: {error}", category="execution")
+            return False, error, True
+
+    def send_report(self, csv_path=None, period=None):
+        """Build and send an HTML summary email with CSV attachment (blocking, single attempt).
+
+        Args:
+            csv_path: Path to analytics CSV (uses settings default if None)
+            period: Optional (start_datetime, end_datetime) tuple. When provided,
+                    the report only includes data within this range. When None,
+                    the period is auto-calculated from the configured schedule_frequency.
+
+        Returns:
+            tuple: (success: bool, error_message: str)
+        """
+        email_settings = self._get_email_settings()
+        error = self._check_email_settings(email_settings)
+        if error:
+            return False, error
+
+        if csv_path is None:
+            csv_path = self._get_csv_path()
+
+        html_body, error = self.render_report(csv_path, period)
+        if html_body is None:
             return False, error
 
+        msg = self._build_message(html_body, csv_path, email_settings)
+        success, error, _ = self._deliver(msg, email_settings)
+        return success, error
+
+    def queue_report(self, csv_path=None, period=None, on_done=None, on_retry=None):
+        """Queue a report for background rendering and delivery. Returns immediately.
+
+        Delivery goes through the report outbox, which retries transient
+        SMTP failures with back-off. on_done(success, error_message) is
+        called from the outbox thread when the report is finally sent or
+        abandoned; on_retry(error_message, delay_seconds) after each failed
+        attempt that will be retried.
+
+        Returns:
+            tuple: (queued: bool, error_message: str)
+        """
+        email_settings = self._get_email_settings()
+        error = self._check_email_settings(email_settings)
+        if error:
+            return False, error
+
+        if csv_path is None:
+            csv_path = self._get_csv_path()
+
+        msg = None
+
+        def attempt():
+            nonlocal msg
+            if msg is None:
+                html_body, render_error = self.render_report(csv_path, period)
+                if html_body is None:
+                    return False, render_error, False
+                msg = self._build_message(html_body, csv_path, email_settings)
+            return self._deliver(msg, email_settings)
+
+        get_report_outbox().enqueue(attempt, description="analytics report",
+                                    on_done=on_done, on_retry=on_retry)
+        return True, ''
+
     def _build_hebrew_html(self, summary):
         """Build the full Hebrew RTL HTML email body"""
 
@@ -794,15 +773,21 @@ class EmailReporter:
                     self._scheduler_stop.wait(60)
                     continue
 
+                # Render the period that just closed so the send is SMTP only
+                self.prerender_report()
+
                 now = datetime.now()
-                if self._is_schedule_due(now, email_settings):
+                if (self._is_schedule_due(now, email_settings)
+                        and not self._scheduled_in_flight.is_set()):
                     freq = email_settings.get('schedule_frequency', 'daily')
                     self.logger.info(
                         f"Scheduled {freq} analytics report sending...",
                         category="execution",
                     )
-                    success, error = self.send_report()
-                    if not success:
+                    self._scheduled_in_flight.set()
+                    queued, error = self.queue_report(on_done=self._on_scheduled_report_done)
+                    if not queued:
+                        self._scheduled_in_flight.clear()
                         self.logger.warning(
                             f"Scheduled report failed: {error}",
                             category="execution",
@@ -813,3 +798,9 @@ class EmailReporter:
 
             # Check every 60 seconds
             self._scheduler_stop.wait(60)
+
+    def _on_scheduled_report_done(self, success, error):
+        """Outbox callback for scheduled reports"""
+        self._scheduled_in_flight.clear()
+        if not success:
+            self.logger.warning(f"Scheduled report failed: {error}", category="execution")
@@ -4,7 +4,7 @@ import threading
 import time
 import json
 from hardware.interfaces.hardware_factory import get_hardware_interface
-from core.safety_system import SafetyViolation, check_step_safety
+from core.safety_system import SafetyViolation, check_step_safety, preview_step_safety
 from core.logger import get_logger
 from core.machine_state import MachineState, MachineStateManager
 
@@ -42,6 +42,8 @@ class ExecutionEngine:
         self.stop_event = threading.Event()
         self.safety_monitor_stop = threading.Event()
         self._transition_lock = threading.Lock()  # Protects in_transition flag
+        self._stream_idle = threading.Event()  # Cleared while a streamed move run owns the machine
+        self._stream_idle.set()
         self.in_transition = False  # Flag to pause safety monitoring during transitions
 
         # Progress tracking
@@ -173,6 +175,10 @@ class ExecutionEngine:
         # Stop safety monitoring
         self.safety_monitor_stop.set()
 
+        # A streamed move run halts the machine itself (feed hold + flush) - let it finish
+        if not self._stream_idle.wait(timeout=5.0):
+            self.logger.warning("Streamed moves still stopping - continuing stop", category="execution")
+
         # Wait for threads to finish (with timeout)
         if self.execution_thread and self.execution_thread.is_alive():
             self.execution_thread.join(timeout=timing_settings.get("thread_join_timeout_execution", 2.0))
@@ -488,7 +494,12 @@ class ExecutionEngine:
                     'total_steps': len(self.steps)
                 })
 
-                step_result = self._execute_step(step)
+                move_run = self._collect_move_run(step)
+                if move_run:
+                    # Consecutive moves are streamed; earlier ones complete via callback
+                    step, step_result = self._execute_move_run(move_run)
+                else:
+                    step_result = self._execute_step(step)
 
                 # CRITICAL: Check if stop was requested during step execution.
                 # If so, break immediately - don't treat step interruption as an error.
@@ -528,40 +539,7 @@ class ExecutionEngine:
                     })
                     break
 
-                # Notify step execution completed (for immediate position updates)
-                self._update_status("step_completed", {
-                    'description': step.get('description', ''),
-                    'step_index': self.current_step_index,
-                    'total_steps': len(self.steps),
-                    'result': step_result
-                })
-
-                # Store result
-                self.step_results.append({
-                    'step_index': self.current_step_index,
-                    'step': step,
-                    'result': step_result,
-                    'timestamp': time.time()
-                })
-
-                # Force canvas position update after each step
-                if hasattr(self, 'canvas_manager') and self.canvas_manager:
-                    self.canvas_manager.update_position_display()
-
-                # Move to next step FIRST, then update status with completed step index
-                completed_step_index = self.current_step_index
-                self.current_step_index += 1
-                self.logger.debug(f"STEP ADVANCE: {completed_step_index + 1} → {self.current_step_index + 1}", category="execution")
-
-                # Update progress - use current index which now points to next step
-                progress = (self.current_step_index) / len(self.steps) * 100
-                self._update_status("executing", {
-                    'step_index': self.current_step_index,
-                    'total_steps': len(self.steps),
-                    'progress': progress,
-                    'step_description': step.get('description', ''),
-                    'result': step_result
-                })
+                self._complete_step(step, step_result)
 
                 # Check what the next step will be
                 if self.current_step_index < len(self.steps):
@@ -606,6 +584,193 @@ class ExecutionEngine:
             MachineStateManager().set_state(MachineState.ERROR, error_message=str(e))
             self._update_status("error", {'error': str(e)})
 
+    def _complete_step(self, step, step_result):
+        """Record a finished step, notify listeners and advance to the next step"""
+        # Notify step execution completed (for immediate position updates)
+        self._update_status("step_completed", {
+            'description': step.get('description', ''),
+            'step_index': self.current_step_index,
+            'total_steps': len(self.steps),
+            'result': step_result
+        })
+
+        # Store result
+        self.step_results.append({
+            'step_index': self.current_step_index,
+            'step': step,
+            'result': step_result,
+            'timestamp': time.time()
+        })
+
+        # Force canvas position update after each step
+        if hasattr(self, 'canvas_manager') and self.canvas_manager:
+            self.canvas_manager.update_position_display()
+
+        # Move to next step FIRST, then update status with completed step index
+        completed_step_index = self.current_step_index
+        self.current_step_index += 1
+        self.logger.debug(f"STEP ADVANCE: {completed_step_index + 1} → {self.current_step_index + 1}", category="execution")
+
+        # Update progress - use current index which now points to next step
+        progress = (self.current_step_index) / len(self.steps) * 100
+        self._update_status("executing", {
+            'step_index': self.current_step_index,
+            'total_steps': len(self.steps),
+            'progress': progress,
+            'step_description': step.get('description', ''),
+            'result': step_result
+        })
+
+    def _collect_move_run(self, step):
+        """Return the consecutive move steps starting at the current step that can
+        be streamed to the motion controller together, or None for a single step.
+
+        The run stops before a step that would trigger the lines -> rows
+        transition (so the transition still runs between steps) and before
+        any step whose safety preview fails - that step then goes through
+        _execute_step and its normal safety check and wait. Each step is
+        previewed (nothing logged or recorded) at the position the earlier
+        moves of the run leave the machine in, so position conditions and
+        movement direction are evaluated per step; pistons and sensors are
+        not changed by moves, and the real-time monitor covers the rest.
+        """
+        if not hasattr(self.hardware, 'stream_moves') or step['operation'] not in ('move_x', 'move_y'):
+            return None
+
+        with self._transition_lock:
+            skip_safety = self.in_transition
+        operation_type = self.current_operation_type
+
+        run = []
+        positions = {}   # axis positions after the moves collected so far
+        index = self.current_step_index
+        while index < len(self.steps):
+            candidate = self.steps[index]
+            if candidate['operation'] not in ('move_x', 'move_y'):
+                break
+            detected_type = self._detect_operation_type_from_step(candidate)
+            if run:
+                if operation_type == 'lines' and detected_type == 'rows':
+                    break
+                operation_type = detected_type
+            if not skip_safety:
+                try:
+                    is_safe, _ = preview_step_safety(candidate, positions)
+                except Exception as e:
+                    self.logger.debug(f"Safety preview failed: {e}", category="execution")
+                    is_safe = False
+                if not is_safe:
+                    break
+            axis_key = 'x_position' if candidate['operation'] == 'move_x' else 'y_position'
+            positions[axis_key] = candidate['parameters']['position']
+            run.append(candidate)
+            index += 1
+
+        return run if len(run) >= 2 else None
+
+    def _execute_move_run(self, run):
+        """Stream a run of move steps; returns (last step, its result).
+
+        Every step but the last is completed from the hardware callback as
+        the machine reaches it, so progress and step results stay per-step.
+        The last step is returned to the execution loop like a normal step.
+        """
+        for step in run:
+            self.logger.info(f"Executing: {step.get('description', '')} (streamed)", category="execution")
+
+        def on_move_complete(index):
+            # After Stop the machine is being halted - report nothing further
+            if index >= len(run) - 1 or self.stop_event.is_set():
+                return
+            self._complete_step(run[index], {'success': True, 'position': run[index]['parameters']['position']})
+            next_step = run[index + 1]
+            self.current_step_description = next_step.get('description', '')
+            self._update_current_operation_type(next_step)
+            self._update_status("step_executing", {
+                'description': next_step.get('description', ''),
+                'hebDescription': next_step.get('hebDescription', next_step.get('description', '')),
+                'hebOperationTitle': next_step.get('hebOperationTitle', ''),
+                'step_index': self.current_step_index,
+                'total_steps': len(self.steps)
+            })
+
+        self._stream_idle.clear()
+        try:
+            moves = [(step['operation'], step['parameters']['position']) for step in run]
+            move_result = self.hardware.stream_moves(moves, on_move_complete=on_move_complete,
+                                                     cancel_event=self.stop_event)
+        except Exception as e:
+            self.logger.error(f"Streamed moves failed: {e}", category="execution")
+            move_result = False
+        finally:
+            self._stream_idle.set()
+
+        # Index now points at the first move the callback has not completed
+        step = self.steps[self.current_step_index]
+        if hasattr(self, 'canvas_manager') and self.canvas_manager:
+            self.canvas_manager.update_position_display()
+
+        if not move_result:
+            target = step['parameters']['position']
+            axis = 'X' if step['operation'] == 'move_x' else 'Y'
+            self.logger.error(f"{step['operation']} to {target} failed or did not complete", category="execution")
+            return step, {'success': False, 'error': f'Movement to {axis}={target} did not complete'}
+
+        return step, {'success': True, 'position': step['parameters']['position']}
+
+    def _run_async_move(self, handle):
+        """Wait for a background move while doing work that does not depend on it.
+
+        While the motors travel: the canvas follows the live position, the
+        next step's safety rules are previewed (so a coming block is in the
+        operator log before the machine stops), and a stop request cancels
+        the move instead of waiting for it to finish.
+        """
+        last_display_update = [0.0]
+
+        def on_progress(x, y, state):
+            now = time.monotonic()
+            if now - last_display_update[0] >= 0.1:
+                last_display_update[0] = now
+                if hasattr(self, 'canvas_manager') and self.canvas_manager:
+                    self.canvas_manager.update_position_display()
+
+        handle.add_progress_callback(on_progress)
+
+        previewed = False
+        while not handle.wait(timeout=0.05):
+            if self.stop_event.is_set():
+                self.logger.info("Stop requested during move - cancelling motion", category="execution")
+                handle.cancel()
+                handle.wait(timeout=5.0)
+                return False
+            if not previewed:
+                self._preview_next_step_safety()
+                previewed = True
+
+        return handle.result()
+
+    def _preview_next_step_safety(self):
+        """Evaluate the next step's safety rules ahead of time (advisory only -
+        the step is still checked for real before it executes)"""
+        next_index = self.current_step_index + 1
+        if next_index >= len(self.steps):
+            return
+        with self._transition_lock:
+            if self.in_transition:
+                return
+        next_step = self.steps[next_index]
+        try:
+            is_safe, violation = preview_step_safety(next_step)
+        except Exception as e:
+            self.logger.debug(f"Safety preview failed: {e}", category="execution")
+            return
+        if not is_safe and violation:
+            self.logger.warning(
+                f"Next step will wait for safety ({violation.safety_code}): {violation.message}",
+                category="execution"
+            )
+
     def _execute_step(self, step):
         """Execute a single step with safety validation"""
         operation = step['operation']
@@ -625,7 +790,8 @@ class ExecutionEngine:
 
             while True:
                 try:
-                    check_step_safety(step)
+                    for checked_step in self._safety_check_steps(step):
+                        check_step_safety(checked_step)
                     # Safety check passed, continue execution
                     if safety_wait_time > 0:
                         self.logger.success(f"Safety condition cleared! Continuing execution.", category="execution")
@@ -678,7 +844,10 @@ class ExecutionEngine:
             if operation == 'move_x':
                 target_x = parameters['position']
                 # Execute movement and wait for completion
-                move_result = self.hardware.move_x(target_x)
+                if hasattr(self.hardware, 'move_x_async'):
+                    move_result = self._run_async_move(self.hardware.move_x_async(target_x))
+                else:
+                    move_result = self.hardware.move_x(target_x)
 
                 # Update GUI position display if available
                 if hasattr(self, 'canvas_manager') and self.canvas_manager:
@@ -693,7 +862,10 @@ class ExecutionEngine:
             elif operation == 'move_y':
                 target_y = parameters['position']
                 # Execute movement and wait for completion
-                move_result = self.hardware.move_y(target_y)
+                if hasattr(self.hardware, 'move_y_async'):
+                    move_result = self._run_async_move(self.hardware.move_y_async(target_y))
+                else:
+                    move_result = self.hardware.move_y(target_y)
 
                 # Update GUI position display if available
                 if hasattr(self, 'canvas_manager') and self.canvas_manager:
@@ -794,16 +966,7 @@ class ExecutionEngine:
                 tool = parameters['tool']
                 action = parameters['action']
 
-                # Map tool actions to hardware functions
-                # NOTE: row_marker tool actions do NOT affect the limit switch state
-                # The limit switch is ONLY controlled by user via toggle button
-                tool_functions = {
-                    'line_marker': {'down': self.hardware.line_marker_down, 'up': self.hardware.line_marker_up},
-                    'line_cutter': {'down': self.hardware.line_cutter_down, 'up': self.hardware.line_cutter_up},
-                    'row_marker': {'down': self._row_marker_tool_down, 'up': self._row_marker_tool_up},
-                    'row_cutter': {'down': self.hardware.row_cutter_down, 'up': self.hardware.row_cutter_up},
-                    'line_motor_piston': {'down': self.hardware.line_motor_piston_down, 'up': self.hardware.line_motor_piston_up}
-                }
+                tool_functions = self._tool_functions()
 
                 if tool in tool_functions and action in tool_functions[tool]:
                     # Track tool DOWN BEFORE hardware call to prevent race with safety monitor
@@ -825,6 +988,31 @@ class ExecutionEngine:
                 else:
                     return {'success': False, 'error': f'Unknown tool/action: {tool}/{action}'}
 
+            elif operation == 'tool_group':
+                actions = {item['tool']: item['action'] for item in parameters['actions']}
+                tool_functions = self._tool_functions()
+                unknown = [tool for tool, action in actions.items()
+                           if tool not in tool_functions or action not in tool_functions[tool]]
+                if unknown:
+                    return {'success': False, 'error': f'Unknown tool/action in group: {unknown}'}
+
+                # Track tools DOWN BEFORE hardware call to prevent race with safety monitor
+                self._engine_lowered_tools.update(tool for tool, action in actions.items() if action == 'down')
+
+                if hasattr(self.hardware, 'set_tools'):
+                    # Drive all pistons together and confirm their sensors concurrently
+                    if not self.hardware.set_tools(actions):
+                        self.logger.warning(f"Grouped tool action not confirmed: {actions}", category="execution")
+                else:
+                    for tool, action in actions.items():
+                        tool_functions[tool][action]()
+                self.logger.success(f"Tool actions completed: {actions}", category="execution")
+
+                # Track tools UP AFTER hardware call confirms completion
+                self._engine_lowered_tools.difference_update(tool for tool, action in actions.items() if action == 'up')
+
+                return {'success': True, 'tools': actions}
+
             elif operation == 'tool_positioning':
                 action = parameters['action']
 
@@ -869,6 +1057,28 @@ class ExecutionEngine:
 
         return result
 
+    def _tool_functions(self):
+        """Map tool actions to hardware functions"""
+        # NOTE: row_marker tool actions do NOT affect the limit switch state
+        # The limit switch is ONLY controlled by user via toggle button
+        return {
+            'line_marker': {'down': self.hardware.line_marker_down, 'up': self.hardware.line_marker_up},
+            'line_cutter': {'down': self.hardware.line_cutter_down, 'up': self.hardware.line_cutter_up},
+            'row_marker': {'down': self._row_marker_tool_down, 'up': self._row_marker_tool_up},
+            'row_cutter': {'down': self.hardware.row_cutter_down, 'up': self.hardware.row_cutter_up},
+            'line_motor_piston': {'down': self.hardware.line_motor_piston_down, 'up': self.hardware.line_motor_piston_up}
+        }
+
+    @staticmethod
+    def _safety_check_steps(step):
+        """Steps to safety-check before executing `step`: each action of a tool group on its own"""
+        if step.get('operation') != 'tool_group':
+            return [step]
+        return [
+            {'operation': 'tool_action', 'parameters': dict(action), 'description': step.get('description', '')}
+            for action in step.get('parameters', {}).get('actions', [])
+        ]
+
     def _row_marker_tool_down(self):
         """Lower the row marker tool for marking"""
         self.logger.debug("Row marker tool: DOWN (marking position)", category="execution")
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Headless Program Runner for Scratch-Desk CNC
+============================================
+
+Runs programs from a CSV file through the ExecutionEngine on the mock
+desk, without the GUI and without a human: an operator model (see
+hardware/implementations/mock/operator_model.py) answers the edge sensor
+waits and closes the rows motor door at the lines -> rows transition.
+The desk clock decides how long simulated travel and piston moves take
+(time_scale 0 = instant), which makes soak tests and throughput
+benchmarks practical.
+
+Every run reports wall time, simulated (desk clock) time and per-operation
+step counts and durations.
+
+Usage:
+    python -m core.headless_runner data/sample_programs.csv --program 1 --repeat 3 --time-scale 0
+    python -m core.headless_runner data/sample_programs.csv --history data/analytics/step_telemetry.csv
+
+    from core.headless_runner import run_program
+    report = run_program(program, FixedDelayOperator(0.5), time_scale=0)
+"""
+
+import time
+from collections import defaultdict
+
+from core.csv_parser import CSVParser
+from core.execution_engine import ExecutionEngine
+from core.logger import get_logger
+from core.safety_system import safety_system
+from core.step_generator import generate_complete_program_steps
+from hardware.implementations.mock.simulated_desk import make_clock
+from hardware.interfaces.hardware_factory import get_hardware_interface, switch_hardware_mode
+
+
+class RunTimer:
+    """Per-operation step timing from the engine's status events"""
+
+    def __init__(self, engine, clock):
+        self.engine = engine
+        self.clock = clock
+        self.operations = defaultdict(lambda: {'count': 0, 'wall_seconds': 0.0, 'simulated_seconds': 0.0})
+        self.sensor_waits = 0
+        self._started = {}   # step_index -> (wall, simulated)
+
+    def on_status(self, status, info):
+        info = info or {}
+        if status == 'step_executing':
+            self._started[info.get('step_index')] = (time.monotonic(), self.clock.now())
+        elif status == 'step_completed':
+            step_index = info.get('step_index')
+            started = self._started.pop(step_index, None)
+            if started is None or step_index is None or step_index >= len(self.engine.steps):
+                return
+            operation = self.operations[self.engine.steps[step_index].get('operation', '')]
+            operation['count'] += 1
+            operation['wall_seconds'] += time.monotonic() - started[0]
+            operation['simulated_seconds'] += self.clock.now() - started[1]
+        elif status == 'waiting_sensor':
+            self.sensor_waits += 1
+
+
+def run_program(program, operator, time_scale=None, timeout=600.0, hardware=None):
+    """
+    Execute one program on the mock desk with a simulated operator.
+
+    Args:
+        program: ScratchDeskProgram
+        operator: OperatorModel answering sensor waits and the door request
+        time_scale: desk clock (1 = real time, 0 = instant); None keeps the current clock
+        timeout: wall-clock seconds before the run is stopped
+        hardware: mock hardware interface (default: the factory singleton)
+
+    Returns:
+        Report dict (completed, wall_seconds, simulated_seconds, operations, ...)
+    """
+    logger = get_logger()
+    hardware = hardware or get_hardware_interface()
+    desk = getattr(hardware, 'desk', None)
+    if desk is None:
+        raise ValueError("Headless runs need the mock hardware (hardware_config.use_real_hardware = false)")
+    previous_clock, previous_safety_hardware = desk.clock, safety_system.hardware
+    if time_scale is not None:
+        desk.clock = make_clock(time_scale)
+
+    steps = generate_complete_program_steps(program)
+    # Engine and safety checks must watch the same desk the operator drives
+    engine = ExecutionEngine()
+    engine.hardware = hardware
+    safety_system.hardware = hardware
+    safety_system.rules_manager.hardware = hardware
+    timer = RunTimer(engine, desk.clock)
+
+    def on_status(status, info=None):
+        timer.on_status(status, info)
+        if status == 'transition_alert':
+            operator.on_door_request(desk, engine.stop_event)
+
+    engine.set_status_callback(on_status)
+
+    # Operator starts at the idle machine with the rows motor door open (lines first)
+    desk.reset_hardware()
+    desk.set_limit_switch_state('rows_door', False)
+    desk.operator = operator
+    wall_start = time.monotonic()
+    simulated_start = desk.clock.now()
+    timed_out = False
+    try:
+        engine.load_steps(steps)
+        if engine.start_execution():
+            while engine.is_running:
+                if time.monotonic() - wall_start > timeout:
+                    timed_out = True
+                    logger.warning(f"Headless run of program {program.program_number} timed out after {timeout}s",
+                                   category="execution")
+                    engine.stop_execution()
+                    break
+                time.sleep(0.01)
+            if engine.execution_thread:
+                engine.execution_thread.join(timeout=5.0)
+    finally:
+        simulated_seconds = desk.clock.now() - simulated_start
+        desk.operator = None
+        desk.clock = previous_clock
+        safety_system.hardware = safety_system.rules_manager.hardware = previous_safety_hardware
+
+    report = {
+        'program_number': program.program_number,
+        'program_name': program.program_name,
+        'steps': len(steps),
+        'completed_steps': len(engine.step_results),
+        'completed': engine.execution_completed,
+        'timed_out': timed_out,
+        'wall_seconds': round(time.monotonic() - wall_start, 3),
+        'simulated_seconds': round(simulated_seconds, 3),
+        'sensor_waits': timer.sensor_waits,
+        'operations': {name: {key: round(value, 3) for key, value in totals.items()}
+                       for name, totals in sorted(timer.operations.items())},
+    }
+    logger.info(f"Headless run program {report['program_number']}: "
+                f"{'completed' if report['completed'] else 'NOT completed'} "
+                f"{report['completed_steps']}/{report['steps']} steps, "
+                f"{report['wall_seconds']}s wall, {report['simulated_seconds']}s simulated", category="execution")
+    return report
+
+
+def run_csv(csv_path, operator, program_numbers=None, repeat=1, **kwargs):
+    """Run the (selected) programs of a CSV file `repeat` times; returns one report per run"""
+    programs, errors = CSVParser().load_programs_from_csv(csv_path)
+    for error in errors:
+        get_logger().warning(f"{csv_path}: {error}", category="execution")
+    if program_numbers:
+        programs = [program for program in programs if program.program_number in program_numbers]
+
+    reports = []
+    for _ in range(repeat):
+        for program in programs:
+            reports.append(run_program(program, operator, **kwargs))
+    return reports
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    from hardware.implementations.mock.operator_model import FixedDelayOperator, SampledDelayOperator
+
+    parser = argparse.ArgumentParser(description="Run CSV programs on the mock desk with a simulated operator")
+    parser.add_argument("csv", help="programs CSV file")
+    parser.add_argument("--program", type=int, action="append", help="program number (repeatable, default all)")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per program")
+    parser.add_argument("--time-scale", type=float, default=0.0, help="desk clock: 1 = real time, 0 = instant")
+    parser.add_argument("--operator-delay", type=float, default=1.0, help="operator reaction time in seconds")
+    parser.add_argument("--history", help="step_telemetry.csv to sample operator reaction times from")
+    parser.add_argument("--seed", type=int, help="random seed for sampled reaction times")
+    parser.add_argument("--timeout", type=float, default=600.0, help="wall-clock limit per run in seconds")
+    parser.add_argument("--json", help="write the reports to this file")
+    args = parser.parse_args()
+
+    if args.history:
+        operator = SampledDelayOperator.from_telemetry(args.history, default=args.operator_delay, seed=args.seed)
+    else:
+        operator = FixedDelayOperator(args.operator_delay)
+
+    switch_hardware_mode(use_real=False)
+    reports = run_csv(args.csv, operator, program_numbers=args.program, repeat=args.repeat,
+                      time_scale=args.time_scale, timeout=args.timeout)
+
+    for report in reports:
+        status = "OK  " if report['completed'] else "FAIL"
+        print(f"{status} program {report['program_number']:>3} {report['completed_steps']:>4}/{report['steps']:<4} steps "
+              f"wall {report['wall_seconds']:>8.2f}s  simulated {report['simulated_seconds']:>9.2f}s")
+    if reports:
+        completed = [report for report in reports if report['completed']]
+        total_wall = sum(report['wall_seconds'] for report in reports)
+        print(f"{len(completed)}/{len(reports)} runs completed, {total_wall:.2f}s wall, "
+              f"{sum(report['simulated_seconds'] for report in completed) / max(len(completed), 1):.2f}s simulated per program")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(reports, f, indent=2, ensure_ascii=False)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Rendered Report Cache for Scratch-Desk Analytics
+=================================================
+
+Stores report HTML bodies on disk so a period that has already been
+rendered is never rebuilt. Entries are keyed by a digest of the report
+period, its label and the period's summary statistics - the summary acts
+as the data version, so new runs inside the period produce a new key
+while runs recorded after the period closed leave the entry valid.
+
+Files live in a 'reports' directory next to the analytics CSV; only the
+most recent MAX_ENTRIES renders are kept.
+
+Usage:
+    from core.report_cache import ReportCache, report_key
+    cache = ReportCache.for_csv('data/analytics/runs.csv')
+    key = report_key(summary)
+    html = cache.get(key)
+    if html is None:
+        cache.put(key, build_html(summary))
+"""
+
+import hashlib
+import json
+import os
+import threading
+
+from core.logger import get_logger
+
+
+MAX_ENTRIES = 24
+
+_cache_lock = threading.Lock()
+
+
+def report_key(summary):
+    """Digest identifying a rendered report (period, label and data)"""
+    payload = json.dumps(summary, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class ReportCache:
+    """On-disk cache of rendered report HTML"""
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.logger = get_logger()
+
+    @classmethod
+    def for_csv(cls, csv_path):
+        """Cache stored in a 'reports' directory next to the analytics CSV"""
+        return cls(os.path.join(os.path.dirname(csv_path), 'reports'))
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f'{key}.html')
+
+    def get(self, key):
+        """Return cached HTML for key, or None"""
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def put(self, key, html):
+        """Store rendered HTML for key and prune old entries"""
+        with _cache_lock:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                tmp_path = self._path(key) + '.tmp'
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    f.write(html)
+                os.replace(tmp_path, self._path(key))
+                self._prune()
+            except OSError as e:
+                self.logger.warning(f"Failed to cache rendered report: {e}", category="execution")
+
+    def _prune(self):
+        entries = [
+            os.path.join(self.cache_dir, name)
+            for name in os.listdir(self.cache_dir) if name.endswith('.html')
+        ]
+        if len(entries) <= MAX_ENTRIES:
+            return
+        entries.sort(key=os.path.getmtime)
+        for path in entries[:-MAX_ENTRIES]:
+            os.remove(path)
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Report Delivery Outbox for Scratch-Desk Analytics
+==================================================
+
+Local in-memory queue for outgoing report emails. A single daemon
+thread runs each delivery attempt; failed attempts that are worth
+retrying (connection drops, server busy) are rescheduled with
+increasing back-off delays instead of being lost, so callers such as
+the admin "Send Report Now" button return immediately.
+
+A job is a callable returning (success, error_message, retryable).
+The optional on_done(success, error_message) callback runs on the
+outbox thread once the job finally succeeds or gives up; the optional
+on_retry(error_message, delay_seconds) callback runs after every failed
+attempt that will be retried, so callers can show the send as pending.
+
+Usage:
+    from core.report_outbox import get_report_outbox
+    get_report_outbox().enqueue(attempt, description="daily report",
+                                on_done=lambda ok, err: ...,
+                                on_retry=lambda err, delay: ...)
+"""
+
+import heapq
+import itertools
+import threading
+import time
+
+from core.logger import get_logger
+
+
+# Seconds to wait before each retry; the job gives up after the last one
+RETRY_DELAYS = (30, 120, 300, 900)
+
+_outbox_instance = None
+_outbox_lock = threading.Lock()
+
+
+def get_report_outbox():
+    """Get singleton ReportOutbox instance"""
+    global _outbox_instance
+    if _outbox_instance is None:
+        with _outbox_lock:
+            if _outbox_instance is None:
+                _outbox_instance = ReportOutbox()
+    return _outbox_instance
+
+
+class ReportOutbox:
+    """Delivers queued reports on a background thread with retry back-off"""
+
+    def __init__(self, retry_delays=RETRY_DELAYS):
+        self.logger = get_logger()
+        self.retry_delays = list(retry_delays)
+        self._jobs = []                 # heap of (due_monotonic, seq, job)
+        self._seq = itertools.count()
+        self._active = 0                # jobs currently being attempted
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._outbox_loop, daemon=True, name="ReportOutbox"
+            )
+            self._thread.start()
+
+    def enqueue(self, attempt, description="report", on_done=None, on_retry=None):
+        """Queue a delivery job for immediate attempt. Never blocks."""
+        job = {
+            'attempt': attempt,
+            'description': description,
+            'on_done': on_done,
+            'on_retry': on_retry,
+            'tries': 0,
+        }
+        with self._cond:
+            heapq.heappush(self._jobs, (time.monotonic(), next(self._seq), job))
+            self._ensure_thread()
+            self._cond.notify()
+
+    def pending(self):
+        """Number of jobs queued or waiting for a retry"""
+        with self._cond:
+            return len(self._jobs) + self._active
+
+    def _next_job(self):
+        with self._cond:
+            while True:
+                if self._jobs:
+                    wait = self._jobs[0][0] - time.monotonic()
+                    if wait <= 0:
+                        self._active += 1
+                        return heapq.heappop(self._jobs)[2]
+                    self._cond.wait(wait)
+                else:
+                    self._cond.wait()
+
+    def _notify(self, callback, *args):
+        if callback:
+            try:
+                callback(*args)
+            except Exception as e:
+                self.logger.warning(f"Report callback failed: {e}", category="execution")
+
+    def _outbox_loop(self):
+        while True:
+            job = self._next_job()
+            try:
+                success, error, retryable = job['attempt']()
+            except Exception as e:
+                success, error, retryable = False, str(e), True
+            job['tries'] += 1
+
+            delay = None
+            with self._cond:
+                self._active -= 1
+                if not success and retryable and job['tries'] <= len(self.retry_delays):
+                    delay = self.retry_delays[job['tries'] - 1]
+                    self.logger.warning(
+                        f"Sending {job['description']} failed ({error}) - retrying in {delay}s",
+                        category="execution"
+                    )
+                    heapq.heappush(self._jobs, (time.monotonic() + delay, next(self._seq), job))
+            if delay is not None:
+                self._notify(job['on_retry'], error, delay)
+                continue
+
+            if not success:
+                self.logger.error(
+                    f"Giving up on {job['description']} after {job['tries']} attempt(s): {error}",
+                    category="execution"
+                )
+            self._notify(job['on_done'], success, error)
@@ -224,6 +224,51 @@ class SafetyRulesManager:
 
         return False
 
+    # Tools that can share a grouped tool step; line_motor_piston moves the Y assembly and stays on its own
+    GROUPABLE_TOOLS = ("line_marker", "line_cutter", "row_marker", "row_cutter")
+
+    def _condition_tools(self, conditions):
+        """Tools whose piston or sensors a conditions block reads"""
+        tools = set()
+        for item in (conditions or {}).get("items", []):
+            if "items" in item:
+                tools |= self._condition_tools(item)
+            elif item.get("type") == "piston":
+                source = item.get("source", "")
+                tools.add("line_motor_piston" if source == "line_motor" else source)
+            elif item.get("type") == "sensor":
+                source = item.get("source", "")
+                if source.startswith("line_motor_"):
+                    tools.add("line_motor_piston")
+                tools |= {t for t in self.GROUPABLE_TOOLS if source.startswith(t + "_")}
+        return tools
+
+    def tool_actions_independent(self, tools):
+        """
+        Whether tool actions on `tools` may run as one grouped step
+
+        True when each tool is groupable and appears once, and no enabled
+        rule that can block a tool_action on one of them depends on the
+        state of another tool of the group (running them together would
+        skip the check between the individual actions).
+        """
+        self.load_rules()
+        tools = list(tools)
+        if len(set(tools)) != len(tools) or any(t not in self.GROUPABLE_TOOLS for t in tools):
+            return False
+        for rule in self.rules:
+            if not rule.get("enabled", True):
+                continue
+            depends_on = self._condition_tools(rule.get("conditions"))
+            for block in rule.get("blocked_operations", []):
+                if block.get("operation") != "tool_action":
+                    continue
+                blocked = block.get("tools") or tools
+                for tool in tools:
+                    if tool in blocked and depends_on & (set(tools) - {tool}):
+                        return False
+        return True
+
     def check_operation_blocked(self, rule, operation, tool=None, is_setup=False, is_rows_start=False, direction_sign=None):
         """Check if an operation is blocked by this rule"""
         blocked_ops = rule.get("blocked_operations", [])
@@ -266,10 +311,14 @@ class SafetyRulesManager:
 
         return False
 
-    def evaluate_rules(self, step, is_setup=False, is_rows_start=False):
+    def evaluate_rules(self, step, is_setup=False, is_rows_start=False, positions=None):
         """
         Evaluate all enabled rules against a step
 
+        positions optionally overrides axis positions of the hardware state
+        (e.g. {'y_position': 28.0}) to evaluate a step that starts where
+        earlier, not yet executed moves will leave the machine.
+
         Returns: (is_safe, violation) tuple
         - is_safe: True if step is safe, False if blocked
         - violation: SafetyViolation exception if blocked, None if safe
@@ -289,6 +338,8 @@ class SafetyRulesManager:
 
         # Get current hardware state
         state = self.get_hardware_state()
+        if positions:
+            state["positions"].update(positions)
 
         # Compute movement direction for direction-based blocking
         direction_sign = None
@@ -522,6 +573,26 @@ class SafetySystem:
 
         return True
 
+    def preview_step_safety(self, step, positions=None):
+        """
+        Evaluate a step's safety rules without raising or logging a violation
+
+        Args:
+            step: Step dictionary with operation, parameters, description
+            positions: optional axis position overrides (see evaluate_rules)
+
+        Returns:
+            (is_safe, violation) - violation is None when safe
+        """
+        if not self.safety_enabled:
+            return True, None
+
+        description = step.get('description', '')
+        return self.rules_manager.evaluate_rules(
+            step, self._is_setup_movement(description), self._is_rows_start_movement(description),
+            positions=positions
+        )
+
     def log_violation(self, safety_code, message):
         """Log safety violation for debugging"""
         violation = {
@@ -568,6 +639,11 @@ def check_step_safety(step):
     return safety_system.check_step_safety(step)
 
 
+def preview_step_safety(step, positions=None):
+    """Convenience function to preview step safety"""
+    return safety_system.preview_step_safety(step, positions)
+
+
 def get_safety_status():
     """Convenience function to get safety status"""
     return safety_system.get_safety_status()
@@ -588,6 +664,11 @@ def reload_rules():
     return safety_system.reload_rules()
 
 
+def tool_actions_independent(tools):
+    """Convenience function to check whether tool actions may be grouped"""
+    return safety_system.rules_manager.tool_actions_independent(tools)
+
+
 if __name__ == "__main__":
     module_logger.info("Safety System Test", category="safety")
     module_logger.info("=" * 30, category="safety")
@@ -101,6 +101,10 @@ def _generate_heb_operation_title(operation, parameters):
 
         return f"{action_verb} {tool_heb}"
 
+    elif operation == 'tool_group':
+        return ' + '.join(_generate_heb_operation_title('tool_action', action)
+                          for action in parameters.get('actions', []))
+
     elif operation == 'wait_sensor':
         sensor = parameters.get('sensor', '')
         sensor_heb = HEBREW_TRANSLATIONS.get(sensor, sensor)
@@ -353,6 +357,51 @@ def create_step(operation, parameters=None, description=""):
     }
 
 
+def compact_tool_steps(steps, tools_independent=None):
+    """
+    Merge runs of adjacent tool_action steps into single 'tool_group' steps
+
+    A run is only extended while tools_independent(tools) allows the tools
+    to move together (default: safety_system.tool_actions_independent,
+    which checks the safety rules). The engine still safety-checks each
+    action of a group before executing it.
+    """
+    def independent(tools):
+        if tools_independent is not None:
+            return tools_independent(tools)
+        # Imported only when there is something to merge: it loads the hardware interface
+        from core.safety_system import tool_actions_independent
+        return tool_actions_independent(tools)
+
+    compacted = []
+    run = []
+
+    def flush():
+        if len(run) == 1:
+            compacted.append(run[0])
+        elif run:
+            group = create_step(
+                'tool_group',
+                {'actions': [dict(step['parameters']) for step in run]},
+                " + ".join(step['description'] for step in run)
+            )
+            group['hebDescription'] = " + ".join(step['hebDescription'] for step in run)
+            compacted.append(group)
+        run.clear()
+
+    for step in steps:
+        if step['operation'] != 'tool_action':
+            flush()
+            compacted.append(step)
+            continue
+        tools = [s['parameters']['tool'] for s in run] + [step['parameters']['tool']]
+        if run and not independent(tools):
+            flush()
+        run.append(step)
+    flush()
+    return compacted
+
+
 def generate_lines_marking_steps(program):
     """
     Generate steps for lines marking workflow with REPEAT SUPPORT.
@@ -936,8 +985,9 @@ def generate_complete_program_steps(program):
          'actual_height': actual_paper_height},
         f"=== Program {program.program_number} completed: {actual_paper_width}×{actual_paper_height}cm paper processed ==="
     ))
-    
-    return all_steps
+
+    # Adjacent independent tool actions run as one grouped step
+    return compact_tool_steps(all_steps)
 
 def get_step_count_summary(program):
     """Get summary of step counts for a program with FIXED repeat structure"""
@@ -106,6 +106,17 @@ HEBREW_TRANSLATIONS = {
     # HARDWARE TEST GUI - Pistons Tab
     # ============================================================================
     "Piston Control": "בקרת בוכנות",
+    "Hardware Health": "תקינות חומרה",
+    "Item": "פריט",
+    "Samples": "דגימות",
+    "p50 (ms)": "חציון (מ\"ש)",
+    "p95 (ms)": "אחוזון 95 (מ\"ש)",
+    "Baseline p95 (ms)": "בסיס אחוזון 95 (מ\"ש)",
+    "Timeouts / Glitches": "חריגות זמן / תקלות",
+    "SLOWING": "מאט",
+    "BOUNCING": "מקפץ",
+    "HEALTHY": "תקין",
+    "{piston} ({state}) is slowing down: p95 {p95} ms, baseline {baseline} ms": "{piston} ({state}) מאט: אחוזון 95 {p95} מ\"ש, בסיס {baseline} מ\"ש",
     "Line Marker": "סמן שורות",
     "Line Cutter": "חותך שורות",
     "Line Motor (Both)": "מנוע שורות (שניהם)",
@@ -1165,18 +1176,26 @@ HEBREW_TRANSLATIONS = {
     "thread_join_timeout_safety": "זמן המתנה לתהליכון בטיחות",
     "sensor_wait_timeout": "זמן המתנה לחיישן",
     "piston_gpio_settling_delay": "השהיית ייצוב GPIO בוכנה",
+    "piston_confirm_timeout": "זמן המתנה לאישור בוכנה",
+    "adaptive_piston_settling": "ייצוב בוכנה אדפטיבי",
+    "piston_p95_drift_ratio": "יחס סטיית זמן הפעלת בוכנה (אחוזון 95)",
+    "health_histogram_window": "חלון היסטוגרמת תקינות",
     "gpio_cleanup_delay": "השהיית ניקוי GPIO",
     "gpio_busy_recovery_delay": "השהיית התאוששות GPIO",
-    "gpio_debounce_samples": "דגימות ניפוי רעש GPIO",
-    "gpio_debounce_delay_ms": "השהיית ניפוי רעש GPIO",
     "gpio_test_read_delay_ms": "השהיית קריאת בדיקה GPIO",
     "limit_switch_test_read_delay_ms": "השהיית קריאת מתג גבול",
     "polling_thread_join_timeout": "זמן המתנה לתהליכון דגימה",
     "switch_polling_interval_ms": "תדירות דגימת מתגים",
+    "adaptive_switch_polling": "דגימת מתגים מסתגלת",
+    "edge_sensor_poll_interval_ms": "מרווח דגימת חיישני קצה",
+    "piston_sensor_poll_interval_ms": "מרווח דגימת חיישני בוכנות",
+    "limit_switch_poll_interval_ms": "מרווח דגימת מתגי גבול",
+    "idle_switch_poll_interval_ms": "מרווח דגימה במנוחה",
+    "other_switch_idle_interval_ms": "מרווח דגימת חיישנים אחרים במנוחה",
+    "piston_sensor_boost_duration": "משך דגימה מהירה אחרי בוכנה",
     "polling_status_update_frequency": "תדירות עדכון סטטוס דגימה",
     "polling_error_recovery_delay": "השהיית התאוששות שגיאת דגימה",
     "grbl_initialization_delay": "השהיית אתחול GRBL",
-    "grbl_serial_poll_delay": "השהיית דגימה סריאלית GRBL",
     "grbl_reset_delay": "השהיית איפוס GRBL",
     "rs485_retry_delay": "השהיית ניסיון חוזר RS485",
     "grbl_init_delay": "השהיית אתחול GRBL",
@@ -1246,6 +1265,8 @@ HEBREW_TRANSLATIONS = {
     "skip_initial_sensor_tests": "דלג על בדיקות חיישנים",
     "gpio_mode": "מצב GPIO",
     "debounce_count": "מספר ניפוי רעש",
+    "debounce_thresholds": "ספי ניפוי רעש לכל חיישן",
+    "edge_detection": "זיהוי קצה בפסיקות",
 
     # --- hardware_config > pistons ---
     "line_marker_piston": "בוכנת סמן שורות",
@@ -1268,12 +1289,16 @@ HEBREW_TRANSLATIONS = {
     "input_count": "מספר כניסות",
     "bulk_read_enabled": "קריאה מרוכזת מופעלת",
     "bulk_read_cache_age_ms": "גיל מטמון קריאה מרוכזת",
+    "modbus_backend": "לקוח Modbus",
+    "sampler_enabled": "תהליך דגימת RS485",
+    "sampler_interval_ms": "מרווח דגימת RS485",
     "default_retry_count": "מספר ניסיונות חוזרים",
     "register_address_low": "כתובת רגיסטר תחתונה",
     "bulk_read_register_count": "מספר רגיסטרים לקריאה",
     "register_address": "כתובת רגיסטר",
     "sensor_addresses": "כתובות חיישנים",
     "nc_sensors": "חיישני NC",
+    "additional_devices": "התקני RS485 נוספים",
     "x_left_edge": "קצה שמאלי X",
     "x_right_edge": "קצה ימני X",
     "y_top_edge": "קצה עליון Y",
@@ -1284,9 +1309,21 @@ HEBREW_TRANSLATIONS = {
     "connection_timeout": "זמן המתנה לחיבור",
     "command_timeout": "זמן המתנה לפקודה",
     "homing_timeout": "זמן המתנה לביות",
+    "skip_homing_when_homed": "דילוג על ביות כשהמכונה כבר מבוייתת",
     "position_tolerance_cm": "סובלנות מיקום",
     "movement_timeout": "זמן המתנה לתנועה",
     "movement_poll_interval": "תדירות דגימת תנועה",
+    "streaming_enabled": "הזרמת תנועות",
+    "rapid_travel": "תנועת מעבר מהירה",
+    "rx_buffer_size": "גודל חוצץ קליטה",
+    "status_report_rate_hz": "קצב דוחות סטטוס",
+    "status_report_rate_run_hz": "קצב דוחות סטטוס בתנועה",
+
+    # --- hardware_config > trace ---
+    "record": "הקלטת חומרה",
+    "trace_dir": "תיקיית הקלטות",
+    "replay_file": "קובץ לניגון",
+    "replay_speed": "מהירות ניגון",
 
     # --- grbl_settings ---
     "units": "יחידות",
@@ -1340,6 +1377,7 @@ HEBREW_TRANSLATIONS = {
     "rs485": "RS485",
     "raspberry_pi": "Raspberry Pi",
     "arduino_grbl": "Arduino GRBL",
+    "trace": "הקלטת חומרה",
 
     # --- section keys (top-level settings.json sections) ---
     "language": "שפה",
@@ -1371,6 +1409,7 @@ HEBREW_TRANSLATIONS = {
     "piston_operation_delay": "השהיית פעולת בוכנה",
     "grbl_homing_delay": "השהיית ביות GRBL",
     "coordinate_reset_delay": "השהיית איפוס קואורדינטות",
+    "time_scale": "מהירות סימולציה",
 
     # ============================================================================
     # ANALYTICS TAB
@@ -1446,6 +1485,7 @@ HEBREW_TRANSLATIONS = {
     "Analytics report sent": "דוח אנליטיקה נשלח",
     "Failed: {error}": "נכשל: {error}",
     "Report send failed: {error}": "שליחת דוח נכשלה: {error}",
+    "Send failed, retrying in {seconds}s: {error}": "השליחה נכשלה, ניסיון חוזר בעוד {seconds} שניות: {error}",
     "Error: {error}": "שגיאה: {error}",
     "Last sent: Never": "נשלח לאחרונה: מעולם לא",
     "Last sent: {time}": "נשלח לאחרונה: {time}",
@@ -1453,6 +1493,7 @@ HEBREW_TRANSLATIONS = {
     # Analytics settings keys
     "analytics": "אנליטיקה",
     "csv_file_path": "נתיב קובץ CSV",
+    "health_file_path": "נתיב קובץ תקינות חומרה",
     "email": "מייל",
     "smtp_server": "שרת SMTP",
     "smtp_port": "פורט SMTP",
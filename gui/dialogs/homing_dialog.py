@@ -229,8 +229,8 @@ class HomingProgressDialog:
         Args:
             step_number: Step number (1-8)
             step_name: Name of the step
-            status: One of "running", "done", "error", "waiting", "safety_hold"
-            message: Optional - string for "waiting", dict for "safety_hold"
+            status: One of "running", "done", "skipped", "error", "waiting", "safety_hold"
+            message: Optional - string for "waiting"/"skipped", dict for "safety_hold"
         """
         def update_gui():
             if step_number not in self.step_status_labels:
@@ -256,6 +256,10 @@ class HomingProgressDialog:
                 # Stop countdown for step 6
                 if step_number == 6:
                     self._stop_countdown()
+            elif status == "skipped":
+                status_label.config(text="–", foreground="gray")
+                text_label.config(foreground="gray", font=("Arial", 10))
+                self.waiting_label.config(text="")
             elif status == "error":
                 status_label.config(text="✗", foreground="red")
                 text_label.config(foreground="red", font=("Arial", 10, "bold"))
@@ -968,11 +968,12 @@ class ControlsPanel:
             op = step.get('operation', '')
             params = step.get('parameters', {})
 
-            if op == 'tool_action':
-                tool = params.get('tool', '')
-                action = params.get('action', '')
-                if tool and action in ('up', 'down'):
-                    tool_states[tool] = action
+            if op in ('tool_action', 'tool_group'):
+                for item in params.get('actions', [params]):
+                    tool = item.get('tool', '')
+                    action = item.get('action', '')
+                    if tool and action in ('up', 'down'):
+                        tool_states[tool] = action
             elif op == 'move_x':
                 last_x = params.get('position')
             elif op == 'move_y':
@@ -1227,7 +1228,7 @@ class ControlsPanel:
                     return
 
                 # Verify at least one actionable step exists
-                actionable_ops = {'move_x', 'move_y', 'tool_action', 'tool_positioning'}
+                actionable_ops = {'move_x', 'move_y', 'tool_action', 'tool_group', 'tool_positioning'}
                 has_actionable = any(s.get('operation') in actionable_ops for s in self.main_app.steps)
                 if not has_actionable:
                     self.logger.warning("No actionable steps in program", category="gui")
@@ -6,6 +6,7 @@ This package contains:
 - real/: Real hardware implementations including:
   - arduino_grbl/: Arduino GRBL controller
   - raspberry_pi/: Raspberry Pi GPIO and RS485 Modbus
+- trace/: Recording wrapper and replay backend for hardware calls
 """
 
 from hardware.implementations.mock.mock_hardware import MockHardware
@@ -13,11 +14,14 @@ from hardware.implementations.real.real_hardware import RealHardware
 from hardware.implementations.real.raspberry_pi.raspberry_pi_gpio import RaspberryPiGPIO
 from hardware.implementations.real.arduino_grbl.arduino_grbl import ArduinoGRBL
 from hardware.implementations.real.raspberry_pi.rs485_modbus import RS485ModbusInterface
+from hardware.implementations.trace.trace_hardware import RecordingHardware, ReplayHardware
 
 __all__ = [
     'MockHardware',
     'RealHardware',
     'RaspberryPiGPIO',
     'ArduinoGRBL',
-    'RS485ModbusInterface'
+    'RS485ModbusInterface',
+    'RecordingHardware',
+    'ReplayHardware'
 ]
@@ -1,5 +1,8 @@
 """Mock hardware implementation package."""
 
 from .mock_hardware import MockHardware
+from .simulated_desk import InstantClock, RealTimeClock, ScaledClock, SimulatedDesk
+from .operator_model import FixedDelayOperator, OperatorModel, SampledDelayOperator
 
-__all__ = ['MockHardware']
\ No newline at end of file
+__all__ = ['MockHardware', 'SimulatedDesk', 'RealTimeClock', 'ScaledClock', 'InstantClock',
+           'OperatorModel', 'FixedDelayOperator', 'SampledDelayOperator']
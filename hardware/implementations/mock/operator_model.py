@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+
+"""
+Simulated Operator
+==================
+
+In mock mode the edge sensor waits and the lines -> rows door check block
+until someone clicks the GUI buttons. An operator model attached to a
+SimulatedDesk does that instead: when a wait starts it lets its reaction
+time pass on the desk clock and then triggers the expected sensor (or
+closes the rows motor door), so whole programs run without a human.
+
+Reaction times are looked up by action: the sensor ('x_left', 'y_top',
+...), the axis of an either-side wait ('x', 'y'), or 'rows_door'.
+- FixedDelayOperator: a constant delay, optionally per action
+- SampledDelayOperator: random draws from observed delays, e.g. the
+  sensor_wait and transition spans of step_telemetry.csv
+
+Usage:
+    desk.operator = FixedDelayOperator(1.5, {'rows_door': 4.0})
+    desk.operator = SampledDelayOperator.from_telemetry("data/analytics/step_telemetry.csv", seed=7)
+"""
+
+import csv
+import random
+from collections import defaultdict
+from threading import Event
+from typing import Dict, List, Optional, Sequence
+
+from core.logger import get_logger
+
+DOOR_ACTION = 'rows_door'
+
+
+class OperatorModel:
+    """Reacts to sensor waits and door requests of a SimulatedDesk"""
+
+    def reaction_time(self, action: str) -> float:
+        """Seconds the operator takes for an action"""
+        raise NotImplementedError
+
+    def on_sensor_wait(self, desk, sensors: Sequence[str], stop_event: Event):
+        """Trigger the first expected sensor after the reaction time (unless stopped)"""
+        action = sensors[0] if len(sensors) == 1 else sensors[0][0]
+        if desk.clock.wait(stop_event, self.reaction_time(action)):
+            return
+        desk.trigger_sensor(sensors[0])
+
+    def on_door_request(self, desk, stop_event: Event):
+        """Close the rows motor door after the reaction time (unless stopped)"""
+        if desk.clock.wait(stop_event, self.reaction_time(DOOR_ACTION)):
+            return
+        desk.set_limit_switch_state('rows_door', True)
+
+
+class FixedDelayOperator(OperatorModel):
+    """Operator with constant reaction times"""
+
+    def __init__(self, delay: float = 1.0, delays: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            delay: seconds for every action without its own entry
+            delays: action -> seconds
+        """
+        self.delay = delay
+        self.delays = dict(delays or {})
+
+    def reaction_time(self, action: str) -> float:
+        return self.delays.get(action, self.delays.get(action[0], self.delay))
+
+
+class SampledDelayOperator(OperatorModel):
+    """Operator whose reaction times are drawn from observed delays"""
+
+    def __init__(self, samples: Dict[str, List[float]], default: float = 1.0, seed: Optional[int] = None):
+        """
+        Args:
+            samples: action -> observed delays in seconds
+            default: seconds when nothing was observed at all
+            seed: random seed for reproducible runs
+        """
+        self.samples = {action: list(values) for action, values in samples.items() if values}
+        self.default = default
+        self._all = [value for action, values in self.samples.items() if action != DOOR_ACTION for value in values]
+        self._random = random.Random(seed)
+
+    def reaction_time(self, action: str) -> float:
+        values = self.samples.get(action) or self.samples.get(action[0])
+        if not values and action != DOOR_ACTION:
+            values = self._all
+        if not values:
+            return self.default
+        return self._random.choice(values)
+
+    @classmethod
+    def from_telemetry(cls, csv_path: str, default: float = 1.0, seed: Optional[int] = None) -> 'SampledDelayOperator':
+        """Build from the sensor_wait and transition spans of step_telemetry.csv"""
+        samples = defaultdict(list)
+        try:
+            with open(csv_path, newline='', encoding='utf-8') as f:
+                for row in csv.DictReader(f):
+                    try:
+                        duration = float(row['duration_seconds'])
+                    except (KeyError, ValueError):
+                        continue
+                    if row.get('event') == 'sensor_wait' and row.get('detail'):
+                        samples[row['detail']].append(duration)
+                    elif row.get('event') == 'transition':
+                        samples[DOOR_ACTION].append(duration)
+        except OSError as e:
+            get_logger().warning(f"Operator history not readable ({e}) - using {default}s reaction time",
+                                 category="hardware")
+        return cls(samples, default=default, seed=seed)
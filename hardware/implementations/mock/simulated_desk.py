@@ -0,0 +1,665 @@
+#!/usr/bin/env python3
+
+"""
+Simulated Scratch Desk
+======================
+
+SimulatedDesk holds the state of one virtual CNC Scratch Desk: motor
+positions, pistons with their up/down sensors, edge sensors, limit
+switches and the air valve. Every instance is independent, so several
+desks can run side by side in one process.
+
+All simulated travel and piston times go through the desk's clock:
+- RealTimeClock: sleeps for real (interactive GUI simulation)
+- ScaledClock(scale): runs `scale` times faster than real time
+- InstantClock: never sleeps; virtual time jumps forward instead
+
+Waiting for an edge sensor blocks until trigger_*_sensor() is called
+from another thread (or by an attached operator model, see
+operator_model.py); its timeout is counted in clock time.
+
+Usage:
+    desk = SimulatedDesk(clock=InstantClock())
+    hardware = MockHardware(desk=desk)
+    hardware.move_x(50.0)          # returns at once, desk.clock.now() advanced
+"""
+
+import threading
+import time
+from threading import Event
+from typing import Dict, Optional, Tuple
+
+from core.logger import get_logger
+
+
+# ============================================================================
+# CLOCKS
+# ============================================================================
+
+class RealTimeClock:
+    """Wall-clock time"""
+
+    def now(self) -> float:
+        return time.time()
+
+    def sleep(self, seconds: float):
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def wait(self, event: Event, timeout: float) -> bool:
+        """Wait for event, at most timeout seconds of clock time"""
+        return event.wait(timeout=timeout)
+
+
+class ScaledClock(RealTimeClock):
+    """Time running `scale` times faster than wall-clock time"""
+
+    def __init__(self, scale: float):
+        if scale <= 0:
+            raise ValueError("scale must be positive (use InstantClock for no waiting)")
+        self.scale = scale
+        self._wall0 = time.time()
+
+    def now(self) -> float:
+        return self._wall0 + (time.time() - self._wall0) * self.scale
+
+    def sleep(self, seconds: float):
+        if seconds > 0:
+            time.sleep(seconds / self.scale)
+
+    def wait(self, event: Event, timeout: float) -> bool:
+        return event.wait(timeout=timeout / self.scale)
+
+
+class InstantClock:
+    """Virtual time that only advances when the desk sleeps"""
+
+    # Real time given to other threads to set an event before virtual time moves on
+    POLL_INTERVAL = 0.001
+
+    def __init__(self, start: Optional[float] = None):
+        self._now = time.time() if start is None else start
+        self._lock = threading.Lock()
+
+    def now(self) -> float:
+        with self._lock:
+            return self._now
+
+    def sleep(self, seconds: float):
+        if seconds > 0:
+            with self._lock:
+                self._now += seconds
+
+    def wait(self, event: Event, timeout: float) -> bool:
+        if event.wait(timeout=self.POLL_INTERVAL):
+            return True
+        self.sleep(timeout)
+        return False
+
+
+def make_clock(time_scale: float = 1.0):
+    """Clock for a time scale: 1 = real time, >1 = faster, 0 = instant"""
+    if time_scale <= 0:
+        return InstantClock()
+    if time_scale == 1:
+        return RealTimeClock()
+    return ScaledClock(time_scale)
+
+
+# ============================================================================
+# DESK
+# ============================================================================
+
+# Piston -> (sensors True when UP, sensors True when DOWN)
+PISTON_SENSORS: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {
+    'line_marker': (('line_marker_up_sensor',), ('line_marker_down_sensor',)),
+    'line_cutter': (('line_cutter_up_sensor',), ('line_cutter_down_sensor',)),
+    'line_motor': (('line_motor_left_up_sensor', 'line_motor_right_up_sensor'),
+                   ('line_motor_left_down_sensor', 'line_motor_right_down_sensor')),
+    'row_marker': (('row_marker_up_sensor',), ('row_marker_down_sensor',)),
+    'row_cutter': (('row_cutter_up_sensor',), ('row_cutter_down_sensor',)),
+}
+
+# Resting position of every piston (line motor assembly rests DOWN)
+DEFAULT_PISTON_STATES = {
+    'line_marker': 'up',
+    'line_cutter': 'up',
+    'line_motor': 'down',
+    'row_marker': 'up',
+    'row_cutter': 'up',
+}
+
+# Edge sensor -> (wait result, sensor_results key, log label)
+EDGE_SENSORS = {
+    'x_left': ('left', 'x_sensor', "Left lines"),
+    'x_right': ('right', 'x_sensor', "Right lines"),
+    'y_top': ('top', 'y_sensor', "Top rows"),
+    'y_bottom': ('bottom', 'y_sensor', "Bottom rows"),
+}
+
+
+class SimulatedDesk:
+    """State and behaviour of one virtual scratch desk"""
+
+    def __init__(self, settings: Optional[Dict] = None, clock=None):
+        """
+        Args:
+            settings: settings.json contents (hardware_limits and timing are used)
+            clock: RealTimeClock (default), ScaledClock or InstantClock
+        """
+        self.clock = clock or RealTimeClock()
+        self.logger = get_logger()
+        self._state_lock = threading.Lock()
+        self.apply_settings(settings or {})
+
+        self.sensor_events = {name: Event() for name in EDGE_SENSORS}
+        self.sensor_results = {'x_sensor': None, 'y_sensor': None}
+        self.sensor_trigger_states = {name: False for name in EDGE_SENSORS}
+        self.sensor_trigger_timers = {name: 0 for name in EDGE_SENSORS}
+        self.limit_switch_states = {
+            'y_top': False,      # Top Y-axis limit switch
+            'y_bottom': False,   # Bottom Y-axis limit switch
+            'x_right': False,    # Right X-axis limit switch
+            'x_left': False,     # Left X-axis limit switch
+            'rows_door': False   # Rows door limit switch - default UP
+        }
+        self.air_pressure_valve = "up"   # "up" (closed/no air) or "down" (open/air flowing)
+        self.current_execution_engine = None
+        self.operator = None             # OperatorModel answering sensor waits (None = GUI buttons)
+        self._reset_state()
+
+    def apply_settings(self, settings: Dict):
+        """Take over hardware_limits and timing from settings.json contents"""
+        limits = settings.get("hardware_limits", {})
+        self.timing_settings = settings.get("timing", {})
+        self.max_x = limits.get("max_x_position", 100.0)
+        self.max_y = limits.get("max_y_position", 100.0)
+        self.min_x = limits.get("min_x_position", 0.0)
+        self.min_y = limits.get("min_y_position", 0.0)
+
+    def _reset_state(self):
+        self.current_x_position = 0.0
+        self.current_y_position = 0.0
+        for piston, state in DEFAULT_PISTON_STATES.items():
+            self._apply_piston(piston, state)
+        self.x_left_edge = False
+        self.x_right_edge = False
+        self.y_top_edge = False
+        self.y_bottom_edge = False
+
+    def _apply_piston(self, piston: str, state: str):
+        up_sensors, down_sensors = PISTON_SENSORS[piston]
+        setattr(self, f"{piston}_piston", state)
+        for sensor in up_sensors:
+            setattr(self, sensor, state == "up")
+        for sensor in down_sensors:
+            setattr(self, sensor, state == "down")
+
+    def reset_hardware(self):
+        """Reset all hardware to initial state"""
+        with self._state_lock:
+            # Air pressure valve is NOT reset here, it is managed at application lifecycle level
+            self._reset_state()
+
+            # NOTE: rows_door is NOT reset - it represents a physical door state
+            # that doesn't change during software reset. Preserve current state.
+            # At position (0,0), x_right and y_bottom limit switches are active (at home)
+            self.limit_switch_states['x_right'] = True
+            self.limit_switch_states['x_left'] = False
+            self.limit_switch_states['y_bottom'] = True
+            self.limit_switch_states['y_top'] = False
+
+            for event in self.sensor_events.values():
+                event.clear()
+            self.sensor_results['x_sensor'] = None
+            self.sensor_results['y_sensor'] = None
+            for key in self.sensor_trigger_states:
+                self.sensor_trigger_states[key] = False
+                self.sensor_trigger_timers[key] = 0
+
+            # Clear execution engine reference to prevent stale callbacks
+            self.current_execution_engine = None
+
+            self.logger.info("Hardware reset to initial state", category="hardware")
+
+    # ========== MOTORS ==========
+
+    def _travel_time(self, distance: float) -> float:
+        delay_per_cm = self.timing_settings.get("motor_movement_delay_per_cm", 0.01)
+        max_delay = self.timing_settings.get("max_motor_movement_delay", 0.5)
+        return min(distance * delay_per_cm, max_delay)
+
+    def move_x(self, position: float) -> bool:
+        """Move X motor to specified position within limits"""
+        self.logger.debug(f"move_x({position:.1f})", category="hardware")
+        with self._state_lock:
+            if position < self.min_x:
+                self.logger.warning(f"X position {position:.1f} below minimum {self.min_x:.1f}, clamping", category="hardware")
+                position = self.min_x
+            elif position > self.max_x:
+                self.logger.warning(f"X position {position:.1f} above maximum {self.max_x:.1f}, clamping", category="hardware")
+                position = self.max_x
+
+            if position != self.current_x_position:
+                self.logger.info(f"Moving X motor from {self.current_x_position:.1f}cm to {position:.1f}cm", category="hardware")
+                self.clock.sleep(self._travel_time(abs(position - self.current_x_position)))
+                self.current_x_position = position
+
+                # Update limit switch states based on position
+                self.limit_switch_states['x_right'] = (position <= self.min_x)
+                self.limit_switch_states['x_left'] = (position >= self.max_x)
+                self.logger.info(f"X motor positioned at {position:.1f}cm", category="hardware")
+            else:
+                self.logger.debug(f"X motor already at {position:.1f}cm", category="hardware")
+            return True
+
+    def move_y(self, position: float) -> bool:
+        """Move Y motor to specified position within limits"""
+        self.logger.debug(f"move_y({position:.1f})", category="hardware")
+        with self._state_lock:
+            if position < self.min_y:
+                self.logger.warning(f"Y position {position:.1f} below minimum {self.min_y:.1f}, clamping", category="hardware")
+                position = self.min_y
+            elif position > self.max_y:
+                self.logger.warning(f"Y position {position:.1f} above maximum {self.max_y:.1f}, clamping", category="hardware")
+                position = self.max_y
+
+            if position != self.current_y_position:
+                self.logger.info(f"Moving Y motor from {self.current_y_position:.1f}cm to {position:.1f}cm", category="hardware")
+                self.clock.sleep(self._travel_time(abs(position - self.current_y_position)))
+                self.current_y_position = position
+
+                # Update limit switch states based on position
+                self.limit_switch_states['y_bottom'] = (position <= self.min_y)
+                self.limit_switch_states['y_top'] = (position >= self.max_y)
+                self.logger.info(f"Y motor positioned at {position:.1f}cm", category="hardware")
+            else:
+                self.logger.debug(f"Y motor already at {position:.1f}cm", category="hardware")
+            return True
+
+    def get_current_x(self) -> float:
+        return self.current_x_position
+
+    def get_current_y(self) -> float:
+        return self.current_y_position
+
+    # ========== PISTONS ==========
+
+    def set_piston(self, piston: str, state: str) -> bool:
+        """Drive a piston ("line_marker", "line_motor", ...) "up" or "down" and update its sensors"""
+        label = piston.replace('_', ' ')
+        with self._state_lock:
+            if getattr(self, f"{piston}_piston") == state:
+                self.logger.debug(f"{label.capitalize()} piston already {state.upper()}", category="hardware")
+                return True
+            self.logger.info(f"{'Lowering' if state == 'down' else 'Raising'} {label} piston", category="hardware")
+            self.clock.sleep(self.timing_settings.get("tool_action_delay", 0.1))
+            self._apply_piston(piston, state)
+            self.logger.success(f"{label.capitalize()} piston {state.upper()} "
+                                f"(up_sensor={state == 'up'}, down_sensor={state == 'down'})", category="hardware")
+            return True
+
+    def line_marker_down(self) -> bool:
+        return self.set_piston('line_marker', 'down')
+
+    def line_marker_up(self) -> bool:
+        return self.set_piston('line_marker', 'up')
+
+    def line_cutter_down(self) -> bool:
+        return self.set_piston('line_cutter', 'down')
+
+    def line_cutter_up(self) -> bool:
+        return self.set_piston('line_cutter', 'up')
+
+    def row_marker_down(self) -> bool:
+        """Lower row marker (does NOT affect motor door limit switch)"""
+        return self.set_piston('row_marker', 'down')
+
+    def row_marker_up(self) -> bool:
+        """Raise row marker (does NOT affect motor door limit switch)"""
+        return self.set_piston('row_marker', 'up')
+
+    def row_cutter_down(self) -> bool:
+        return self.set_piston('row_cutter', 'down')
+
+    def row_cutter_up(self) -> bool:
+        return self.set_piston('row_cutter', 'up')
+
+    line_marker_piston_down = line_marker_down
+    line_marker_piston_up = line_marker_up
+    line_cutter_piston_down = line_cutter_down
+    line_cutter_piston_up = line_cutter_up
+    row_marker_piston_down = row_marker_down
+    row_marker_piston_up = row_marker_up
+    row_cutter_piston_down = row_cutter_down
+    row_cutter_piston_up = row_cutter_up
+
+    def line_motor_piston_down(self) -> bool:
+        """Lower the Y motor assembly (both sides move together)"""
+        return self.set_piston('line_motor', 'down')
+
+    def line_motor_piston_up(self) -> bool:
+        """Lift the Y motor assembly (both sides move together)"""
+        return self.set_piston('line_motor', 'up')
+
+    def air_pressure_valve_down(self) -> bool:
+        """Open air pressure valve (air flows to pistons)"""
+        if self.air_pressure_valve != "down":
+            self.logger.info("Opening air pressure valve - air flowing to pistons", category="hardware")
+            self.clock.sleep(self.timing_settings.get("tool_action_delay", 0.1))
+            self.air_pressure_valve = "down"
+            self.logger.success("Air pressure valve OPEN (down) - air flowing", category="hardware")
+        return True
+
+    def air_pressure_valve_up(self) -> bool:
+        """Close air pressure valve (no air to pistons)"""
+        if self.air_pressure_valve != "up":
+            self.logger.info("Closing air pressure valve - stopping air flow", category="hardware")
+            self.clock.sleep(self.timing_settings.get("tool_action_delay", 0.1))
+            self.air_pressure_valve = "up"
+            self.logger.success("Air pressure valve CLOSED (up) - no air flow", category="hardware")
+        return True
+
+    def get_air_pressure_valve_state(self) -> str:
+        return self.air_pressure_valve
+
+    def lift_line_tools(self) -> bool:
+        """Lift line tools off surface"""
+        self.logger.info("Lifting line tools off surface", category="hardware")
+        self.line_marker_up()
+        self.line_cutter_up()
+        self.clock.sleep(self.timing_settings.get("row_marker_stable_delay", 0.2))
+        return True
+
+    def lower_line_tools(self) -> bool:
+        """Lower line tools to surface"""
+        self.logger.info("Lowering line tools to surface", category="hardware")
+        self.line_marker_down()
+        self.line_cutter_down()
+        return True
+
+    def move_line_tools_to_top(self) -> bool:
+        """Lift line tools and move them to maximum Y position"""
+        self.lift_line_tools()
+        return self.move_y(self.max_y)
+
+    # ========== PISTON / SENSOR GETTERS ==========
+
+    def get_line_marker_piston_state(self) -> str:
+        return self.line_marker_piston
+
+    def get_line_cutter_piston_state(self) -> str:
+        return self.line_cutter_piston
+
+    def get_line_motor_piston_state(self) -> str:
+        return self.line_motor_piston
+
+    def get_row_marker_piston_state(self) -> str:
+        return self.row_marker_piston
+
+    def get_row_cutter_piston_state(self) -> str:
+        return self.row_cutter_piston
+
+    def get_line_marker_up_sensor(self) -> bool:
+        return self.line_marker_up_sensor
+
+    def get_line_marker_down_sensor(self) -> bool:
+        return self.line_marker_down_sensor
+
+    def get_line_cutter_up_sensor(self) -> bool:
+        return self.line_cutter_up_sensor
+
+    def get_line_cutter_down_sensor(self) -> bool:
+        return self.line_cutter_down_sensor
+
+    def get_line_motor_left_up_sensor(self) -> bool:
+        return self.line_motor_left_up_sensor
+
+    def get_line_motor_left_down_sensor(self) -> bool:
+        return self.line_motor_left_down_sensor
+
+    def get_line_motor_right_up_sensor(self) -> bool:
+        return self.line_motor_right_up_sensor
+
+    def get_line_motor_right_down_sensor(self) -> bool:
+        return self.line_motor_right_down_sensor
+
+    def get_row_marker_up_sensor(self) -> bool:
+        return self.row_marker_up_sensor
+
+    def get_row_marker_down_sensor(self) -> bool:
+        return self.row_marker_down_sensor
+
+    def get_row_cutter_up_sensor(self) -> bool:
+        return self.row_cutter_up_sensor
+
+    def get_row_cutter_down_sensor(self) -> bool:
+        return self.row_cutter_down_sensor
+
+    # Legacy single-sensor getters ('up' if up_sensor True, else 'down')
+    def get_line_marker_state(self) -> str:
+        return "up" if self.line_marker_up_sensor else "down"
+
+    def get_line_cutter_state(self) -> str:
+        return "up" if self.line_cutter_up_sensor else "down"
+
+    def get_row_marker_state(self) -> str:
+        return "up" if self.row_marker_up_sensor else "down"
+
+    def get_row_cutter_state(self) -> str:
+        return "up" if self.row_cutter_up_sensor else "down"
+
+    def get_x_left_edge(self) -> bool:
+        return self.x_left_edge
+
+    def get_x_right_edge(self) -> bool:
+        return self.x_right_edge
+
+    def get_y_top_edge(self) -> bool:
+        return self.y_top_edge
+
+    def get_y_bottom_edge(self) -> bool:
+        return self.y_bottom_edge
+
+    # ========== EDGE SENSORS ==========
+
+    def _wait_for_edge(self, sensors: Tuple[str, ...], update_canvas: bool = True) -> Optional[str]:
+        """Wait until one of the edge sensors is triggered. Ignores premature triggers and safety pauses."""
+        label = " or ".join(EDGE_SENSORS[sensor][2] for sensor in sensors)
+        self.logger.info(f"Waiting for {label} sensor... (Use trigger_{sensors[0]}_sensor())", category="hardware")
+
+        # Clear any existing triggers first (ignore premature triggers and safety pause triggers)
+        for sensor in sensors:
+            self.sensor_events[sensor].clear()
+
+        start_time = self.clock.now()
+        max_timeout = self.timing_settings.get("sensor_wait_timeout", 300.0)
+        poll_timeout = self.timing_settings.get("sensor_poll_timeout", 0.1)
+
+        if self.operator is not None:
+            engine = self.current_execution_engine
+            self.operator.on_sensor_wait(self, sensors, getattr(engine, 'stop_event', None) or Event())
+
+        while True:
+            engine = self.current_execution_engine
+            # Check for stop event FIRST (critical for proper stop/reset)
+            if engine and hasattr(engine, 'stop_event') and engine.stop_event.is_set():
+                self.logger.warning(f"{label} sensor wait aborted - stop requested", category="hardware")
+                return None
+
+            if self.clock.now() - start_time > max_timeout:
+                self.logger.warning(f"{label} sensor wait timeout after {max_timeout}s", category="hardware")
+                return None
+
+            for sensor in sensors:
+                if not self.clock.wait(self.sensor_events[sensor], poll_timeout):
+                    continue
+                self.sensor_events[sensor].clear()
+                # Triggers during a safety pause are flushed and the wait goes on
+                if engine and engine.is_paused:
+                    self.logger.warning(f"{EDGE_SENSORS[sensor][2]} sensor trigger ignored - execution paused due to safety violation", category="hardware")
+                    break
+
+                result, result_key, sensor_label = EDGE_SENSORS[sensor]
+                self.sensor_results[result_key] = result
+                self.logger.info(f"{sensor_label} sensor triggered: {result.upper()} edge detected", category="hardware")
+                if update_canvas:
+                    self._move_to_sensor_location(sensor)
+                return result
+
+    def wait_for_x_left_sensor(self):
+        return self._wait_for_edge(('x_left',))
+
+    def wait_for_x_right_sensor(self):
+        return self._wait_for_edge(('x_right',))
+
+    def wait_for_y_top_sensor(self):
+        return self._wait_for_edge(('y_top',))
+
+    def wait_for_y_bottom_sensor(self):
+        return self._wait_for_edge(('y_bottom',))
+
+    def wait_for_x_sensor(self):
+        """Wait for either lines sensor. Returns 'left' or 'right'."""
+        return self._wait_for_edge(('x_left', 'x_right'), update_canvas=False)
+
+    def wait_for_y_sensor(self):
+        """Wait for either rows sensor. Returns 'top' or 'bottom'."""
+        return self._wait_for_edge(('y_top', 'y_bottom'), update_canvas=False)
+
+    def flush_all_sensor_buffers(self):
+        """Clear all sensor event buffers - used when resuming from safety pauses"""
+        self.logger.info("FLUSH: Clearing all sensor buffers (removing triggers from safety pause)", category="hardware")
+        for event in self.sensor_events.values():
+            event.clear()
+
+    def signal_all_sensor_events(self):
+        """Signal all sensor events to unblock waiting threads during stop"""
+        self.logger.info("SIGNAL: Waking all sensor wait threads for stop", category="hardware")
+        for event in self.sensor_events.values():
+            event.set()
+
+    def trigger_sensor(self, sensor: str):
+        """Manually trigger an edge sensor ('x_left', 'x_right', 'y_top', 'y_bottom')"""
+        self.sensor_events[sensor].set()
+        self.sensor_trigger_states[sensor] = True
+        self.sensor_trigger_timers[sensor] = self.clock.now()
+        setattr(self, f"{sensor}_edge", True)
+        self.logger.info(f"Manual trigger: {EDGE_SENSORS[sensor][2]} sensor activated", category="hardware")
+
+    def trigger_x_left_sensor(self):
+        self.trigger_sensor('x_left')
+
+    def trigger_x_right_sensor(self):
+        self.trigger_sensor('x_right')
+
+    def trigger_y_top_sensor(self):
+        self.trigger_sensor('y_top')
+
+    def trigger_y_bottom_sensor(self):
+        self.trigger_sensor('y_bottom')
+
+    def get_sensor_trigger_states(self) -> Dict[str, bool]:
+        """Current sensor trigger states, auto-reset 1 second after the trigger"""
+        now = self.clock.now()
+        for sensor, triggered in self.sensor_trigger_states.items():
+            if triggered and now - self.sensor_trigger_timers[sensor] > 1.0:
+                self.sensor_trigger_states[sensor] = False
+                setattr(self, f"{sensor}_edge", False)
+        return self.sensor_trigger_states.copy()
+
+    def reset_sensor_trigger_state(self, sensor_name: str):
+        if sensor_name in self.sensor_trigger_states:
+            self.sensor_trigger_states[sensor_name] = False
+
+    # ========== LIMIT SWITCHES ==========
+
+    def get_row_motor_limit_switch(self) -> str:
+        """Row motor door switch: True (ON) = "down", False (OFF) = "up" """
+        return "down" if self.limit_switch_states.get('rows_door', False) else "up"
+
+    def set_row_marker_limit_switch(self, state: str):
+        """Manually set row marker limit switch state ("up"/"down")"""
+        if state in ["up", "down"]:
+            self.limit_switch_states['rows_door'] = (state == "down")
+            self.logger.info(f"Row marker limit switch manually set to: {state.upper()}", category="hardware")
+
+    def toggle_row_marker_limit_switch(self) -> str:
+        self.limit_switch_states['rows_door'] = not self.limit_switch_states['rows_door']
+        new_state = self.get_row_motor_limit_switch()
+        self.logger.info(f"Row marker limit switch toggled to: {new_state.upper()}", category="hardware")
+        return new_state
+
+    def toggle_limit_switch(self, switch_name: str) -> bool:
+        """Toggle a limit switch state (motor door sensor - independent from marker piston)"""
+        if switch_name not in self.limit_switch_states:
+            return False
+        self.limit_switch_states[switch_name] = not self.limit_switch_states[switch_name]
+        state = self.limit_switch_states[switch_name]
+        self.logger.info(f"Limit switch {switch_name} toggled to: {'ON' if state else 'OFF'}", category="hardware")
+        return state
+
+    def get_limit_switch_state(self, switch_name: str) -> bool:
+        return self.limit_switch_states.get(switch_name, False)
+
+    def set_limit_switch_state(self, switch_name: str, state: bool):
+        if switch_name in self.limit_switch_states:
+            self.limit_switch_states[switch_name] = state
+            self.logger.info(f"Limit switch {switch_name} set to: {'ON' if state else 'OFF'}", category="hardware")
+
+    # ========== STATUS ==========
+
+    def get_hardware_status(self) -> Dict:
+        """Current hardware status for debugging"""
+        with self._state_lock:
+            status = {
+                'x_position': self.current_x_position,
+                'y_position': self.current_y_position,
+            }
+            for piston, (up_sensors, down_sensors) in PISTON_SENSORS.items():
+                status[f"{piston}_piston"] = getattr(self, f"{piston}_piston")
+                for sensor in up_sensors + down_sensors:
+                    status[sensor] = getattr(self, sensor)
+            status['row_marker_limit_switch'] = self.get_row_motor_limit_switch()
+            status['air_pressure_valve'] = self.air_pressure_valve
+            return status
+
+    def print_hardware_status(self):
+        self.logger.info("=== Hardware Status ===", category="hardware")
+        for key, value in self.get_hardware_status().items():
+            self.logger.info(f"{key}: {value}", category="hardware")
+        self.logger.info("=====================", category="hardware")
+
+    # ========== EXECUTION ENGINE ==========
+
+    def set_execution_engine_reference(self, execution_engine):
+        """Set reference to execution engine for sensor positioning"""
+        self.current_execution_engine = execution_engine
+
+    def _move_to_sensor_location(self, sensor_type: str):
+        """Trigger visual sensor update in canvas when triggered during wait_sensor steps.
+        NOTE: This does NOT move motors - only updates canvas display!
+        """
+        engine = self.current_execution_engine
+        if not engine or not engine.is_running:
+            return
+
+        # Only sensors expected by the current wait_sensor step update the canvas
+        if engine.current_step_index < len(engine.steps):
+            current_step = engine.steps[engine.current_step_index]
+            if current_step.get('operation') != 'wait_sensor':
+                return
+            expected_sensor = current_step.get('parameters', {}).get('sensor')
+            if expected_sensor != sensor_type and expected_sensor != sensor_type[0]:
+                self.logger.debug(f"Sensor {sensor_type} doesn't match expected sensor {expected_sensor} - ignoring trigger", category="hardware")
+                return
+
+        canvas_manager = getattr(engine, 'canvas_manager', None)
+        if not canvas_manager or not canvas_manager.main_app.current_program:
+            return
+
+        self.logger.info(f"Sensor {sensor_type} triggered - updating canvas display only (motors remain at current position)", category="hardware")
+        if hasattr(canvas_manager, 'canvas_sensors'):
+            canvas_manager.canvas_sensors.trigger_sensor_visualization(sensor_type)
+        else:
+            canvas_manager.update_position_display()
@@ -6,14 +6,32 @@ Arduino GRBL Interface
 
 Handles G-code communication with Arduino running GRBL firmware.
 Controls X and Y motors via serial communication.
+
+All serial reads happen on the GrblTransport reader thread (see
+grbl_transport.py); commands wait on acknowledgement futures and status
+queries on the latest-status slot, so neither blocks the other.
+
+Status reports are requested at a steady rate by GrblStatusScheduler
+(grbl_status.py); get_status() serves the latest pushed report and only
+queries GRBL directly when the scheduler is disabled or stale.
+
+Setting serial_port to "sim://grbl" connects to the built-in GRBL
+simulator (grbl_simulator.py) instead of a real Arduino.
 """
 
 import json
 import time
-import re
 from typing import Optional, Tuple, Dict
+import threading
 from threading import Lock, Event
 from core.logger import get_logger
+from hardware.implementations.real.arduino_grbl.grbl_transport import (
+    GrblTransport, GrblCommandError, LINE_ALARM, LINE_MESSAGE, LINE_WELCOME
+)
+from hardware.implementations.real.arduino_grbl.grbl_status import GrblStatus, GrblStatusScheduler, parse_status
+from hardware.implementations.real.arduino_grbl.grbl_settings import GrblSettingsSync
+from hardware.implementations.real.arduino_grbl.motion_planner import format_motion_command
+from hardware.interfaces.motion_handle import MotionHandle
 
 # Try to import pyserial, fall back to mock if not available
 try:
@@ -79,15 +97,15 @@ class ArduinoGRBL:
         self.feed_rate = self.grbl_settings.get("feed_rate", 1000)  # mm/min
         self.rapid_rate = self.grbl_settings.get("rapid_rate", 3000)  # mm/min
 
-        # Load timing configuration values
+        # Load timing configuration values (upper bounds - the waits end on GRBL's banner)
         timing_config = self.config.get("timing", {})
         self._grbl_init_delay = timing_config.get("grbl_initialization_delay", 2)
-        self._grbl_serial_poll_delay = timing_config.get("grbl_serial_poll_delay", 0.01)
         self._grbl_reset_delay = timing_config.get("grbl_reset_delay", 2)
 
         self.serial_connection: Optional[serial.Serial] = None
+        self.simulator = None  # GrblSimulator, set when serial_port is sim://
+        self.transport: Optional[GrblTransport] = None  # Reader thread + response demux
         self.is_connected = False
-        self.command_lock = Lock()  # Thread safety for serial commands
 
         self.current_x = 0.0  # Current X position in mm
         self.current_y = 0.0  # Current Y position in mm
@@ -97,6 +115,20 @@ class ArduinoGRBL:
         self.movement_timeout = self.grbl_config.get("movement_timeout", 60.0)  # seconds
         self.movement_poll_interval = self.grbl_config.get("movement_poll_interval", 0.1)  # seconds
 
+        # Character-counting streaming of consecutive moves (see stream_moves)
+        self.streaming_enabled = self.grbl_config.get("streaming_enabled", True)
+        self.rx_buffer_size = self.grbl_config.get("rx_buffer_size", 128)  # bytes
+        self._stream_line_number = 0
+
+        # Travel moves (no working tool engaged) use G0 at the machine's rapid rate ($110/$111)
+        self.rapid_travel = self.grbl_config.get("rapid_travel", True)
+
+        # Pushed status reports (0 Hz disables the scheduler; get_status then queries directly)
+        self.status_report_rate = self.grbl_config.get("status_report_rate_hz", 10.0)
+        self.status_report_rate_run = self.grbl_config.get("status_report_rate_run_hz", 20.0)
+        self.status_scheduler: Optional[GrblStatusScheduler] = None
+        self._status_subscribers = []
+
         # Safety feed hold mechanism - allows safety monitor to pause/resume GRBL mid-movement
         self._safety_hold_event = Event()  # Set when safety hold is active
         self._safety_hold_lock = Lock()
@@ -111,6 +143,14 @@ class ArduinoGRBL:
         self._cached_wco_x = 0.0  # mm
         self._cached_wco_y = 0.0  # mm
 
+        # Last-known device state for warm starts: the '$' settings read from
+        # GRBL (cached until GRBL resets) and whether the machine has been
+        # homed since GRBL last lost its position
+        self.settings_sync = GrblSettingsSync(self._send_command)
+        self._homed = False
+        self._expecting_reset = False  # our own Ctrl-X keeps the position
+        self.skip_homing_when_homed = self.grbl_config.get("skip_homing_when_homed", False)
+
         # Limit switch state tracking (calculated from Pn: field + position)
         self._limit_switches = {'x_right': False, 'x_left': False, 'y_bottom': False, 'y_top': False}
         hardware_limits = self.config.get("hardware_limits", {})
@@ -158,8 +198,11 @@ class ArduinoGRBL:
             self.logger.debug(f"Timeout: {self.connection_timeout}s", category="grbl")
 
             # Check if port exists (list available ports)
-            import serial.tools.list_ports
-            available_ports = [port.device for port in serial.tools.list_ports.comports()]
+            if self._is_simulated_port():
+                available_ports = [self.serial_port]
+            else:
+                from serial.tools import list_ports  # keeps the module-level `serial` name visible
+                available_ports = [port.device for port in list_ports.comports()]
             self.logger.debug(f"Available ports: {available_ports if available_ports else 'None found'}", category="grbl")
 
             if self.serial_port not in available_ports:
@@ -171,11 +214,7 @@ class ArduinoGRBL:
 
             # Open serial connection
             try:
-                self.serial_connection = serial.Serial(
-                    port=self.serial_port,
-                    baudrate=self.baud_rate,
-                    timeout=self.connection_timeout
-                )
+                self.serial_connection = self._open_serial()
                 self.logger.debug("Serial port opened", category="grbl")
             except serial.SerialException as e:
                 if "Permission denied" in str(e):
@@ -192,12 +231,12 @@ class ArduinoGRBL:
                     self.logger.error(error_msg, category="grbl")
                 raise RuntimeError(error_msg)
 
+            # Reader thread consumes the startup message
+            self._start_transport()
+
             # Wait for GRBL to initialize (it sends startup message)
             self.logger.debug("Waiting for GRBL to initialize...", category="grbl")
-            time.sleep(self._grbl_init_delay)
-
-            # Flush any startup messages
-            self.serial_connection.flushInput()
+            self._wait_until_ready(self._grbl_init_delay)
 
             # Send a simple command to verify connection
             self.logger.debug("Sending status query to GRBL...", category="grbl")
@@ -246,9 +285,6 @@ class ArduinoGRBL:
         else:
             self.logger.warning("Failed to apply some GRBL configuration settings", category="grbl")
 
-        # Small delay to ensure settings are written to EEPROM
-        time.sleep(0.3)
-
         # Set positioning mode (absolute/relative)
         positioning_mode = self.grbl_settings.get("positioning_mode", "G90")
         self._send_command(positioning_mode)
@@ -285,10 +321,131 @@ class ArduinoGRBL:
 
         self.logger.success("GRBL initialized", category="grbl")
 
+    def _start_transport(self):
+        """Start the reader thread for the current serial connection"""
+        self._stop_transport()
+        self.transport = GrblTransport(self.serial_connection, rx_buffer_size=self.rx_buffer_size)
+        self.transport.add_listener(self._on_transport_line)
+        self.settings_sync.attach(self.transport)
+        self.transport.start()
+        if self.status_report_rate > 0:
+            self.status_scheduler = GrblStatusScheduler(
+                self.transport, self.status_report_rate, self.status_report_rate_run
+            )
+            self.status_scheduler.subscribe(self._on_status_report)
+            self.status_scheduler.start()
+
+    def _stop_transport(self):
+        """Stop the status scheduler and reader thread (if any)"""
+        if self.status_scheduler:
+            self.status_scheduler.stop()
+            self.status_scheduler = None
+        if self.transport:
+            self.transport.stop()
+            self.transport = None
+
+    def _wait_until_ready(self, timeout: float, banner_only: bool = False) -> bool:
+        """Wait for GRBL's welcome banner (or a status reply) for at most timeout seconds"""
+        start = time.monotonic()
+        ready = self.transport.wait_for_ready(timeout, banner_only=banner_only)
+        if ready:
+            self.logger.debug(f"GRBL ready after {time.monotonic() - start:.2f}s", category="grbl")
+        else:
+            self.logger.warning(f"GRBL did not report ready within {timeout}s", category="grbl")
+        return ready
+
+    def _on_transport_line(self, kind: str, line: str):
+        """Reader-thread listener: forget the homed state when GRBL loses its position"""
+        if kind == LINE_WELCOME:
+            # Our own soft reset while idle keeps the position; a power-up or
+            # DTR reset (or any reset we did not send) does not
+            if not self._expecting_reset:
+                self._homed = False
+            self._expecting_reset = False
+        elif kind == LINE_ALARM or (kind == LINE_MESSAGE and "to unlock" in line):
+            self._homed = False
+
+    def _soft_reset(self, timeout: float) -> bool:
+        """Ctrl-X, then wait for the new welcome banner"""
+        self._expecting_reset = True
+        self.transport.soft_reset()
+        return self._wait_until_ready(timeout, banner_only=True)
+
+    def is_homed(self) -> bool:
+        """True if homing completed and GRBL has not lost its position since (idle, no alarm)"""
+        if not (self.is_connected and self._homed):
+            return False
+        status = self.get_status(log_changes_only=True)
+        return bool(status) and status.get('state') == 'Idle'
+
+    def subscribe_status(self, callback):
+        """Register callback(GrblStatus) for every status report; survives reconnects"""
+        if callback not in self._status_subscribers:
+            self._status_subscribers.append(callback)
+
+    def unsubscribe_status(self, callback):
+        if callback in self._status_subscribers:
+            self._status_subscribers.remove(callback)
+
+    def _resolve_position(self, report: GrblStatus) -> bool:
+        """Fill report.x/y (work position, cm) from WPos, or MPos minus the cached WCO"""
+        if report.wco:
+            # WCO is only included every few reports - cache it for the others
+            self._cached_wco_x, self._cached_wco_y = report.wco[0], report.wco[1]
+        if report.wpos:
+            x_mm, y_mm = report.wpos[0], report.wpos[1]
+        elif report.mpos:
+            x_mm = report.mpos[0] - self._cached_wco_x
+            y_mm = report.mpos[1] - self._cached_wco_y
+        else:
+            return False
+        report.x = x_mm / 10.0
+        report.y = y_mm / 10.0
+        return True
+
+    def _on_status_report(self, report: GrblStatus):
+        """Scheduler callback (reader thread): resolve position, then fan out"""
+        if self._resolve_position(report):
+            self._publish_status(report)
+
+    def _publish_status(self, report: GrblStatus):
+        for callback in list(self._status_subscribers):
+            try:
+                callback(report)
+            except Exception as e:
+                self.logger.debug(f"Status subscriber error: {e}", category="grbl")
+
+    def _latest_status_report(self) -> Optional[GrblStatus]:
+        """Latest pushed report if the scheduler is running and it is recent"""
+        scheduler = self.status_scheduler
+        if scheduler is None or not scheduler.is_running:
+            return None
+        report = scheduler.latest(max_age=2 * scheduler.interval() + 0.05)
+        return report if report is not None and report.x is not None else None
+
+    def _wait_next_status(self, timeout: float):
+        """Sleep until the next pushed status report (or timeout without a scheduler)"""
+        scheduler = self.status_scheduler
+        if scheduler is not None and scheduler.is_running:
+            scheduler.wait_for_update(timeout)
+        else:
+            time.sleep(timeout)
+
+    def _write_realtime(self, data: bytes):
+        """Write a real-time command byte (!, ~, ?, Ctrl-X) outside the command queue"""
+        if self.transport:
+            self.transport.write_realtime(data)
+        else:
+            self.serial_connection.write(data)
+
     def _send_command(self, command: str, timeout: Optional[float] = None) -> Optional[str]:
         """
         Send G-code command to GRBL and wait for response
 
+        The response is demultiplexed by the transport reader thread: line
+        commands resolve on their own ok/error, while "?" waits for the
+        next status report without queueing behind motion commands.
+
         Args:
             command: G-code command to send
             timeout: Timeout in seconds (uses default if not specified)
@@ -304,65 +461,22 @@ class ArduinoGRBL:
         if timeout is None:
             timeout = self.command_timeout
 
+        command = command.strip()
         try:
-            with self.command_lock:
-                # Send command
-                command = command.strip()
-                is_status_query = command == "?"
-
-                # Only log non-status commands at debug level
-                if not is_status_query:
-                    self.logger.debug(f"GRBL >> {command}", category="grbl")
-
-                self.serial_connection.write(f"{command}\n".encode())
-
-                # Read response with buffering for partial serial data
-                start_time = time.time()
-                response_lines = []
-                read_buffer = ""
-
-                while time.time() - start_time < timeout:
-                    if self.serial_connection.in_waiting > 0:
-                        raw_data = self.serial_connection.read(self.serial_connection.in_waiting)
-                        read_buffer += raw_data.decode(errors='replace')
-
-                        # Process complete lines from the buffer
-                        while '\n' in read_buffer:
-                            line, read_buffer = read_buffer.split('\n', 1)
-                            line = line.strip()
-                            if not line:
-                                continue
-
-                            # Only log non-status responses at debug level
-                            if not is_status_query:
-                                self.logger.debug(f"GRBL << {line}", category="grbl")
-
-                            # Status queries: ONLY look for <...> format, ignore "ok"
-                            if is_status_query:
-                                if line.startswith("<") and line.endswith(">"):
-                                    # Found status response - return immediately
-                                    return line
-                                elif line.lower() == "ok":
-                                    # Ignore leftover "ok" from previous commands
-                                    continue
-                                else:
-                                    # Add to response lines
-                                    response_lines.append(line)
-                            else:
-                                # Regular commands: collect all lines until ok/error
-                                response_lines.append(line)
-
-                                # Regular commands wait for ok or error
-                                if "ok" in line.lower() or "error" in line.lower():
-                                    response = "\n".join(response_lines)
-                                    return response
-
-                    time.sleep(self._grbl_serial_poll_delay)
-
-                if not is_status_query:
-                    self.logger.debug(f"Command timeout after {timeout}s", category="grbl")
-                return "\n".join(response_lines) if response_lines else None
+            if self.transport is None or not self.transport.is_running:
+                if self.transport and self.transport.link_error:
+                    raise serial.SerialException(str(self.transport.link_error))
+                self._start_transport()
+
+            if command == "?":
+                return self.transport.query_status(timeout)
+
+            self.logger.debug(f"GRBL >> {command}", category="grbl")
+            return self.transport.send_command(command, timeout)
 
+        except GrblCommandError as e:
+            self.logger.debug(f"Command '{command}' aborted: {e}", category="grbl")
+            return None
         except serial.SerialException as e:
             self.logger.error(f"Serial error: {e}. Attempting reconnect...", category="grbl")
             if self._reconnect():
@@ -372,6 +486,33 @@ class ArduinoGRBL:
             self.logger.error(f"Error sending command: {e}", category="grbl")
             return None
 
+    def _is_simulated_port(self) -> bool:
+        return str(self.serial_port).startswith("sim://")
+
+    def _open_serial(self):
+        """Open the configured port; a sim:// port opens the GRBL simulator"""
+        if self._is_simulated_port():
+            # Test/bench only - imported here so real starts never load the simulator
+            from hardware.implementations.real.arduino_grbl.grbl_simulator import GrblSimulator, SimulatedSerial
+
+            # One simulated machine per interface, so a reconnect finds it where it was
+            if self.simulator is None:
+                self.simulator = GrblSimulator(
+                    self.grbl_config.get("grbl_configuration", {}),
+                    time_scale=self.grbl_config.get("simulator_time_scale", 1.0)
+                )
+            return SimulatedSerial(
+                port=self.serial_port,
+                baudrate=self.baud_rate,
+                timeout=self.connection_timeout,
+                simulator=self.simulator
+            )
+        return serial.Serial(
+            port=self.serial_port,
+            baudrate=self.baud_rate,
+            timeout=self.connection_timeout
+        )
+
     def _reconnect(self) -> bool:
         """
         Attempt to reconnect to GRBL serial port after connection loss.
@@ -382,6 +523,7 @@ class ArduinoGRBL:
         self.logger.warning("Attempting GRBL serial reconnection...", category="grbl")
         try:
             # Close existing connection if any
+            self._stop_transport()
             if self.serial_connection:
                 try:
                     self.serial_connection.close()
@@ -391,25 +533,18 @@ class ArduinoGRBL:
             self.is_connected = False
 
             # Re-open serial connection
-            self.serial_connection = serial.Serial(
-                port=self.serial_port,
-                baudrate=self.baud_rate,
-                timeout=self.connection_timeout
-            )
+            self.serial_connection = self._open_serial()
+
+            self._start_transport()
 
             # Wait for GRBL to initialize after reconnect
-            time.sleep(self._grbl_init_delay)
-            self.serial_connection.flushInput()
+            self._wait_until_ready(self._grbl_init_delay)
 
             # Verify connection with status query
-            self.serial_connection.write(b"?\n")
-            time.sleep(0.1)
-            if self.serial_connection.in_waiting > 0:
-                response = self.serial_connection.readline().decode().strip()
-                if response:
-                    self.is_connected = True
-                    self.logger.success("GRBL reconnection successful", category="grbl")
-                    return True
+            if self.transport.query_status(timeout=1.0):
+                self.is_connected = True
+                self.logger.success("GRBL reconnection successful", category="grbl")
+                return True
 
             self.logger.error("GRBL reconnection failed - no response", category="grbl")
             return False
@@ -418,13 +553,14 @@ class ArduinoGRBL:
             self.logger.error(f"GRBL reconnection failed: {e}", category="grbl")
             return False
 
-    def move_to(self, x: float, y: float, rapid: bool = False, wait_for_completion: bool = True) -> bool:
+    def move_to(self, x: Optional[float], y: Optional[float], rapid: bool = False,
+                wait_for_completion: bool = True) -> bool:
         """
         Move to absolute position
 
         Args:
-            x: Target X position in cm (will be converted to mm for GRBL)
-            y: Target Y position in cm (will be converted to mm for GRBL)
+            x: Target X position in cm (will be converted to mm for GRBL); None leaves X where it is
+            y: Target Y position in cm (will be converted to mm for GRBL); None leaves Y where it is
             rapid: Use rapid movement (G0) instead of feed rate (G1)
             wait_for_completion: If True, blocks until motor reaches target position (default True)
 
@@ -444,19 +580,13 @@ class ArduinoGRBL:
         # Convert cm to mm (GRBL uses mm in G21 mode)
         # User's config: X100 GRBL units = 10cm = 100mm
         # So 1 GRBL unit = 1mm
-        x_mm = x * 10.0
-        y_mm = y * 10.0
+        # G0 = rapid positioning (no feed rate), G1 = linear interpolation with feed rate.
+        # An omitted axis is not commanded at all, so it never moves to a stale cached value.
+        command = format_motion_command(x, y, rapid, self.feed_rate)
+        x, y = self._fill_axes(x, y)
 
         try:
-            # Choose movement command
-            if rapid:
-                # G0 = rapid positioning (no feed rate)
-                command = f"G0 X{x_mm:.3f} Y{y_mm:.3f}"
-            else:
-                # G1 = linear interpolation with feed rate
-                command = f"G1 X{x_mm:.3f} Y{y_mm:.3f} F{self.feed_rate}"
-
-            self.logger.info(f"Moving: {x:.2f}cm, {y:.2f}cm → GRBL: X{x_mm:.3f}, Y{y_mm:.3f} (mm)", category="grbl")
+            self.logger.info(f"Moving: {x:.2f}cm, {y:.2f}cm → GRBL: {command}", category="grbl")
             response = self._send_command(command)
 
             if response and "ok" in response.lower():
@@ -493,6 +623,17 @@ class ArduinoGRBL:
             self.logger.error(f"Error moving to position: {e}", category="grbl")
             return False
 
+    def _fill_axes(self, x: Optional[float], y: Optional[float]) -> Tuple[float, float]:
+        """Complete a target with the reported position of any uncommanded axis"""
+        if x is not None and y is not None:
+            return x, y
+        status = self.get_status(log_changes_only=True)
+        if status:
+            current_x, current_y = status.get('x', self.current_x), status.get('y', self.current_y)
+        else:
+            current_x, current_y = self.current_x, self.current_y
+        return (current_x if x is None else x), (current_y if y is None else y)
+
     def move_relative(self, dx: float, dy: float) -> bool:
         """
         Move relative to current position
@@ -556,102 +697,69 @@ class ArduinoGRBL:
             return None
 
         try:
-            response = self._send_command("?", timeout=1.0)
+            report = self._latest_status_report()
+            if report is None:
+                response = self._send_command("?", timeout=1.0)
 
-            # Debug level only - shows every query
-            self.logger.debug(f"GRBL raw response to '?': '{response}'", category="grbl")
+                # Debug level only - shows every query
+                self.logger.debug(f"GRBL raw response to '?': '{response}'", category="grbl")
 
-            if response:
-                # Parse GRBL status response
-                # Format: <Idle|MPos:0.000,0.000,0.000|WPos:0.000,0.000,0.000>
-                status = {}
-
-                # Extract state (Idle, Run, Hold, etc.)
-                state_match = re.search(r'<([^|]+)', response)
-                if state_match:
-                    status['state'] = state_match.group(1)
-                else:
-                    status['state'] = 'Unknown'
-
-                # Extract work position (GRBL reports in mm)
-                wpos_match = re.search(r'WPos:([\d.-]+),([\d.-]+)', response)
-                mpos_match = re.search(r'MPos:([\d.-]+),([\d.-]+)', response)
-                wco_match = re.search(r'WCO:([\d.-]+),([\d.-]+)', response)
-
-                # Update cached WCO if present in response
-                if wco_match:
-                    self._cached_wco_x = float(wco_match.group(1))
-                    self._cached_wco_y = float(wco_match.group(2))
-                    self.logger.debug(f"Updated WCO cache: X={self._cached_wco_x}mm, Y={self._cached_wco_y}mm", category="grbl")
-
-                # Calculate position (prefer WPos, fallback to MPos - WCO)
-                if wpos_match:
-                    # Direct WPos from GRBL
-                    x_mm = float(wpos_match.group(1))
-                    y_mm = float(wpos_match.group(2))
-                    status['x'] = x_mm / 10.0
-                    status['y'] = y_mm / 10.0
-                    self.logger.debug(f"Using WPos directly: X={x_mm}mm, Y={y_mm}mm", category="grbl")
-                elif mpos_match:
-                    # Calculate WPos = MPos - WCO (using cached WCO if not in this response)
-                    mpos_x_mm = float(mpos_match.group(1))
-                    mpos_y_mm = float(mpos_match.group(2))
-
-                    # Use cached WCO for calculation
-                    wpos_x_mm = mpos_x_mm - self._cached_wco_x
-                    wpos_y_mm = mpos_y_mm - self._cached_wco_y
-
-                    status['x'] = wpos_x_mm / 10.0
-                    status['y'] = wpos_y_mm / 10.0
-                    self.logger.debug(f"Calculated WPos from MPos: MPos=({mpos_x_mm},{mpos_y_mm}) - WCO=({self._cached_wco_x},{self._cached_wco_y}) = WPos=({wpos_x_mm},{wpos_y_mm})mm", category="grbl")
-                else:
-                    self.logger.error("Could not parse position from GRBL response!", category="grbl")
+                if not response:
+                    self.logger.error("GRBL returned empty response to '?' command", category="grbl")
                     return None
 
-                # Parse Pn: field for limit switch pins (only present when pins are active)
-                pn_match = re.search(r'Pn:([A-Za-z]+)', response)
-                pin_x = pin_y = False
-                if pn_match:
-                    pins = pn_match.group(1)
-                    pin_x = 'X' in pins
-                    pin_y = 'Y' in pins
-                status['pins'] = {'X': pin_x, 'Y': pin_y}
-
-                # Calculate specific limit switches from position
-                x_pos = status.get('x', 0.0)
-                y_pos = status.get('y', 0.0)
-                self._limit_switches['x_right'] = pin_x and (x_pos < self._max_x / 2)
-                self._limit_switches['x_left'] = pin_x and (x_pos >= self._max_x / 2)
-                self._limit_switches['y_bottom'] = pin_y and (y_pos < self._max_y / 2)
-                self._limit_switches['y_top'] = pin_y and (y_pos >= self._max_y / 2)
-                status['limit_switches'] = dict(self._limit_switches)
-
-                # Check if anything changed (only log changes)
-                if log_changes_only:
-                    x_changed = (self._last_logged_x is None or
-                                abs(status.get('x', 0) - self._last_logged_x) > 0.01)  # 0.01cm threshold
-                    y_changed = (self._last_logged_y is None or
-                                abs(status.get('y', 0) - self._last_logged_y) > 0.01)
-                    state_changed = (self._last_logged_state != status.get('state'))
-
-                    # Only log if something changed
-                    if x_changed or y_changed or state_changed:
-                        if state_changed:
-                            self.logger.info(f"GRBL state changed: {self._last_logged_state} → {status.get('state')}", category="grbl")
-
-                        if x_changed or y_changed:
-                            self.logger.info(f"GRBL position: X={status.get('x', 0):.2f}cm, Y={status.get('y', 0):.2f}cm [State: {status.get('state')}]", category="grbl")
-
-                        # Update last logged values
-                        self._last_logged_x = status.get('x', 0)
-                        self._last_logged_y = status.get('y', 0)
-                        self._last_logged_state = status.get('state')
-
-                return status
-
-            else:
-                self.logger.error("GRBL returned empty response to '?' command", category="grbl")
-                return None
+                # Format: <Idle|MPos:0.000,0.000,0.000|WCO:0.000,0.000,0.000>
+                report = parse_status(response, time.monotonic())
+                if report is None or not self._resolve_position(report):
+                    self.logger.error("Could not parse position from GRBL response!", category="grbl")
+                    return None
+                if self.status_scheduler is None:
+                    self._publish_status(report)  # otherwise the scheduler already saw this reply
+
+            status = {
+                'state': report.state,
+                'x': report.x,
+                'y': report.y,
+                # Ln: line number of the executing block (builds with line numbers enabled)
+                'line': report.line,
+            }
+
+            # Pn: field lists active limit switch pins (only present when pins are active)
+            pin_x = 'X' in report.pins
+            pin_y = 'Y' in report.pins
+            status['pins'] = {'X': pin_x, 'Y': pin_y}
+
+            # Calculate specific limit switches from position
+            x_pos = status.get('x', 0.0)
+            y_pos = status.get('y', 0.0)
+            self._limit_switches['x_right'] = pin_x and (x_pos < self._max_x / 2)
+            self._limit_switches['x_left'] = pin_x and (x_pos >= self._max_x / 2)
+            self._limit_switches['y_bottom'] = pin_y and (y_pos < self._max_y / 2)
+            self._limit_switches['y_top'] = pin_y and (y_pos >= self._max_y / 2)
+            status['limit_switches'] = dict(self._limit_switches)
+
+            # Check if anything changed (only log changes)
+            if log_changes_only:
+                x_changed = (self._last_logged_x is None or
+                            abs(status.get('x', 0) - self._last_logged_x) > 0.01)  # 0.01cm threshold
+                y_changed = (self._last_logged_y is None or
+                            abs(status.get('y', 0) - self._last_logged_y) > 0.01)
+                state_changed = (self._last_logged_state != status.get('state'))
+
+                # Only log if something changed
+                if x_changed or y_changed or state_changed:
+                    if state_changed:
+                        self.logger.info(f"GRBL state changed: {self._last_logged_state} → {status.get('state')}", category="grbl")
+
+                    if x_changed or y_changed:
+                        self.logger.info(f"GRBL position: X={status.get('x', 0):.2f}cm, Y={status.get('y', 0):.2f}cm [State: {status.get('state')}]", category="grbl")
+
+                    # Update last logged values
+                    self._last_logged_x = status.get('x', 0)
+                    self._last_logged_y = status.get('y', 0)
+                    self._last_logged_state = status.get('state')
+
+            return status
 
         except Exception as e:
             self.logger.error(f"Error getting status: {e}", category="grbl")
@@ -661,7 +769,8 @@ class ArduinoGRBL:
         """Get a specific limit switch state calculated from GRBL Pn: field and position"""
         return self._limit_switches.get(switch_name, False)
 
-    def wait_for_movement_complete(self, target_x: float, target_y: float, timeout: float = None) -> bool:
+    def wait_for_movement_complete(self, target_x: float, target_y: float, timeout: float = None,
+                                   cancel_event: Optional[Event] = None) -> bool:
         """
         Wait for GRBL to complete movement to target position.
 
@@ -673,9 +782,10 @@ class ArduinoGRBL:
             target_x: Target X position in cm
             target_y: Target Y position in cm
             timeout: Maximum wait time in seconds (uses default if None)
+            cancel_event: Optional event that abandons the wait when set
 
         Returns:
-            True if movement completed successfully, False on timeout or error
+            True if movement completed successfully, False on timeout, error or cancel
         """
         if not self.is_connected:
             return False
@@ -693,6 +803,10 @@ class ArduinoGRBL:
         time.sleep(0.05)
 
         while (time.time() - start_time) < timeout:
+            if cancel_event is not None and cancel_event.is_set():
+                self.logger.info("Movement wait cancelled", category="grbl")
+                return False
+
             # Check for safety feed hold - if active, wait until cleared
             if self._safety_hold_event.is_set():
                 # Safety hold is active - GRBL should already be stopped via '!'
@@ -701,6 +815,8 @@ class ArduinoGRBL:
                 self.logger.debug("Movement paused by safety feed hold - waiting for resolution...", category="grbl")
 
                 while self._safety_hold_event.is_set():
+                    if cancel_event is not None and cancel_event.is_set():
+                        return False
                     time.sleep(self.movement_poll_interval)
 
                 # Resume sent by safety_resume() - extend timeout by hold duration
@@ -714,7 +830,7 @@ class ArduinoGRBL:
             status = self.get_status(log_changes_only=True)
 
             if not status:
-                time.sleep(self.movement_poll_interval)
+                self._wait_next_status(self.movement_poll_interval)
                 continue
 
             current_state = status.get('state', 'Unknown')
@@ -742,10 +858,10 @@ class ArduinoGRBL:
             if current_state == 'Hold' or current_state.startswith('Hold:'):
                 # If safety hold is active, this is expected - just wait
                 if self._safety_hold_event.is_set():
-                    time.sleep(self.movement_poll_interval)
+                    self._wait_next_status(self.movement_poll_interval)
                     continue
                 # If not safety hold, might be clearing - wait briefly
-                time.sleep(self.movement_poll_interval)
+                self._wait_next_status(self.movement_poll_interval)
                 continue
 
             # Check if GRBL is idle
@@ -762,7 +878,7 @@ class ArduinoGRBL:
                     # GRBL might not have started yet - wait a bit more
                     elapsed = time.time() - start_time
                     if elapsed < 0.5:  # Give up to 500ms for GRBL to start moving
-                        time.sleep(self.movement_poll_interval)
+                        self._wait_next_status(self.movement_poll_interval)
                         continue
 
                 # Either we saw it run and stop, or we've waited long enough
@@ -792,7 +908,7 @@ class ArduinoGRBL:
                 return False
 
             # Still running, wait before next poll
-            time.sleep(self.movement_poll_interval)
+            self._wait_next_status(self.movement_poll_interval)
 
         # Timeout reached
         elapsed = time.time() - start_time
@@ -809,6 +925,280 @@ class ArduinoGRBL:
 
         return False
 
+    def move_to_async(self, x: Optional[float], y: Optional[float], rapid: bool = False) -> MotionHandle:
+        """
+        Start a move to an absolute position without blocking.
+
+        The G1 command is queued in GRBL's planner and a background thread
+        waits for arrival. While the move runs, current_x/current_y follow
+        the live position from the status stream and each report is passed
+        to the handle's progress callbacks. Cancelling the handle stops the
+        motors (feed hold, then a soft reset to flush the planner).
+
+        Args:
+            x: Target X position in cm (None leaves X where it is)
+            y: Target Y position in cm (None leaves Y where it is)
+            rapid: G0 travel instead of G1 at the feed rate
+
+        Returns:
+            MotionHandle resolving to True once the target is reached
+        """
+        if not self.is_connected:
+            self.logger.debug("Not connected to GRBL", category="grbl")
+            handle = MotionHandle(x or 0.0, y or 0.0)
+            handle.finish(False)
+            return handle
+
+        command = format_motion_command(x, y, rapid, self.feed_rate)
+        x, y = self._fill_axes(x, y)
+        handle = MotionHandle(x, y)
+        self.logger.info(f"Moving (async): {x:.2f}cm, {y:.2f}cm", category="grbl")
+        response = self._send_command(command)
+        if not response or "ok" not in response.lower():
+            self.logger.warning(f"Move command failed: {response}", category="grbl")
+            handle.finish(False)
+            return handle
+
+        def on_status(report):
+            self.current_x = report.x
+            self.current_y = report.y
+            handle.report_progress(report.x, report.y, report.state)
+
+        def wait_for_arrival():
+            self.subscribe_status(on_status)
+            try:
+                reached = self.wait_for_movement_complete(x, y, cancel_event=handle.cancel_event)
+                if handle.cancel_requested and not reached:
+                    self._cancel_motion()
+            except Exception as e:
+                self.logger.error(f"Error waiting for async move: {e}", category="grbl")
+                reached = False
+            finally:
+                self.unsubscribe_status(on_status)
+
+            if reached:
+                self.current_x = x
+                self.current_y = y
+                self.logger.success(f"✓ Movement complete: X={x:.2f}cm, Y={y:.2f}cm", category="grbl")
+            else:
+                status = self.get_status(log_changes_only=False)
+                if status:
+                    self.current_x = status.get('x', self.current_x)
+                    self.current_y = status.get('y', self.current_y)
+            handle.finish(reached)
+
+        threading.Thread(target=wait_for_arrival, daemon=True, name="GrblMotion").start()
+        return handle
+
+    def _cancel_motion(self, settle_timeout: float = 2.0) -> bool:
+        """
+        Stop the current move: feed hold, wait for the machine to stop, flush the planner
+
+        The planner is flushed with a soft reset only once the hold has
+        completed (Hold:0 or Idle) - a reset while the axes still move
+        raises ALARM:3 and loses the position. The reset is our own, so
+        the homed state survives it.
+
+        Returns:
+            True if the machine stopped and the planner was flushed, False otherwise
+        """
+        self.logger.info("Cancelling GRBL motion", category="grbl")
+        self._write_realtime(b"!")
+        deadline = time.time() + settle_timeout
+        held = False
+        while time.time() < deadline:
+            status = self.get_status(log_changes_only=False)
+            # Hold:0 = hold complete; resetting then keeps the machine position
+            if status and status.get('state') in ('Hold:0', 'Idle'):
+                held = True
+                break
+            self._wait_next_status(self.movement_poll_interval)
+        if not held:
+            self.logger.error(f"Feed hold did not complete within {settle_timeout}s - "
+                              "planner not flushed (machine left in hold)", category="grbl")
+            return False
+        if not self.transport:
+            return False
+
+        if not self._soft_reset(settle_timeout):
+            self.logger.error("GRBL did not come back from the cancel reset", category="grbl")
+            return False
+        # Wait for a report from after the reset (the cached one may still say Hold)
+        state = None
+        reset_deadline = time.time() + settle_timeout
+        while time.time() < reset_deadline:
+            self._wait_next_status(self.movement_poll_interval)
+            status = self.get_status(log_changes_only=False)
+            state = status.get('state') if status else None
+            if state in ('Idle', 'Alarm'):
+                break
+        if state == 'Alarm':
+            # Only a reset during motion (or an earlier alarm) locks GRBL - position is not trusted
+            self.logger.error("GRBL is in ALARM after the cancel reset - position lost, home the machine",
+                              category="grbl")
+            return False
+        self.logger.info(f"GRBL motion cancelled (state: {state or 'unknown'})", category="grbl")
+        return True
+
+    def stream_moves(self, targets, on_target_reached=None, rapid: bool = False,
+                     cancel_event: Optional[threading.Event] = None) -> bool:
+        """
+        Stream a sequence of absolute moves into GRBL's planner.
+
+        Lines are written with the character-counting protocol, so GRBL
+        plans across the junctions instead of decelerating to a stop and
+        waiting for a round trip after every move. Each line carries an
+        N line number; the Ln field of the status report tells which
+        target is executing. Without Ln, a target counts as reached once
+        the position is within tolerance, and any remaining targets are
+        reported when GRBL goes Idle at the final position.
+
+        Args:
+            targets: list of (x, y) absolute positions in cm; None leaves
+                that axis where the previous target put it
+            on_target_reached: optional callback(index) called in order as
+                each target is reached
+            rapid: G0 travel instead of G1 at the feed rate
+            cancel_event: optional event; once set, the machine is stopped
+                (feed hold, planner flushed) and no further target is reported
+
+        Returns:
+            True if every target was reached, False otherwise
+        """
+        if not self.is_connected:
+            self.logger.debug("Not connected to GRBL", category="grbl")
+            return False
+        if not targets:
+            return True
+
+        line_numbers = []
+        acks = []
+        commands = [format_motion_command(x, y, rapid, self.feed_rate) for x, y in targets]
+        # Resolve uncommanded axes so every target can be checked against the position
+        resolved = []
+        x, y = self._fill_axes(*targets[0])
+        resolved.append((x, y))
+        for target_x, target_y in targets[1:]:
+            x = x if target_x is None else target_x
+            y = y if target_y is None else target_y
+            resolved.append((x, y))
+        targets = resolved
+
+        try:
+            if self.transport is None or not self.transport.is_running:
+                self._start_transport()
+            for motion in commands:
+                self._stream_line_number = self._stream_line_number % 99999 + 1
+                line_numbers.append(self._stream_line_number)
+                command = f"N{self._stream_line_number} {motion}"
+                self.logger.debug(f"GRBL >> {command} (streamed)", category="grbl")
+                acks.append(self.transport.send_streamed(command, timeout=self.command_timeout))
+        except Exception as e:
+            self.logger.error(f"Error streaming moves: {e}", category="grbl")
+            return False
+
+        self.logger.info(f"Streaming {len(targets)} moves to GRBL planner", category="grbl")
+
+        reached = 0
+
+        def mark_reached(count):
+            nonlocal reached
+            while reached < count:
+                x, y = targets[reached]
+                self.current_x = x
+                self.current_y = y
+                if on_target_reached:
+                    on_target_reached(reached)
+                reached += 1
+
+        final_x, final_y = targets[-1]
+        start_time = time.time()
+        saw_run_state = False
+        timeout = self.movement_timeout * len(targets)
+
+        time.sleep(0.05)
+
+        while (time.time() - start_time) < timeout:
+            if cancel_event is not None and cancel_event.is_set():
+                self.logger.info(f"Streamed moves cancelled after {reached}/{len(targets)} targets", category="grbl")
+                self._cancel_motion()
+                status = self.get_status(log_changes_only=False)
+                if status:
+                    self.current_x = status.get('x', self.current_x)
+                    self.current_y = status.get('y', self.current_y)
+                return False
+
+            if self._safety_hold_event.is_set():
+                hold_start = time.time()
+                self.logger.debug("Streamed moves paused by safety feed hold", category="grbl")
+                while self._safety_hold_event.is_set():
+                    if cancel_event is not None and cancel_event.is_set():
+                        break
+                    time.sleep(self.movement_poll_interval)
+                start_time += time.time() - hold_start
+                time.sleep(0.1)
+
+            status = self.get_status(log_changes_only=True)
+            if not status:
+                self._wait_next_status(self.movement_poll_interval)
+                continue
+
+            rejected = [ack for ack in acks if ack.done() and (ack.exception() or
+                        "error" in ack.result().lower())]
+            if rejected:
+                error = rejected[0].exception() or rejected[0].result()
+                self.logger.error(f"GRBL rejected streamed move: {error}", category="grbl")
+                return False
+
+            state = status.get('state', 'Unknown')
+            if state == 'Run':
+                saw_run_state = True
+            elif state == 'Alarm':
+                self.logger.error("GRBL entered ALARM state during streamed moves!", category="grbl")
+                return False
+
+            line = status.get('line')
+            if line is not None and line in line_numbers:
+                # The block executing now has passed all earlier targets
+                mark_reached(line_numbers.index(line))
+            elif reached < len(targets):
+                x, y = targets[reached]
+                if (abs(status.get('x', 0.0) - x) <= self.position_tolerance and
+                        abs(status.get('y', 0.0) - y) <= self.position_tolerance):
+                    mark_reached(reached + 1)
+
+            if state == 'Idle':
+                x_ok = abs(status.get('x', 0.0) - final_x) <= self.position_tolerance
+                y_ok = abs(status.get('y', 0.0) - final_y) <= self.position_tolerance
+                if self.transport.pending_count() > 0:
+                    # Not every line has reached the planner yet
+                    self._wait_next_status(self.movement_poll_interval)
+                    continue
+                if x_ok and y_ok:
+                    mark_reached(len(targets))
+                    self.logger.success(
+                        f"✓ Streamed moves complete: X={final_x:.2f}cm, Y={final_y:.2f}cm",
+                        category="grbl"
+                    )
+                    return True
+                if not saw_run_state and (time.time() - start_time) < 0.5:
+                    self._wait_next_status(self.movement_poll_interval)
+                    continue
+                self.logger.error(
+                    f"GRBL idle before streamed moves finished. "
+                    f"Current: ({status.get('x', 0.0):.2f}, {status.get('y', 0.0):.2f}), "
+                    f"Target: ({final_x:.2f}, {final_y:.2f})",
+                    category="grbl"
+                )
+                self.current_x = status.get('x', self.current_x)
+                self.current_y = status.get('y', self.current_y)
+                return False
+
+            self._wait_next_status(self.movement_poll_interval)
+
+        self.logger.error(f"Streamed moves timed out after {timeout:.1f}s", category="grbl")
+        return False
+
     def stop(self) -> bool:
         """
         Emergency stop (feed hold)
@@ -821,7 +1211,7 @@ class ArduinoGRBL:
 
         try:
             # Send feed hold character (!)
-            self.serial_connection.write(b"!")
+            self._write_realtime(b"!")
             self.logger.info("EMERGENCY STOP activated", category="grbl")
             return True
         except Exception as e:
@@ -840,7 +1230,7 @@ class ArduinoGRBL:
 
         try:
             # Send cycle start character (~)
-            self.serial_connection.write(b"~")
+            self._write_realtime(b"~")
             self.logger.info("Resuming operation", category="grbl")
             return True
         except Exception as e:
@@ -863,7 +1253,7 @@ class ArduinoGRBL:
         # Send feed hold immediately (don't wait for poll cycle)
         if self.is_connected and self.serial_connection:
             try:
-                self.serial_connection.write(b"!")
+                self._write_realtime(b"!")
                 with self._safety_hold_lock:
                     self._safety_hold_sent = True
                 self.logger.info("GRBL feed hold '!' sent for safety", category="grbl")
@@ -882,7 +1272,7 @@ class ArduinoGRBL:
 
         if was_held and self.is_connected and self.serial_connection:
             try:
-                self.serial_connection.write(b"~")
+                self._write_realtime(b"~")
                 self.logger.info("GRBL cycle resume '~' sent - continuing movement to target", category="grbl")
             except Exception as e:
                 self.logger.error(f"Failed to send safety resume: {e}", category="grbl")
@@ -901,9 +1291,8 @@ class ArduinoGRBL:
             return False
 
         try:
-            # Send reset character (Ctrl-X)
-            self.serial_connection.write(b"\x18")
-            time.sleep(self._grbl_reset_delay)  # Wait for reset
+            # Send reset character (Ctrl-X) - drops any queued commands
+            self._soft_reset(self._grbl_reset_delay)
             self.logger.success("GRBL reset", category="grbl")
             return True
         except Exception as e:
@@ -935,7 +1324,7 @@ class ArduinoGRBL:
 
             if response and "ok" in response.lower():
                 self.logger.success("✓ GRBL alarm cleared - machine unlocked", category="grbl")
-                time.sleep(0.5)
+                self._wait_next_status(0.5)
 
                 # Verify alarm is cleared
                 status = self.get_status()
@@ -957,7 +1346,9 @@ class ArduinoGRBL:
         """
         Apply GRBL configuration from settings.json
 
-        Reads grbl_configuration from settings and applies each setting to GRBL.
+        Reads grbl_configuration from settings and writes the settings whose
+        value differs from what GRBL already holds (read once with '$$' and
+        cached), so a warm start with unchanged settings writes nothing.
 
         Returns:
             True if all settings applied successfully, False otherwise
@@ -973,35 +1364,119 @@ class ArduinoGRBL:
             self.logger.warning("No GRBL configuration found in settings.json", category="grbl")
             return True  # Not an error if not configured
 
-        self.logger.info(f"Applying {len(grbl_configuration)} GRBL configuration settings...", category="grbl")
+        self.logger.info(f"Syncing {len(grbl_configuration)} GRBL configuration settings...", category="grbl")
+        result = self.write_settings(grbl_configuration)
 
-        success_count = 0
-        fail_count = 0
+        if result.ok:
+            self.logger.success(
+                f"GRBL settings in sync ({len(result.written)} written, {len(result.unchanged)} unchanged)",
+                category="grbl"
+            )
+            return True
+        else:
+            self.logger.warning(
+                f"Applied {len(result.written)} settings, {len(result.failed)} failed", category="grbl"
+            )
+            return False
 
-        # Apply each setting
-        for param, value in sorted(grbl_configuration.items()):
-            try:
-                command = f"{param}={value}"
-                self.logger.debug(f"Setting {command}", category="grbl")
-                response = self._send_command(command)
+    def _raise_tool_pistons(self, hardware_interface) -> list:
+        """Command every tool piston UP; returns the pistons whose sensors did not confirm it"""
+        failed = []
+        for piston in ("line_marker", "line_cutter", "row_marker", "row_cutter"):
+            self.logger.info(f"Retracting {piston.replace('_', ' ')} piston...", category="grbl")
+            if not getattr(hardware_interface, f"{piston}_piston_up")():
+                failed.append(piston)
+        return failed
 
-                if response and "ok" in response.lower():
-                    success_count += 1
-                    self.logger.debug(f"✓ {param}={value} applied", category="grbl")
-                else:
-                    fail_count += 1
-                    self.logger.warning(f"✗ Failed to apply {param}={value}", category="grbl")
+    def _skip_homing_sequence(self, hardware_interface=None, progress_callback=None) -> tuple[bool, str]:
+        """
+        Warm start: GRBL is idle and still homed, so keep its position.
 
-            except Exception as e:
-                fail_count += 1
-                self.logger.error(f"Error applying {param}: {e}", category="grbl")
+        Brings the '$' settings up to date and leaves the pistons as the full
+        sequence does (tool pistons UP, line motor piston DOWN); the door
+        check and the motion steps of the sequence are reported as skipped.
+        """
+        self.logger.info("GRBL already homed and idle - skipping homing sequence", category="grbl")
+        if progress_callback:
+            progress_callback(1, "Apply GRBL configuration", "running")
+        if not self.apply_grbl_configuration():
+            error_msg = "Failed to apply GRBL configuration from settings.json"
+            self.logger.error(error_msg, category="grbl")
+            if progress_callback:
+                progress_callback(1, "Apply GRBL configuration", "error")
+            return False, error_msg
+        if progress_callback:
+            progress_callback(1, "Apply GRBL configuration", "done")
+            progress_callback(2, "Check door is open", "skipped", "Already homed - skipped")
+
+        # Step 3: tool pistons UP, as in the full sequence
+        if progress_callback:
+            progress_callback(3, "Reset all pistons to default position", "running")
+        if hardware_interface:
+            failed = self._raise_tool_pistons(hardware_interface)
+            if failed:
+                error_msg = f"Tool pistons did not reach UP: {', '.join(failed)}"
+                self.logger.error(error_msg, category="grbl")
+                if progress_callback:
+                    progress_callback(3, "Reset all pistons to default position", "error")
+                return False, error_msg
+        if progress_callback:
+            progress_callback(3, "Reset all pistons to default position", "done")
+            for step, name in ((4, "Lift line motor pistons"),
+                               (5, "Move Y axis (pre-home clearance)"),
+                               (6, "Run GRBL homing ($H)"),
+                               (7, "Reset work coordinates to (0,0)")):
+                progress_callback(step, name, "skipped", "Already homed - skipped")
+
+        # Step 8: a stop or sensor timeout may have left the line motor piston raised
+        if progress_callback:
+            progress_callback(8, "Lower line motor pistons", "running")
+        if hardware_interface:
+            if not hardware_interface.line_motor_piston_down():
+                error_msg = "Failed to lower line motor pistons"
+                self.logger.error(error_msg, category="grbl")
+                if progress_callback:
+                    progress_callback(8, "Lower line motor pistons", "error")
+                return False, error_msg
+            self.logger.success("✓ Line motor pistons DOWN", category="grbl")
+            if progress_callback:
+                progress_callback(8, "Lower line motor pistons", "done")
+        elif progress_callback:
+            progress_callback(8, "Lower line motor pistons", "skipped", "No hardware interface")
 
-        if fail_count == 0:
-            self.logger.success(f"All {success_count} GRBL settings applied successfully", category="grbl")
-            return True
-        else:
-            self.logger.warning(f"Applied {success_count} settings, {fail_count} failed", category="grbl")
-            return False
+        if progress_callback:
+            progress_callback(9, "Verify all tool pistons UP", "done")
+
+        status = self.get_status()
+        if status:
+            self.current_x = status.get('x', 0.0)
+            self.current_y = status.get('y', 0.0)
+        self.logger.success("Homing skipped - machine position retained", category="grbl")
+        return True, ""
+
+    def read_device_settings(self, refresh: bool = False) -> Optional[Dict]:
+        """
+        '$' settings stored in GRBL as a typed map, e.g. {'$0': 10, '$110': 2000.0}
+
+        Read with a single '$$' and cached until GRBL resets, so repeated
+        reads cost no serial traffic.
+
+        Args:
+            refresh: Re-read from GRBL even if cached
+
+        Returns:
+            Settings dictionary, or None if GRBL did not answer
+        """
+        return self.settings_sync.read(refresh=refresh)
+
+    def write_settings(self, values: Dict):
+        """
+        Write the '$' settings in values that differ from GRBL's current ones
+
+        Returns:
+            SettingsSyncResult with the written, unchanged and failed keys
+        """
+        return self.settings_sync.apply(values)
 
     def perform_complete_homing_sequence(self, hardware_interface=None, progress_callback=None, safety_check=None) -> tuple[bool, str]:
         """
@@ -1033,6 +1508,9 @@ class ArduinoGRBL:
             self.logger.error(error_msg, category="grbl")
             return False, error_msg
 
+        if self.skip_homing_when_homed and self.is_homed():
+            return self._skip_homing_sequence(hardware_interface, progress_callback)
+
         try:
             self.logger.info("="*60, category="grbl")
             self.logger.info("STARTING COMPLETE HOMING SEQUENCE", category="grbl")
@@ -1046,10 +1524,7 @@ class ArduinoGRBL:
             # First, send a soft reset to ensure GRBL is in a clean state
             self.logger.info("Sending soft reset to GRBL...", category="grbl")
             try:
-                self.serial_connection.write(b'\x18')  # Ctrl+X soft reset
-                self.serial_connection.flush()
-                time.sleep(self._grbl_reset_delay)  # Wait for GRBL to reset and initialize
-                self.serial_connection.flushInput()  # Clear any startup messages
+                self._soft_reset(self._grbl_reset_delay)  # Ctrl+X, wait for the welcome banner
                 self.logger.info("Soft reset sent, GRBL should be ready", category="grbl")
             except Exception as e:
                 self.logger.warning(f"Soft reset warning (non-fatal): {e}", category="grbl")
@@ -1063,7 +1538,6 @@ class ArduinoGRBL:
                     self.logger.warning("GRBL is in Alarm state, attempting to clear with $X...", category="grbl")
                     unlock_response = self._send_command("$X")
                     self.logger.info(f"Unlock response: {unlock_response}", category="grbl")
-                    time.sleep(0.5)
 
             # Now apply the GRBL configuration
             if not self.apply_grbl_configuration():
@@ -1073,8 +1547,7 @@ class ArduinoGRBL:
                     progress_callback(1, "Apply GRBL configuration", "error")
                 return False, error_msg
 
-            # Small delay to ensure all settings are written to EEPROM
-            time.sleep(0.5)
+            # GRBL acknowledges a '$' write only after the EEPROM write, so no settle delay is needed
             self.logger.info("GRBL configuration applied successfully", category="grbl")
 
             if progress_callback:
@@ -1123,18 +1596,15 @@ class ArduinoGRBL:
                 progress_callback(3, "Reset all pistons to default position", "running")
             self.logger.info("Step 3: Resetting all pistons to default (UP) position...", category="grbl")
             if hardware_interface:
-                # Retract all tool pistons to UP position to clear any leftover state
-                self.logger.info("Retracting line marker piston...", category="grbl")
-                hardware_interface.line_marker_piston_up()
-                self.logger.info("Retracting line cutter piston...", category="grbl")
-                hardware_interface.line_cutter_piston_up()
-                self.logger.info("Retracting row marker piston...", category="grbl")
-                hardware_interface.row_marker_piston_up()
-                self.logger.info("Retracting row cutter piston...", category="grbl")
-                hardware_interface.row_cutter_piston_up()
-
-                # Wait for all pistons to fully retract
-                time.sleep(2.0)
+                # Retract all tool pistons to UP position to clear any leftover state;
+                # each call returns once the piston's sensor confirms the position
+                failed = self._raise_tool_pistons(hardware_interface)
+                if failed:
+                    error_msg = f"Tool pistons did not reach UP: {', '.join(failed)}"
+                    self.logger.error(error_msg, category="grbl")
+                    if progress_callback:
+                        progress_callback(3, "Reset all pistons to default position", "error")
+                    return False, error_msg
                 self.logger.success("All pistons reset to default (UP) position", category="grbl")
             else:
                 self.logger.warning("No hardware interface - skipping piston reset", category="grbl")
@@ -1157,13 +1627,7 @@ class ArduinoGRBL:
                         progress_callback(4, "Lift line motor pistons", "error")
                     return False, error_msg
 
-                self.logger.success("✓ Line motor pistons commanded UP", category="grbl")
-                self.logger.info("Waiting 2 seconds for pistons to fully lift...", category="grbl")
-
-                # Wait for pistons to fully lift
-                time.sleep(2.0)
-
-                self.logger.success("✓ Line motor pistons should now be UP", category="grbl")
+                self.logger.success("✓ Line motor pistons UP", category="grbl")
             else:
                 self.logger.warning("No hardware interface - skipping piston lift", category="grbl")
             if progress_callback:
@@ -1205,7 +1669,7 @@ class ArduinoGRBL:
                     status = self.get_status(log_changes_only=False)
                     if status and status.get('state') == 'Idle':
                         break
-                    time.sleep(0.2)
+                    self._wait_next_status(0.2)
                 self.logger.success(f"Y axis moved {y_pre_home_mm}mm for pre-home clearance", category="grbl")
             else:
                 self.logger.warning(f"Pre-home Y move may have failed: {move_response}", category="grbl")
@@ -1217,7 +1681,7 @@ class ArduinoGRBL:
             # $H cannot be paused with feed-hold, so on safety violation we
             # soft-reset GRBL to stop motors immediately, then re-run $H
             # when the violation clears.
-            # IMPORTANT: $H is sent non-blocking (raw serial write) because
+            # IMPORTANT: $H is sent non-blocking (acknowledgement future) because
             # _send_command blocks until "ok" which only arrives when homing
             # finishes — that would prevent safety checks from running.
             if progress_callback:
@@ -1231,12 +1695,12 @@ class ArduinoGRBL:
             max_wait_time = homing_timeout + 5.0  # Extra buffer time
 
             while not homing_complete:
-                # Send $H non-blocking (write directly, don't wait for response)
+                # Send $H non-blocking - the reader thread resolves the future on ok/error
                 try:
-                    with self.command_lock:
-                        self.logger.debug("GRBL >> $H (non-blocking)", category="grbl")
-                        self.serial_connection.write(b"$H\n")
-                        self.serial_connection.flush()
+                    self.logger.debug("GRBL >> $H (non-blocking)", category="grbl")
+                    homing_future = self.transport.send_command_async("$H")
+                    if homing_future.done() and homing_future.exception():
+                        raise homing_future.exception()
                 except Exception as e:
                     error_msg = f"Failed to send $H command: {e}"
                     self.logger.error(error_msg, category="grbl")
@@ -1251,7 +1715,6 @@ class ArduinoGRBL:
                 # Poll for homing completion with inline safety checking
                 safety_aborted = False
                 last_state = None
-                read_buffer = ""
 
                 while (time.time() - homing_overall_start) < max_wait_time:
                     # Safety check during $H homing
@@ -1261,14 +1724,9 @@ class ArduinoGRBL:
                             # $H ignores feed-hold — soft-reset to stop motors NOW
                             self.logger.error("HOMING STEP 6: Safety violation - aborting $H with soft reset", category="grbl")
                             try:
-                                self.serial_connection.write(b'\x18')  # Ctrl+X soft reset
-                                self.serial_connection.flush()
-                                time.sleep(self._grbl_reset_delay)
-                                self.serial_connection.flushInput()
-                                read_buffer = ""  # Clear local buffer too
+                                self._soft_reset(self._grbl_reset_delay)  # Ctrl+X (fails the $H future)
                                 # Clear the alarm caused by the reset
                                 self._send_command("$X")
-                                time.sleep(0.3)
                             except Exception as e:
                                 self.logger.warning(f"Soft reset during safety abort: {e}", category="grbl")
 
@@ -1288,33 +1746,25 @@ class ArduinoGRBL:
 
                             break  # Break inner poll loop to re-send $H
 
-                    # Check serial for "ok" or "error" (non-blocking read)
-                    try:
-                        if self.serial_connection.in_waiting > 0:
-                            raw_data = self.serial_connection.read(self.serial_connection.in_waiting)
-                            read_buffer += raw_data.decode(errors='replace')
-
-                            while '\n' in read_buffer:
-                                line, read_buffer = read_buffer.split('\n', 1)
-                                line = line.strip()
-                                if not line:
-                                    continue
-                                self.logger.debug(f"GRBL << {line}", category="grbl")
-
-                                if "ok" in line.lower():
-                                    self.logger.success("GRBL homing $H returned ok", category="grbl")
-                                    homing_complete = True
-                                    break
-                                elif "error" in line.lower():
-                                    error_msg = f"GRBL homing returned error: {line}"
-                                    self.logger.error(error_msg, category="grbl")
-                                    if progress_callback:
-                                        progress_callback(6, "Run GRBL homing ($H)", "error")
-                                    if hardware_interface:
-                                        hardware_interface.line_motor_piston_down()
-                                    return False, error_msg
-                    except Exception as e:
-                        self.logger.warning(f"Serial read during homing: {e}", category="grbl")
+                    # Check whether the reader thread received "ok" or "error" for $H
+                    if homing_future.done():
+                        try:
+                            response = homing_future.result()
+                        except Exception as e:
+                            response = f"error: {e}"
+                            self.logger.warning(f"$H aborted: {e}", category="grbl")
+
+                        if "ok" in response.lower():
+                            self.logger.success("GRBL homing $H returned ok", category="grbl")
+                            homing_complete = True
+                        else:
+                            error_msg = f"GRBL homing returned error: {response}"
+                            self.logger.error(error_msg, category="grbl")
+                            if progress_callback:
+                                progress_callback(6, "Run GRBL homing ($H)", "error")
+                            if hardware_interface:
+                                hardware_interface.line_motor_piston_down()
+                            return False, error_msg
 
                     if homing_complete:
                         break
@@ -1337,7 +1787,7 @@ class ArduinoGRBL:
                         elif current_state in ['Home', 'Run']:
                             self.logger.debug(f"Homing still in progress (state: {current_state})...", category="grbl")
 
-                    time.sleep(0.3)  # Poll every 300ms
+                    self._wait_next_status(0.3)  # Next pushed report (poll every 300ms without one)
 
                 if safety_aborted:
                     # Safety resolved — loop back to re-send $H
@@ -1378,10 +1828,11 @@ class ArduinoGRBL:
             if response and "ok" in response.lower():
                 self.current_x = 0.0
                 self.current_y = 0.0
+                self._homed = True
                 self.logger.success("✓ Work coordinates reset to (0, 0) - machine is now at origin", category="grbl")
 
                 # Verify the new position
-                time.sleep(0.2)  # Brief delay for GRBL to update
+                self._wait_next_status(0.2)  # Report sent after the new WCO
                 verify_status = self.get_status()
                 if verify_status:
                     self.logger.info(f"Verified position: X={verify_status.get('x', 0):.2f}cm, Y={verify_status.get('y', 0):.2f}cm", category="grbl")
@@ -1400,12 +1851,12 @@ class ArduinoGRBL:
                 self.logger.info(f"Piston down result: {result}", category="grbl")
 
                 if not result:
-                    self.logger.warning("Failed to lower line motor pistons", category="grbl")
-                else:
-                    self.logger.success("✓ Line motor pistons commanded DOWN", category="grbl")
-                    self.logger.info("Waiting 2 seconds for pistons to fully lower...", category="grbl")
-                    time.sleep(2.0)
-                    self.logger.success("✓ Line motor pistons should now be DOWN", category="grbl")
+                    error_msg = "Failed to lower line motor pistons"
+                    self.logger.error(error_msg, category="grbl")
+                    if progress_callback:
+                        progress_callback(8, "Lower line motor pistons", "error")
+                    return False, error_msg
+                self.logger.success("✓ Line motor pistons DOWN", category="grbl")
             else:
                 self.logger.warning("No hardware interface - skipping piston lower", category="grbl")
             if progress_callback:
@@ -1417,11 +1868,13 @@ class ArduinoGRBL:
             self.logger.info("Step 9: Final verification - ensuring all tool pistons are UP...", category="grbl")
             if hardware_interface:
                 # Re-command all tool pistons UP as a safety guarantee
-                hardware_interface.line_marker_piston_up()
-                hardware_interface.line_cutter_piston_up()
-                hardware_interface.row_marker_piston_up()
-                hardware_interface.row_cutter_piston_up()
-                time.sleep(1.0)
+                failed = self._raise_tool_pistons(hardware_interface)
+                if failed:
+                    error_msg = f"Tool pistons did not reach UP after homing: {', '.join(failed)}"
+                    self.logger.error(error_msg, category="grbl")
+                    if progress_callback:
+                        progress_callback(9, "Verify all tool pistons UP", "error")
+                    return False, error_msg
                 self.logger.success("All tool pistons verified UP after homing", category="grbl")
             if progress_callback:
                 progress_callback(9, "Verify all tool pistons UP", "done")
@@ -1450,6 +1903,9 @@ class ArduinoGRBL:
         """
         Disconnect from GRBL
         """
+        self._stop_transport()
+        self.settings_sync.invalidate()
+        self._homed = False
         if self.serial_connection:
             try:
                 self.serial_connection.close()
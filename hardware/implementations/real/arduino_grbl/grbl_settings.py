@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+
+"""
+GRBL Settings Sync
+==================
+
+Keeps GRBL's '$' settings in step with settings.json with as little
+serial traffic as possible:
+
+- the device is read with a single '$$' and parsed into a typed map
+  (integers for flags/masks/times, floats for rates and distances)
+- the map is cached, so later reads are free until GRBL reports a reset
+  (welcome banner) or the settings are restored with '$RST'
+- applying desired values writes only the keys that differ, each with
+  its own acknowledgement, and updates the cache from the acks instead
+  of re-reading
+
+Writes are sent one at a time: GRBL stores each '$' value in EEPROM with
+interrupts disabled, so serial bytes arriving during a write are lost
+and '$' lines must not be streamed.
+
+Usage:
+    sync = GrblSettingsSync(grbl._send_command)
+    sync.attach(transport)
+    current = sync.read()
+    result = sync.apply({"$110": 2000, "$111": 2000})
+    print(result.written, result.failed)
+"""
+
+import re
+import threading
+from typing import Callable, Dict, List, Optional, Union
+
+from core.logger import get_logger
+from hardware.implementations.real.arduino_grbl.grbl_transport import LINE_WELCOME
+
+SettingValue = Union[int, float]
+
+# GRBL 1.1 settings holding integers (microseconds, milliseconds, booleans, masks);
+# everything else is a float reported with 3 decimals
+INTEGER_SETTINGS = frozenset({0, 1, 2, 3, 4, 5, 6, 10, 13, 20, 21, 22, 23, 26, 30, 31, 32})
+FLOAT_TOLERANCE = 0.0005
+
+_SETTING_LINE_RE = re.compile(r'^\$(\d+)=([-+]?\d*\.?\d+)')
+
+
+def setting_number(param: str) -> int:
+    """'$110' -> 110"""
+    return int(str(param).lstrip('$'))
+
+
+def coerce_setting(param: str, value) -> SettingValue:
+    """Typed value for a setting (raises ValueError for non-numeric values)"""
+    if setting_number(param) in INTEGER_SETTINGS:
+        return int(round(float(value)))
+    return float(value)
+
+
+def settings_equal(param: str, a, b) -> bool:
+    try:
+        a, b = coerce_setting(param, a), coerce_setting(param, b)
+    except (TypeError, ValueError):
+        return False
+    if isinstance(a, int):
+        return a == b
+    return abs(a - b) < FLOAT_TOLERANCE
+
+
+def parse_settings(response: str) -> Dict[str, SettingValue]:
+    """Typed map of a '$$' dump, e.g. {'$0': 10, '$110': 2000.0}"""
+    settings = {}
+    for line in response.splitlines():
+        match = _SETTING_LINE_RE.match(line.strip())
+        if match:
+            param = f"${match.group(1)}"
+            settings[param] = coerce_setting(param, match.group(2))
+    return settings
+
+
+def format_setting(param: str, value: SettingValue) -> str:
+    """'$N=value' line as GRBL prints it"""
+    value = coerce_setting(param, value)
+    return f"{param}={value}" if isinstance(value, int) else f"{param}={value:.3f}"
+
+
+class SettingsSyncResult:
+    """Outcome of one apply(): which keys were written, skipped or rejected"""
+
+    __slots__ = ('written', 'unchanged', 'failed')
+
+    def __init__(self):
+        self.written: List[str] = []
+        self.unchanged: List[str] = []
+        self.failed: Dict[str, str] = {}     # param -> GRBL response or error
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+
+class GrblSettingsSync:
+    """Cached, diff-based access to GRBL's '$' settings"""
+
+    def __init__(self, send_command: Callable[[str], Optional[str]]):
+        """
+        Args:
+            send_command: sends one line and returns GRBL's response (None on failure)
+        """
+        self.logger = get_logger()
+        self.send_command = send_command
+        self._lock = threading.Lock()
+        self._snapshot: Optional[Dict[str, SettingValue]] = None
+
+    def attach(self, transport):
+        """Watch a (new) transport; the cache is dropped on every GRBL reset it sees"""
+        transport.add_listener(self._on_line)
+
+    def invalidate(self):
+        with self._lock:
+            self._snapshot = None
+
+    def snapshot(self) -> Optional[Dict[str, SettingValue]]:
+        """Cached settings without touching the device (None if not read yet)"""
+        with self._lock:
+            return dict(self._snapshot) if self._snapshot is not None else None
+
+    def read(self, refresh: bool = False) -> Optional[Dict[str, SettingValue]]:
+        """Device settings, read with one '$$' unless cached; None if GRBL did not answer"""
+        if not refresh:
+            cached = self.snapshot()
+            if cached is not None:
+                return cached
+        response = self.send_command("$$")
+        if not response or not response.rstrip().endswith("ok"):
+            self.logger.warning(f"Could not read GRBL settings: {response}", category="grbl")
+            return None
+        settings = parse_settings(response)
+        with self._lock:
+            self._snapshot = settings
+        return dict(settings)
+
+    def diff(self, desired: Dict[str, object]) -> Dict[str, SettingValue]:
+        """Desired settings whose value differs from the device (all of them if unreadable)"""
+        current = self.read() or {}
+        changed = {}
+        for param, value in desired.items():
+            if not settings_equal(param, current.get(param), value):
+                try:
+                    changed[param] = coerce_setting(param, value)
+                except (TypeError, ValueError):
+                    changed[param] = value
+        return changed
+
+    def apply(self, desired: Dict[str, object]) -> SettingsSyncResult:
+        """Write the settings that differ; each write is acknowledged before the next"""
+        result = SettingsSyncResult()
+        changed = self.diff(desired)
+        result.unchanged = sorted(set(desired) - set(changed), key=setting_number)
+        for param in sorted(changed, key=setting_number):
+            value = changed[param]
+            command = format_setting(param, value) if isinstance(value, (int, float)) else f"{param}={value}"
+            self.logger.debug(f"Setting {command}", category="grbl")
+            response = self.send_command(command)
+            if response and response.rstrip().endswith("ok"):
+                result.written.append(param)
+                with self._lock:
+                    if self._snapshot is not None:
+                        self._snapshot[param] = value
+            else:
+                result.failed[param] = response or "no response"
+                self.logger.warning(f"✗ Failed to apply {command}: {response}", category="grbl")
+        return result
+
+    def restore_defaults(self, scope: str = "$") -> bool:
+        """'$RST=$' (settings), '$RST=#' (offsets) or '$RST=*' (all)"""
+        response = self.send_command(f"$RST={scope}")
+        self.invalidate()
+        return bool(response) and response.rstrip().endswith("ok")
+
+    def _on_line(self, kind: str, line: str):
+        if kind == LINE_WELCOME:
+            self.invalidate()
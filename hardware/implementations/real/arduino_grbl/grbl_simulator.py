@@ -0,0 +1,641 @@
+#!/usr/bin/env python3
+
+"""
+GRBL Simulator
+==============
+
+In-process emulation of an Arduino running GRBL 1.1, for running
+ArduinoGRBL (and RealHardware on top of it) end to end without a board.
+
+SimulatedSerial is a drop-in for serial.Serial; ArduinoGRBL opens one
+when the configured serial port is "sim://grbl". Behind it GrblSimulator
+implements:
+
+    ok / error:N      line acknowledgement (error:9 in alarm lock,
+                      error:20 unsupported command, error:22 no feed rate,
+                      error:8 '$' command while moving)
+    ?                 <State|MPos or WPos|FS|Pn|WCO|Ln> status reports
+    ! ~ Ctrl-X        feed hold (decelerates to Hold:0), cycle resume,
+                      soft reset (ALARM:3 if reset while moving)
+    $H $X $$ $N=v     homing, unlock, settings dump / write
+    G0 G1 G4 G10 L20 G90 G91 G92 G20 G21 and harmless modal words
+    planner           15-block buffer; 'ok' for a motion line is sent when
+                      the block enters the planner, like the firmware
+    RX buffer         128 bytes; overflow is counted in rx_overflows, so
+                      streaming code can be checked for character counting
+
+Motion follows a trapezoidal velocity profile per block using the
+$110/$111 max rates and $120/$121 accelerations (blocks start and end at
+rest; GRBL's junction blending is not modelled). time_scale > 1 runs the
+simulated clock faster than real time for quick tests and benchmarks.
+
+Usage:
+    from hardware.implementations.real.arduino_grbl.grbl_simulator import SimulatedSerial
+    port = SimulatedSerial(timeout=0.1, time_scale=10.0)
+    port.write(b"$X\\n")
+    print(port.readline())
+
+    # Serve the simulator on a pseudo-terminal for other programs:
+    python3 -m hardware.implementations.real.arduino_grbl.grbl_simulator --time-scale 1
+"""
+
+import math
+import queue
+import re
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+
+SIMULATOR_PORT = "sim://grbl"
+
+WELCOME_BANNER = "Grbl 1.1h ['$' for help]"
+PLANNER_BLOCKS = 15
+RX_BUFFER_SIZE = 128
+
+# Firmware defaults for the settings the simulator uses
+DEFAULT_SETTINGS = {
+    10: 1.0,                             # status report: MPos
+    22: 0.0, 23: 0.0, 24: 25.0, 25: 500.0,
+    100: 250.0, 101: 250.0, 102: 250.0,
+    110: 500.0, 111: 500.0, 112: 500.0,  # max rate, mm/min
+    120: 10.0, 121: 10.0, 122: 10.0,     # acceleration, mm/s^2
+    130: 200.0, 131: 200.0, 132: 200.0,
+}
+
+_WORD_RE = re.compile(r'([A-Z])([-+]?(?:\d+\.?\d*|\.\d+))')
+_COMMENT_RE = re.compile(r'\([^)]*\)|;.*$')
+_SETTING_RE = re.compile(r'^\$(\d+)=([-+]?(?:\d+\.?\d*|\.\d+))$')
+
+# Modal words accepted without effect
+_IGNORED_G = {17.0, 54.0, 94.0, 21.0}
+_IGNORED_M = {0.0, 2.0, 3.0, 4.0, 5.0, 8.0, 9.0, 30.0}
+
+
+class _Block:
+    """One planned straight move with a rest-to-rest trapezoidal profile"""
+
+    __slots__ = ('start', 'end', 'length', 'v_max', 'accel', 'v_peak', 't_acc', 't_total', 'line')
+
+    def __init__(self, start, end, v_max, accel, line=None):
+        self.start = start
+        self.end = end
+        self.line = line
+        self.length = math.hypot(end[0] - start[0], end[1] - start[1])
+        self.v_max = v_max
+        self.accel = accel
+        self.v_peak = min(v_max, math.sqrt(accel * self.length)) if self.length > 0 else 0.0
+        self.t_acc = self.v_peak / accel if accel > 0 else 0.0
+        d_acc = self.v_peak * self.t_acc / 2
+        t_cruise = (self.length - 2 * d_acc) / self.v_peak if self.v_peak > 0 else 0.0
+        self.t_total = 2 * self.t_acc + max(0.0, t_cruise)
+
+    def sample(self, t):
+        """(distance travelled, speed) at t seconds into the block"""
+        if t <= 0 or self.length == 0:
+            return 0.0, 0.0
+        if t >= self.t_total:
+            return self.length, 0.0
+        if t < self.t_acc:
+            return self.accel * t * t / 2, self.accel * t
+        t_dec = self.t_total - self.t_acc
+        d_acc = self.v_peak * self.t_acc / 2
+        if t < t_dec:
+            return d_acc + self.v_peak * (t - self.t_acc), self.v_peak
+        remaining = self.t_total - t
+        return self.length - self.accel * remaining * remaining / 2, self.accel * remaining
+
+    def point(self, distance):
+        if self.length == 0:
+            return self.end
+        f = distance / self.length
+        return (self.start[0] + (self.end[0] - self.start[0]) * f,
+                self.start[1] + (self.end[1] - self.start[1]) * f)
+
+
+class GrblSimulator:
+    """GRBL 1.1 state machine and kinematic model driven by a tick thread"""
+
+    def __init__(self, settings: Optional[Dict] = None, time_scale: float = 1.0,
+                 line_numbers: bool = True, tick_interval: float = 0.002):
+        """
+        Args:
+            settings: '$N' -> value overrides (e.g. settings.json grbl_configuration)
+            time_scale: simulated seconds per real second
+            line_numbers: include Ln: in status reports (firmware compile option)
+            tick_interval: real seconds between model updates
+        """
+        self.settings = dict(DEFAULT_SETTINGS)
+        for key, value in (settings or {}).items():
+            self.settings[int(str(key).lstrip('$'))] = float(value)
+        self.time_scale = time_scale
+        self.line_numbers = line_numbers
+        self.tick_interval = tick_interval
+
+        self.output: "queue.Queue[bytes]" = queue.Queue()
+        self.pins = ''                  # Pn: letters, set by tests (e.g. 'X')
+        self.rx_overflows = 0
+        self.commands = []              # every line received, for assertions
+
+        self._lock = threading.RLock()
+        self._rx_partial = b""
+        self._rx_lines = deque()
+        self._rx_bytes = 0
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self._boot()
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def _boot(self):
+        self.mpos = (0.0, 0.0)
+        self.wco = (0.0, 0.0)
+        self.state = 'Alarm' if self.settings.get(22, 0) else 'Idle'
+        self._reset_motion()
+        self._absolute = True
+        self._inches = False
+        self._feed = None
+        self._wco_countdown = 0
+        self._emit(WELCOME_BANNER)
+        if self.state == 'Alarm':
+            self._emit("[MSG:'$H'|'$X' to unlock]")
+
+    def _reset_motion(self):
+        self._planner = deque()
+        self._block: Optional[_Block] = None
+        self._block_t0 = 0.0
+        self._hold = None               # None, or (t0, position, speed, direction) while decelerating
+        self._held_target = None        # remaining target of an interrupted block
+        self._resume_pending = False
+        self._busy_until = None         # sync commands ($H, G4) finishing at this sim time
+        self._busy_done = None
+        self._speed = 0.0
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._t_real0 = time.monotonic()
+        self._thread = threading.Thread(target=self._tick_loop, daemon=True, name="GrblSimulator")
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+        self._thread = None
+
+    def now(self) -> float:
+        """Simulated seconds since start"""
+        return (time.monotonic() - self._t_real0) * self.time_scale
+
+    # ------------------------------------------------------------------
+    # Serial side
+    # ------------------------------------------------------------------
+
+    def receive(self, data: bytes):
+        """Bytes written by the host"""
+        with self._lock:
+            for byte in data:
+                char = bytes([byte])
+                if char == b"?":
+                    self._emit(self._status_report())
+                elif char == b"!":
+                    self._feed_hold()
+                elif char == b"~":
+                    self._cycle_start()
+                elif char == b"\x18":
+                    self._soft_reset()
+                elif char != b"\r":
+                    # Line bytes (including '\n') occupy the serial RX buffer until executed
+                    self._rx_bytes += 1
+                    if self._rx_bytes > RX_BUFFER_SIZE:
+                        self.rx_overflows += 1
+                    if char == b"\n":
+                        line = self._rx_partial.decode(errors='replace').strip()
+                        if line:
+                            self._rx_lines.append((line, len(self._rx_partial) + 1))
+                        else:
+                            self._rx_bytes -= len(self._rx_partial) + 1
+                        self._rx_partial = b""
+                    else:
+                        self._rx_partial += char
+
+    def _emit(self, line: str):
+        self.output.put(line.encode() + b"\r\n")
+
+    # ------------------------------------------------------------------
+    # Model
+    # ------------------------------------------------------------------
+
+    def _tick_loop(self):
+        while self._running:
+            with self._lock:
+                self._advance(self.now())
+                self._process_lines()
+            time.sleep(self.tick_interval)
+
+    def _advance(self, now: float):
+        if self._hold is not None:
+            t0, position, speed, direction, accel = self._hold
+            t = now - t0
+            stop_time = speed / accel if accel > 0 else 0.0
+            if t >= stop_time:
+                t = stop_time
+                self.state = 'Hold:0'
+                self._speed = 0.0
+            else:
+                self._speed = speed - accel * t
+            distance = speed * t - accel * t * t / 2
+            self.mpos = (position[0] + direction[0] * distance, position[1] + direction[1] * distance)
+            if self.state == 'Hold:0' and self._resume_pending:
+                self._resume_pending = False
+                self._resume(now)
+            return
+
+        if self._busy_until is not None:
+            if now >= self._busy_until:
+                done, self._busy_done, self._busy_until = self._busy_done, None, None
+                done()
+            return
+
+        while True:
+            if self._block is None:
+                if not self._planner:
+                    self._speed = 0.0
+                    if self.state == 'Run':
+                        self.state = 'Idle'
+                    return
+                # Start time was set when the block was queued onto an empty
+                # planner, or carried over from the end of the previous block
+                self._block = self._planner.popleft()
+                self.state = 'Run'
+            t = now - self._block_t0
+            if t >= self._block.t_total:
+                self.mpos = self._block.end
+                self._block_t0 += self._block.t_total
+                self._block = None
+                continue
+            distance, self._speed = self._block.sample(t)
+            self.mpos = self._block.point(distance)
+            return
+
+    def _feed_hold(self):
+        if self.state != 'Run' or self._block is None:
+            return
+        now = self.now()
+        self._advance(now)
+        if self._block is None:
+            return
+        block = self._block
+        length = block.length or 1.0
+        direction = ((block.end[0] - block.start[0]) / length, (block.end[1] - block.start[1]) / length)
+        self._hold = (now, self.mpos, self._speed, direction, block.accel)
+        self._held_target = block
+        self._block = None
+        self.state = 'Hold:1'
+
+    def _cycle_start(self):
+        if self._hold is None:
+            return
+        if self.state == 'Hold:0':
+            self._resume(self.now())
+        else:
+            self._resume_pending = True
+
+    def _resume(self, now):
+        held = self._held_target
+        self._hold = None
+        self._held_target = None
+        if held is not None:
+            self._planner.appendleft(_Block(self.mpos, held.end, held.v_max, held.accel, held.line))
+        self._block_t0 = now
+        self.state = 'Run' if self._planner else 'Idle'
+
+    def _soft_reset(self):
+        moving = self.state == 'Run' or self.state == 'Hold:1' or self.state == 'Home'
+        self._advance(self.now())
+        self._rx_lines.clear()
+        self._rx_partial = b""
+        self._rx_bytes = 0
+        self._reset_motion()
+        self._absolute = True
+        self._inches = False
+        self._feed = None
+        if moving:
+            self._emit("ALARM:3")
+            self.state = 'Alarm'
+        elif self.state != 'Alarm':
+            self.state = 'Idle'
+        self._emit(WELCOME_BANNER)
+        if self.state == 'Alarm':
+            self._emit("[MSG:'$H'|'$X' to unlock]")
+
+    def trigger_alarm(self, code: int = 1):
+        """Raise an alarm as the firmware would on a hard limit (code 1)"""
+        with self._lock:
+            self._reset_motion()
+            self._rx_lines.clear()
+            self._rx_bytes = 0
+            self.state = 'Alarm'
+            self._emit(f"ALARM:{code}")
+
+    def _idle(self) -> bool:
+        return (self._block is None and not self._planner and self._hold is None
+                and self._busy_until is None and self.state in ('Idle', 'Alarm'))
+
+    def _status_report(self) -> str:
+        with self._lock:
+            self._advance(self.now())
+            fields = [self.state]
+            if int(self.settings.get(10, 1)) & 1:
+                fields.append("MPos:%.3f,%.3f,0.000" % self.mpos)
+            else:
+                fields.append("WPos:%.3f,%.3f,0.000" % (self.mpos[0] - self.wco[0], self.mpos[1] - self.wco[1]))
+            if self.line_numbers and self._block is not None and self._block.line is not None:
+                fields.append(f"Ln:{self._block.line}")
+            fields.append(f"FS:{self._speed * 60:.0f},0")
+            if self.pins:
+                fields.append(f"Pn:{self.pins}")
+            if self._wco_countdown <= 0:
+                fields.append("WCO:%.3f,%.3f,0.000" % self.wco)
+                self._wco_countdown = 10
+            else:
+                self._wco_countdown -= 1
+            return "<" + "|".join(fields) + ">"
+
+    # ------------------------------------------------------------------
+    # Line commands
+    # ------------------------------------------------------------------
+
+    def _process_lines(self):
+        while self._rx_lines and self._busy_until is None:
+            line, size = self._rx_lines[0]
+            result = self._execute(line)
+            if result is None:
+                return  # waits for planner space or motion to finish
+            self._rx_lines.popleft()
+            self._rx_bytes = max(0, self._rx_bytes - size)
+            self.commands.append(line)
+            if result:
+                self._emit(result)
+
+    def _execute(self, line: str) -> Optional[str]:
+        """Run one line. Returns the response, '' if it is sent later, None to retry."""
+        if line.startswith('$'):
+            return self._system_command(line)
+
+        block = _COMMENT_RE.sub('', line.upper()).replace(' ', '')
+        if not block:
+            return "ok"
+        words = _WORD_RE.findall(block)
+        if ''.join(letter + value for letter, value in words) != block:
+            return "error:20"
+        if self.state == 'Alarm':
+            return "error:9"
+
+        values = {}
+        motion = None
+        g_codes = []
+        for letter, value in words:
+            number = float(value)
+            if letter == 'G':
+                g_codes.append(number)
+            elif letter == 'M':
+                if number not in _IGNORED_M:
+                    return "error:20"
+            elif letter in 'XYZFPLNST':
+                values[letter] = number
+            else:
+                return "error:20"
+
+        for code in g_codes:
+            if code in (0.0, 1.0):
+                motion = code
+            elif code == 90.0:
+                self._absolute = True
+            elif code == 91.0:
+                self._absolute = False
+            elif code == 20.0:
+                self._inches = True
+            elif code in (4.0, 10.0, 92.0):
+                motion = code
+            elif code not in _IGNORED_G:
+                return "error:20"
+            if code == 21.0:
+                self._inches = False
+
+        if 'F' in values:
+            self._feed = values['F'] * (25.4 if self._inches else 1.0)
+
+        if motion in (4.0, 10.0, 92.0):
+            # Non-modal commands wait for the planner to empty (buffer sync)
+            if not self._idle():
+                return None
+            if motion == 4.0:
+                self._busy_until = self.now() + values.get('P', 0.0)
+                self._busy_done = lambda: self._emit("ok")
+                return ""
+            if motion == 10.0 and values.get('L') != 20.0:
+                return "error:20"
+            target = self._target(values, self.mpos)
+            self.wco = (self.mpos[0] - target[0] if 'X' in values else self.wco[0],
+                        self.mpos[1] - target[1] if 'Y' in values else self.wco[1])
+            self._wco_countdown = 0
+            return "ok"
+
+        if motion is None or ('X' not in values and 'Y' not in values):
+            return "ok"
+        if motion == 1.0 and self._feed is None:
+            return "error:22"
+        if len(self._planner) >= PLANNER_BLOCKS:
+            return None
+
+        # Plan from the end of the last queued block
+        if self._planner:
+            start = self._planner[-1].end
+        elif self._block is not None:
+            start = self._block.end
+        elif self._held_target is not None:
+            start = self._held_target.end
+        else:
+            start = self.mpos
+        start_work = (start[0] - self.wco[0], start[1] - self.wco[1])
+        target_work = self._target(values, start_work)
+        end = (target_work[0] + self.wco[0], target_work[1] + self.wco[1])
+        v_max, accel = self._limits(start, end, rapid=motion == 0.0)
+        new_block = _Block(start, end, v_max, accel, int(values['N']) if 'N' in values else None)
+        if self._block is None and not self._planner and self._hold is None:
+            self._block_t0 = self.now()
+        self._planner.append(new_block)
+        if self.state == 'Idle':
+            self.state = 'Run'
+        return "ok"
+
+    def _target(self, values, origin):
+        scale = 25.4 if self._inches else 1.0
+        x, y = origin
+        if 'X' in values:
+            x = values['X'] * scale if self._absolute else x + values['X'] * scale
+        if 'Y' in values:
+            y = values['Y'] * scale if self._absolute else y + values['Y'] * scale
+        return x, y
+
+    def _limits(self, start, end, rapid):
+        """Speed (mm/s) and acceleration limited so no axis exceeds its own setting"""
+        dx, dy = abs(end[0] - start[0]), abs(end[1] - start[1])
+        length = math.hypot(dx, dy) or 1.0
+        v_max = math.inf if rapid else self._feed / 60.0
+        accel = math.inf
+        for delta, rate_key, accel_key in ((dx, 110, 120), (dy, 111, 121)):
+            if delta > 0:
+                share = delta / length
+                v_max = min(v_max, self.settings[rate_key] / 60.0 / share)
+                accel = min(accel, self.settings[accel_key] / share)
+        return v_max, (accel if accel != math.inf else 1.0)
+
+    def _system_command(self, line: str) -> Optional[str]:
+        command = line.upper()
+        if command == '$X':
+            if self.state == 'Alarm':
+                self.state = 'Idle'
+                self._emit("[MSG:Caution: Unlocked]")
+            return "ok"
+        if not self._idle():
+            return "error:8"
+        if command == '$H':
+            if not self.settings.get(22, 0):
+                return "error:5"
+            self.state = 'Home'
+            seek = self.settings.get(25, 500.0) / 60.0
+            distance = math.hypot(*self.mpos)
+            self._busy_until = self.now() + (distance / seek if seek > 0 else 0.0)
+
+            def homed():
+                self.mpos = (0.0, 0.0)
+                self.state = 'Idle'
+                self._emit("ok")
+
+            self._busy_done = homed
+            return ""
+        if command == '$$':
+            for key in sorted(self.settings):
+                value = self.settings[key]
+                self._emit(f"${key}={int(value) if value == int(value) and key < 100 else '%.3f' % value}")
+            return "ok"
+        if command == '$G':
+            self._emit(f"[GC:G0 G54 G17 {'G20' if self._inches else 'G21'} "
+                       f"{'G90' if self._absolute else 'G91'} G94 M5 M9 T0 F{self._feed or 0:g} S0]")
+            return "ok"
+        if command == '$I':
+            self._emit("[VER:1.1h.20190825:]")
+            self._emit(f"[OPT:V,{PLANNER_BLOCKS},{RX_BUFFER_SIZE}]")
+            return "ok"
+        if command == '$#':
+            self._emit("[G54:%.3f,%.3f,0.000]" % self.wco)
+            return "ok"
+        match = _SETTING_RE.match(command)
+        if match:
+            self.settings[int(match.group(1))] = float(match.group(2))
+            return "ok"
+        return "error:3"
+
+
+class SimulatedSerial:
+    """serial.Serial stand-in connected to a GrblSimulator"""
+
+    def __init__(self, port: str = SIMULATOR_PORT, baudrate: int = 115200, timeout: Optional[float] = 1.0,
+                 simulator: Optional[GrblSimulator] = None, **simulator_options):
+        self.port = port
+        self.baudrate = baudrate
+        self.timeout = timeout
+        self.simulator = simulator or GrblSimulator(**simulator_options)
+        self.simulator.start()
+        self.is_open = True
+        self._partial = b""
+
+    @property
+    def in_waiting(self) -> int:
+        return self.simulator.output.qsize()
+
+    def write(self, data: bytes) -> int:
+        if not self.is_open:
+            raise OSError("Simulated port is closed")
+        self.simulator.receive(data)
+        return len(data)
+
+    def readline(self) -> bytes:
+        if not self.is_open:
+            raise OSError("Simulated port is closed")
+        try:
+            return self.simulator.output.get(timeout=self.timeout)
+        except queue.Empty:
+            return b""
+
+    def reset_input_buffer(self):
+        while not self.simulator.output.empty():
+            try:
+                self.simulator.output.get_nowait()
+            except queue.Empty:
+                break
+
+    flushInput = reset_input_buffer
+
+    def close(self):
+        self.is_open = False
+        self.simulator.stop()
+
+
+def serve_pty(simulator: GrblSimulator):
+    """Expose the simulator on a pseudo-terminal; returns the slave device path"""
+    import os
+    import tty
+
+    master, slave = os.openpty()
+    tty.setraw(slave)
+    port = SimulatedSerial(timeout=0.1, simulator=simulator)
+
+    def host_to_grbl():
+        while port.is_open:
+            try:
+                data = os.read(master, 256)
+            except OSError:
+                break
+            if data:
+                port.write(data)
+
+    def grbl_to_host():
+        while port.is_open:
+            line = port.readline()
+            if line:
+                os.write(master, line)
+
+    threading.Thread(target=host_to_grbl, daemon=True, name="GrblPtyIn").start()
+    threading.Thread(target=grbl_to_host, daemon=True, name="GrblPtyOut").start()
+    return os.ttyname(slave)
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Serve a simulated GRBL controller on a pseudo-terminal")
+    parser.add_argument("--config", default="config/settings.json", help="settings file with grbl_configuration")
+    parser.add_argument("--time-scale", type=float, default=1.0, help="simulated seconds per real second")
+    args = parser.parse_args()
+
+    try:
+        with open(args.config) as f:
+            grbl_settings = json.load(f).get("hardware_config", {}).get("arduino_grbl", {}).get("grbl_configuration", {})
+    except (OSError, ValueError):
+        grbl_settings = {}
+
+    device = serve_pty(GrblSimulator(grbl_settings, time_scale=args.time_scale))
+    print(f"Simulated GRBL listening on {device} (Ctrl-C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
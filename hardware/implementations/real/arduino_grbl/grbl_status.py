@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+
+"""
+GRBL Status Scheduler
+=====================
+
+Sends GRBL's real-time '?' byte at a fixed rate (faster while the machine
+is moving) and parses every status report exactly once into a GrblStatus
+object. Parsed reports are published to subscribers and kept as the
+latest status, so position displays, movement waits and the admin monitor
+all read one shared stream instead of each issuing their own queries.
+
+Reports are parsed from the transport's reader thread; subscribers are
+called there too and must return quickly.
+
+Usage:
+    scheduler = GrblStatusScheduler(transport, idle_rate_hz=10, run_rate_hz=20)
+    scheduler.subscribe(lambda status: print(status.state, status.mpos))
+    scheduler.start()
+    status = scheduler.latest()
+    scheduler.stop()
+"""
+
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+from core.logger import get_logger
+from hardware.implementations.real.arduino_grbl.grbl_transport import LINE_STATUS
+
+# States in which the machine is moving and reports are requested at run_rate_hz
+MOTION_STATES = ('Run', 'Jog', 'Home')
+
+
+class GrblStatus:
+    """One parsed GRBL status report. Positions are in mm, as GRBL reports them."""
+
+    __slots__ = ('state', 'mpos', 'wpos', 'wco', 'pins', 'line', 'feed', 'received', 'raw', 'x', 'y')
+
+    def __init__(self, raw: str, received: float):
+        self.raw = raw
+        self.received = received
+        self.state = 'Unknown'
+        self.mpos: Optional[Tuple[float, ...]] = None
+        self.wpos: Optional[Tuple[float, ...]] = None
+        self.wco: Optional[Tuple[float, ...]] = None
+        self.pins = ''
+        self.line: Optional[int] = None
+        self.feed: Optional[float] = None
+        # Work position in cm, filled in by the consumer that knows the WCO
+        self.x: Optional[float] = None
+        self.y: Optional[float] = None
+
+
+def _coords(value: str) -> Tuple[float, ...]:
+    return tuple(float(v) for v in value.split(','))
+
+
+def parse_status(line: str, received: float = 0.0) -> Optional[GrblStatus]:
+    """Parse '<State|Field:value|...>' in a single pass; None if malformed"""
+    if not (line.startswith('<') and line.endswith('>')):
+        return None
+    fields = line[1:-1].split('|')
+    status = GrblStatus(line, received)
+    status.state = fields[0] or 'Unknown'
+    try:
+        for field in fields[1:]:
+            name, _, value = field.partition(':')
+            if name == 'MPos':
+                status.mpos = _coords(value)
+            elif name == 'WPos':
+                status.wpos = _coords(value)
+            elif name == 'WCO':
+                status.wco = _coords(value)
+            elif name == 'Pn':
+                status.pins = value
+            elif name == 'Ln':
+                status.line = int(value)
+            elif name in ('FS', 'F'):
+                status.feed = float(value.split(',')[0])
+    except ValueError:
+        return None
+    return status
+
+
+class GrblStatusScheduler:
+    """Requests status reports at a steady rate and fans them out to subscribers"""
+
+    def __init__(self, transport, idle_rate_hz: float = 10.0, run_rate_hz: float = 20.0):
+        self.logger = get_logger()
+        self.transport = transport
+        self.idle_rate_hz = idle_rate_hz
+        self.run_rate_hz = run_rate_hz
+
+        self._cond = threading.Condition()
+        self._latest: Optional[GrblStatus] = None
+        self._seq = 0
+        self._subscribers: List[Callable[[GrblStatus], None]] = []
+
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        transport.add_listener(self._on_line)
+
+    def start(self):
+        """Start the request thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._request_loop, daemon=True, name="GrblStatusScheduler")
+        self._thread.start()
+
+    def stop(self, join_timeout: float = 1.0):
+        """Stop requesting reports and wake any waiters"""
+        self._stop_event.set()
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=join_timeout)
+        self._thread = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def subscribe(self, callback: Callable[[GrblStatus], None]):
+        """Register callback(status) for every parsed report"""
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[GrblStatus], None]):
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def latest(self, max_age: Optional[float] = None) -> Optional[GrblStatus]:
+        """Most recent report, or None if there is none (or it is older than max_age seconds)"""
+        with self._cond:
+            status = self._latest
+        if status is None:
+            return None
+        if max_age is not None and time.monotonic() - status.received > max_age:
+            return None
+        return status
+
+    def interval(self) -> float:
+        """Current request period in seconds"""
+        status = self._latest
+        moving = status is not None and status.state.split(':')[0] in MOTION_STATES
+        rate = self.run_rate_hz if moving else self.idle_rate_hz
+        return 1.0 / rate if rate > 0 else 1.0
+
+    def wait_for_update(self, timeout: float) -> Optional[GrblStatus]:
+        """Block until the next report arrives; returns it, or None on timeout/stop"""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            seq = self._seq
+            while self._seq == seq:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._stop_event.is_set():
+                    return None
+                self._cond.wait(remaining)
+            return self._latest
+
+    def _request_loop(self):
+        while not self._stop_event.is_set():
+            if not self.transport.is_running:
+                break
+            try:
+                self.transport.write_realtime(b"?")
+            except Exception as e:
+                self.logger.debug(f"Status request failed: {e}", category="grbl")
+            self._stop_event.wait(self.interval())
+
+    def _on_line(self, kind: str, line: str):
+        if kind != LINE_STATUS:
+            return
+        status = parse_status(line, time.monotonic())
+        if status is None:
+            self.logger.debug(f"Unparseable status report: {line}", category="grbl")
+            return
+        for callback in list(self._subscribers):
+            try:
+                callback(status)
+            except Exception as e:
+                self.logger.debug(f"Status subscriber error: {e}", category="grbl")
+        with self._cond:
+            self._latest = status
+            self._seq += 1
+            self._cond.notify_all()
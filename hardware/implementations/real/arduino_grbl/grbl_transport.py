@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+
+"""
+GRBL Serial Transport
+=====================
+
+Owns the serial line to a GRBL controller. A single reader thread blocks
+on readline() and classifies every incoming line:
+
+    ok / error:N     acknowledgement of the oldest outstanding command
+    <...>            real-time status report -> latest-status slot
+    ALARM:N          alarm notification
+    [MSG:...] [...]  feedback messages (kept with the pending command)
+    Grbl x.y ...     welcome banner (controller reset)
+    anything else    response data for the pending command ($$, $#, ...)
+
+GRBL acknowledges commands strictly in the order it receives them, so
+pending commands are kept in a FIFO of futures and each ok/error resolves
+the head. Status queries use the real-time '?' byte, which is never
+acknowledged with 'ok' - they wait on the status slot instead, so motion
+commands and position queries never block each other and nothing polls.
+
+Every queued line also counts against GRBL's serial RX buffer until it
+is acknowledged. send_streamed() uses that count for the standard
+character-counting protocol: a line is written as soon as it fits in
+the buffer, so GRBL's planner always has the next moves to blend.
+
+Usage:
+    transport = GrblTransport(serial_connection)
+    transport.start()
+    response = transport.send_command("G1 X10 F1000", timeout=10.0)
+    futures = [transport.send_streamed(line, timeout=10.0) for line in gcode]
+    status_line = transport.query_status(timeout=1.0)
+    transport.stop()
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Callable, Deque, List, Optional, Tuple
+
+from core.logger import get_logger
+
+
+# Line classes produced by classify_line()
+LINE_OK = "ok"
+LINE_ERROR = "error"
+LINE_STATUS = "status"
+LINE_ALARM = "alarm"
+LINE_MESSAGE = "message"
+LINE_WELCOME = "welcome"
+LINE_DATA = "data"
+
+# GRBL 1.1 serial receive buffer (RX_BUFFER_SIZE in the firmware)
+DEFAULT_RX_BUFFER_SIZE = 128
+
+
+def classify_line(line: str) -> str:
+    """Return the LINE_* class of a (stripped) line received from GRBL"""
+    if line == "ok":
+        return LINE_OK
+    if line.startswith("error"):
+        return LINE_ERROR
+    if line.startswith("<") and line.endswith(">"):
+        return LINE_STATUS
+    if line.startswith("ALARM"):
+        return LINE_ALARM
+    if line.startswith("["):
+        return LINE_MESSAGE
+    if line.startswith("Grbl "):
+        return LINE_WELCOME
+    return LINE_DATA
+
+
+class GrblCommandError(Exception):
+    """Raised into pending command futures when the link fails or GRBL resets"""
+
+
+class _PendingCommand:
+    """A command waiting for its ok/error acknowledgement"""
+
+    __slots__ = ('command', 'lines', 'future', 'size')
+
+    def __init__(self, command: str):
+        self.command = command
+        self.lines: List[str] = []
+        self.future: Future = Future()
+        self.size = len(command) + 1  # bytes held in GRBL's RX buffer, incl. newline
+
+
+class GrblTransport:
+    """Reader thread + FIFO acknowledgement demultiplexer for one GRBL link"""
+
+    def __init__(self, serial_connection, rx_buffer_size: int = DEFAULT_RX_BUFFER_SIZE):
+        self.logger = get_logger()
+        self.serial_connection = serial_connection
+        self.rx_buffer_size = rx_buffer_size
+
+        self._write_lock = threading.Lock()
+        self._pending: Deque[_PendingCommand] = deque()
+        self._pending_lock = threading.Condition()  # notified when buffer space frees up
+        self._inflight_bytes = 0
+
+        # Latest status report: (line, monotonic timestamp, sequence number)
+        self._status_cond = threading.Condition()
+        self._status_line: Optional[str] = None
+        self._status_time = 0.0
+        self._status_seq = 0
+
+        self.last_alarm: Optional[str] = None
+        self.welcome_banner: Optional[str] = None
+        self.messages: Deque[str] = deque(maxlen=50)
+        self._listeners: List[Callable[[str, str], None]] = []
+
+        self._running = False
+        self._reader_thread: Optional[threading.Thread] = None
+        self.link_error: Optional[Exception] = None
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """Start the reader thread"""
+        if self._running:
+            return
+        self._running = True
+        self.link_error = None
+        self._reader_thread = threading.Thread(
+            target=self._reader_loop, daemon=True, name="GrblReader"
+        )
+        self._reader_thread.start()
+
+    def stop(self, join_timeout: float = 1.0):
+        """Stop the reader thread and fail any outstanding commands"""
+        self._running = False
+        self._fail_pending(GrblCommandError("GRBL transport stopped"))
+        if self._reader_thread and self._reader_thread is not threading.current_thread():
+            self._reader_thread.join(timeout=join_timeout)
+        self._reader_thread = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._running and self._reader_thread is not None and self._reader_thread.is_alive()
+
+    def add_listener(self, callback: Callable[[str, str], None]):
+        """Register callback(line_class, line) for every line the reader receives"""
+        self._listeners.append(callback)
+
+    # ------------------------------------------------------------------
+    # Sending
+    # ------------------------------------------------------------------
+
+    def send_command_async(self, command: str) -> Future:
+        """Write a line command; the returned future resolves to GRBL's response text.
+
+        The response is every line received for the command joined with
+        newlines, ending in 'ok' or 'error:N' (same format the old
+        blocking reader returned).
+        """
+        return self._send(_PendingCommand(command.strip()))
+
+    def _send(self, pending: _PendingCommand) -> Future:
+        with self._write_lock:
+            # Queue before writing so the ack can never arrive first
+            with self._pending_lock:
+                self._pending.append(pending)
+                self._inflight_bytes += pending.size
+            try:
+                self.serial_connection.write(f"{pending.command}\n".encode())
+            except Exception as e:
+                with self._pending_lock:
+                    if pending in self._pending:
+                        self._pending.remove(pending)
+                        self._inflight_bytes -= pending.size
+                        self._pending_lock.notify_all()
+                pending.future.set_exception(e)
+        return pending.future
+
+    def send_streamed(self, command: str, timeout: float) -> Future:
+        """Write a line as soon as it fits in GRBL's RX buffer (character counting).
+
+        Blocks only while the buffer is full, then returns the command's
+        acknowledgement future without waiting for it.
+
+        Raises:
+            TimeoutError: if buffer space did not free up within timeout
+        """
+        pending = _PendingCommand(command.strip())
+        deadline = time.monotonic() + timeout
+        with self._pending_lock:
+            while self._inflight_bytes + pending.size > self.rx_buffer_size and self._pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"GRBL RX buffer full for {timeout}s")
+                if not self._running:
+                    raise GrblCommandError("GRBL transport stopped")
+                self._pending_lock.wait(remaining)
+        return self._send(pending)
+
+    def inflight_bytes(self) -> int:
+        """Bytes written to GRBL and not yet acknowledged"""
+        with self._pending_lock:
+            return self._inflight_bytes
+
+    def send_command(self, command: str, timeout: float) -> Optional[str]:
+        """Send a line command and wait for its acknowledgement.
+
+        Returns:
+            Response text, or None on timeout. Serial errors are raised.
+        """
+        future = self.send_command_async(command)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            # Leave the entry queued: GRBL will still ack it in order,
+            # and its late ok must not be credited to a newer command.
+            self.logger.debug(f"Command timeout after {timeout}s: {command}", category="grbl")
+            return None
+
+    def write_realtime(self, data: bytes):
+        """Write real-time command bytes ('?', '!', '~', 0x18); never acknowledged"""
+        with self._write_lock:
+            self.serial_connection.write(data)
+
+    def query_status(self, timeout: float = 1.0) -> Optional[str]:
+        """Request a fresh status report and wait for it (None on timeout)"""
+        with self._status_cond:
+            seq = self._status_seq
+        self.write_realtime(b"?")
+        deadline = time.monotonic() + timeout
+        with self._status_cond:
+            while self._status_seq == seq:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._running:
+                    return None
+                self._status_cond.wait(remaining)
+            return self._status_line
+
+    def wait_for_ready(self, timeout: float, banner_only: bool = False, poll_interval: float = 0.1) -> bool:
+        """Wait until GRBL is ready instead of sleeping a fixed boot delay.
+
+        Ready means the welcome banner has arrived since start()/soft_reset(),
+        or - unless banner_only - GRBL answered a status query (a controller
+        that was not reset on port open prints no banner). Returns False on
+        timeout.
+        """
+        deadline = time.monotonic() + timeout
+        with self._status_cond:
+            seq = self._status_seq
+        while self._running:
+            if not banner_only:
+                self.write_realtime(b"?")
+            with self._status_cond:
+                wake_at = min(deadline, time.monotonic() + poll_interval)
+                while True:
+                    if self.welcome_banner is not None:
+                        return True
+                    if not banner_only and self._status_seq != seq:
+                        return True
+                    remaining = wake_at - time.monotonic()
+                    if remaining <= 0 or not self._running:
+                        break
+                    self._status_cond.wait(remaining)
+            if time.monotonic() >= deadline:
+                return False
+        return False
+
+    def latest_status(self) -> Tuple[Optional[str], float]:
+        """Return (last status line, monotonic time it was received)"""
+        with self._status_cond:
+            return self._status_line, self._status_time
+
+    def soft_reset(self):
+        """Send Ctrl-X. GRBL drops its input buffer, so pending commands are failed."""
+        with self._status_cond:
+            self.welcome_banner = None  # wait_for_ready() waits for the new one
+        self.write_realtime(b"\x18")
+        self._fail_pending(GrblCommandError("GRBL soft reset"))
+
+    def pending_count(self) -> int:
+        with self._pending_lock:
+            return len(self._pending)
+
+    # ------------------------------------------------------------------
+    # Reader
+    # ------------------------------------------------------------------
+
+    def _fail_pending(self, error: Exception):
+        with self._pending_lock:
+            pending = list(self._pending)
+            self._pending.clear()
+            self._inflight_bytes = 0
+            self._pending_lock.notify_all()
+        for item in pending:
+            if not item.future.done():
+                item.future.set_exception(error)
+
+    def _reader_loop(self):
+        buffer = b""
+        while self._running:
+            try:
+                chunk = self.serial_connection.readline()
+            except Exception as e:
+                if self._running:
+                    self.link_error = e
+                    self.logger.error(f"GRBL reader stopped: {e}", category="grbl")
+                    self._running = False
+                    self._fail_pending(e)
+                    with self._status_cond:
+                        self._status_cond.notify_all()
+                break
+
+            if not chunk:
+                continue  # read timeout - nothing arrived
+            buffer += chunk
+            if not buffer.endswith(b"\n"):
+                continue  # partial line, keep reading
+            for raw in buffer.splitlines():
+                line = raw.decode(errors='replace').strip()
+                if line:
+                    self._dispatch(line)
+            buffer = b""
+
+    def _dispatch(self, line: str):
+        kind = classify_line(line)
+
+        if kind == LINE_STATUS:
+            with self._status_cond:
+                self._status_line = line
+                self._status_time = time.monotonic()
+                self._status_seq += 1
+                self._status_cond.notify_all()
+        else:
+            self.logger.debug(f"GRBL << {line}", category="grbl")
+
+            if kind in (LINE_OK, LINE_ERROR):
+                with self._pending_lock:
+                    pending = self._pending.popleft() if self._pending else None
+                    if pending is not None:
+                        self._inflight_bytes -= pending.size
+                        self._pending_lock.notify_all()
+                if pending is None:
+                    self.logger.debug(f"Unsolicited GRBL response: {line}", category="grbl")
+                elif not pending.future.done():
+                    pending.lines.append(line)
+                    pending.future.set_result("\n".join(pending.lines))
+
+            elif kind == LINE_ALARM:
+                self.last_alarm = line
+                self.logger.warning(f"GRBL {line}", category="grbl")
+
+            elif kind == LINE_WELCOME:
+                # Controller reset (power-up, DTR or Ctrl-X): anything in flight is lost
+                self._fail_pending(GrblCommandError(f"GRBL reset: {line}"))
+                with self._status_cond:
+                    self.welcome_banner = line
+                    self._status_cond.notify_all()
+
+            else:
+                if kind == LINE_MESSAGE:
+                    self.messages.append(line)
+                with self._pending_lock:
+                    if self._pending:
+                        self._pending[0].lines.append(line)
+
+        for listener in self._listeners:
+            try:
+                listener(kind, line)
+            except Exception as e:
+                self.logger.debug(f"GRBL listener error: {e}", category="grbl")
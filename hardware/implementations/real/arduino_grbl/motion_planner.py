@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+
+"""
+GRBL Motion Planner
+===================
+
+Turns the step plan's single-axis moves into G-code segments:
+
+- adjacent travel moves are coalesced: an X move followed by a Y move
+  (or Y then X) becomes one diagonal segment, and repeated moves of the
+  same axis keep only the last target
+- each segment names only the axes it changes, so an untouched axis is
+  never commanded to a possibly stale cached position
+- travel (no working tool engaged) uses G0 at the machine's rapid rate;
+  G1 at the feed rate is kept for moves made with a tool engaged, and
+  those moves are never coalesced because their path matters
+
+Positions are in cm, as everywhere above the GRBL driver.
+
+Usage:
+    segments = plan_moves([('move_x', 0.0), ('move_y', 0.0)], rapid=True)
+    for segment in segments:
+        command = format_motion_command(segment.x, segment.y, segment.rapid, feed_rate)
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+
+class MotionSegment:
+    """One G-code move covering one or more consecutive plan moves"""
+
+    __slots__ = ('x', 'y', 'rapid', 'move_indices')
+
+    def __init__(self, x: Optional[float], y: Optional[float], rapid: bool, move_indices: List[int]):
+        self.x = x                          # target in cm, None = axis not commanded
+        self.y = y
+        self.rapid = rapid
+        self.move_indices = move_indices    # indices into the planned move list
+
+    def __repr__(self):
+        return f"MotionSegment(x={self.x}, y={self.y}, rapid={self.rapid}, moves={self.move_indices})"
+
+
+def format_motion_command(x: Optional[float], y: Optional[float], rapid: bool, feed_rate: float) -> str:
+    """G0/G1 line for a target in cm (GRBL works in mm), omitting uncommanded axes"""
+    words = ["G0" if rapid else "G1"]
+    if x is not None:
+        words.append(f"X{x * 10.0:.3f}")
+    if y is not None:
+        words.append(f"Y{y * 10.0:.3f}")
+    if not rapid:
+        words.append(f"F{feed_rate}")
+    return " ".join(words)
+
+
+def plan_moves(moves: Sequence[Tuple[str, float]], rapid: bool) -> List[MotionSegment]:
+    """
+    Plan consecutive ('move_x' | 'move_y', position) moves as segments.
+
+    Args:
+        moves: plan moves in execution order
+        rapid: True when no tool is engaged - moves are travel and may be
+            coalesced; False keeps one G1 segment per move
+
+    Returns:
+        Segments in order; every move index appears in exactly one segment
+    """
+    segments: List[MotionSegment] = []
+    for index, (operation, position) in enumerate(moves):
+        axis = 'x' if operation == 'move_x' else 'y'
+        if rapid and segments and segments[-1].rapid:
+            segment = segments[-1]
+            other = 'y' if axis == 'x' else 'x'
+            # X then Y becomes one diagonal; a repeated single axis just takes
+            # the newer target. A third move (X, Y, X) starts a new segment so
+            # the corner it was planned through is still visited.
+            if getattr(segment, axis) is None or getattr(segment, other) is None:
+                setattr(segment, axis, position)
+                segment.move_indices.append(index)
+                continue
+        segment = MotionSegment(None, None, rapid, [index])
+        setattr(segment, axis, position)
+        segments.append(segment)
+    return segments
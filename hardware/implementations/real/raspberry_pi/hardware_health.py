@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+
+"""
+Hardware Health Monitor
+=======================
+
+Rolling histograms of piston actuation times and sensor bounce counts,
+used to spot slow pistons and intermittent sensors before they fail.
+
+Pistons: every confirmed actuation (command -> sensor edge, measured by
+the PistonActuationMonitor) goes into a RollingHistogram per piston and
+direction. The baseline is the last one recorded in hardware_health.csv
+(seed_baselines()), so it survives restarts; only a piston without
+history takes the p95 of its first BASELINE_SAMPLES actuations. Once
+BASELINE_SAMPLES actuations were measured, a current p95 above
+baseline * drift_ratio is reported in alerts() and logged once.
+
+Sensors: the polling thread reports every debounced settle of an RS485
+sensor with the number of times its reading flipped before it became
+stable. Settles that changed the state count as transitions, settles
+back to the old state as glitches; the flip counts form a histogram.
+
+Histograms keep one bucket index per sample in a fixed-size ring, so
+memory is bounded and percentiles are read from the bucket counts.
+
+Usage:
+    health = HardwareHealthMonitor(window=200, drift_ratio=1.5)
+    health.record_actuation("line_marker_piston", "down", 0.12, True)
+    health.record_sensor("line_marker_down_sensor", bounces=2, changed=True)
+    print(health.snapshot()["alerts"])
+"""
+
+import threading
+from collections import deque
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+from core.logger import get_logger
+
+# Upper bucket edges; values above the last edge fall into an open-ended bucket
+LATENCY_BUCKETS_MS = (10, 20, 30, 40, 50, 75, 100, 150, 200, 300, 400, 600, 800, 1000)
+BOUNCE_BUCKETS = (0, 1, 2, 3, 5, 10)
+# Actuations measured before a piston's baseline p95 is fixed
+BASELINE_SAMPLES = 20
+
+
+class RollingHistogram:
+    """Bucket counts over the last `window` values"""
+
+    __slots__ = ('edges', 'counts', '_recent')
+
+    def __init__(self, edges: Sequence[float], window: int = 200):
+        self.edges = tuple(edges)
+        self.counts = [0] * (len(self.edges) + 1)
+        self._recent: Deque[int] = deque(maxlen=window)
+
+    def add(self, value: float):
+        index = len(self.edges)
+        for i, edge in enumerate(self.edges):
+            if value <= edge:
+                index = i
+                break
+        if len(self._recent) == self._recent.maxlen:
+            self.counts[self._recent[0]] -= 1
+        self._recent.append(index)
+        self.counts[index] += 1
+
+    @property
+    def count(self) -> int:
+        return len(self._recent)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Upper edge of the bucket holding the p-th percentile (the last edge for the open bucket)"""
+        if not self._recent:
+            return None
+        rank = max(1, int(round(p / 100.0 * len(self._recent))))
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return self.edges[min(i, len(self.edges) - 1)]
+        return self.edges[-1]
+
+    def buckets(self) -> List[Tuple[str, int]]:
+        """(label, count) per bucket, e.g. ('<=50', 3) ... ('>1000', 1)"""
+        labels = [f"<={edge}" for edge in self.edges] + [f">{self.edges[-1]}"]
+        return list(zip(labels, self.counts))
+
+
+class PistonHealth:
+    """Actuation-time histogram, baseline and timeouts of one piston direction"""
+
+    def __init__(self, window: int):
+        self.latency = RollingHistogram(LATENCY_BUCKETS_MS, window)
+        self.commands = 0
+        self.timeouts = 0
+        self.measured = 0
+        self.baseline_p95: Optional[float] = None
+        self.alert = False
+
+
+class SensorHealth:
+    """Bounce histogram and settle counters of one sensor"""
+
+    def __init__(self, window: int):
+        self.bounces = RollingHistogram(BOUNCE_BUCKETS, window)
+        self.transitions = 0
+        self.glitches = 0
+        self.total_bounces = 0
+
+
+class HardwareHealthMonitor:
+    """Collects piston and sensor health and raises drift alerts"""
+
+    def __init__(self, window: int = 200, drift_ratio: float = 1.5):
+        """
+        Args:
+            window: Samples kept per histogram
+            drift_ratio: Alert when a piston's p95 exceeds its baseline by this factor
+        """
+        self.logger = get_logger()
+        self.window = window
+        self.drift_ratio = drift_ratio
+        self._lock = threading.Lock()
+        self._pistons: Dict[Tuple[str, str], PistonHealth] = {}
+        self._sensors: Dict[str, SensorHealth] = {}
+
+    def configure(self, window: int, drift_ratio: float):
+        """Apply new settings; a changed window only affects histograms created afterwards"""
+        self.window = window
+        self.drift_ratio = drift_ratio
+
+    def seed_baselines(self, baselines: Dict[str, float]):
+        """Baseline p95 (ms) per 'piston:state' from earlier runs, e.g. analytics_health.load_baselines()"""
+        with self._lock:
+            for name, baseline in baselines.items():
+                piston, _, state = name.rpartition(':')
+                if not piston:
+                    continue
+                health = self._pistons.get((piston, state))
+                if health is None:
+                    health = self._pistons[(piston, state)] = PistonHealth(self.window)
+                health.baseline_p95 = baseline
+
+    def reset(self):
+        with self._lock:
+            self._pistons.clear()
+            self._sensors.clear()
+
+    # ========== RECORDING ==========
+
+    def record_actuation(self, piston: str, state: str, actuation_time: Optional[float], ok: bool):
+        """One piston command; actuation_time is None when the sensor was not seen moving"""
+        with self._lock:
+            health = self._pistons.get((piston, state))
+            if health is None:
+                health = self._pistons[(piston, state)] = PistonHealth(self.window)
+            health.commands += 1
+            if not ok:
+                health.timeouts += 1
+            if actuation_time is None:
+                return
+            health.latency.add(actuation_time * 1000)
+            health.measured += 1
+            if health.measured < BASELINE_SAMPLES:
+                return
+            if health.baseline_p95 is None:
+                health.baseline_p95 = health.latency.percentile(95)
+                return
+            p95 = health.latency.percentile(95)
+            drifted = p95 > health.baseline_p95 * self.drift_ratio
+            raised = drifted and not health.alert
+            health.alert = drifted
+        if raised:
+            self.logger.warning(
+                f"Piston {piston} ({state}) is slowing down: p95 actuation {p95:.0f}ms, "
+                f"baseline {health.baseline_p95:.0f}ms", category="hardware")
+
+    def record_sensor(self, sensor: str, bounces: int, changed: bool):
+        """One debounced settle of a sensor after `bounces` flips of its reading"""
+        with self._lock:
+            health = self._sensors.get(sensor)
+            if health is None:
+                health = self._sensors[sensor] = SensorHealth(self.window)
+            health.bounces.add(bounces)
+            health.total_bounces += bounces
+            if changed:
+                health.transitions += 1
+            else:
+                health.glitches += 1
+
+    # ========== REPORTING ==========
+
+    def alerts(self) -> List[Dict]:
+        """Pistons whose p95 actuation time has drifted past the baseline"""
+        with self._lock:
+            return [{'piston': piston, 'state': state, 'p95_ms': health.latency.percentile(95),
+                     'baseline_p95_ms': health.baseline_p95}
+                    for (piston, state), health in sorted(self._pistons.items()) if health.alert]
+
+    def snapshot(self) -> Dict:
+        """{'pistons': {'piston:state': {...}}, 'sensors': {name: {...}}, 'alerts': [...]}"""
+        with self._lock:
+            pistons = {
+                f"{piston}:{state}": {
+                    'commands': health.commands,
+                    'timeouts': health.timeouts,
+                    'samples': health.latency.count,
+                    'p50_ms': health.latency.percentile(50),
+                    'p95_ms': health.latency.percentile(95),
+                    'baseline_p95_ms': health.baseline_p95,
+                    'alert': health.alert,
+                    'histogram': health.latency.buckets(),
+                }
+                for (piston, state), health in sorted(self._pistons.items())
+            }
+            sensors = {
+                sensor: {
+                    'transitions': health.transitions,
+                    'glitches': health.glitches,
+                    'bounces': health.total_bounces,
+                    'p95_bounces': health.bounces.percentile(95),
+                    'histogram': health.bounces.buckets(),
+                }
+                for sensor, health in sorted(self._sensors.items())
+            }
+        return {'pistons': pistons, 'sensors': sensors, 'alerts': self.alerts()}
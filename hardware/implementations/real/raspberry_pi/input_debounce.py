@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+
+"""
+Bitmask Input Debouncer
+=======================
+
+Debounces a whole bank of inputs packed into one integer (bit N = input N)
+with a few bitwise operations per sample, however many sensors the bank
+holds.
+
+The debouncer is a shift register of the last samples. A bit whose
+threshold is T takes the new value once it has been the same in the last
+T samples: for k = 1..max(T) the bits that differed from the newest
+sample anywhere in the last k samples are OR-ed together, and every
+threshold group is masked against that once. The cost per sample is
+proportional to the largest threshold, not to the number of inputs.
+
+Only bits that toggled are touched individually, to count the flips
+before they settle (reported as settles for the health histograms).
+
+Usage:
+    debouncer = BitmaskDebouncer({"door_sensor": 15, "row_motor_limit_switch": 4},
+                                 thresholds={"door_sensor": 3}, default_threshold=2)
+    update = debouncer.update(snapshot.bits)
+    for name in debouncer.names(update.changed):
+        print(name, debouncer.state_of(name))
+"""
+
+from collections import deque
+from typing import Deque, Dict, Iterator, NamedTuple, Optional, Tuple
+
+
+class DebounceUpdate(NamedTuple):
+    """Result of one sample"""
+    changed: int                                  # known bits whose filtered state changed
+    initialized: int                              # bits confirmed for the first time
+    settles: Tuple[Tuple[str, int, bool], ...]    # (name, bounces, changed) of bits that toggled and settled
+
+
+def iter_bits(mask: int) -> Iterator[int]:
+    """Indexes of the set bits of mask, lowest first"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class BitmaskDebouncer:
+    """Shift-register debounce of named inputs packed in one integer"""
+
+    def __init__(self, bits: Dict[str, int], thresholds: Optional[Dict[str, int]] = None,
+                 default_threshold: int = 2):
+        """
+        Args:
+            bits: input name -> bit index in the sampled mask
+            thresholds: input name -> equal samples required (default_threshold when missing)
+            default_threshold: equal samples required by the other inputs
+        """
+        thresholds = thresholds or {}
+        self.bits = dict(bits)
+        self._names = {bit: name for name, bit in self.bits.items()}
+        self.mask = 0
+        groups: Dict[int, int] = {}
+        for name, bit in self.bits.items():
+            threshold = max(1, int(thresholds.get(name, default_threshold)))
+            groups[threshold] = groups.get(threshold, 0) | (1 << bit)
+            self.mask |= 1 << bit
+        self._groups = groups
+        self._history: Deque[int] = deque(maxlen=max(groups, default=1))
+        self._flips: Dict[int, int] = {}
+        self.state = 0      # filtered inputs
+        self.known = 0      # bits whose filtered state has been confirmed at least once
+
+    def update(self, raw: int) -> DebounceUpdate:
+        """Feed one sample of the raw input mask"""
+        raw &= self.mask
+        history = self._history
+        if history:
+            for bit in iter_bits(raw ^ history[0]):
+                self._flips[bit] = self._flips.get(bit, 0) + 1
+        history.appendleft(raw)
+
+        unstable = 0
+        stable = 0
+        for k, sample in enumerate(history, 1):
+            unstable |= sample ^ raw
+            group = self._groups.get(k)
+            if group:
+                stable |= group & ~unstable
+
+        state = (self.state & ~stable) | (raw & stable)
+        changed = (state ^ self.state) & self.known
+        initialized = stable & ~self.known
+        self.state = state
+        self.known |= stable
+
+        settles = ()
+        if self._flips:
+            settled = []
+            for bit in [bit for bit in self._flips if (stable >> bit) & 1]:
+                flips = self._flips.pop(bit)
+                if not (initialized >> bit) & 1:
+                    was_changed = bool((changed >> bit) & 1)
+                    # A clean change flips once; every other flip is a bounce
+                    settled.append((self._names[bit], flips - was_changed, was_changed))
+            settles = tuple(settled)
+        return DebounceUpdate(changed, initialized, settles)
+
+    def state_of(self, name: str) -> Optional[bool]:
+        """Filtered state of an input (None until it has been stable once)"""
+        bit = self.bits.get(name)
+        if bit is None or not (self.known >> bit) & 1:
+            return None
+        return bool((self.state >> bit) & 1)
+
+    def names(self, mask: int) -> Iterator[str]:
+        """Names of the inputs set in mask"""
+        for bit in iter_bits(mask & self.mask):
+            yield self._names[bit]
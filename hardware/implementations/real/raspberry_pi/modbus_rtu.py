@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+
+"""
+Modbus RTU Client
+=================
+
+Minimal Modbus RTU master for the N4DIH32 input module, used instead of
+pymodbus. It implements only what the sensor bus needs:
+
+- function code 03 (Read Holding Registers) and exception responses
+- CRC16 (polynomial 0xA001, table driven)
+- request frames built once per (device, address, count) and reused
+- the 3.5 character silent interval between frames (fixed 1.75 ms above
+  19200 baud, as the Modbus serial line spec allows)
+- a response timeout, after which late bytes are drained so the next
+  transaction starts on a clean frame boundary
+
+read_holding_registers() has the same signature and response shape
+(.registers, .isError()) as pymodbus' ModbusSerialClient, so
+RS485ModbusInterface can use either.
+
+Usage:
+    client = ModbusRTUClient("/dev/ttyUSB1", baudrate=9600, timeout=0.1)
+    client.connect()
+    response = client.read_holding_registers(address=192, count=2, device_id=1)
+    if not response.isError():
+        print(response.registers, client.last_round_trip)
+"""
+
+import struct
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import serial
+    SERIAL_AVAILABLE = True
+except ImportError:
+    serial = None
+    SERIAL_AVAILABLE = False
+
+FC_READ_HOLDING_REGISTERS = 0x03
+EXCEPTION_FLAG = 0x80
+
+
+def _crc_table() -> List[int]:
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+        table.append(crc)
+    return table
+
+
+_CRC_TABLE = _crc_table()
+
+
+def crc16(data: bytes) -> int:
+    """Modbus CRC16 of a frame body (sent low byte first)"""
+    crc = 0xFFFF
+    for byte in data:
+        crc = (crc >> 8) ^ _CRC_TABLE[(crc ^ byte) & 0xFF]
+    return crc
+
+
+def with_crc(body: bytes) -> bytes:
+    return body + struct.pack('<H', crc16(body))
+
+
+def check_crc(frame: bytes) -> bool:
+    return len(frame) >= 4 and struct.unpack('<H', frame[-2:])[0] == crc16(frame[:-2])
+
+
+def build_read_holding_registers(device_id: int, address: int, count: int) -> bytes:
+    """FC03 request frame: id, 0x03, start address, register count, CRC"""
+    return with_crc(struct.pack('>BBHH', device_id, FC_READ_HOLDING_REGISTERS, address, count))
+
+
+def character_time(baudrate: int, bytesize: int = 8, parity: str = 'N', stopbits: float = 1) -> float:
+    """Seconds on the wire for one character (start bit + data + parity + stop)"""
+    bits = 1 + bytesize + (0 if parity == 'N' else 1) + stopbits
+    return bits / float(baudrate)
+
+
+def silent_interval(baudrate: int, bytesize: int = 8, parity: str = 'N', stopbits: float = 1) -> float:
+    """Minimum gap between frames (t3.5)"""
+    if baudrate > 19200:
+        return 0.00175
+    return 3.5 * character_time(baudrate, bytesize, parity, stopbits)
+
+
+class ModbusRTUError(Exception):
+    """No response, a corrupt response, or a response to another request"""
+
+
+class ModbusResponse:
+    """Holding register values, or the exception code the device answered with"""
+
+    __slots__ = ('registers', 'exception_code')
+
+    def __init__(self, registers: Optional[List[int]] = None, exception_code: Optional[int] = None):
+        self.registers = registers or []
+        self.exception_code = exception_code
+
+    def isError(self) -> bool:
+        return self.exception_code is not None
+
+    def __repr__(self):
+        if self.isError():
+            return f"ModbusResponse(exception_code={self.exception_code})"
+        return f"ModbusResponse(registers={self.registers})"
+
+
+class ModbusRTUClient:
+    """Modbus RTU master on a serial port (FC03 only)"""
+
+    def __init__(self, port: str, baudrate: int = 9600, bytesize: int = 8, parity: str = 'N',
+                 stopbits: float = 1, timeout: float = 1.0, serial_port=None):
+        """
+        Args:
+            port: Serial device path
+            timeout: Seconds to wait for a complete response
+            serial_port: Already open serial.Serial-like object to use instead of opening `port`
+        """
+        self.port = port
+        self.baudrate = baudrate
+        self.bytesize = bytesize
+        self.parity = parity
+        self.stopbits = stopbits
+        self.timeout = timeout
+        self.serial = serial_port
+        self.char_time = character_time(baudrate, bytesize, parity, stopbits)
+        self.silent_interval = silent_interval(baudrate, bytesize, parity, stopbits)
+        self.last_round_trip: Optional[float] = None
+
+        self._lock = threading.Lock()
+        self._frames: Dict[Tuple[int, int, int], bytes] = {}
+        self._bus_idle_at = 0.0  # monotonic time the last frame ended
+
+    def connect(self) -> bool:
+        if self.serial is None:
+            if not SERIAL_AVAILABLE:
+                raise ImportError("pyserial is required for Modbus RTU")
+            self.serial = serial.Serial(
+                port=self.port, baudrate=self.baudrate, bytesize=self.bytesize,
+                parity=self.parity, stopbits=self.stopbits, timeout=self.timeout,
+            )
+        return bool(getattr(self.serial, 'is_open', True))
+
+    def close(self):
+        if self.serial is not None:
+            self.serial.close()
+            self.serial = None
+
+    def request_frame(self, device_id: int, address: int, count: int) -> bytes:
+        """Pre-built FC03 request (built on first use)"""
+        key = (device_id, address, count)
+        frame = self._frames.get(key)
+        if frame is None:
+            frame = self._frames[key] = build_read_holding_registers(device_id, address, count)
+        return frame
+
+    def read_holding_registers(self, address: int, count: int = 1, device_id: int = 1) -> ModbusResponse:
+        """
+        Read `count` holding registers starting at `address`
+
+        Raises:
+            ModbusRTUError: on timeout, CRC error or a mismatched response
+        """
+        if self.serial is None:
+            raise ModbusRTUError("Modbus RTU client not connected")
+        request = self.request_frame(device_id, address, count)
+
+        with self._lock:
+            # Respect the silent interval after the previous frame
+            gap = self._bus_idle_at + self.silent_interval - time.monotonic()
+            if gap > 0:
+                time.sleep(gap)
+
+            self.serial.reset_input_buffer()
+            started = time.monotonic()
+            self.serial.write(request)
+            try:
+                frame = self._read_response(started + self.timeout)
+                self._bus_idle_at = time.monotonic()
+                self.last_round_trip = self._bus_idle_at - started
+                return self._decode(frame, device_id, count)
+            except ModbusRTUError:
+                self._drain()
+                self._bus_idle_at = time.monotonic()
+                raise
+
+    def _read_exact(self, size: int, deadline: float) -> bytes:
+        # The port's own timeout bounds each read; changing it per read would reconfigure the tty
+        data = b""
+        while len(data) < size and time.monotonic() < deadline:
+            data += self.serial.read(size - len(data))
+        return data
+
+    def _read_response(self, deadline: float) -> bytes:
+        header = self._read_exact(3, deadline)
+        if len(header) < 3:
+            raise ModbusRTUError(f"No response within {self.timeout}s")
+        if header[1] & EXCEPTION_FLAG:
+            rest_size = 2                  # exception code already in header[2]; CRC follows
+        else:
+            rest_size = header[2] + 2      # data bytes + CRC
+        rest = self._read_exact(rest_size, deadline)
+        if len(rest) < rest_size:
+            raise ModbusRTUError(f"Incomplete response ({len(header) + len(rest)} bytes)")
+        return header + rest
+
+    def _decode(self, frame: bytes, device_id: int, count: int) -> ModbusResponse:
+        if not check_crc(frame):
+            raise ModbusRTUError("CRC error in response")
+        if frame[0] != device_id or frame[1] & 0x7F != FC_READ_HOLDING_REGISTERS:
+            raise ModbusRTUError(f"Unexpected response from device {frame[0]} (function {frame[1]})")
+        if frame[1] & EXCEPTION_FLAG:
+            return ModbusResponse(exception_code=frame[2])
+        if frame[2] != 2 * count:
+            raise ModbusRTUError(f"Expected {2 * count} data bytes, got {frame[2]}")
+        return ModbusResponse(list(struct.unpack(f'>{count}H', frame[3:3 + 2 * count])))
+
+    def _drain(self):
+        """Discard a late or partial response so it is not read as the next one"""
+        time.sleep(self.silent_interval)
+        self.serial.reset_input_buffer()
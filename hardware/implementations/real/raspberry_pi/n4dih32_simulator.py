@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+
+"""
+N4DIH32 Simulator
+=================
+
+Simulated N4DIH32 32-input Modbus RTU slave, for testing RS485 sensor
+reading (and measuring round-trip latency) without the module.
+
+N4DIH32Simulator answers function code 03 for the two input registers
+(0x00C0 = X00-X15, 0x00C1 = X16-X31) with exception 01 for other function
+codes and 02 for other addresses. Frames with a bad CRC or for another
+device id get no reply, like a real slave.
+
+SimulatedModbusSerial is a drop-in for serial.Serial; RS485ModbusInterface
+opens one when the configured serial port is "sim://n4dih32". Replies are
+delivered after the time the request and response take on the wire at
+the configured baud rate plus the device's response delay, so latency
+measurements are meaningful.
+
+Usage:
+    port = SimulatedModbusSerial(baudrate=9600, timeout=0.1)
+    port.simulator.set_input(14, True)
+    client = ModbusRTUClient(port.port, baudrate=9600, serial_port=port)
+
+    # Serve the simulator on a pseudo-terminal for other programs:
+    python3 -m hardware.implementations.real.raspberry_pi.n4dih32_simulator --baudrate 9600
+
+    # Round-trip benchmark of the built-in client at 9600/19200/115200 baud:
+    python3 -m hardware.implementations.real.raspberry_pi.n4dih32_simulator --benchmark 200
+"""
+
+import struct
+import threading
+import time
+from typing import List, Optional
+
+from hardware.implementations.real.raspberry_pi.modbus_rtu import (
+    FC_READ_HOLDING_REGISTERS, EXCEPTION_FLAG, ModbusRTUClient, character_time, check_crc, with_crc,
+)
+
+SIMULATOR_PORT = "sim://n4dih32"
+REGISTER_ADDRESS_LOW = 192
+REQUEST_FRAME_SIZE = 8  # FC03: id, fc, address(2), count(2), crc(2)
+
+ILLEGAL_FUNCTION = 0x01
+ILLEGAL_DATA_ADDRESS = 0x02
+
+
+class N4DIH32Simulator:
+    """Modbus slave state: 32 inputs behind two holding registers"""
+
+    def __init__(self, device_id: int = 1, response_delay: float = 0.002,
+                 register_address: int = REGISTER_ADDRESS_LOW):
+        """
+        Args:
+            device_id: Modbus slave id (DIP switches on the real module)
+            response_delay: Device processing time before it starts replying
+        """
+        self.device_id = device_id
+        self.response_delay = response_delay
+        self.register_address = register_address
+        self.inputs = 0                # bit N = input XN
+        self.requests = 0
+        self.muted = False             # test hook: stop answering
+        self.corrupt_next = False      # test hook: break the CRC of the next reply
+        self._lock = threading.Lock()
+        self._buffer = b""
+
+    # ========== INPUTS ==========
+
+    def set_input(self, index: int, state: bool):
+        with self._lock:
+            if state:
+                self.inputs |= 1 << index
+            else:
+                self.inputs &= ~(1 << index)
+
+    def set_inputs(self, bits: int):
+        with self._lock:
+            self.inputs = bits & 0xFFFFFFFF
+
+    def registers(self) -> List[int]:
+        with self._lock:
+            return [self.inputs & 0xFFFF, (self.inputs >> 16) & 0xFFFF]
+
+    # ========== PROTOCOL ==========
+
+    def receive(self, data: bytes) -> bytes:
+        """Feed bytes from the bus; returns the reply bytes (possibly empty)"""
+        self._buffer += data
+        replies = b""
+        while len(self._buffer) >= REQUEST_FRAME_SIZE:
+            frame = self._buffer[:REQUEST_FRAME_SIZE]
+            if not check_crc(frame):
+                self._buffer = self._buffer[1:]  # resynchronise on the next byte
+                continue
+            self._buffer = self._buffer[REQUEST_FRAME_SIZE:]
+            reply = self.handle_frame(frame)
+            if reply:
+                replies += reply
+        return replies
+
+    def handle_frame(self, frame: bytes) -> Optional[bytes]:
+        """Reply to one CRC-checked request frame (None = no reply)"""
+        device_id, function = frame[0], frame[1]
+        if device_id != self.device_id or self.muted:
+            return None
+        self.requests += 1
+        if function != FC_READ_HOLDING_REGISTERS:
+            reply = self._exception(function, ILLEGAL_FUNCTION)
+        else:
+            address, count = struct.unpack('>HH', frame[2:6])
+            offset = address - self.register_address
+            if count < 1 or offset < 0 or offset + count > 2:
+                reply = self._exception(function, ILLEGAL_DATA_ADDRESS)
+            else:
+                values = self.registers()[offset:offset + count]
+                reply = with_crc(struct.pack(f'>BBB{count}H', self.device_id, function, 2 * count, *values))
+        if self.corrupt_next:
+            self.corrupt_next = False
+            reply = reply[:-1] + bytes([reply[-1] ^ 0xFF])
+        return reply
+
+    def _exception(self, function: int, code: int) -> bytes:
+        return with_crc(bytes([self.device_id, function | EXCEPTION_FLAG, code]))
+
+
+class SimulatedModbusSerial:
+    """serial.Serial stand-in connected to an N4DIH32Simulator, with wire timing"""
+
+    def __init__(self, port: str = SIMULATOR_PORT, baudrate: int = 9600, bytesize: int = 8,
+                 parity: str = 'N', stopbits: float = 1, timeout: Optional[float] = 1.0,
+                 simulator: Optional[N4DIH32Simulator] = None, **simulator_options):
+        self.port = port
+        self.baudrate = baudrate
+        self.timeout = timeout
+        self.simulator = simulator or N4DIH32Simulator(**simulator_options)
+        self.char_time = character_time(baudrate, bytesize, parity, stopbits)
+        self.is_open = True
+        self._cond = threading.Condition()
+        self._pending = []             # (ready time, bytes) not yet on the host side
+        self._rx = b""
+
+    def write(self, data: bytes) -> int:
+        if not self.is_open:
+            raise OSError("Simulated port is closed")
+        sent_at = time.monotonic() + len(data) * self.char_time
+        reply = self.simulator.receive(data)
+        if reply:
+            ready = sent_at + self.simulator.response_delay + len(reply) * self.char_time
+            with self._cond:
+                self._pending.append((ready, reply))
+                self._cond.notify_all()
+        return len(data)
+
+    def _collect(self, now: float):
+        while self._pending and self._pending[0][0] <= now:
+            self._rx += self._pending.pop(0)[1]
+
+    @property
+    def in_waiting(self) -> int:
+        with self._cond:
+            self._collect(time.monotonic())
+            return len(self._rx)
+
+    def read(self, size: int = 1) -> bytes:
+        if not self.is_open:
+            raise OSError("Simulated port is closed")
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._collect(now)
+                if len(self._rx) >= size or (deadline is not None and now >= deadline):
+                    data, self._rx = self._rx[:size], self._rx[size:]
+                    return data
+                wake = self._pending[0][0] if self._pending else None
+                if deadline is not None:
+                    wake = deadline if wake is None else min(wake, deadline)
+                self._cond.wait(None if wake is None else max(0.0, wake - now))
+
+    def reset_input_buffer(self):
+        with self._cond:
+            self._collect(time.monotonic())
+            self._rx = b""
+
+    def close(self):
+        self.is_open = False
+
+
+def serve_pty(simulator: N4DIH32Simulator, baudrate: int = 9600):
+    """Expose the simulator on a pseudo-terminal; returns the slave device path"""
+    import os
+    import tty
+
+    master, slave = os.openpty()
+    tty.setraw(slave)
+    port = SimulatedModbusSerial(baudrate=baudrate, timeout=0.1, simulator=simulator)
+
+    def host_to_device():
+        while port.is_open:
+            try:
+                data = os.read(master, 256)
+            except OSError:
+                break
+            if data:
+                port.write(data)
+
+    def device_to_host():
+        while port.is_open:
+            data = port.read(256)
+            if data:
+                os.write(master, data)
+
+    threading.Thread(target=host_to_device, daemon=True, name="N4DIH32PtyIn").start()
+    threading.Thread(target=device_to_host, daemon=True, name="N4DIH32PtyOut").start()
+    return os.ttyname(slave)
+
+
+def benchmark(baudrate: int, samples: int = 200, device_id: int = 1) -> List[float]:
+    """Round-trip times (seconds) of the bulk read through the built-in client"""
+    port = SimulatedModbusSerial(baudrate=baudrate, timeout=0.5, device_id=device_id)
+    client = ModbusRTUClient(port.port, baudrate=baudrate, timeout=0.5, serial_port=port)
+    client.connect()
+    times = []
+    for _ in range(samples):
+        client.read_holding_registers(address=REGISTER_ADDRESS_LOW, count=2, device_id=device_id)
+        times.append(client.last_round_trip)
+    client.close()
+    return times
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Simulated N4DIH32 Modbus RTU input module")
+    parser.add_argument("--baudrate", type=int, default=9600)
+    parser.add_argument("--device-id", type=int, default=1)
+    parser.add_argument("--benchmark", type=int, metavar="N", help="time N bulk reads at 9600/19200/115200 baud")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        for baud in (9600, 19200, 115200):
+            times = sorted(benchmark(baud, args.benchmark, args.device_id))
+            mean = sum(times) / len(times)
+            p95 = times[int(len(times) * 0.95) - 1]
+            print(f"{baud:>6} baud: mean {mean * 1000:6.2f} ms  p95 {p95 * 1000:6.2f} ms  max {times[-1] * 1000:6.2f} ms")
+    else:
+        device = serve_pty(N4DIH32Simulator(args.device_id), args.baudrate)
+        print(f"Simulated N4DIH32 (device {args.device_id}) listening on {device} (Ctrl-C to stop)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+
+"""
+Piston Actuation Monitor
+========================
+
+Confirms piston commands from the RS485 input snapshots instead of
+sleeping and polling.
+
+Every piston command gets a PistonActuation handle. The monitor listens
+to the RS485 bus scheduler and resolves the handle on the first snapshot
+that shows the expected up/down sensor active, or fails it after the
+confirmation timeout. When the sensor was first seen inactive (the piston
+really moved) the time from command to confirmation is recorded per
+piston and direction.
+
+Samples that arrive within the settling window after a command are
+ignored, since switching the valve can glitch the sensor inputs. The
+window starts at piston_gpio_settling_delay; once actuation times have
+been measured it becomes half of the fastest recent actuation of that
+piston and direction, so slow pistons are filtered for longer and no
+command waits for a fixed delay. Each resolved command is also passed to
+an optional HardwareHealthMonitor for the actuation-time histograms.
+
+Usage:
+    monitor = PistonActuationMonitor(settling_time=0.05, timeout=0.5)
+    monitor.attach(rs485)
+    GPIO.output(pin, GPIO.HIGH)
+    handle = monitor.command("line_marker_piston", "down", "line_marker_down_sensor")
+    if handle.wait():
+        print(handle.actuation_time, monitor.stats())
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+# Settling window as a fraction of the fastest recently measured actuation
+SETTLING_RATIO = 0.5
+# Poll period for waiters when no sampler thread publishes snapshots
+REFRESH_INTERVAL = 0.01
+
+
+class PistonActuation:
+    """Completion handle of one piston command"""
+
+    def __init__(self, piston: str, state: str, sensor: Optional[str], settling_time: float,
+                 timeout: float, refresh: Optional[Callable[[], None]] = None,
+                 on_done: Optional[Callable[['PistonActuation'], None]] = None):
+        self.piston = piston
+        self.state = state
+        self.sensor = sensor
+        self.issued = time.time()
+        self.settling_time = settling_time
+        self.timeout = timeout
+        self.result: Optional[bool] = None          # None while pending
+        self.actuation_time: Optional[float] = None  # seconds, only when the sensor was seen moving
+        self._refresh = refresh
+        self._on_done = on_done
+        self._seen_inactive = False
+        self._lock = threading.Lock()
+        self._event = threading.Event()
+
+    def done(self) -> bool:
+        return self._event.is_set()
+
+    def observe(self, active: bool, timestamp: float) -> bool:
+        """Feed one sample of the sensor; returns True once the handle is resolved"""
+        if self.done():
+            return True
+        if timestamp < self.issued:
+            return False
+        if not active:
+            self._seen_inactive = True
+            return False
+        if timestamp - self.issued < self.settling_time:
+            return False
+        elapsed = timestamp - self.issued if self._seen_inactive else None
+        return self._resolve(True, elapsed)
+
+    def _resolve(self, ok: bool, actuation_time: Optional[float] = None) -> bool:
+        with self._lock:
+            if self.done():
+                return True
+            self.result = ok
+            self.actuation_time = actuation_time
+            self._event.set()
+        if self._on_done:
+            self._on_done(self)
+        return True
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the sensor confirms the position
+
+        Args:
+            timeout: Seconds to wait (default: the rest of the confirmation timeout)
+
+        Returns:
+            True if confirmed, False on timeout
+        """
+        deadline = self.issued + self.timeout
+        if timeout is not None:
+            deadline = min(deadline, time.time() + timeout)
+        while not self.done():
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                if time.time() >= self.issued + self.timeout:
+                    self._resolve(False)
+                break
+            if self._refresh is not None:
+                self._refresh()
+                self._event.wait(min(remaining, REFRESH_INTERVAL))
+            else:
+                self._event.wait(remaining)
+        return bool(self.result)
+
+
+class PistonActuationMonitor:
+    """Resolves piston handles from RS485 snapshots and keeps actuation statistics"""
+
+    def __init__(self, settling_time: float = 0.05, timeout: float = 0.5, adaptive: bool = True,
+                 history: int = 20, health=None):
+        """
+        Args:
+            settling_time: Settling window before any actuation has been measured (seconds)
+            timeout: Time a piston gets to reach its sensor (seconds)
+            adaptive: Derive the settling window from measured actuation times
+            history: Number of recent actuation times kept per piston and direction
+            health: Optional HardwareHealthMonitor fed with every resolved command
+        """
+        self.settling_time = settling_time
+        self.timeout = timeout
+        self.adaptive = adaptive
+        self.history = history
+        self.health = health
+        self.rs485 = None
+        self._lock = threading.Lock()
+        self._pending: List[PistonActuation] = []
+        self._times: Dict[Tuple[str, str], Deque[float]] = {}
+        self._counts: Dict[Tuple[str, str], Dict[str, int]] = {}
+
+    def configure(self, settling_time: float, timeout: float, adaptive: bool = True):
+        self.settling_time = settling_time
+        self.timeout = timeout
+        self.adaptive = adaptive
+
+    def attach(self, rs485):
+        """Listen to the snapshots of an RS485ModbusInterface"""
+        self.detach()
+        self.rs485 = rs485
+        rs485.bus.add_listener(self._on_sample)
+
+    def detach(self):
+        if self.rs485 is not None:
+            self.rs485.bus.remove_listener(self._on_sample)
+            self.rs485 = None
+
+    # ========== COMMANDS ==========
+
+    def settling_for(self, piston: str, state: str) -> float:
+        """Settling window of a piston/direction: learned from its actuation times when available"""
+        times = self._times.get((piston, state))
+        if not self.adaptive or not times:
+            return self.settling_time
+        return min(times) * SETTLING_RATIO
+
+    def command(self, piston: str, state: str, sensor: Optional[str]) -> PistonActuation:
+        """
+        Handle for a piston command just issued
+
+        Without a sensor for this piston/direction (or without RS485) the
+        handle is confirmed immediately, as there is nothing to verify.
+        """
+        rs485 = self.rs485
+        location = rs485.bus.device_for(sensor) if (rs485 is not None and sensor) else None
+        refresh = None
+        if location is not None and not rs485.sampler_running:
+            # No sampler: waiting refreshes the snapshot, which notifies _on_sample
+            device = rs485.bus.devices[location[0]]
+            refresh = lambda: rs485.get_snapshot(device)
+        handle = PistonActuation(piston, state, sensor, self.settling_for(piston, state), self.timeout,
+                                 refresh=refresh, on_done=self._record)
+        if location is None:
+            handle._resolve(True)
+            return handle
+        with self._lock:
+            self._pending.append(handle)
+        return handle
+
+    def _on_sample(self, device, snapshot):
+        """Bus listener: test the pending handles' sensors against a new snapshot"""
+        if not self._pending:
+            return
+        with self._lock:
+            pending = list(self._pending)
+        bus = self.rs485.bus
+        for handle in pending:
+            location = bus.device_for(handle.sensor)
+            if location is None or location[0] != device.name:
+                continue
+            handle.observe(bool((snapshot.bits >> location[1]) & 1), snapshot.timestamp)
+
+    def _record(self, handle: PistonActuation):
+        with self._lock:
+            if handle in self._pending:
+                self._pending.remove(handle)
+            key = (handle.piston, handle.state)
+            counts = self._counts.setdefault(key, {'commands': 0, 'timeouts': 0})
+            counts['commands'] += 1
+            if not handle.result:
+                counts['timeouts'] += 1
+            if handle.actuation_time is not None:
+                self._times.setdefault(key, deque(maxlen=self.history)).append(handle.actuation_time)
+        if self.health is not None and handle.sensor is not None and self.rs485 is not None:
+            self.health.record_actuation(handle.piston, handle.state, handle.actuation_time, bool(handle.result))
+
+    # ========== DIAGNOSTICS ==========
+
+    def stats(self) -> Dict[str, Dict]:
+        """Per 'piston:direction': command/timeout counts, actuation times (ms) and settling window (ms)"""
+        with self._lock:
+            keys = sorted(set(self._counts) | set(self._times))
+            result = {}
+            for piston, state in keys:
+                times = list(self._times.get((piston, state), ()))
+                counts = self._counts.get((piston, state), {'commands': 0, 'timeouts': 0})
+                result[f"{piston}:{state}"] = {
+                    'commands': counts['commands'],
+                    'timeouts': counts['timeouts'],
+                    'samples': len(times),
+                    'last_ms': times[-1] * 1000 if times else None,
+                    'mean_ms': sum(times) / len(times) * 1000 if times else None,
+                    'min_ms': min(times) * 1000 if times else None,
+                    'max_ms': max(times) * 1000 if times else None,
+                    'settling_ms': self.settling_for(piston, state) * 1000,
+                }
+        return result
@@ -13,6 +13,13 @@ import time
 import threading
 from typing import Dict, Optional
 from hardware.implementations.real.raspberry_pi.rs485_modbus import RS485ModbusInterface
+from hardware.implementations.real.raspberry_pi.piston_actuation import PistonActuation, PistonActuationMonitor
+from hardware.implementations.real.raspberry_pi.hardware_health import HardwareHealthMonitor
+from hardware.implementations.real.raspberry_pi.input_debounce import BitmaskDebouncer
+from hardware.implementations.real.raspberry_pi.switch_poll_scheduler import (
+    SwitchPollScheduler, sensor_group, GROUP_EDGE, GROUP_PISTON, GROUP_LIMIT, GROUP_OTHER,
+)
+from core.analytics_health import load_baselines
 from core.logger import get_logger
 
 # Module-level logger
@@ -108,19 +115,51 @@ class RaspberryPiGPIO:
         self.polling_active = False
         self.switch_states = {}  # Track last known state of all switches
 
+        # Sensor waiters block on this condition; it is notified on every switch change
+        self._switch_cond = threading.Condition()
+        self._switch_version = 0
+
+        # Edge switches reported by RPi.GPIO interrupts instead of the polling thread
+        self._edge_detection = self.gpio_config.get("edge_detection", True)
+        self._edge_detect_pins = {}  # pin -> sensor name
+
         # Load all timing config values
         timing_config = self.config.get("timing", {})
         self._piston_settling_time = timing_config.get("piston_gpio_settling_delay", 0.05)
         self._gpio_cleanup_delay = timing_config.get("gpio_cleanup_delay", 0.1)
         self._gpio_busy_recovery_delay = timing_config.get("gpio_busy_recovery_delay", 0.05)
-        self._gpio_debounce_samples = timing_config.get("gpio_debounce_samples", 3)
-        self._gpio_debounce_delay = timing_config.get("gpio_debounce_delay_ms", 1) / 1000.0
         self._gpio_test_read_delay = timing_config.get("gpio_test_read_delay_ms", 1) / 1000.0
         self._polling_thread_join_timeout = timing_config.get("polling_thread_join_timeout", 1.0)
         self._switch_polling_interval = timing_config.get("switch_polling_interval_ms", 10) / 1000.0
         self._polling_status_update_freq = timing_config.get("polling_status_update_frequency", 1000)
         self._polling_error_recovery_delay = timing_config.get("polling_error_recovery_delay", 0.1)
 
+        # Adaptive switch polling: fast only for the groups in use, idle rate otherwise
+        self._piston_boost_duration = timing_config.get("piston_sensor_boost_duration", 2.0)
+        self.poll_scheduler = SwitchPollScheduler(
+            self._poll_group_intervals(timing_config),
+            idle_interval=timing_config.get("idle_switch_poll_interval_ms", 100) / 1000.0,
+            adaptive=timing_config.get("adaptive_switch_polling", True),
+            idle_intervals=self._poll_group_idle_intervals(timing_config),
+        )
+
+        # Actuation-time and sensor-bounce histograms with drift alerts
+        self.health_monitor = HardwareHealthMonitor(
+            window=timing_config.get("health_histogram_window", 200),
+            drift_ratio=timing_config.get("piston_p95_drift_ratio", 1.5),
+        )
+        # Compare against the baselines of earlier runs, not just this process's first actuations
+        health_path = self.config.get("analytics", {}).get("health_file_path", "data/analytics/hardware_health.csv")
+        self.health_monitor.seed_baselines(load_baselines(health_path))
+
+        # Piston commands are confirmed from the RS485 snapshots
+        self.actuation_monitor = PistonActuationMonitor(
+            settling_time=self._piston_settling_time,
+            timeout=timing_config.get("piston_confirm_timeout", 0.5),
+            adaptive=timing_config.get("adaptive_piston_settling", True),
+            health=self.health_monitor,
+        )
+
         # Load debounce count from raspberry_pi config
         self._debounce_count = self.gpio_config.get("debounce_count", 2)
 
@@ -144,6 +183,22 @@ class RaspberryPiGPIO:
         # REMOVED limit switch logging - not part of user's machine
         self.logger.info("="*60, category="hardware")
 
+    @staticmethod
+    def _poll_group_intervals(timing_config: Dict) -> Dict[str, float]:
+        """Active poll interval (seconds) of each switch group from the timing settings"""
+        base_ms = timing_config.get("switch_polling_interval_ms", 10)
+        return {
+            GROUP_EDGE: timing_config.get("edge_sensor_poll_interval_ms", base_ms) / 1000.0,
+            GROUP_PISTON: timing_config.get("piston_sensor_poll_interval_ms", base_ms) / 1000.0,
+            GROUP_LIMIT: timing_config.get("limit_switch_poll_interval_ms", base_ms) / 1000.0,
+            GROUP_OTHER: base_ms / 1000.0,
+        }
+
+    @staticmethod
+    def _poll_group_idle_intervals(timing_config: Dict) -> Dict[str, float]:
+        """Idle poll interval (seconds) of the groups that do not use idle_switch_poll_interval_ms"""
+        return {GROUP_OTHER: timing_config.get("other_switch_idle_interval_ms", 50) / 1000.0}
+
     def _load_config(self, config_path: str) -> Dict:
         """Load configuration from settings.json"""
         try:
@@ -247,14 +302,22 @@ class RaspberryPiGPIO:
                         register_address_low=self.rs485_config.get('register_address_low', 192),
                         bulk_read_register_count=self.rs485_config.get('bulk_read_register_count', 2),
                         default_retry_count=self.rs485_config.get('default_retry_count', 2),
-                        retry_delay=self.config.get('timing_parameters', {}).get('rs485_retry_delay', 0.01)
+                        retry_delay=self.config.get('timing_parameters', {}).get('rs485_retry_delay', 0.01),
+                        bulk_read_max_age=self.rs485_config.get('bulk_read_cache_age_ms', 10) / 1000.0,
+                        backend=self.rs485_config.get('modbus_backend', 'builtin'),
+                        additional_devices=self.rs485_config.get('additional_devices', [])
                     )
 
                     # Connect to RS485 bus
                     if not self.rs485.connect():
                         raise RuntimeError("Failed to connect to RS485 bus")
 
-                    sensor_count = len(self.rs485_config.get('sensor_addresses', {}))
+                    # One thread owns the bus; sensor reads use its latest snapshot
+                    if self.rs485_config.get('sampler_enabled', True):
+                        self.rs485.start_sampler(self.rs485_config.get('sampler_interval_ms', 10) / 1000.0)
+                    self.actuation_monitor.attach(self.rs485)
+
+                    sensor_count = len(self._rs485_sensor_addresses())
                     self.logger.debug("RS485 initialized", category="hardware")
                     self.logger.debug(f"Serial port: {self.rs485_config.get('serial_port')}", category="hardware")
                     self.logger.debug(f"Baudrate: {self.rs485_config.get('baudrate')}", category="hardware")
@@ -318,7 +381,7 @@ class RaspberryPiGPIO:
                     self._last_sensor_states[sensor_name] = False
 
                 if self.rs485:
-                    sensor_addresses = self.rs485_config.get('sensor_addresses', {})
+                    sensor_addresses = self._rs485_sensor_addresses()
                     for sensor_name in sensor_addresses.keys():
                         self._last_sensor_states[sensor_name] = False
 
@@ -360,7 +423,7 @@ class RaspberryPiGPIO:
 
     def set_piston(self, piston_name: str, state: str) -> bool:
         """
-        Set piston state with COMPREHENSIVE electrical interference suppression
+        Set piston state and wait until its position sensor confirms it
 
         Args:
             piston_name: Name of piston (e.g., 'line_marker_piston')
@@ -368,25 +431,41 @@ class RaspberryPiGPIO:
 
         Returns:
             True if successful, False otherwise
+        """
+        handle = self.command_piston(piston_name, state)
+        if handle is None:
+            return False
+        if not handle.wait():
+            self.logger.warning(f"Piston '{piston_name}' may not have reached '{state}' position", category="gpio")
+            return False
+        return True
+
+    def command_piston(self, piston_name: str, state: str) -> Optional[PistonActuation]:
+        """
+        Set piston output and return without waiting
 
-        Note:
-            This method includes comprehensive recovery mechanisms to prevent
-            persistent false positives on sensor channels. The fix addresses
-            GPIO pin corruption that can persist indefinitely after piston operations.
+        The returned handle resolves as soon as the RS485 snapshots show the
+        expected up/down sensor (see PistonActuationMonitor); samples within
+        the settling window after the command are ignored to suppress
+        electrical interference from the valve.
+
+        Returns:
+            Completion handle, or None if the output could not be set
         """
         if not self.is_initialized:
             self.logger.error("GPIO not initialized", category="hardware")
-            return False
+            return None
 
         if piston_name not in self.piston_pins:
             self.logger.error(f"Unknown piston: {piston_name}", category="hardware")
-            return False
+            return None
 
         try:
             pin = self.piston_pins[piston_name]
             # HIGH = extended/down, LOW = retracted/up
             gpio_state = GPIO.HIGH if state == "down" else GPIO.LOW
             GPIO.output(pin, gpio_state)
+            self.poll_scheduler.boost(GROUP_PISTON, self._piston_boost_duration)
 
             # Track the actual GPIO pin state
             with self._piston_state_lock:
@@ -394,60 +473,43 @@ class RaspberryPiGPIO:
 
             self.logger.debug(f"Piston '{piston_name}' set to {state.upper()} (GPIO {pin} = {'HIGH' if gpio_state else 'LOW'})", category="hardware")
 
-            # Settling delay to allow electrical noise to dissipate
-            time.sleep(self._piston_settling_time)
-
-            # Verify piston reached target position via sensor (best-effort)
-            if not self._verify_piston_position(piston_name, state):
-                self.logger.warning(f"Piston '{piston_name}' may not have reached '{state}' position", category="gpio")
-                return False
-
-            return True
+            sensor_name = self._PISTON_SENSOR_MAP.get(piston_name, {}).get(state)
+            return self.actuation_monitor.command(piston_name, state, sensor_name)
         except Exception as e:
             self.logger.error(f"Error setting piston {piston_name}: {e}", category="hardware")
-            return False
+            return None
 
-    def _verify_piston_position(self, piston_name: str, expected_state: str, timeout: float = 0.5) -> bool:
+    def set_pistons(self, states: Dict[str, str]) -> bool:
         """
-        Verify piston reached target position by reading the corresponding sensor.
+        Set several pistons at once and wait for all their sensors together
+
+        All outputs are driven first, then the completion handles are
+        waited on, so the total time is that of the slowest piston rather
+        than the sum.
 
         Args:
-            piston_name: Name of piston
-            expected_state: Expected state ('up' or 'down')
-            timeout: Maximum time to wait for sensor confirmation (seconds)
+            states: piston name -> 'up' or 'down'
 
         Returns:
-            True if sensor confirms position, False if not
+            True if every piston was set and confirmed
         """
-        # Look up the sensor for this piston/state combination
-        sensor_map = self._PISTON_SENSOR_MAP.get(piston_name)
-        if not sensor_map:
-            # No sensor mapping for this piston (e.g. air_pressure_valve) - skip verification
-            return True
-
-        sensor_name = sensor_map.get(expected_state)
-        if not sensor_name:
-            return True
-
-        # Check if RS485 is available for sensor reading
-        if not self.rs485:
-            # No RS485 module - can't verify, assume success
-            return True
-
-        # Poll sensor with timeout
-        start_time = time.time()
-        poll_interval = 0.05  # 50ms between polls
-
-        while time.time() - start_time < timeout:
-            try:
-                sensor_value = self.read_sensor(sensor_name)
-                if sensor_value is True:
-                    return True
-            except Exception:
-                pass
-            time.sleep(poll_interval)
-
-        return False
+        handles = {piston_name: self.command_piston(piston_name, state) for piston_name, state in states.items()}
+        ok = True
+        for piston_name, handle in handles.items():
+            if handle is None:
+                ok = False
+            elif not handle.wait():
+                self.logger.warning(f"Piston '{piston_name}' may not have reached '{states[piston_name]}' position", category="gpio")
+                ok = False
+        return ok
+
+    def piston_actuation_stats(self) -> Dict[str, Dict]:
+        """Measured actuation times and timeouts per piston and direction"""
+        return self.actuation_monitor.stats()
+
+    def hardware_health(self) -> Dict:
+        """Piston actuation and sensor bounce histograms plus drift alerts"""
+        return self.health_monitor.snapshot()
 
     def piston_up(self, piston_name: str) -> bool:
         """Retract piston (set to UP position)"""
@@ -504,58 +566,13 @@ class RaspberryPiGPIO:
 
     # ========== SENSOR READING METHODS ==========
 
-    def _read_with_debounce(self, pin_or_channel, is_rs485=False, sensor_name=None, samples=None, delay=None):
-        """
-        Read GPIO or RS485 with debouncing
-
-        Args:
-            pin_or_channel: GPIO pin number (for direct GPIO)
-            is_rs485: True if reading from RS485
-            sensor_name: Sensor name for RS485 lookup (if is_rs485=True)
-            samples: Number of consistent reads required (defaults to configured value)
-            delay: Delay between reads in seconds (defaults to configured value)
-
-        Returns:
-            Stable boolean state or None if reads are inconsistent
-        """
-        import time
-
-        # Use configured values if not provided
-        if samples is None:
-            samples = self._gpio_debounce_samples
-        if delay is None:
-            delay = self._gpio_debounce_delay
-
-        # PERFORMANCE OPTIMIZED: Minimal RS485 debouncing for 50ms trigger detection
-        if is_rs485:
-            samples = 1  # Single read for RS485 (bulk read already filtered by hardware)
-            delay = 0  # No delay needed for single sample
-
-        readings = []
-        for i in range(samples):
-            if is_rs485 and self.rs485:
-                # For RS485, read via Modbus
-                register_address = self.rs485_config.get('register_address', 0)
-                value = self.rs485.read_sensor(sensor_name, register_address)
-                if value is None:
-                    # RS485 read failed - return None
-                    return None
-            else:
-                # For direct GPIO
-                value = GPIO.input(pin_or_channel)
-
-            readings.append(value)
-
-            if i < samples - 1:  # Don't delay after last read
-                time.sleep(delay)
-
-        # Check if all readings are consistent
-        if all(r == readings[0] for r in readings):
-            return bool(readings[0])
-        else:
-            # Inconsistent reads - sensor is bouncing/noisy
-            # Return None to indicate unstable read
-            return None
+    def _rs485_sensor_addresses(self) -> Dict[str, int]:
+        """Sensors of the main RS485 module and every additional device (name -> input index)"""
+        addresses = dict(self.rs485_config.get('sensor_addresses', {}))
+        for device in self.rs485_config.get('additional_devices', []):
+            for sensor_name, address in device.get('sensor_addresses', {}).items():
+                addresses.setdefault(sensor_name, address)
+        return addresses
 
     def read_sensor(self, sensor_name: str) -> Optional[bool]:
         """
@@ -581,7 +598,7 @@ class RaspberryPiGPIO:
                 self.logger.debug(f"   Switch states keys: {list(self.switch_states.keys())}", category="hardware")
 
             # Check if sensor is connected via RS485
-            rs485_addresses = self.rs485_config.get('sensor_addresses', {})
+            rs485_addresses = self._rs485_sensor_addresses()
             if sensor_name in rs485_addresses:
                 # Return state from polling thread's switch_states (debounced and verified)
                 switch_key = f"rs485_{sensor_name}"
@@ -707,7 +724,7 @@ class RaspberryPiGPIO:
 
         # Read all RS485 sensors
         if self.rs485:
-            sensor_addresses = self.rs485_config.get('sensor_addresses', {})
+            sensor_addresses = self._rs485_sensor_addresses()
             for sensor_name in sensor_addresses.keys():
                 state = self.read_sensor(sensor_name)
                 if state is not None:
@@ -740,18 +757,18 @@ class RaspberryPiGPIO:
 
         # Read all RS485 sensors
         if self.rs485:
-            sensor_addresses = self.rs485_config.get('sensor_addresses', {})
+            sensor_addresses = self._rs485_sensor_addresses()
             self.logger.info(f"Initializing {len(sensor_addresses)} RS485 sensor states...", category="hardware")
             for sensor_name, slave_address in sensor_addresses.items():
                 try:
-                    state = self._read_with_debounce(None, is_rs485=True, sensor_name=sensor_name)
+                    state = self.rs485.read_sensor(sensor_name)
                     if state is not None:
                         self._last_sensor_states[sensor_name] = state
                         state_str = 'HIGH (ACTIVE)' if state else 'LOW (INACTIVE)'
                         self.logger.info(f"   RS485 {sensor_name:30s} [ADDR{slave_address:2d}] = {state_str}", category="hardware")
                     else:
                         self._last_sensor_states[sensor_name] = False  # Default to False if unstable
-                        self.logger.warning(f"   RS485 {sensor_name:30s} [ADDR{slave_address:2d}] = UNSTABLE (defaulting to LOW)", category="hardware")
+                        self.logger.warning(f"   RS485 {sensor_name:30s} [ADDR{slave_address:2d}] = READ FAILED (defaulting to LOW)", category="hardware")
                 except Exception as e:
                     self.logger.error(f"   RS485 {sensor_name:30s} [ADDR{slave_address:2d}] = ERROR: {e}", category="hardware")
                     self._last_sensor_states[sensor_name] = False
@@ -823,13 +840,12 @@ class RaspberryPiGPIO:
         self.logger.info("TESTING RS485 SENSOR READS", category="hardware")
         self.logger.info("="*60, category="hardware")
 
-        sensor_addresses = self.rs485_config.get('sensor_addresses', {})
+        sensor_addresses = self._rs485_sensor_addresses()
         self.logger.info(f"Testing {len(sensor_addresses)} RS485 sensors...", category="hardware")
 
         for sensor_name, slave_address in sensor_addresses.items():
             try:
-                # Read with 3-sample debouncing (PERFORMANCE OPTIMIZED)
-                state = self._read_with_debounce(None, is_rs485=True, sensor_name=sensor_name)
+                state = self.rs485.read_sensor(sensor_name)
 
                 if state is not None:
                     state_str = 'HIGH (ACTIVE/TRIGGERED)' if state else 'LOW (INACTIVE)'
@@ -846,6 +862,87 @@ class RaspberryPiGPIO:
 
     # ========== CONTINUOUS SWITCH POLLING ==========
 
+    def _set_switch_state(self, switch_key: str, state) -> None:
+        """Store a switch state and wake any sensor waiters"""
+        with self._switch_cond:
+            self.switch_states[switch_key] = state
+            self._switch_version += 1
+            self._switch_cond.notify_all()
+
+    def switch_version(self) -> int:
+        """Counter bumped on every switch change (pass to wait_for_switch_change)"""
+        with self._switch_cond:
+            return self._switch_version
+
+    def wait_for_switch_change(self, since: int, timeout: float) -> int:
+        """
+        Block until any switch changes after `since` or the timeout expires
+
+        Returns:
+            The current switch version
+        """
+        with self._switch_cond:
+            self._switch_cond.wait_for(lambda: self._switch_version != since, timeout=timeout)
+            return self._switch_version
+
+    def wake_sensor_waiters(self) -> None:
+        """Wake every wait_for_switch_change() caller so it re-checks its stop conditions"""
+        with self._switch_cond:
+            self._switch_version += 1
+            self._switch_cond.notify_all()
+
+    def _update_edge_switch(self, sensor_name: str, pin) -> None:
+        """Read one edge switch and record (and log) a change"""
+        self._record_edge_switch(sensor_name, pin, GPIO.input(pin))  # Direct read: HIGH=triggered, LOW=ready
+
+    def _record_edge_switch(self, sensor_name: str, pin, current_state) -> None:
+        """Store an edge switch state and log it if it changed"""
+        last_state = self.switch_states.get(sensor_name)
+
+        # Detect state changes
+        if current_state != last_state:
+            self._set_switch_state(sensor_name, current_state)
+            self.logger.info("="*60, category="hardware")
+            self.logger.info(f"EDGE SWITCH CHANGED: {sensor_name}", category="hardware")
+            self.logger.info(f"  Pin: {pin}", category="hardware")
+            self.logger.info(f"  Previous: {'TRIGGERED' if last_state else 'READY'}", category="hardware")
+            self.logger.info(f"  Current: {'TRIGGERED' if current_state else 'READY'}", category="hardware")
+            self.logger.info("="*60, category="hardware")
+
+    def _on_edge_interrupt(self, pin) -> None:
+        """RPi.GPIO callback (runs on its event thread) for an edge switch pin"""
+        sensor_name = self._edge_detect_pins.get(pin)
+        if sensor_name is None:
+            return
+        try:
+            self._update_edge_switch(sensor_name, pin)
+        except Exception as e:
+            self.logger.error(f"Error reading {sensor_name} on pin {pin}: {e}", category="hardware")
+
+    def _start_edge_detection(self) -> None:
+        """Register edge interrupts for the edge switches; pins that fail stay polled"""
+        if not self._edge_detection or not hasattr(GPIO, "add_event_detect"):
+            return
+        thresholds = self.gpio_config.get("debounce_thresholds", {})
+        for sensor_name, pin in self.direct_sensor_pins.items():
+            if thresholds.get(sensor_name, 1) > 1:
+                continue  # debounced by the polling thread
+            try:
+                GPIO.add_event_detect(pin, GPIO.BOTH, callback=self._on_edge_interrupt)
+                self._edge_detect_pins[pin] = sensor_name
+            except (RuntimeError, ValueError) as e:
+                self.logger.warning(f"Edge detection unavailable for {sensor_name} [pin {pin}], polling instead: {e}", category="hardware")
+        if self._edge_detect_pins:
+            self.logger.info(f"   Edge interrupts active for {len(self._edge_detect_pins)} edge switches", category="hardware")
+
+    def _stop_edge_detection(self) -> None:
+        for pin in list(self._edge_detect_pins):
+            try:
+                GPIO.remove_event_detect(pin)
+            except Exception as e:
+                self.logger.debug(f"remove_event_detect({pin}): {e}", category="hardware")
+        self._edge_detect_pins.clear()
+
     def start_switch_polling(self):
         """Start continuous polling thread to monitor all switches"""
         if self.polling_active:
@@ -854,9 +951,11 @@ class RaspberryPiGPIO:
 
         self.logger.info("Starting continuous switch polling thread...", category="hardware")
         self.logger.info("   This thread will monitor ALL switches and log state changes", category="hardware")
-        self.logger.info("   Poll interval: 10ms (100 times per second) - REAL-TIME OPTIMIZED", category="hardware")
+        for group in (GROUP_EDGE, GROUP_PISTON, GROUP_LIMIT, GROUP_OTHER):
+            self.logger.info(f"   {group} poll interval: {self.poll_scheduler.interval(group) * 1000:.0f}ms", category="hardware")
 
         self.polling_active = True
+        self._start_edge_detection()
         self.polling_thread = threading.Thread(target=self._poll_switches_continuously, daemon=True)
         self.polling_thread.start()
 
@@ -865,10 +964,132 @@ class RaspberryPiGPIO:
         if self.polling_active:
             self.logger.info("Stopping switch polling thread...", category="hardware")
             self.polling_active = False
+            self.poll_scheduler.wake()
+            self._stop_edge_detection()
             if self.polling_thread:
                 self.polling_thread.join(timeout=self._polling_thread_join_timeout)
             self.logger.info("Polling thread stopped", category="hardware")
 
+    def _debounce_thresholds(self, names: Dict[str, str], default: int) -> Dict[str, int]:
+        """Input key -> debounce threshold, from debounce_thresholds by sensor/switch name"""
+        configured = self.gpio_config.get("debounce_thresholds", {})
+        return {key: configured.get(name, default) for key, name in names.items()}
+
+    def _build_gpio_banks(self) -> Dict[str, Dict]:
+        """Per switch group, a debouncer over the GPIO pins the polling thread reads"""
+        inputs: Dict[str, Dict[str, tuple]] = {}
+        for sensor_name, pin in self.direct_sensor_pins.items():
+            if pin not in self._edge_detect_pins:
+                inputs.setdefault(sensor_group(sensor_name), {})[sensor_name] = (sensor_name, pin, False)
+        for switch_name, pin in self.limit_switch_pins.items():
+            # Limit switches are active LOW
+            inputs.setdefault(GROUP_LIMIT, {})[f"limit_{switch_name}"] = (switch_name, pin, True)
+
+        banks = {}
+        for group, pins in inputs.items():
+            keys = list(pins)
+            thresholds = self._debounce_thresholds({key: pins[key][0] for key in keys}, 1)
+            banks[group] = {
+                'debouncer': BitmaskDebouncer({key: bit for bit, key in enumerate(keys)}, thresholds, 1),
+                'pins': [(1 << bit, pins[key][1], pins[key][2], key) for bit, key in enumerate(keys)],
+                'raw': 0,
+            }
+        return banks
+
+    def _build_rs485_banks(self) -> Dict[str, Dict]:
+        """Per RS485 bus device and switch group ("device/group"), a debouncer over those sensor bits"""
+        banks = {}
+        for device in self.rs485.bus.devices.values():
+            addresses: Dict[str, Dict[str, int]] = {}
+            for name, address in device.sensor_addresses.items():
+                addresses.setdefault(sensor_group(name), {})[name] = address
+            for group, sensor_addresses in addresses.items():
+                names = {name: name for name in sensor_addresses}
+                banks[f"{device.name}/{group}"] = {
+                    'device': device,
+                    'group': group,
+                    'debouncer': BitmaskDebouncer(sensor_addresses,
+                                                  self._debounce_thresholds(names, self._debounce_count),
+                                                  self._debounce_count),
+                    'sequence': None,
+                }
+        return banks
+
+    def _apply_rs485_poll_rates(self, rs485_banks: Dict[str, Dict]) -> None:
+        """Slow each RS485 device down to the fastest current interval of its switch groups"""
+        intervals: Dict[str, float] = {}
+        for bank in rs485_banks.values():
+            name = bank['device'].name
+            interval = self.poll_scheduler.interval(bank['group'])
+            intervals[name] = min(interval, intervals.get(name, interval))
+        for name, interval in intervals.items():
+            if self.rs485.bus.devices[name].min_interval != interval:
+                self.rs485.bus.set_min_interval(name, interval)
+
+    def _poll_gpio_bank(self, bank: Dict, poll_count: int) -> None:
+        """Sample the pins of one bank into a mask and apply the debounced changes"""
+        raw = 0
+        for bit, pin, active_low, key in bank['pins']:
+            try:
+                if bool(GPIO.input(pin)) != active_low:
+                    raw |= bit
+            except Exception as e:
+                raw |= bank['raw'] & bit  # keep the last reading
+                self.logger.error(f"Error reading {key} on pin {pin}: {e}", category="hardware")
+        bank['raw'] = raw
+
+        debouncer = bank['debouncer']
+        update = debouncer.update(raw)
+        if update.changed or update.initialized:
+            pins = {key: pin for _, pin, _, key in bank['pins']}
+            for key in debouncer.names(update.changed | update.initialized):
+                state = debouncer.state_of(key)
+                if key.startswith("limit_"):
+                    self._record_limit_switch(key, pins[key], state, poll_count)
+                else:
+                    self._record_edge_switch(key, pins[key], state)
+        for name, bounces, changed in update.settles:
+            self.health_monitor.record_sensor(name, bounces, changed)
+
+    def _poll_rs485_bank(self, bank: Dict, poll_count: int) -> None:
+        """Debounce a new snapshot of one RS485 device/group bank and publish the changed sensors"""
+        snapshot = self.rs485.get_snapshot(bank['device'])
+        if snapshot is None or snapshot.sequence == bank['sequence']:
+            return  # read failed, or no new sample since the last sweep
+        bank['sequence'] = snapshot.sequence
+
+        debouncer = bank['debouncer']
+        update = debouncer.update(snapshot.bits)
+        for sensor_name in debouncer.names(update.initialized):
+            state = debouncer.state_of(sensor_name)
+            self._set_switch_state(f"rs485_{sensor_name}", state)
+            state_str = 'HIGH (ACTIVE/TRIGGERED)' if state else 'LOW (INACTIVE)'
+            self.logger.info(f"RS485 SENSOR INITIALIZED: {sensor_name} = {state_str} [address {debouncer.bits[sensor_name]}]", category="hardware")
+        for sensor_name in debouncer.names(update.changed):
+            state = debouncer.state_of(sensor_name)
+            self._set_switch_state(f"rs485_{sensor_name}", state)
+            self.logger.info("=== RS485 SENSOR CHANGED ===", category="hardware")
+            self.logger.info(f"   Sensor: {sensor_name}", category="hardware")
+            self.logger.info(f"   Modbus Address: {debouncer.bits[sensor_name]}", category="hardware")
+            self.logger.info(f"   Old State: {'LOW (INACTIVE)' if state else 'HIGH (ACTIVE/TRIGGERED)'}", category="hardware")
+            self.logger.info(f"   New State: {'HIGH (ACTIVE/TRIGGERED)' if state else 'LOW (INACTIVE)'}", category="hardware")
+            self.logger.info(f"   Poll: #{poll_count}", category="hardware")
+        for sensor_name, bounces, changed in update.settles:
+            self.health_monitor.record_sensor(sensor_name, bounces, changed)
+
+    def _record_limit_switch(self, switch_key: str, pin, state: bool, poll_count: int) -> None:
+        """Store a debounced limit switch state and log it"""
+        switch_name = switch_key[len("limit_"):]
+        last_state = self.switch_states.get(switch_key)
+        if last_state == state:
+            return
+        self._set_switch_state(switch_key, state)
+        state_str = 'ACTIVATED (CLOSED)' if state else 'INACTIVE (OPEN)'
+        if last_state is None:
+            self.logger.debug(f"LIMIT SWITCH INITIAL: {switch_name} = {state_str} [pin {pin}]", category="hardware")
+        else:
+            self.logger.info(f"LIMIT SWITCH CHANGED: {switch_name} = {state_str} [pin {pin}] (poll #{poll_count})", category="hardware")
+
     def _poll_switches_continuously(self):
         """Background thread that continuously polls all switches and logs changes"""
         self.logger.info("Switch polling thread started", category="hardware")
@@ -877,132 +1098,46 @@ class RaspberryPiGPIO:
         for sensor_name, pin in self.direct_sensor_pins.items():
             try:
                 current_state = GPIO.input(pin)  # Direct read: HIGH=triggered, LOW=ready
-                self.switch_states[sensor_name] = current_state
+                self._set_switch_state(sensor_name, current_state)
                 self.logger.debug(f"Edge switch {sensor_name} [pin {pin}] initialized: {'TRIGGERED' if current_state else 'READY'}", category="hardware")
             except Exception as e:
                 self.logger.error(f"Error initializing {sensor_name}: {e}", category="hardware")
-                self.switch_states[sensor_name] = False
+                self._set_switch_state(sensor_name, False)
 
-        # Initialize debounce counters for RS485 sensors
-        debounce_counters = {}
+        # Debounced input banks: polled GPIO pins per switch group, RS485 inputs per bus device
+        gpio_banks = self._build_gpio_banks()
+        rs485_banks = self._build_rs485_banks() if self.rs485 else {}
+        self.poll_scheduler.set_groups(set(gpio_banks) | {bank['group'] for bank in rs485_banks.values()})
 
         poll_count = 0
 
         while self.polling_active:
             try:
                 poll_count += 1
-
-                # Read ALL edge switches
-                for sensor_name, pin in self.direct_sensor_pins.items():
-                    try:
-                        current_state = GPIO.input(pin)  # Direct read: HIGH=triggered, LOW=ready
-                        last_state = self.switch_states.get(sensor_name)
-
-                        # Detect state changes
-                        if current_state != last_state:
-                            self.switch_states[sensor_name] = current_state
-                            self.logger.info("="*60, category="hardware")
-                            self.logger.info(f"EDGE SWITCH CHANGED: {sensor_name}", category="hardware")
-                            self.logger.info(f"  Pin: {pin}", category="hardware")
-                            self.logger.info(f"  Previous: {'TRIGGERED' if last_state else 'READY'}", category="hardware")
-                            self.logger.info(f"  Current: {'TRIGGERED' if current_state else 'READY'}", category="hardware")
-                            self.logger.info("="*60, category="hardware")
-
-                    except Exception as e:
-                        self.logger.error(f"Error reading {sensor_name} on pin {pin}: {e}", category="hardware")
-
-                # Poll RS485 switches (piston position sensors)
-                if self.rs485:
-                    sensor_addresses = self.rs485_config.get('sensor_addresses', {})
-                    for sensor_name, slave_address in sensor_addresses.items():
-                        try:
-                            # Direct read from bulk cache (no debouncing - optimized for 50ms triggers)
-                            current_state = self._read_with_debounce(None, is_rs485=True, sensor_name=sensor_name)
-
-                            # Skip if read was unstable (returns None)
-                            if current_state is None:
-                                continue
-
-                            switch_key = f"rs485_{sensor_name}"
-                            last_confirmed_state = self.switch_states.get(switch_key)
-
-                            # Initialize debounce counter for this sensor if needed
-                            if switch_key not in debounce_counters:
-                                debounce_counters[switch_key] = {'pending_state': None, 'count': 0}
-
-                            debounce = debounce_counters[switch_key]
-
-                            # Handle debounce logic for initial and subsequent reads
-                            if debounce['pending_state'] is None:
-                                # Very first read of this sensor - start debounce
-                                debounce['pending_state'] = current_state
-                                debounce['count'] = 1
-                                self.logger.debug(f"RS485 SWITCH FIRST READ: {sensor_name} = {'HIGH (CLOSED/ON)' if current_state else 'LOW (OPEN/OFF)'} [address {slave_address}] - waiting for confirmation", category="hardware")
-                            elif debounce['pending_state'] == current_state:
-                                # Reading matches pending state, increment count
-                                debounce['count'] += 1
-                            else:
-                                # State changed, restart debounce
-                                debounce['pending_state'] = current_state
-                                debounce['count'] = 1
-
-                            # Check if we have enough consecutive readings
-                            if debounce['count'] >= self._debounce_count:
-                                # Check if this is different from confirmed state (or first confirmation)
-                                if current_state != last_confirmed_state:
-                                    # State change confirmed (or initial state set)!
-                                    self.switch_states[switch_key] = current_state
-
-                                    # Log state change or initial state
-                                    if last_confirmed_state is not None:
-                                        # Real state change (not initial)
-                                        old_state_str = 'HIGH (ACTIVE/TRIGGERED)' if last_confirmed_state else 'LOW (INACTIVE)'
-                                        new_state_str = 'HIGH (ACTIVE/TRIGGERED)' if current_state else 'LOW (INACTIVE)'
-                                        self.logger.info("=== RS485 SENSOR CHANGED ===", category="hardware")
-                                        self.logger.info(f"   Sensor: {sensor_name}", category="hardware")
-                                        self.logger.info(f"   Modbus Address: {slave_address}", category="hardware")
-                                        self.logger.info(f"   Old State: {old_state_str}", category="hardware")
-                                        self.logger.info(f"   New State: {new_state_str}", category="hardware")
-                                        self.logger.info(f"   Poll: #{poll_count}", category="hardware")
-                                    else:
-                                        # Initial state set
-                                        state_str = 'HIGH (ACTIVE/TRIGGERED)' if current_state else 'LOW (INACTIVE)'
-                                        self.logger.info(f"RS485 SENSOR INITIALIZED: {sensor_name} = {state_str} [address {slave_address}]", category="hardware")
-
-                        except Exception as e:
-                            self.logger.error(f"Error reading RS485 {sensor_name} at address {slave_address}: {e}", category="hardware")
-
-                # Poll limit switches
-                for switch_name, pin in self.limit_switch_pins.items():
-                    try:
-                        raw_state = GPIO.input(pin)
-                        current_state = not raw_state  # Inverted: LOW = activated
-                        switch_key = f"limit_{switch_name}"
-                        last_state = self.switch_states.get(switch_key)
-
-                        # Log state change
-                        if last_state is None:
-                            # First read - initialize
-                            self.switch_states[switch_key] = current_state
-                            self.logger.debug(f"LIMIT SWITCH INITIAL: {switch_name} = {'ACTIVATED (CLOSED)' if current_state else 'INACTIVE (OPEN)'} [pin {pin}]", category="hardware")
-                        elif last_state != current_state:
-                            # State changed!
-                            self.switch_states[switch_key] = current_state
-                            self.logger.info(f"LIMIT SWITCH CHANGED: {switch_name} = {'ACTIVATED (CLOSED)' if current_state else 'INACTIVE (OPEN)'} [pin {pin}] (poll #{poll_count})", category="hardware")
-
-                    except Exception as e:
-                        self.logger.error(f"Error reading limit switch {switch_name} on pin {pin}: {e}", category="hardware")
-
-                # Status update every 1000 polls (10 seconds at 10ms interval)
-                if poll_count % 1000 == 0:
+                due = self.poll_scheduler.due_groups()
+
+                # GPIO pins not covered by edge interrupts: one sampled mask per group
+                for group, bank in gpio_banks.items():
+                    if group in due:
+                        self._poll_gpio_bank(bank, poll_count)
+
+                # RS485 inputs: the due groups' bits of each device snapshot; idle devices are read less often
+                for bank in rs485_banks.values():
+                    if bank['group'] in due:
+                        self._poll_rs485_bank(bank, poll_count)
+                if rs485_banks:
+                    self._apply_rs485_poll_rates(rs485_banks)
+
+                # Status update every polling_status_update_frequency sweeps
+                if self._polling_status_update_freq and poll_count % self._polling_status_update_freq == 0:
                     edge_count = len(self.direct_sensor_pins)
-                    rs485_count = len(self.rs485_config.get('sensor_addresses', {})) if self.rs485 else 0
+                    rs485_count = len(self._rs485_sensor_addresses()) if self.rs485 else 0
                     limit_count = len(self.limit_switch_pins)
                     total = edge_count + rs485_count + limit_count
                     self.logger.debug(f"Polling heartbeat: {poll_count} polls completed, monitoring {total} switches ({edge_count} edge + {rs485_count} rs485 + {limit_count} limit)", category="hardware")
 
-                # REAL-TIME: Sleep 10ms between polls (100 Hz) for maximum responsiveness
-                time.sleep(0.010)
+                # Sleep until the next group is due (or a group is activated)
+                self.poll_scheduler.wait()
 
             except Exception as e:
                 self.logger.error(f"Polling thread error: {e}", category="hardware")
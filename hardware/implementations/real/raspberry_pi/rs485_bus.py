@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+
+"""
+RS485 Bus Scheduler
+===================
+
+Polls several Modbus input modules on one RS485 bus from a single thread.
+
+Each ModbusDevice has its own poll interval and priority; the switch poll
+scheduler can slow an idle device down further (set_min_interval()). On every turn
+the scheduler reads the due device with the highest priority (lowest
+number); devices of equal priority take turns in order of how overdue
+they are. A slow or failing expansion module therefore only uses bus time
+the safety-critical module does not need, instead of adding its latency
+to every read.
+
+Every read is published as an immutable InputSnapshot per device, and
+the per-device snapshots are swapped in as one read-only mapping, so
+read_sensor() resolves a sensor name to (device, bit) and does a
+lock-free bit test. Per-device latency and error counters are kept in
+DeviceStats. Listeners added with add_listener() are called with every
+new snapshot, so waiters react to a sample instead of polling for it.
+
+Usage:
+    devices = [
+        ModbusDevice("inputs", 1, {"x_left_edge": 14}, interval=0.01, priority=0),
+        ModbusDevice("inputs_2", 2, {"door_sensor": 3}, interval=0.1, priority=1),
+    ]
+    bus = RS485BusScheduler(lambda device: rs485.read_input_bits(device), devices)
+    bus.start()
+    print(bus.read_sensor("door_sensor"), bus.stats())
+"""
+
+import threading
+import time
+from types import MappingProxyType
+from typing import Callable, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+from core.logger import get_logger
+
+
+class InputSnapshot(NamedTuple):
+    """One bulk read: bit N of `bits` is input XN, NC sensors already inverted"""
+    bits: int
+    raw_bits: int
+    sequence: int
+    timestamp: float
+
+
+class ModbusDevice:
+    """One input module on the bus"""
+
+    def __init__(self, name: str, device_id: int, sensor_addresses: Optional[Dict[str, int]] = None,
+                 nc_sensors: Iterable[str] = (), interval: float = 0.01, priority: int = 0,
+                 register_address: int = 192, register_count: int = 2, input_count: int = 32):
+        self.name = name
+        self.device_id = device_id
+        self.sensor_addresses = dict(sensor_addresses or {})
+        self.nc_sensors = set(nc_sensors)
+        self.interval = interval
+        self.priority = priority
+        self.register_address = register_address
+        self.register_count = register_count
+        self.input_count = input_count
+        self.min_interval = 0.0
+        self.nc_mask = 0
+        self.update_nc_mask()
+
+    @property
+    def poll_interval(self) -> float:
+        """Time between reads: the device's own interval, or longer while its inputs are idle"""
+        return max(self.interval, self.min_interval)
+
+    def update_nc_mask(self):
+        """Recompute the XOR mask after sensor_addresses or nc_sensors change"""
+        mask = 0
+        for sensor_name in self.nc_sensors:
+            address = self.sensor_addresses.get(sensor_name)
+            if address is not None:
+                mask |= 1 << address
+        self.nc_mask = mask
+
+    @classmethod
+    def from_config(cls, config: Dict, name: str = None) -> 'ModbusDevice':
+        """Device from an rs485 'additional_devices' entry"""
+        return cls(
+            name=name or config.get('name', f"device_{config.get('modbus_device_id', 1)}"),
+            device_id=config.get('modbus_device_id', 1),
+            sensor_addresses=config.get('sensor_addresses', {}),
+            nc_sensors=config.get('nc_sensors', []),
+            interval=config.get('poll_interval_ms', 50) / 1000.0,
+            priority=config.get('priority', 1),
+            register_address=config.get('register_address_low', 192),
+            register_count=config.get('bulk_read_register_count', 2),
+            input_count=config.get('input_count', 32),
+        )
+
+
+class DeviceStats:
+    """Read latency and error counters of one device"""
+
+    __slots__ = ('reads', 'errors', 'consecutive_errors', 'last_latency', 'max_latency',
+                 '_latency_total', 'last_ok')
+
+    def __init__(self):
+        self.reads = 0
+        self.errors = 0
+        self.consecutive_errors = 0
+        self.last_latency: Optional[float] = None
+        self.max_latency = 0.0
+        self._latency_total = 0.0
+        self.last_ok: Optional[float] = None
+
+    def record(self, ok: bool, latency: float):
+        self.reads += 1
+        self.last_latency = latency
+        self.max_latency = max(self.max_latency, latency)
+        self._latency_total += latency
+        if ok:
+            self.consecutive_errors = 0
+            self.last_ok = time.time()
+        else:
+            self.errors += 1
+            self.consecutive_errors += 1
+
+    def as_dict(self) -> Dict:
+        return {
+            'reads': self.reads,
+            'errors': self.errors,
+            'consecutive_errors': self.consecutive_errors,
+            'last_latency_ms': None if self.last_latency is None else self.last_latency * 1000,
+            'mean_latency_ms': self._latency_total / self.reads * 1000 if self.reads else None,
+            'max_latency_ms': self.max_latency * 1000,
+            'last_ok': self.last_ok,
+        }
+
+
+class RS485BusScheduler:
+    """Priority/rate scheduler for the input modules on one RS485 bus"""
+
+    def __init__(self, read_bits: Callable[[ModbusDevice], Optional[int]], devices: List[ModbusDevice]):
+        """
+        Args:
+            read_bits: reads one device, returning its raw input mask or None on failure
+            devices: the modules on the bus
+        """
+        self.logger = get_logger()
+        self.read_bits = read_bits
+        self.devices: Dict[str, ModbusDevice] = {device.name: device for device in devices}
+        self._stats: Dict[str, DeviceStats] = {name: DeviceStats() for name in self.devices}
+        self._next_due: Dict[str, float] = {name: 0.0 for name in self.devices}
+        self._snapshots: Mapping[str, Optional[InputSnapshot]] = MappingProxyType({})
+        self._sequences: Dict[str, int] = {name: 0 for name in self.devices}
+        self._sensor_map: Dict[str, Tuple[str, int]] = {}
+        self.rebuild_sensor_map()
+        self._listeners: Tuple[Callable[[ModbusDevice, InputSnapshot], None], ...] = ()
+
+        self._cond = threading.Condition()
+        self._schedule_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def rebuild_sensor_map(self):
+        """Sensor name -> (device name, input index); the first device listing a name wins"""
+        sensor_map = {}
+        for device in self.devices.values():
+            device.update_nc_mask()
+            for sensor_name, address in device.sensor_addresses.items():
+                sensor_map.setdefault(sensor_name, (device.name, address))
+        self._sensor_map = sensor_map
+
+    # ========== SNAPSHOTS ==========
+
+    def publish(self, device: ModbusDevice, raw_bits: Optional[int]) -> Optional[InputSnapshot]:
+        """Store a read of `device`; a failed read (None) clears its snapshot"""
+        with self._cond:
+            if raw_bits is None:
+                snapshot = None
+            else:
+                self._sequences[device.name] += 1
+                snapshot = InputSnapshot(raw_bits ^ device.nc_mask, raw_bits,
+                                         self._sequences[device.name], time.time())
+            snapshots = dict(self._snapshots)
+            snapshots[device.name] = snapshot
+            self._snapshots = MappingProxyType(snapshots)
+            self._cond.notify_all()
+        if snapshot is not None:
+            for listener in self._listeners:
+                try:
+                    listener(device, snapshot)
+                except Exception as e:
+                    self.logger.error(f"RS485 snapshot listener failed: {e}", category="hardware")
+        return snapshot
+
+    def add_listener(self, listener: Callable[[ModbusDevice, InputSnapshot], None]):
+        """Call `listener(device, snapshot)` on the publishing thread for every successful read"""
+        self._listeners = self._listeners + (listener,)
+
+    def remove_listener(self, listener: Callable[[ModbusDevice, InputSnapshot], None]):
+        self._listeners = tuple(l for l in self._listeners if l != listener)
+
+    def snapshot(self, device_name: str) -> Optional[InputSnapshot]:
+        return self._snapshots.get(device_name)
+
+    def device_for(self, sensor_name: str) -> Optional[Tuple[str, int]]:
+        """(device name, input index) of a sensor, None if no device has it"""
+        return self._sensor_map.get(sensor_name)
+
+    def read_sensor(self, sensor_name: str) -> Optional[bool]:
+        """Sensor state from its device's latest snapshot (None if unknown or the device is failing)"""
+        location = self._sensor_map.get(sensor_name)
+        if location is None:
+            return None
+        snapshot = self._snapshots.get(location[0])
+        if snapshot is None:
+            return None
+        return bool((snapshot.bits >> location[1]) & 1)
+
+    def read_all(self) -> Dict[str, Optional[bool]]:
+        """Every named sensor on the bus, taken from one consistent set of snapshots"""
+        snapshots = self._snapshots
+        states = {}
+        for sensor_name, (device_name, address) in self._sensor_map.items():
+            snapshot = snapshots.get(device_name)
+            states[sensor_name] = None if snapshot is None else bool((snapshot.bits >> address) & 1)
+        return states
+
+    def wait_for_sample(self, device_name: str, since: int, timeout: float) -> Optional[InputSnapshot]:
+        """Block until `device_name` publishes a snapshot newer than sequence `since` (None on timeout)"""
+        with self._cond:
+            self._cond.wait_for(lambda: self._sequences[device_name] != since, timeout=timeout)
+            snapshot = self._snapshots.get(device_name)
+        return snapshot if snapshot is not None and snapshot.sequence != since else None
+
+    def stats(self) -> Dict[str, Dict]:
+        """Per-device counters: reads, errors, latencies (ms)"""
+        return {name: stats.as_dict() for name, stats in self._stats.items()}
+
+    # ========== SCHEDULING ==========
+
+    def next_device(self, now: float) -> Optional[ModbusDevice]:
+        """Highest-priority due device (most overdue first among equals), None if none is due"""
+        due = [device for name, device in self.devices.items() if self._next_due[name] <= now]
+        if not due:
+            return None
+        return min(due, key=lambda device: (device.priority, self._next_due[device.name]))
+
+    def time_until_due(self, now: float) -> float:
+        return max(0.0, min(self._next_due.values(), default=1.0) - now)
+
+    def set_min_interval(self, device_name: str, interval: float):
+        """Read `device_name` at most every `interval` seconds (0 = at its own interval)"""
+        device = self.devices[device_name]
+        with self._schedule_lock:
+            speeds_up = interval < device.min_interval
+            device.min_interval = interval
+            if speeds_up:
+                # Read at once instead of finishing the slow interval
+                self._next_due[device_name] = 0.0
+        if speeds_up:
+            self._wake.set()
+
+    def poll_once(self, now: Optional[float] = None) -> Optional[ModbusDevice]:
+        """Read the next due device, if any; returns the device that was read"""
+        now = time.monotonic() if now is None else now
+        with self._schedule_lock:
+            device = self.next_device(now)
+            if device is None:
+                return None
+            # Keep the device's cadence; after falling behind restart it rather than bursting to catch up
+            due = self._next_due[device.name] + device.poll_interval
+            self._next_due[device.name] = due if due > now else now + device.poll_interval
+        started = time.monotonic()
+        try:
+            raw_bits = self.read_bits(device)
+        except Exception as e:
+            self.logger.error(f"RS485 read of {device.name} failed: {e}", category="hardware")
+            raw_bits = None
+        self._stats[device.name].record(raw_bits is not None, time.monotonic() - started)
+        self.publish(device, raw_bits)
+        return device
+
+    # ========== THREAD ==========
+
+    @property
+    def running(self) -> bool:
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self.thread = threading.Thread(target=self._run, name="rs485-bus", daemon=True)
+        self.thread.start()
+
+    def stop(self, timeout: float = 1.0):
+        if self.thread is None:
+            return
+        self._stop.set()
+        self._wake.set()
+        self.thread.join(timeout=timeout)
+        self.thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            if self.poll_once() is None:
+                self._wake.wait(self.time_until_due(time.monotonic()))
+                self._wake.clear()
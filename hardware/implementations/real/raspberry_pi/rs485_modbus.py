@@ -24,14 +24,30 @@ N4DIH32 Register Layout:
 Address Mapping:
 - Input X14 = Bit 14 of register 0x00C0
 - Input X15 = Bit 15 of register 0x00C0
+
+Modbus backend:
+- "builtin" (default): ModbusRTUClient from modbus_rtu.py, needs only pyserial
+- "pymodbus": pymodbus' ModbusSerialClient, if installed
+- serial port "sim://n4dih32" talks to the in-process N4DIH32 simulator
+
+Sampling:
+- start_sampler() runs one thread that owns the bus (RS485BusScheduler) and
+  reads this module plus any 'additional_devices' at their own rates and
+  priorities, publishing an immutable InputSnapshot per device (32-bit mask
+  with NC inversion already applied, sequence number, timestamp)
+- read_sensor() then only tests a bit of the latest snapshot and never waits
+  for the serial port; without the sampler it falls back to a lazily
+  refreshed cache
 """
 
 import time
 import threading
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 from core.logger import get_logger
+from hardware.implementations.real.raspberry_pi.modbus_rtu import ModbusRTUClient, ModbusRTUError
+from hardware.implementations.real.raspberry_pi.rs485_bus import InputSnapshot, ModbusDevice, RS485BusScheduler
 
-# Try to import pymodbus library
+# pymodbus is optional; the built-in Modbus RTU client is used without it
 try:
     from pymodbus.client import ModbusSerialClient
     from pymodbus.exceptions import ModbusException
@@ -39,7 +55,7 @@ try:
 except ImportError:
     MODBUS_AVAILABLE = False
     ModbusSerialClient = None
-    ModbusException = Exception
+    ModbusException = ModbusRTUError
 
 
 class RS485ModbusInterface:
@@ -61,7 +77,10 @@ class RS485ModbusInterface:
         register_address_low: int = 192,
         bulk_read_register_count: int = 2,
         default_retry_count: int = 2,
-        retry_delay: float = 0.01
+        retry_delay: float = 0.01,
+        bulk_read_max_age: float = 0.010,
+        backend: str = "builtin",
+        additional_devices: Optional[List[Dict]] = None
     ):
         """
         Initialize RS485 Modbus RTU interface
@@ -82,6 +101,9 @@ class RS485ModbusInterface:
             bulk_read_register_count: Number of registers to read in bulk (default: 2)
             default_retry_count: Number of retry attempts on read failure (default: 2)
             retry_delay: Delay in seconds between retry attempts (default: 0.01)
+            bulk_read_max_age: Max age in seconds of the lazily refreshed cache when no sampler runs (default: 0.01)
+            backend: Modbus client - 'builtin' or 'pymodbus' (default: builtin)
+            additional_devices: Further input modules on the bus ('additional_devices' entries of the rs485 config)
         """
         self.logger = get_logger()
         self.port = port
@@ -90,7 +112,6 @@ class RS485ModbusInterface:
         self.parity = parity
         self.stopbits = stopbits
         self.timeout = timeout
-        self.sensor_addresses = sensor_addresses or {}
         self.device_id = device_id
         self.input_count = input_count
         self.bulk_read_enabled = bulk_read_enabled
@@ -105,28 +126,39 @@ class RS485ModbusInterface:
         self.retry_delay = retry_delay
 
         # Modbus client
-        self.client: Optional[ModbusSerialClient] = None
+        self.backend = backend
+        self.client = None
+        self.simulator = None  # N4DIH32Simulator behind a sim:// port
         self.is_connected = False
 
         # Thread lock for serial communication
         self.lock = threading.Lock()
 
-        # Bulk read cache - configurable via settings
-        self.bulk_read_cache: Optional[list] = None
-        self.bulk_read_timestamp = 0
-        self.bulk_read_max_age = 0.010  # 10ms max cache age for real-time response
+        # Devices on the bus: this module first (highest priority), then any expansion modules
+        self.primary = ModbusDevice(
+            "main", device_id, sensor_addresses, self.nc_sensors, interval=0.010, priority=0,
+            register_address=register_address_low, register_count=bulk_read_register_count,
+            input_count=input_count,
+        )
+        self.sensor_addresses = self.primary.sensor_addresses
+        self.devices = [self.primary] + [
+            ModbusDevice.from_config(config, name=config.get('name', f"device_{index + 2}"))
+            for index, config in enumerate(additional_devices or [])
+        ]
+
+        # Bus scheduler: publishes one snapshot per device, read without locks
+        self.bus = RS485BusScheduler(self.read_input_bits, self.devices)
+        self.bulk_read_max_age = bulk_read_max_age
 
-        # Check if pymodbus is available
-        if not MODBUS_AVAILABLE:
-            self.logger.error("pymodbus library not available! Install with: pip3 install pymodbus", category="hardware")
-            self.logger.error("RS485 communication will not work without pymodbus", category="hardware")
-            raise ImportError("pymodbus library required for RS485 communication")
+        if self.backend == "pymodbus" and not MODBUS_AVAILABLE:
+            self.logger.warning("pymodbus not installed - using the built-in Modbus RTU client", category="hardware")
+            self.backend = "builtin"
 
         self.logger.info(
             f"RS485 Modbus RTU interface initialized: port={port}, baudrate={baudrate}, format={bytesize}{parity}{stopbits}",
             category="hardware"
         )
-        self.logger.info(f"Modbus Device ID: {device_id}, Input Count: {input_count}, Bulk Read: {bulk_read_enabled}", category="hardware")
+        self.logger.info(f"Modbus Device ID: {device_id}, Input Count: {input_count}, Bulk Read: {bulk_read_enabled}, Backend: {self.backend}", category="hardware")
         self.logger.debug(f"Configured sensors: {len(self.sensor_addresses)}", category="hardware")
 
     def connect(self) -> bool:
@@ -145,21 +177,14 @@ class RS485ModbusInterface:
 
             # Check if port exists
             import os
-            if not os.path.exists(self.port):
+            is_simulated = self.port.startswith("sim://")
+            if not is_simulated and not os.path.exists(self.port):
                 self.logger.error(f"Serial port {self.port} does not exist! Check physical connection.", category="hardware")
                 self.logger.error("Run: ls -la /dev/ttyUSB* to see available ports", category="hardware")
                 return False
 
             # Create Modbus RTU client
-            self.client = ModbusSerialClient(
-                port=self.port,
-                baudrate=self.baudrate,
-                bytesize=self.bytesize,
-                parity=self.parity,
-                stopbits=self.stopbits,
-                timeout=self.timeout
-                # Note: pymodbus 3.x - ModbusSerialClient is RTU by default, no 'method' parameter needed
-            )
+            self.client = self._create_client(is_simulated)
 
             # Connect to the bus
             if self.client.connect():
@@ -195,15 +220,40 @@ class RS485ModbusInterface:
             self.logger.error(f"RS485 connection error: {e}", category="hardware")
             return False
 
+    def _create_client(self, is_simulated: bool):
+        if is_simulated:
+            from hardware.implementations.real.raspberry_pi.n4dih32_simulator import (
+                N4DIH32Simulator, SimulatedModbusSerial,
+            )
+            if self.simulator is None:
+                self.simulator = N4DIH32Simulator(device_id=self.device_id)
+            port = SimulatedModbusSerial(self.port, baudrate=self.baudrate, bytesize=self.bytesize,
+                                         parity=self.parity, stopbits=self.stopbits,
+                                         timeout=self.timeout, simulator=self.simulator)
+            return ModbusRTUClient(self.port, self.baudrate, self.bytesize, self.parity,
+                                   self.stopbits, self.timeout, serial_port=port)
+        if self.backend == "pymodbus":
+            return ModbusSerialClient(
+                port=self.port,
+                baudrate=self.baudrate,
+                bytesize=self.bytesize,
+                parity=self.parity,
+                stopbits=self.stopbits,
+                timeout=self.timeout
+                # Note: pymodbus 3.x - ModbusSerialClient is RTU by default, no 'method' parameter needed
+            )
+        return ModbusRTUClient(self.port, self.baudrate, self.bytesize, self.parity, self.stopbits, self.timeout)
+
     def disconnect(self):
         """Disconnect from RS485 bus"""
+        self.stop_sampler()
         if self.client and self.is_connected:
             self.logger.info("Disconnecting RS485...", category="hardware")
             self.client.close()
             self.is_connected = False
             self.logger.success("RS485 disconnected", category="hardware")
 
-    def read_all_inputs_bulk(self) -> Optional[list]:
+    def read_input_bits(self, device: Optional[ModbusDevice] = None) -> Optional[int]:
         """
         Read all inputs from N4DIH32 device using holding registers
 
@@ -211,9 +261,13 @@ class RS485ModbusInterface:
         - Register 0x00C0 (192): Contains inputs X00-X15
         - Register 0x00C1 (193): Contains inputs X16-X31
 
+        Args:
+            device: Module to read (default: the main module)
+
         Returns:
-            List of 32 boolean values for all inputs (X00-X31), or None on error
+            Raw 32-bit input mask (bit N = input XN), or None on error
         """
+        device = device or self.primary
         if not self.is_connected:
             self.logger.error("RS485 not connected - cannot read inputs", category="hardware")
             return None
@@ -225,15 +279,15 @@ class RS485ModbusInterface:
                 with self.lock:
                     # Read holding registers from N4DIH32 (Function Code 03)
                     response = self.client.read_holding_registers(
-                        address=self.register_address_low,  # Start register (configurable, default: 192/0x00C0)
-                        count=self.bulk_read_register_count,  # Number of registers (configurable, default: 2)
-                        device_id=self.device_id
+                        address=device.register_address,  # Start register (configurable, default: 192/0x00C0)
+                        count=device.register_count,  # Number of registers (configurable, default: 2)
+                        device_id=device.device_id
                     )
 
                     # Check if read was successful
                     if response.isError():
                         self.logger.error(
-                            f"N4DIH32 read error (device {self.device_id}, attempt {attempt + 1}/{max_attempts}): {response}",
+                            f"N4DIH32 read error (device {device.device_id}, attempt {attempt + 1}/{max_attempts}): {response}",
                             category="hardware"
                         )
                         if attempt < max_attempts - 1:
@@ -241,10 +295,10 @@ class RS485ModbusInterface:
                         continue
 
                     # Validate register count before parsing
-                    if not hasattr(response, 'registers') or len(response.registers) < self.bulk_read_register_count:
+                    if not hasattr(response, 'registers') or len(response.registers) < device.register_count:
                         actual_count = len(response.registers) if hasattr(response, 'registers') else 0
                         self.logger.error(
-                            f"N4DIH32 returned {actual_count} registers, expected {self.bulk_read_register_count} "
+                            f"N4DIH32 returned {actual_count} registers, expected {device.register_count} "
                             f"(attempt {attempt + 1}/{max_attempts})",
                             category="hardware"
                         )
@@ -252,26 +306,13 @@ class RS485ModbusInterface:
                             time.sleep(self.retry_delay)
                         continue
 
-                    # Extract the two 16-bit registers
-                    reg0 = response.registers[0]  # X00-X15
-                    reg1 = response.registers[1]  # X16-X31
-
-                    # Convert registers to list of 32 boolean values
-                    inputs = []
-
-                    # Extract X00-X15 from reg0 (bits 0-15)
-                    for i in range(16):
-                        bit_value = (reg0 >> i) & 1
-                        inputs.append(bool(bit_value))
+                    # X00-X15 from the first register, X16-X31 from the second
+                    bits = 0
+                    for index, register in enumerate(response.registers[:device.register_count]):
+                        bits |= (register & 0xFFFF) << (16 * index)
+                    return bits
 
-                    # Extract X16-X31 from reg1 (bits 0-15)
-                    for i in range(16):
-                        bit_value = (reg1 >> i) & 1
-                        inputs.append(bool(bit_value))
-
-                    return inputs
-
-            except ModbusException as e:
+            except (ModbusException, ModbusRTUError) as e:
                 self.logger.error(
                     f"Modbus exception during bulk read (attempt {attempt + 1}/{max_attempts}): {e}",
                     category="hardware"
@@ -286,40 +327,101 @@ class RS485ModbusInterface:
                 if attempt < max_attempts - 1:
                     time.sleep(self.retry_delay)
 
-        self.logger.error(f"Bulk read failed after {max_attempts} attempts", category="hardware")
+        self.logger.error(f"Bulk read of device {device.device_id} failed after {max_attempts} attempts", category="hardware")
         return None
 
-    def refresh_bulk_cache(self) -> bool:
+    def read_all_inputs_bulk(self) -> Optional[list]:
+        """
+        Read all inputs from the device
+
+        Returns:
+            List of 32 boolean values for all inputs (X00-X31), or None on error
+        """
+        bits = self.read_input_bits()
+        if bits is None:
+            return None
+        return [bool((bits >> i) & 1) for i in range(self.input_count)]
+
+    def _publish(self, raw_bits: Optional[int], device: Optional[ModbusDevice] = None) -> Optional[InputSnapshot]:
+        """Replace a device's snapshot; a failed read (None) clears it so readers do not see stale data"""
+        return self.bus.publish(device or self.primary, raw_bits)
+
+    def refresh_bulk_cache(self, device: Optional[ModbusDevice] = None) -> bool:
         """
         Refresh the bulk read cache with current input states
 
         Returns:
             True if cache was refreshed successfully, False otherwise
         """
-        inputs = self.read_all_inputs_bulk()
-        if inputs is not None:
-            self.bulk_read_cache = inputs
-            self.bulk_read_timestamp = time.time()
-            return True
-        # Invalidate stale cache on failure to prevent returning wrong data
-        self.bulk_read_cache = None
-        self.bulk_read_timestamp = 0
-        return False
+        return self._publish(self.read_input_bits(device), device) is not None
+
+    def get_snapshot(self, device: Optional[ModbusDevice] = None) -> Optional[InputSnapshot]:
+        """
+        Latest input snapshot of a device (default: the main module)
+
+        With the sampler running this never touches the bus; otherwise the
+        snapshot is refreshed here once it is older than bulk_read_max_age.
+        """
+        device = device or self.primary
+        snapshot = self.bus.snapshot(device.name)
+        if self.sampler_running:
+            return snapshot
+        if snapshot is None or time.time() - snapshot.timestamp > self.bulk_read_max_age:
+            snapshot = self._publish(self.read_input_bits(device), device)
+        return snapshot
 
     def get_cached_bulk_read(self) -> Optional[list]:
         """
         Get bulk read from cache, refreshing if needed
 
         Returns:
-            List of input states, or None on error
+            List of raw input states, or None on error
         """
-        # Check if cache needs refresh
-        cache_age = time.time() - self.bulk_read_timestamp
-        if self.bulk_read_cache is None or cache_age > self.bulk_read_max_age:
-            if not self.refresh_bulk_cache():
-                return None
+        snapshot = self.get_snapshot()
+        if snapshot is None:
+            return None
+        return [bool((snapshot.raw_bits >> i) & 1) for i in range(self.input_count)]
+
+    # ========== SAMPLER THREAD ==========
+
+    @property
+    def sampler_running(self) -> bool:
+        return self.bus.running
+
+    @property
+    def sampler_interval(self) -> float:
+        """Poll interval of the main module"""
+        return self.primary.interval
+
+    @sampler_interval.setter
+    def sampler_interval(self, interval: float):
+        self.primary.interval = interval
+
+    def start_sampler(self, interval: float = 0.010):
+        """Start the bus thread; the main module is read every `interval` seconds"""
+        if self.sampler_running:
+            return
+        self.sampler_interval = interval
+        self.bus.start()
+        for device in self.devices:
+            self.logger.info(
+                f"RS485 sampler: {device.name} (device {device.device_id}) every {device.interval * 1000:.0f}ms, priority {device.priority}",
+                category="hardware"
+            )
+
+    def stop_sampler(self, timeout: float = 1.0):
+        if self.bus.thread is None:
+            return
+        self.bus.stop(timeout)
+        self.logger.info("RS485 sampler stopped", category="hardware")
 
-        return self.bulk_read_cache
+    def wait_for_sample(self, since: int, timeout: float, device: Optional[ModbusDevice] = None) -> Optional[InputSnapshot]:
+        """Block until a snapshot newer than sequence `since` is published (None on timeout)"""
+        return self.bus.wait_for_sample((device or self.primary).name, since, timeout)
+
+    def bus_stats(self) -> Dict[str, Dict]:
+        """Per-device read counters and latencies"""
+        return self.bus.stats()
 
     def read_sensor(self, sensor_name: str, register_address: int = 0) -> Optional[bool]:
         """
@@ -338,65 +440,37 @@ class RS485ModbusInterface:
             self.logger.error("RS485 not connected - cannot read sensor", category="hardware")
             return None
 
-        # Get Modbus input address for this sensor (0-based)
-        input_address = self.sensor_addresses.get(sensor_name)
-        if input_address is None:
+        # Device and input address for this sensor (0-based)
+        location = self.bus.device_for(sensor_name)
+        if location is None:
             self.logger.error(f"No RS485 address configured for sensor: {sensor_name}", category="hardware")
             return None
+        device = self.bus.devices[location[0]]
+        input_address = location[1]
 
-        # Use bulk read if enabled
-        if self.bulk_read_enabled:
-            try:
-                # Get cached bulk read (auto-refreshes if needed)
-                inputs = self.get_cached_bulk_read()
-                if inputs is None:
-                    return None
-
-                # Check if address is valid
-                if input_address >= len(inputs):
-                    self.logger.error(
-                        f"Invalid input address {input_address} for sensor {sensor_name} (max: {len(inputs)-1})",
-                        category="hardware"
-                    )
-                    return None
-
-                # Get raw input state
-                raw_state = inputs[input_address]
-
-                # Invert for NC (Normally Closed) sensors
-                if sensor_name in self.nc_sensors:
-                    return not raw_state
-
-                return raw_state
-
-            except Exception as e:
-                self.logger.error(f"Error reading sensor {sensor_name} from bulk cache: {e}", category="hardware")
-                return None
+        if input_address >= device.input_count:
+            self.logger.error(
+                f"Invalid input address {input_address} for sensor {sensor_name} (max: {device.input_count-1})",
+                category="hardware"
+            )
+            return None
 
-        # Fallback: For N4DIH32, there's no efficient individual read
-        # We always use bulk read since the device stores inputs in registers
-        # If bulk_read is disabled, perform a fresh bulk read for this sensor
         try:
-            inputs = self.read_all_inputs_bulk()
-            if inputs is None:
-                return None
-
-            # Check if address is valid
-            if input_address >= len(inputs):
-                self.logger.error(
-                    f"Invalid input address {input_address} for sensor {sensor_name} (max: {len(inputs)-1})",
-                    category="hardware"
-                )
-                return None
-
-            # Get raw input state
-            raw_state = inputs[input_address]
-
-            # Invert for NC (Normally Closed) sensors
-            if sensor_name in self.nc_sensors:
-                return not raw_state
+            if self.bulk_read_enabled or self.sampler_running:
+                # Latest snapshot (sampler) or cached bulk read (auto-refreshes if needed)
+                snapshot = self.get_snapshot(device)
+                if snapshot is None:
+                    return None
+                bits = snapshot.bits
+            else:
+                # N4DIH32 has no efficient individual read: do a fresh bulk read for this sensor
+                raw_bits = self.read_input_bits(device)
+                if raw_bits is None:
+                    return None
+                bits = raw_bits ^ device.nc_mask
 
-            return raw_state
+            # NC inversion is already applied by the XOR mask
+            return bool((bits >> input_address) & 1)
 
         except Exception as e:
             self.logger.error(f"Error reading sensor {sensor_name}: {e}", category="hardware")
@@ -486,6 +560,7 @@ class RS485ModbusInterface:
         """Set Modbus slave address for a sensor"""
         if 1 <= address <= 247:
             self.sensor_addresses[sensor_name] = address
+            self.bus.rebuild_sensor_map()
             self.logger.debug(f"Set {sensor_name} address to {address}", category="hardware")
         else:
             self.logger.error(f"Invalid Modbus address {address} (must be 1-247)", category="hardware")
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+
+"""
+Switch Poll Scheduler
+=====================
+
+Decides which switch groups the GPIO polling thread reads on each sweep.
+
+Switches are grouped by role:
+- edge:   X/Y edge sensors (fast while a sensor wait is running)
+- piston: piston up/down position sensors (fast right after a piston command)
+- limit:  limit switches (always at their own rate)
+- other:  everything else, e.g. the door sensor (own idle interval)
+
+A group is "active" while something holds it (hold()) or until a boost
+expires (boost()); active groups are polled at their configured interval,
+inactive groups back off to their idle interval. Activating a group wakes
+the polling thread so the first read happens immediately. Only the groups
+that have switches (set_groups()) are scheduled, so the polling thread
+sleeps for the idle interval when nothing is in use.
+
+Usage:
+    scheduler = SwitchPollScheduler({"edge": 0.01, "piston": 0.01}, idle_interval=0.1,
+                                    idle_intervals={"other": 0.05})
+    with scheduler.hold("edge"):
+        ...                                   # wait for an edge sensor
+    scheduler.boost("piston", 2.0)           # after a piston command
+
+    # polling thread
+    due = scheduler.due_groups()
+    ...                                       # read the switches of the due groups
+    scheduler.wait()
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Optional, Set
+
+GROUP_EDGE = "edge"
+GROUP_PISTON = "piston"
+GROUP_LIMIT = "limit"
+GROUP_OTHER = "other"
+SWITCH_GROUPS = (GROUP_EDGE, GROUP_PISTON, GROUP_LIMIT, GROUP_OTHER)
+
+EDGE_SENSORS = frozenset({"x_left_edge", "x_right_edge", "y_top_edge", "y_bottom_edge"})
+
+
+def sensor_group(sensor_name: str) -> str:
+    """Group of an RS485 or direct sensor by its name"""
+    if sensor_name in EDGE_SENSORS:
+        return GROUP_EDGE
+    if sensor_name.endswith("_up_sensor") or sensor_name.endswith("_down_sensor"):
+        return GROUP_PISTON
+    return GROUP_OTHER
+
+
+class SwitchPollScheduler:
+    """Per-group poll intervals that speed up while a group is in use"""
+
+    def __init__(self, active_intervals: Dict[str, float], idle_interval: float,
+                 adaptive: bool = True, always_active: Iterable[str] = (GROUP_LIMIT,),
+                 idle_intervals: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            active_intervals: group -> poll interval in seconds while active
+            idle_interval: poll interval for inactive groups
+            adaptive: False polls every group at its active interval all the time
+            always_active: groups that never back off
+            idle_intervals: group -> idle interval overriding idle_interval
+        """
+        self.active_intervals = dict(active_intervals)
+        self.idle_interval = idle_interval
+        self.idle_intervals = dict(idle_intervals or {})
+        self.adaptive = adaptive
+        self.always_active = frozenset(always_active)
+        self.groups = SWITCH_GROUPS
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._holds: Dict[str, int] = {}
+        self._boost_until: Dict[str, float] = {}
+        self._next_due: Dict[str, float] = {}
+
+    def configure(self, active_intervals: Optional[Dict[str, float]] = None,
+                  idle_interval: Optional[float] = None, adaptive: Optional[bool] = None,
+                  idle_intervals: Optional[Dict[str, float]] = None):
+        """Change rates live; the next sweep uses them"""
+        with self._lock:
+            if active_intervals is not None:
+                self.active_intervals.update(active_intervals)
+            if idle_interval is not None:
+                self.idle_interval = idle_interval
+            if idle_intervals is not None:
+                self.idle_intervals.update(idle_intervals)
+            if adaptive is not None:
+                self.adaptive = adaptive
+        self.wake()
+
+    def set_groups(self, groups: Iterable[str]):
+        """Schedule only these groups (the ones that have switches to read)"""
+        with self._lock:
+            self.groups = tuple(group for group in SWITCH_GROUPS if group in set(groups))
+        self.wake()
+
+    # ========== ACTIVATION ==========
+
+    def _activate(self, group: str):
+        # Caller holds the lock; poll the group on the next sweep
+        self._next_due[group] = 0.0
+
+    @contextmanager
+    def hold(self, group: str):
+        """Keep a group active for the duration of the with-block"""
+        with self._lock:
+            self._holds[group] = self._holds.get(group, 0) + 1
+            self._activate(group)
+        self.wake()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._holds[group] -= 1
+
+    def boost(self, group: str, duration: float):
+        """Keep a group active for `duration` seconds from now"""
+        with self._lock:
+            self._boost_until[group] = max(self._boost_until.get(group, 0.0), time.monotonic() + duration)
+            self._activate(group)
+        self.wake()
+
+    def is_active(self, group: str, now: Optional[float] = None) -> bool:
+        with self._lock:
+            return self._is_active(group, time.monotonic() if now is None else now)
+
+    def _is_active(self, group: str, now: float) -> bool:
+        if not self.adaptive or group in self.always_active:
+            return True
+        return self._holds.get(group, 0) > 0 or now < self._boost_until.get(group, 0.0)
+
+    def interval(self, group: str, now: Optional[float] = None) -> float:
+        """Current poll interval of a group"""
+        with self._lock:
+            return self._interval(group, time.monotonic() if now is None else now)
+
+    def _interval(self, group: str, now: float) -> float:
+        active = self.active_intervals.get(group, self.idle_interval)
+        if self._is_active(group, now):
+            return active
+        return max(active, self.idle_intervals.get(group, self.idle_interval))
+
+    # ========== POLLING THREAD ==========
+
+    def due_groups(self, now: Optional[float] = None) -> Set[str]:
+        """Groups to read on this sweep; each one is rescheduled one interval ahead"""
+        now = time.monotonic() if now is None else now
+        due = set()
+        with self._lock:
+            for group in self.groups:
+                if self._next_due.get(group, 0.0) <= now:
+                    due.add(group)
+                    self._next_due[group] = now + self._interval(group, now)
+        return due
+
+    def time_until_due(self, now: Optional[float] = None) -> float:
+        """Seconds until the next group is due (0 if one is due now)"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            next_due = min((self._next_due.get(group, 0.0) for group in self.groups),
+                           default=now + self.idle_interval)
+        return max(0.0, next_due - now)
+
+    def wait(self, max_wait: Optional[float] = None):
+        """Sleep until the next group is due or a group is activated"""
+        timeout = self.time_until_due()
+        if max_wait is not None:
+            timeout = min(timeout, max_wait)
+        self._wake.wait(timeout=timeout)
+        self._wake.clear()
+
+    def wake(self):
+        self._wake.set()
@@ -8,17 +8,24 @@ Combines Raspberry Pi GPIO and Arduino GRBL into single interface.
 This class contains ONLY real hardware implementation.
 """
 
+import contextlib
 import json
 import time
 import threading
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Tuple
 from hardware.implementations.real.raspberry_pi.raspberry_pi_gpio import RaspberryPiGPIO
+from hardware.implementations.real.raspberry_pi.switch_poll_scheduler import GROUP_EDGE
 from hardware.implementations.real.arduino_grbl.arduino_grbl import ArduinoGRBL
+from hardware.implementations.real.arduino_grbl.motion_planner import plan_moves
+from hardware.interfaces.motion_handle import MotionHandle
 from core.logger import get_logger
 
 # Module-level logger for main section
 module_logger = get_logger()
 
+# Longest a sensor wait sleeps on switch-change notifications before re-checking pause/stop
+SENSOR_WAIT_RECHECK = 0.25
+
 
 class RealHardware:
     """
@@ -149,8 +156,8 @@ class RealHardware:
             self.logger.error("Hardware not initialized", category="hardware")
             return False
 
-        # Move only X axis, keep Y at current position
-        return self.grbl.move_to(position, self.grbl.current_y)
+        # Command only the X axis - Y is left exactly where it is
+        return self.grbl.move_to(position, None, rapid=self._is_travel())
 
     def move_y(self, position: float) -> bool:
         """
@@ -166,8 +173,96 @@ class RealHardware:
             self.logger.error("Hardware not initialized", category="hardware")
             return False
 
-        # Move only Y axis, keep X at current position
-        return self.grbl.move_to(self.grbl.current_x, position)
+        # Command only the Y axis - X is left exactly where it is
+        return self.grbl.move_to(None, position, rapid=self._is_travel())
+
+    def move_x_async(self, position: float) -> MotionHandle:
+        """
+        Start moving X motor to absolute position without blocking
+
+        Args:
+            position: Target position in cm
+
+        Returns:
+            MotionHandle resolving to True once the motor arrives
+        """
+        if not self.is_initialized or not self.grbl:
+            self.logger.error("Hardware not initialized", category="hardware")
+            handle = MotionHandle(position, 0.0)
+            handle.finish(False)
+            return handle
+
+        return self.grbl.move_to_async(position, None, rapid=self._is_travel())
+
+    def move_y_async(self, position: float) -> MotionHandle:
+        """
+        Start moving Y motor to absolute position without blocking
+
+        Args:
+            position: Target position in cm
+
+        Returns:
+            MotionHandle resolving to True once the motor arrives
+        """
+        if not self.is_initialized or not self.grbl:
+            self.logger.error("Hardware not initialized", category="hardware")
+            handle = MotionHandle(0.0, position)
+            handle.finish(False)
+            return handle
+
+        return self.grbl.move_to_async(None, position, rapid=self._is_travel())
+
+    def stream_moves(self, moves: List[Tuple[str, float]], on_move_complete=None,
+                     cancel_event: Optional[threading.Event] = None) -> bool:
+        """
+        Execute consecutive single-axis moves as one streamed GRBL sequence
+
+        Args:
+            moves: list of ('move_x' | 'move_y', position in cm)
+            on_move_complete: optional callback(index) called as each move finishes
+            cancel_event: optional event that stops the machine and abandons the rest
+
+        Returns:
+            True if every move completed, False otherwise
+        """
+        if not self.is_initialized or not self.grbl:
+            self.logger.error("Hardware not initialized", category="hardware")
+            return False
+
+        rapid = self._is_travel()
+        segments = plan_moves(moves, rapid=rapid)
+        if len(segments) < len(moves):
+            self.logger.debug(f"Coalesced {len(moves)} moves into {len(segments)} GRBL segments", category="hardware")
+
+        def segment_done(segment_index):
+            if on_move_complete:
+                for move_index in segments[segment_index].move_indices:
+                    on_move_complete(move_index)
+
+        if not self.grbl.streaming_enabled:
+            # One segment at a time, each waiting for GRBL to go Idle
+            for segment_index, segment in enumerate(segments):
+                if cancel_event is not None and cancel_event.is_set():
+                    return False
+                if not self.grbl.move_to(segment.x, segment.y, rapid=rapid):
+                    return False
+                segment_done(segment_index)
+            return True
+
+        targets = [(segment.x, segment.y) for segment in segments]
+        return self.grbl.stream_moves(targets, on_target_reached=segment_done, rapid=rapid,
+                                      cancel_event=cancel_event)
+
+    def _is_travel(self) -> bool:
+        """True when no working tool is engaged, so moves may use G0 rapid travel"""
+        if not self.grbl.rapid_travel:
+            return False
+        for get_state in (self.get_line_marker_piston_state, self.get_line_cutter_piston_state,
+                          self.get_row_marker_piston_state, self.get_row_cutter_piston_state):
+            # Anything but a confirmed 'up' (down, unknown) keeps the G1 feed rate
+            if get_state() != "up":
+                return False
+        return True
 
     def move_to(self, x: float, y: float) -> bool:
         """
@@ -571,6 +666,36 @@ class RealHardware:
 
     # ========== TOOL ACTION METHODS ==========
 
+    # Execution-engine tool names -> GPIO piston names of the tools that may move
+    # together; line_motor_piston moves the Y assembly and is always driven on its own
+    TOOL_PISTONS = {
+        'line_marker': 'line_marker_piston',
+        'line_cutter': 'line_cutter_piston',
+        'row_marker': 'row_marker_piston',
+        'row_cutter': 'row_cutter_piston',
+    }
+
+    def set_tools(self, actions: Dict[str, str]) -> bool:
+        """
+        Move several tools in one pass (e.g. {'line_marker': 'up', 'row_cutter': 'up'})
+
+        All piston outputs are driven together and their sensors are
+        confirmed concurrently (RaspberryPiGPIO.set_pistons).
+
+        Returns:
+            True if every tool reached its position
+        """
+        if not self.is_initialized or not self.gpio:
+            self.logger.error("Hardware not initialized", category="hardware")
+            return False
+
+        unknown = [tool for tool in actions if tool not in self.TOOL_PISTONS]
+        if unknown:
+            self.logger.error(f"Unknown tools: {unknown}", category="hardware")
+            return False
+
+        return self.gpio.set_pistons({self.TOOL_PISTONS[tool]: action for tool, action in actions.items()})
+
     def line_marker_down(self) -> bool:
         """Lower line marker tool"""
         return self.line_marker_piston_down()
@@ -605,17 +730,15 @@ class RealHardware:
 
     def lift_line_tools(self) -> bool:
         """Lift all line tools (marker, cutter, motor pistons)"""
-        marker_ok = self.line_marker_up()
-        cutter_ok = self.line_cutter_up()
+        tools_ok = self.set_tools({'line_marker': 'up', 'line_cutter': 'up'})
         motor_ok = self.line_motor_piston_up()
-        return marker_ok and cutter_ok and motor_ok
+        return tools_ok and motor_ok
 
     def lower_line_tools(self) -> bool:
         """Lower all line tools (marker, cutter, motor pistons)"""
-        marker_ok = self.line_marker_down()
-        cutter_ok = self.line_cutter_down()
+        tools_ok = self.set_tools({'line_marker': 'down', 'line_cutter': 'down'})
         motor_ok = self.line_motor_piston_down()
-        return marker_ok and cutter_ok and motor_ok
+        return tools_ok and motor_ok
 
     def move_line_tools_to_top(self) -> bool:
         """Move line motor to top position and lift all tools"""
@@ -804,21 +927,40 @@ class RealHardware:
 
     # ========== WAIT FOR SENSOR METHODS ==========
 
-    def wait_for_x_sensor(self):
+    def _wait_for_sensor_change(self, version: Optional[int], timeout: float) -> Optional[int]:
         """
-        Wait for X sensor trigger (either left or right edge).
-        Blocks until sensor is triggered.
+        Sleep until a switch changes (GPIO change notification) or the timeout expires.
+        Falls back to an interruptible sleep when the GPIO layer has no notifications.
+        """
+        if version is not None and self.gpio and hasattr(self.gpio, 'wait_for_switch_change'):
+            return self.gpio.wait_for_switch_change(version, timeout)
+        self._stop_sensor_wait.wait(timeout=min(timeout, self.sensor_poll_interval))
+        return version
+
+    def _wait_for_edge_sensors(self, checks: List[Tuple[str, str, str]], name: str) -> Optional[str]:
+        """
+        Block until one of the edge sensors is triggered.
+
+        Args:
+            checks: (getter name, result, log message) tried in order
+            name: Sensor description used in abort/timeout messages (e.g. 'X left')
 
         Returns:
-            'left' if left edge triggered, 'right' if right edge triggered
+            The result of the first triggered sensor, None on stop or timeout
         """
-        self.logger.info("Waiting for X sensor (left or right edge)...", category="hardware")
+        # Poll the edge sensors at their fast rate for the duration of the wait
+        scheduler = getattr(self.gpio, 'poll_scheduler', None)
+        with scheduler.hold(GROUP_EDGE) if scheduler else contextlib.nullcontext():
+            return self._wait_for_edge_sensors_loop(checks, name)
+
+    def _wait_for_edge_sensors_loop(self, checks: List[Tuple[str, str, str]], name: str) -> Optional[str]:
         start_time = time.time()
+        version = self.gpio.switch_version() if self.gpio and hasattr(self.gpio, 'switch_version') else None
 
         while True:
             # Check for fast-unblock signal (from signal_all_sensor_events)
             if self._stop_sensor_wait.is_set():
-                self.logger.warning("X sensor wait aborted - stop signal received", category="hardware")
+                self.logger.warning(f"{name} sensor wait aborted - stop signal received", category="hardware")
                 return None
 
             # Check if execution is paused
@@ -829,26 +971,36 @@ class RealHardware:
             # Check for stop signal
             if self.execution_engine and hasattr(self.execution_engine, 'stop_event'):
                 if self.execution_engine.stop_event.is_set():
-                    self.logger.warning("X sensor wait aborted - stop requested", category="hardware")
+                    self.logger.warning(f"{name} sensor wait aborted - stop requested", category="hardware")
                     return None
 
-            # Check left edge sensor
-            if self.get_x_left_edge_sensor():
-                self.logger.info("X sensor triggered: LEFT edge detected", category="hardware")
-                return 'left'
-
-            # Check right edge sensor
-            if self.get_x_right_edge_sensor():
-                self.logger.info("X sensor triggered: RIGHT edge detected", category="hardware")
-                return 'right'
+            for getter, result, message in checks:
+                if getattr(self, getter)():
+                    self.logger.info(message, category="hardware")
+                    return result
 
             # Check timeout
-            if time.time() - start_time > self.sensor_wait_timeout:
-                self.logger.warning(f"X sensor wait timeout after {self.sensor_wait_timeout}s", category="hardware")
+            remaining = self.sensor_wait_timeout - (time.time() - start_time)
+            if remaining <= 0:
+                self.logger.warning(f"{name} sensor wait timeout after {self.sensor_wait_timeout}s", category="hardware")
                 return None
 
-            # Small delay before next poll (interruptible by stop signal)
-            self._stop_sensor_wait.wait(timeout=self.sensor_poll_interval)
+            # Sleep until the next switch change; re-check stop/pause at least every SENSOR_WAIT_RECHECK
+            version = self._wait_for_sensor_change(version, min(remaining, SENSOR_WAIT_RECHECK))
+
+    def wait_for_x_sensor(self):
+        """
+        Wait for X sensor trigger (either left or right edge).
+        Blocks until sensor is triggered.
+
+        Returns:
+            'left' if left edge triggered, 'right' if right edge triggered
+        """
+        self.logger.info("Waiting for X sensor (left or right edge)...", category="hardware")
+        return self._wait_for_edge_sensors([
+            ('get_x_left_edge_sensor', 'left', "X sensor triggered: LEFT edge detected"),
+            ('get_x_right_edge_sensor', 'right', "X sensor triggered: RIGHT edge detected"),
+        ], "X")
 
     def wait_for_y_sensor(self):
         """
@@ -859,42 +1011,10 @@ class RealHardware:
             'top' if top edge triggered, 'bottom' if bottom edge triggered
         """
         self.logger.info("Waiting for Y sensor (top or bottom edge)...", category="hardware")
-        start_time = time.time()
-
-        while True:
-            # Check for fast-unblock signal (from signal_all_sensor_events)
-            if self._stop_sensor_wait.is_set():
-                self.logger.warning("Y sensor wait aborted - stop signal received", category="hardware")
-                return None
-
-            # Check if execution is paused
-            if self.execution_engine and hasattr(self.execution_engine, 'is_paused') and self.execution_engine.is_paused:
-                self._stop_sensor_wait.wait(timeout=self.sensor_poll_interval)
-                continue
-
-            # Check for stop signal
-            if self.execution_engine and hasattr(self.execution_engine, 'stop_event'):
-                if self.execution_engine.stop_event.is_set():
-                    self.logger.warning("Y sensor wait aborted - stop requested", category="hardware")
-                    return None
-
-            # Check top edge sensor
-            if self.get_y_top_edge_sensor():
-                self.logger.info("Y sensor triggered: TOP edge detected", category="hardware")
-                return 'top'
-
-            # Check bottom edge sensor
-            if self.get_y_bottom_edge_sensor():
-                self.logger.info("Y sensor triggered: BOTTOM edge detected", category="hardware")
-                return 'bottom'
-
-            # Check timeout
-            if time.time() - start_time > self.sensor_wait_timeout:
-                self.logger.warning(f"Y sensor wait timeout after {self.sensor_wait_timeout}s", category="hardware")
-                return None
-
-            # Small delay before next poll (interruptible by stop signal)
-            self._stop_sensor_wait.wait(timeout=self.sensor_poll_interval)
+        return self._wait_for_edge_sensors([
+            ('get_y_top_edge_sensor', 'top', "Y sensor triggered: TOP edge detected"),
+            ('get_y_bottom_edge_sensor', 'bottom', "Y sensor triggered: BOTTOM edge detected"),
+        ], "Y")
 
     def wait_for_x_left_sensor(self):
         """
@@ -905,37 +1025,9 @@ class RealHardware:
             'left' when triggered, None on timeout
         """
         self.logger.info("Waiting for X LEFT edge sensor...", category="hardware")
-        start_time = time.time()
-
-        while True:
-            # Check for fast-unblock signal
-            if self._stop_sensor_wait.is_set():
-                self.logger.warning("X left sensor wait aborted - stop signal received", category="hardware")
-                return None
-
-            # Check if execution is paused
-            if self.execution_engine and hasattr(self.execution_engine, 'is_paused') and self.execution_engine.is_paused:
-                self._stop_sensor_wait.wait(timeout=self.sensor_poll_interval)
-                continue
-
-            # Check for stop signal
-            if self.execution_engine and hasattr(self.execution_engine, 'stop_event'):
-                if self.execution_engine.stop_event.is_set():
-                    self.logger.warning("X left sensor wait aborted - stop requested", category="hardware")
-                    return None
-
-            # Check left edge sensor
-            if self.get_x_left_edge_sensor():
-                self.logger.info("X LEFT edge sensor triggered", category="hardware")
-                return 'left'
-
-            # Check timeout
-            if time.time() - start_time > self.sensor_wait_timeout:
-                self.logger.warning(f"X left sensor wait timeout after {self.sensor_wait_timeout}s", category="hardware")
-                return None
-
-            # Small delay before next poll (interruptible by stop signal)
-            self._stop_sensor_wait.wait(timeout=self.sensor_poll_interval)
+        return self._wait_for_edge_sensors([
+            ('get_x_left_edge_sensor', 'left', "X LEFT edge sensor triggered"),
+        ], "X left")
 
     def wait_for_x_right_sensor(self):
         """
@@ -946,37 +1038,9 @@ class RealHardware:
             'right' when triggered, None on timeout
         """
         self.logger.info("Waiting for X RIGHT edge sensor...", category="hardware")
-        start_time = time.time()
-
-        while True:
-            # Check for fast-unblock signal
-            if self._stop_sensor_wait.is_set():
-                self.logger.warning("X right sensor wait aborted - stop signal received", category="hardware")
-                return None
-
-            # Check if execution is paused
-            if self.execution_engine and hasattr(self.execution_engine, 'is_paused') and self.execution_engine.is_paused:
-                self._stop_sensor_wait.wait(timeout=self.sensor_poll_interval)
-                continue
-
-            # Check for stop signal
-            if self.execution_engine and hasattr(self.execution_engine, 'stop_event'):
-                if self.execution_engine.stop_event.is_set():
-                    self.logger.warning("X right sensor wait aborted - stop requested", category="hardware")
-                    return None
-
-            # Check right edge sensor
-            if self.get_x_right_edge_sensor():
-                self.logger.info("X RIGHT edge sensor triggered", category="hardware")
-                return 'right'
-
-            # Check timeout
-            if time.time() - start_time > self.sensor_wait_timeout:
-                self.logger.warning(f"X right sensor wait timeout after {self.sensor_wait_timeout}s", category="hardware")
-                return None
-
-            # Small delay before next poll (interruptible by stop signal)
-            self._stop_sensor_wait.wait(timeout=self.sensor_poll_interval)
+        return self._wait_for_edge_sensors([
+            ('get_x_right_edge_sensor', 'right', "X RIGHT edge sensor triggered"),
+        ], "X right")
 
     def wait_for_y_top_sensor(self):
         """
@@ -987,37 +1051,9 @@ class RealHardware:
             'top' when triggered, None on timeout
         """
         self.logger.info("Waiting for Y TOP edge sensor...", category="hardware")
-        start_time = time.time()
-
-        while True:
-            # Check for fast-unblock signal
-            if self._stop_sensor_wait.is_set():
-                self.logger.warning("Y top sensor wait aborted - stop signal received", category="hardware")
-                return None
-
-            # Check if execution is paused
-            if self.execution_engine and hasattr(self.execution_engine, 'is_paused') and self.execution_engine.is_paused:
-                self._stop_sensor_wait.wait(timeout=self.sensor_poll_interval)
-                continue
-
-            # Check for stop signal
-            if self.execution_engine and hasattr(self.execution_engine, 'stop_event'):
-                if self.execution_engine.stop_event.is_set():
-                    self.logger.warning("Y top sensor wait aborted - stop requested", category="hardware")
-                    return None
-
-            # Check top edge sensor
-            if self.get_y_top_edge_sensor():
-                self.logger.info("Y TOP edge sensor triggered", category="hardware")
-                return 'top'
-
-            # Check timeout
-            if time.time() - start_time > self.sensor_wait_timeout:
-                self.logger.warning(f"Y top sensor wait timeout after {self.sensor_wait_timeout}s", category="hardware")
-                return None
-
-            # Small delay before next poll (interruptible by stop signal)
-            self._stop_sensor_wait.wait(timeout=self.sensor_poll_interval)
+        return self._wait_for_edge_sensors([
+            ('get_y_top_edge_sensor', 'top', "Y TOP edge sensor triggered"),
+        ], "Y top")
 
     def wait_for_y_bottom_sensor(self):
         """
@@ -1028,37 +1064,9 @@ class RealHardware:
             'bottom' when triggered, None on timeout
         """
         self.logger.info("Waiting for Y BOTTOM edge sensor...", category="hardware")
-        start_time = time.time()
-
-        while True:
-            # Check for fast-unblock signal
-            if self._stop_sensor_wait.is_set():
-                self.logger.warning("Y bottom sensor wait aborted - stop signal received", category="hardware")
-                return None
-
-            # Check if execution is paused
-            if self.execution_engine and hasattr(self.execution_engine, 'is_paused') and self.execution_engine.is_paused:
-                self._stop_sensor_wait.wait(timeout=self.sensor_poll_interval)
-                continue
-
-            # Check for stop signal
-            if self.execution_engine and hasattr(self.execution_engine, 'stop_event'):
-                if self.execution_engine.stop_event.is_set():
-                    self.logger.warning("Y bottom sensor wait aborted - stop requested", category="hardware")
-                    return None
-
-            # Check bottom edge sensor
-            if self.get_y_bottom_edge_sensor():
-                self.logger.info("Y BOTTOM edge sensor triggered", category="hardware")
-                return 'bottom'
-
-            # Check timeout
-            if time.time() - start_time > self.sensor_wait_timeout:
-                self.logger.warning(f"Y bottom sensor wait timeout after {self.sensor_wait_timeout}s", category="hardware")
-                return None
-
-            # Small delay before next poll (interruptible by stop signal)
-            self._stop_sensor_wait.wait(timeout=self.sensor_poll_interval)
+        return self._wait_for_edge_sensors([
+            ('get_y_bottom_edge_sensor', 'bottom', "Y BOTTOM edge sensor triggered"),
+        ], "Y bottom")
 
     # ========== HARDWARE STATUS ==========
 
@@ -1113,14 +1121,17 @@ class RealHardware:
             'is_initialized': self.is_initialized
         }
 
+    def get_hardware_health(self) -> Dict:
+        """Piston actuation-time and sensor-bounce histograms with drift alerts"""
+        if not self.gpio:
+            return {'pistons': {}, 'sensors': {}, 'alerts': []}
+        return self.gpio.hardware_health()
+
     def reset_hardware(self):
         """Reset hardware to initial state (raise ALL tools, no homing)"""
         if self.is_initialized:
             # Raise ALL tool pistons to safe UP state
-            self.line_marker_up()
-            self.line_cutter_up()
-            self.row_marker_up()
-            self.row_cutter_up()
+            self.set_tools({tool: 'up' for tool in self.TOOL_PISTONS})
             self.line_motor_piston_up()
 
     # ========== MOCK-SPECIFIC METHODS (no-op for real hardware) ==========
@@ -1141,6 +1152,8 @@ class RealHardware:
         """Signal all sensor wait loops to unblock immediately during stop"""
         self.logger.info("Signaling all sensor wait loops to unblock for stop", category="hardware")
         self._stop_sensor_wait.set()
+        if self.gpio and hasattr(self.gpio, 'wake_sensor_waiters'):
+            self.gpio.wake_sensor_waiters()
 
     # ========== CLEANUP ==========
 
@@ -0,0 +1,10 @@
+"""
+Hardware Trace - record hardware calls and replay them deterministically.
+"""
+
+from hardware.implementations.trace.trace_hardware import RecordingHardware, ReplayHardware
+
+__all__ = [
+    'RecordingHardware',
+    'ReplayHardware'
+]
@@ -0,0 +1,483 @@
+#!/usr/bin/env python3
+
+"""
+Hardware Trace Recording and Replay
+===================================
+
+RecordingHardware wraps the interface returned by the hardware factory
+(MockHardware or RealHardware) and logs every method call to a gzipped
+JSON-lines trace: arguments, return value, start time and duration,
+calls of callbacks passed in (e.g. stream_moves' on_move_complete) and
+the completion of MotionHandles. Queries (get_*/is_*/read_*) are only
+written when their value changes, so the constant sensor polling of the
+GUI and the safety monitor stays small. With real hardware the
+RaspberryPiGPIO switch changes are recorded as sensor edges as well.
+
+ReplayHardware plays such a trace back:
+- an action (move_x, tool actions, wait_for_*, ...) returns the recorded
+  result of the next call of that method, after replaying its callback
+  calls and the recorded duration;
+- a query returns the value it had at the current trace time.
+
+Trace time runs at `speed` times wall time (2.0 = twice as fast); with
+speed 0 the replay never sleeps and jumps straight to the end of each
+recorded action (and on to the start of the next one), so a run
+reproduces deterministically in a fraction of the time. Calls whose arguments differ from the recording are counted in
+`divergences`.
+
+Events are written by a background thread, so recording adds no file
+I/O to the execution thread. Every batch of events is its own gzip member
+and is flushed at once, and load_trace ignores a cut-off tail, so the
+trace of a process that crashed is readable up to its last batch.
+
+Usage:
+    hardware = RecordingHardware(MockHardware(), "data/traces/run.jsonl.gz")
+    ...
+    hardware.close_trace()
+
+    replay = ReplayHardware("data/traces/run.jsonl.gz", speed=0)
+    engine.hardware = replay
+"""
+
+import atexit
+import bisect
+import gzip
+import json
+import os
+import queue
+import threading
+import time
+from collections import defaultdict, deque
+import zlib
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from core.logger import get_logger
+from hardware.interfaces.motion_handle import MotionHandle
+
+TRACE_FORMAT = "scratch-desk-hardware-trace"
+TRACE_VERSION = 1
+QUERY_PREFIXES = ("get_", "is_", "read_")
+
+
+def is_query(method: str) -> bool:
+    """Queries are answered by trace time, everything else in call order"""
+    return method.startswith(QUERY_PREFIXES)
+
+
+def _encode(value: Any) -> Any:
+    """JSON-safe form of an argument or result"""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_encode(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _encode(item) for key, item in value.items()}
+    if callable(value):
+        return "<callback>"
+    if isinstance(value, threading.Event):
+        return "<event>"
+    return repr(value)
+
+
+def _args_key(args: Any) -> str:
+    return json.dumps(args, sort_keys=True, separators=(',', ':'))
+
+
+def default_trace_path(trace_dir: str) -> str:
+    return os.path.join(trace_dir, f"hardware_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl.gz")
+
+
+# ============================================================================
+# RECORDING
+# ============================================================================
+
+class TraceWriter:
+    """Appends events to a gzipped JSON-lines file from a background thread
+
+    Events are written in batches of at most `flush_every`, or whatever
+    arrived within `flush_interval` seconds, each batch as a separate gzip
+    member flushed to disk.
+    """
+
+    def __init__(self, path: str, header: Dict, flush_every: int = 100, flush_interval: float = 1.0):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._file = open(path, 'wb')
+        self._write_batch([header])
+        self._queue: "queue.SimpleQueue[Optional[Dict]]" = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="hardware-trace", daemon=True)
+        self._thread.start()
+
+    def write(self, event: Dict):
+        self._queue.put(event)
+
+    def _write_batch(self, events: List[Dict]):
+        data = "".join(json.dumps(event, separators=(',', ':')) + "\n" for event in events)
+        self._file.write(gzip.compress(data.encode('utf-8')))
+        self._file.flush()
+
+    def _run(self):
+        batch: List[Dict] = []
+        deadline = 0.0
+        while True:
+            try:
+                event = self._queue.get(timeout=max(deadline - time.monotonic(), 0.0) if batch else None)
+            except queue.Empty:
+                self._write_batch(batch)
+                batch = []
+                continue
+            if event is None:
+                break
+            if not batch:
+                deadline = time.monotonic() + self.flush_interval
+            batch.append(event)
+            if len(batch) >= self.flush_every:
+                self._write_batch(batch)
+                batch = []
+        if batch:
+            self._write_batch(batch)
+        self._file.close()
+
+    def close(self, timeout: float = 5.0):
+        self._queue.put(None)
+        self._thread.join(timeout=timeout)
+
+
+class RecordingHardware:
+    """Transparent proxy that records every call of a hardware interface"""
+
+    def __init__(self, hardware, path: str, flush_interval: float = 1.0):
+        """
+        Args:
+            hardware: the interface to record (MockHardware, RealHardware, ...)
+            path: trace file to write (.jsonl.gz)
+            flush_interval: longest time in seconds an event waits before it is on disk
+        """
+        self.logger = get_logger()
+        self._hardware = hardware
+        self._t0 = time.monotonic()
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self._last_values: Dict[Tuple[str, str], str] = {}
+        self._wrappers: Dict[str, Callable] = {}
+        self._writer = TraceWriter(path, {
+            'format': TRACE_FORMAT,
+            'version': TRACE_VERSION,
+            'created': datetime.now().isoformat(),
+            'hardware': type(hardware).__name__,
+        }, flush_interval=flush_interval)
+        self.trace_path = path
+        self._closed = False
+        self._edge_stop = threading.Event()
+        self._edge_thread = None
+        gpio = getattr(hardware, 'gpio', None)
+        if gpio is not None and hasattr(gpio, 'wait_for_switch_change'):
+            self._edge_thread = threading.Thread(target=self._record_edges, args=(gpio,),
+                                                 name="hardware-trace-edges", daemon=True)
+            self._edge_thread.start()
+        # Also close the trace when the app exits without calling close_trace()
+        atexit.register(self.close_trace)
+        self.logger.info(f"Recording hardware trace to {path}", category="hardware")
+
+    def _now(self) -> float:
+        return round(time.monotonic() - self._t0, 6)
+
+    def _new_id(self) -> int:
+        with self._lock:
+            self._next_id += 1
+            return self._next_id
+
+    @property
+    def __class__(self):
+        # isinstance(hardware, RealHardware) checks keep working through the proxy
+        return type(self._hardware)
+
+    def __getattr__(self, name):
+        attribute = getattr(self._hardware, name)
+        if not callable(attribute) or name.startswith('_'):
+            return attribute
+        wrapper = self._wrappers.get(name)
+        if wrapper is None:
+            wrapper = self._wrappers[name] = self._wrap(name)
+        return wrapper
+
+    def _wrap(self, name: str) -> Callable:
+        query = is_query(name)
+
+        def recorded(*args, **kwargs):
+            method = getattr(self._hardware, name)
+            if query:
+                result = method(*args, **kwargs)
+                self._record_query(name, args, kwargs, result)
+                return result
+            call_id = self._new_id()
+            args = tuple(self._wrap_callback(call_id, i, arg) for i, arg in enumerate(args))
+            kwargs = {key: self._wrap_callback(call_id, key, arg) for key, arg in kwargs.items()}
+            started = self._now()
+            result = method(*args, **kwargs)
+            event = {'k': 'call', 'id': call_id, 'm': name, 't': started, 'd': round(self._now() - started, 6),
+                     'a': _encode(args), 'kw': _encode(kwargs)}
+            if isinstance(result, MotionHandle):
+                event['motion'] = True
+                result.add_done_callback(lambda handle: self._writer.write(
+                    {'k': 'done', 'id': call_id, 't': self._now(), 'r': handle.result()}))
+            else:
+                event['r'] = _encode(result)
+            self._writer.write(event)
+            return result
+
+        recorded.__name__ = name
+        return recorded
+
+    def _wrap_callback(self, call_id: int, position, value):
+        """Record the calls of a callback argument, attributed to the call that received it"""
+        if not callable(value):
+            return value
+
+        def callback(*args):
+            self._writer.write({'k': 'cb', 'id': call_id, 'p': position, 't': self._now(), 'a': _encode(args)})
+            return value(*args)
+        return callback
+
+    def _record_query(self, name: str, args, kwargs, result):
+        key = (name, _args_key(_encode([args, kwargs])))
+        encoded = _encode(result)
+        value_key = _args_key(encoded)
+        with self._lock:
+            if self._last_values.get(key) == value_key:
+                return
+            self._last_values[key] = value_key
+        self._writer.write({'k': 'q', 'm': name, 't': self._now(), 'a': _encode(args), 'kw': _encode(kwargs),
+                            'r': encoded})
+
+    def _record_edges(self, gpio):
+        """Record every RaspberryPiGPIO switch change as a sensor edge"""
+        version = gpio.switch_version()
+        states = dict(gpio.switch_states)
+        while not self._edge_stop.is_set():
+            version = gpio.wait_for_switch_change(version, timeout=0.5)
+            current = dict(gpio.switch_states)
+            for switch_key, state in current.items():
+                if states.get(switch_key) != state:
+                    self._writer.write({'k': 'edge', 's': switch_key, 't': self._now(), 'v': _encode(state)})
+            states = current
+
+    def close_trace(self):
+        """Stop recording and flush the trace file"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        atexit.unregister(self.close_trace)
+        self._edge_stop.set()
+        if self._edge_thread is not None:
+            self._edge_thread.join(timeout=1.0)
+        self._writer.close()
+        self.logger.info(f"Hardware trace saved: {self.trace_path}", category="hardware")
+
+    def shutdown(self):
+        result = self._hardware.shutdown() if hasattr(self._hardware, 'shutdown') else None
+        self.close_trace()
+        return result
+
+
+# ============================================================================
+# REPLAY
+# ============================================================================
+
+def _read_lines(path: str) -> List[str]:
+    """Complete lines of a trace file, up to where an unfinished recording was cut off"""
+    lines = []
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        try:
+            for line in f:
+                lines.append(line)
+        except (EOFError, gzip.BadGzipFile, zlib.error):
+            get_logger().warning(f"Hardware trace {path} is truncated, reading it up to the cut", category="hardware")
+    if lines and not lines[-1].endswith("\n"):
+        lines.pop()
+    return lines
+
+
+def load_trace(path: str) -> Tuple[Dict, List[Dict]]:
+    """(header, events) of a trace file"""
+    lines = _read_lines(path)
+    header = json.loads(lines[0]) if lines else {}
+    if header.get('format') != TRACE_FORMAT:
+        raise ValueError(f"{path} is not a hardware trace")
+    events = [json.loads(line) for line in lines[1:] if line.strip()]
+    return header, events
+
+
+class ReplayClock:
+    """Trace time: wall time scaled by speed, jumping ahead instead of sleeping when speed is 0"""
+
+    def __init__(self, speed: float = 1.0):
+        self.speed = speed
+        self._lock = threading.Lock()
+        self._base = 0.0
+        self._wall0 = time.monotonic()
+
+    def now(self) -> float:
+        with self._lock:
+            if self.speed <= 0:
+                return self._base
+            return self._base + (time.monotonic() - self._wall0) * self.speed
+
+    def advance_to(self, t: float):
+        """Block (or jump) until trace time t"""
+        remaining = t - self.now()
+        if remaining <= 0:
+            return
+        if self.speed <= 0:
+            with self._lock:
+                self._base = max(self._base, t)
+            return
+        time.sleep(remaining / self.speed)
+
+
+class ReplayHardware:
+    """Hardware interface answering from a recorded trace"""
+
+    def __init__(self, path: str, speed: float = 1.0):
+        """
+        Args:
+            path: trace file written by RecordingHardware
+            speed: trace seconds per wall second (0 = no waiting at all)
+        """
+        self.logger = get_logger()
+        self.header, events = load_trace(path)
+        self.trace_path = path
+        self.clock = ReplayClock(speed)
+        self.divergences: List[Dict] = []
+        self._lock = threading.Lock()
+        self._calls: Dict[str, deque] = defaultdict(deque)
+        self._last_calls: Dict[str, Dict] = {}
+        self._callbacks: Dict[int, List[Dict]] = defaultdict(list)
+        self._done: Dict[int, Dict] = {}
+        self._query_times: Dict[Tuple[str, str], List[float]] = defaultdict(list)
+        self._query_values: Dict[Tuple[str, str], List[Any]] = defaultdict(list)
+        self.edges: List[Dict] = []
+        for event in events:
+            kind = event['k']
+            if kind == 'call':
+                self._calls[event['m']].append(event)
+            elif kind == 'cb':
+                self._callbacks[event['id']].append(event)
+            elif kind == 'done':
+                self._done[event['id']] = event
+            elif kind == 'q':
+                key = (event['m'], _args_key([event['a'], event['kw']]))
+                self._query_times[key].append(event['t'])
+                self._query_values[key].append(event['r'])
+            elif kind == 'edge':
+                self.edges.append(event)
+        self._end = max((event['t'] for event in events), default=0.0)
+        self._methods = set(self._calls) | {method for method, _ in self._query_times}
+        self.logger.info(f"Replaying hardware trace {path} ({len(events)} events, speed {speed})", category="hardware")
+
+    def __getattr__(self, name):
+        if name.startswith('_') or name not in self._methods:
+            raise AttributeError(name)
+        if is_query(name):
+            return lambda *args, **kwargs: self._query(name, args, kwargs)
+        return lambda *args, **kwargs: self._action(name, args, kwargs)
+
+    def _query(self, name: str, args, kwargs):
+        key = (name, _args_key(_encode([args, kwargs])))
+        times = self._query_times.get(key)
+        if not times:
+            self._diverge(name, args, "query never recorded with these arguments")
+            return None
+        index = bisect.bisect_right(times, self.clock.now()) - 1
+        return self._query_values[key][max(index, 0)]
+
+    def _action(self, name: str, args, kwargs):
+        with self._lock:
+            pending = self._calls[name]
+            event = pending.popleft() if pending else None
+            if event is not None:
+                self._last_calls[name] = event
+        if event is None:
+            self._diverge(name, args, "more calls than recorded")
+            event = self._last_calls.get(name)
+            if event is None:
+                return None
+            return self._result(event, args)
+
+        if _encode(list(args)) != event['a'] or _encode(kwargs) != event['kw']:
+            self._diverge(name, args, f"recorded with {event['a']} {event['kw']}")
+        self.clock.advance_to(event['t'])
+        live = dict(enumerate(args))
+        live.update(kwargs)
+        for callback in self._callbacks.get(event['id'], ()):
+            self.clock.advance_to(callback['t'])
+            function = live.get(callback['p'])
+            if callable(function):
+                function(*callback['a'])
+        self.clock.advance_to(event['t'] + event['d'])
+        if self.clock.speed <= 0:
+            # Without waiting the idle time before the next action passes at once, so queries
+            # made in between see the values recorded up to that action
+            self.clock.advance_to(self._next_start())
+        return self._result(event, args)
+
+    def _next_start(self) -> float:
+        with self._lock:
+            return min((pending[0]['t'] for pending in self._calls.values() if pending), default=self._end)
+
+    def _result(self, event: Dict, args):
+        if not event.get('motion'):
+            return event.get('r')
+        target = args[0] if args else 0.0
+        handle = MotionHandle(target if event['m'].startswith('move_x') else 0.0,
+                              target if event['m'].startswith('move_y') else 0.0)
+        done = self._done.get(event['id'])
+        if done is None:
+            return handle  # never finished in the recording
+        threading.Thread(target=self._finish_motion, args=(handle, done), daemon=True).start()
+        return handle
+
+    def _finish_motion(self, handle: MotionHandle, done: Dict):
+        self.clock.advance_to(done['t'])
+        handle.finish(done['r'])
+
+    def _diverge(self, name: str, args, reason: str):
+        self.divergences.append({'method': name, 'args': _encode(list(args)), 'reason': reason,
+                                 't': self.clock.now()})
+        self.logger.warning(f"Replay divergence in {name}{tuple(args)}: {reason}", category="hardware")
+
+    def remaining_calls(self) -> Dict[str, int]:
+        """Recorded actions not replayed yet, per method"""
+        with self._lock:
+            return {name: len(pending) for name, pending in self._calls.items() if pending}
+
+
+def summarize_trace(path: str) -> Dict:
+    """Event counts and duration of a trace"""
+    header, events = load_trace(path)
+    calls = defaultdict(int)
+    for event in events:
+        if event['k'] == 'call':
+            calls[event['m']] += 1
+    return {
+        'hardware': header.get('hardware'),
+        'created': header.get('created'),
+        'duration': max((event['t'] + event.get('d', 0) for event in events), default=0.0),
+        'events': len(events),
+        'edges': sum(1 for event in events if event['k'] == 'edge'),
+        'calls': dict(sorted(calls.items())),
+    }
+
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) != 2:
+        print("Usage: python -m hardware.implementations.trace.trace_hardware <trace.jsonl.gz>")
+        sys.exit(1)
+    print(json.dumps(summarize_trace(sys.argv[1]), indent=2))
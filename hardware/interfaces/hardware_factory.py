@@ -6,7 +6,9 @@ Hardware Factory
 
 Factory pattern to create appropriate hardware interface based on configuration.
 Automatically selects between mock hardware (simulation) and real hardware
-(Raspberry Pi + Arduino) based on settings.json.
+(Raspberry Pi + Arduino) based on settings.json. hardware_config.trace can
+wrap the interface in a call recorder or replace it with the replay of a
+recorded trace (see hardware/implementations/trace).
 """
 
 import json
@@ -27,6 +29,30 @@ def load_config(config_path: str = "config/settings.json") -> Dict:
         return {}
 
 
+def _trace_config(config: Dict) -> Dict:
+    return config.get("hardware_config", {}).get("trace", {})
+
+
+def _create_replay(config: Dict):
+    """ReplayHardware when hardware_config.trace.replay_file is set, else None"""
+    trace_config = _trace_config(config)
+    replay_file = trace_config.get("replay_file", "")
+    if not replay_file:
+        return None
+    from hardware.implementations.trace.trace_hardware import ReplayHardware
+    logger.info(f"Mode: REPLAY of {replay_file}", category="hardware")
+    return ReplayHardware(replay_file, speed=trace_config.get("replay_speed", 1.0))
+
+
+def _with_recording(hardware, config: Dict):
+    """Wrap hardware in a RecordingHardware when hardware_config.trace.record is on"""
+    trace_config = _trace_config(config)
+    if not trace_config.get("record", False):
+        return hardware
+    from hardware.implementations.trace.trace_hardware import RecordingHardware, default_trace_path
+    return RecordingHardware(hardware, default_trace_path(trace_config.get("trace_dir", "data/traces")))
+
+
 def create_hardware_interface(config_path: str = "config/settings.json"):
     """
     Factory method to create appropriate hardware interface.
@@ -47,14 +73,18 @@ def create_hardware_interface(config_path: str = "config/settings.json"):
     logger.info(f"Mode: {'REAL HARDWARE' if use_real_hardware else 'MOCK/SIMULATION'}", category="hardware")
     logger.info("="*60, category="hardware")
 
+    replay = _create_replay(config)
+    if replay is not None:
+        return replay
+
     if use_real_hardware:
         # Import and return real hardware interface
         from hardware.implementations.real.real_hardware import RealHardware
-        return RealHardware(config_path)
+        return _with_recording(RealHardware(config_path), config)
     else:
         # Import and return mock hardware interface
         from hardware.implementations.mock.mock_hardware import MockHardware
-        return MockHardware(config_path)
+        return _with_recording(MockHardware(config_path), config)
 
 
 # Convenience singleton for global access
@@ -124,7 +154,11 @@ def switch_hardware_mode(use_real: bool, config_path: str = "config/settings.jso
 
     # Step 2: Create new hardware instance
     try:
-        if use_real:
+        config = load_config(config_path)
+        replay = _create_replay(config)
+        if replay is not None:
+            _hardware_instance = replay
+        elif use_real:
             logger.info("Creating Real Hardware instance...", category="hardware")
             from hardware.implementations.real.real_hardware import RealHardware
             _hardware_instance = RealHardware(config_path)
@@ -136,10 +170,11 @@ def switch_hardware_mode(use_real: bool, config_path: str = "config/settings.jso
                 return _hardware_instance, False, error_msg
 
             logger.info("Real Hardware instance created successfully", category="hardware")
+            _hardware_instance = _with_recording(_hardware_instance, config)
         else:
             logger.info("Creating Mock Hardware instance...", category="hardware")
             from hardware.implementations.mock.mock_hardware import MockHardware
-            _hardware_instance = MockHardware(config_path)
+            _hardware_instance = _with_recording(MockHardware(config_path), config)
             logger.info("Mock Hardware instance created successfully", category="hardware")
 
         logger.info("=" * 60, category="hardware")
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+
+"""
+Motion Handle
+=============
+
+Handle for a motor move that runs in the background. Returned by the
+hardware's move_*_async methods so the caller can do other work while
+the motors travel, then wait for (or cancel) the move.
+
+The handle resolves to True when the target was reached and False when
+the move failed or was cancelled. Progress callbacks receive live
+positions while the move runs; done callbacks run once it finishes.
+Callbacks run on the hardware's background threads and must be quick.
+
+Usage:
+    handle = hardware.move_x_async(42.0)
+    handle.add_progress_callback(lambda x, y, state: print(x, y, state))
+    while not handle.wait(timeout=0.05):
+        do_something_useful()
+    reached = handle.result()
+"""
+
+import threading
+from concurrent.futures import Future
+from typing import Callable, List, Optional
+
+from core.logger import get_logger
+
+
+class MotionHandle:
+    """Future-like handle for one background move"""
+
+    def __init__(self, target_x: float, target_y: float):
+        self.logger = get_logger()
+        self.target_x = target_x
+        self.target_y = target_y
+        self._future: Future = Future()
+        self._cancel_event = threading.Event()
+        self._progress_callbacks: List[Callable[[float, float, str], None]] = []
+
+    # ----- caller side -----
+
+    def done(self) -> bool:
+        return self._future.done()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait up to timeout seconds; True once the move has finished"""
+        try:
+            self._future.exception(timeout=timeout)
+        except Exception:
+            pass
+        return self._future.done()
+
+    def result(self, timeout: Optional[float] = None) -> bool:
+        """True if the target was reached (blocks until the move finishes)"""
+        return self._future.result(timeout=timeout)
+
+    def cancel(self):
+        """Ask the hardware to stop this move; the handle then resolves to False"""
+        self._cancel_event.set()
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel_event.is_set()
+
+    @property
+    def cancel_event(self) -> threading.Event:
+        return self._cancel_event
+
+    def add_done_callback(self, callback: Callable[['MotionHandle'], None]):
+        """Call callback(handle) when the move finishes (immediately if it already has)"""
+        self._future.add_done_callback(lambda _: callback(self))
+
+    def add_progress_callback(self, callback: Callable[[float, float, str], None]):
+        """Call callback(x, y, state) for every position update while the move runs"""
+        self._progress_callbacks.append(callback)
+
+    # ----- hardware side -----
+
+    def report_progress(self, x: float, y: float, state: str):
+        for callback in list(self._progress_callbacks):
+            try:
+                callback(x, y, state)
+            except Exception as e:
+                self.logger.debug(f"Motion progress callback error: {e}", category="hardware")
+
+    def finish(self, reached: bool):
+        if not self._future.done():
+            self._future.set_result(bool(reached))
@@ -32,6 +32,24 @@ def _shutdown_air_pressure():
         pass
 
 
+def _flush_analytics():
+    """Wait briefly for queued analytics writes (run rows, telemetry) to reach disk"""
+    try:
+        from core.analytics_writer import get_analytics_writer
+        get_analytics_writer().flush(timeout=2.0)
+    except Exception:
+        pass
+
+
+def _close_hardware_trace():
+    """Finish the hardware trace file when hardware_config.trace.record is on"""
+    try:
+        if _hardware is not None and hasattr(_hardware, 'close_trace'):
+            _hardware.close_trace()
+    except Exception:
+        pass
+
+
 def _signal_handler(signum, frame):
     """Handle SIGTERM/SIGINT to ensure air pressure is turned off"""
     _shutdown_air_pressure()
@@ -74,6 +92,12 @@ def main():
 
         # 3. Shut off air pressure
         _shutdown_air_pressure()
+
+        # 4. Flush pending analytics writes (the stop above queues the run record)
+        _flush_analytics()
+
+        # 5. Close the hardware trace so the recording can be replayed
+        _close_hardware_trace()
         try:
             root.destroy()
         except:
@@ -91,6 +115,8 @@ def main():
         traceback.print_exc()
     finally:
         _shutdown_air_pressure()
+        _flush_analytics()
+        _close_hardware_trace()
         try:
             root.destroy()
         except:
@@ -2,6 +2,7 @@ import pytest
 import sys
 import os
 import json
+import threading
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -171,3 +172,68 @@ def csv_file(tmp_path):
     path = tmp_path / "programs.csv"
     path.write_text(csv_content)
     return str(path)
+
+
+class FakeModbusResponse:
+    def __init__(self, registers):
+        self.registers = registers
+
+    def isError(self):
+        return False
+
+
+class FakeModbusClient:
+    """N4DIH32 stand-in for RS485ModbusInterface.client
+
+    Inputs are set as a 32-bit mask: `bits` answers every device id, while
+    modules registered with set_bits() answer per id and any other id gets
+    no reply. `fail` makes every read raise; `reads` and `read_event` let
+    tests follow the bus traffic.
+    """
+
+    def __init__(self):
+        self.bits = 0
+        self.devices = {}
+        self.reads = 0
+        self.fail = False
+        self.read_event = threading.Event()
+
+    def set_bits(self, device_id, bits):
+        self.devices[device_id] = bits
+
+    def read_holding_registers(self, address, count, device_id):
+        self.reads += 1
+        self.read_event.set()
+        if self.fail or (self.devices and device_id not in self.devices):
+            raise OSError("no response")
+        bits = self.devices.get(device_id, self.bits)
+        return FakeModbusResponse([bits & 0xFFFF, (bits >> 16) & 0xFFFF])
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def modbus_client():
+    """Fake N4DIH32 Modbus client with all inputs off"""
+    return FakeModbusClient()
+
+
+@pytest.fixture
+def rs485_interface(modbus_client):
+    """Factory for RS485ModbusInterface instances wired to modbus_client; disconnected after the test"""
+    from hardware.implementations.real.raspberry_pi.rs485_modbus import RS485ModbusInterface
+    interfaces = []
+
+    def make(sensor_addresses, nc_sensors=(), **kwargs):
+        kwargs.setdefault('default_retry_count', 0)
+        kwargs.setdefault('retry_delay', 0)
+        rs485 = RS485ModbusInterface(sensor_addresses=dict(sensor_addresses), nc_sensors=list(nc_sensors), **kwargs)
+        rs485.client = modbus_client
+        rs485.is_connected = True
+        interfaces.append(rs485)
+        return rs485
+
+    yield make
+    for rs485 in interfaces:
+        rs485.disconnect()
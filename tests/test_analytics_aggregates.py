@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+
+import csv
+import pytest
+from datetime import datetime
+from core.analytics import CSV_COLUMNS
+from core.analytics_aggregates import (
+    AnalyticsAggregates, get_aggregates_path, iter_csv_records, iter_rows, summarize_rows
+)
+
+
+def _row(run_id, timestamp, status='success', duration=10.0, program='Prog A', safety_code=''):
+    return {
+        'run_id': run_id,
+        'timestamp_start': timestamp,
+        'timestamp_end': timestamp,
+        'duration_seconds': duration,
+        'program_number': 1,
+        'program_name': program,
+        'completion_status': status,
+        'total_steps': 10,
+        'completed_steps': 10 if status == 'success' else 4,
+        'successful_steps': 10 if status == 'success' else 4,
+        'failed_steps': 0,
+        'error_message': '',
+        'safety_code': safety_code,
+        'safety_message': '',
+        'hardware_mode': 'mock',
+        'repeat_rows': 1,
+        'repeat_lines': 1,
+    }
+
+
+def _write_csv(path, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+
+
+def _append_csv(path, row):
+    with open(path, 'a', newline='', encoding='utf-8') as f:
+        csv.DictWriter(f, fieldnames=CSV_COLUMNS).writerow(row)
+
+
+@pytest.fixture
+def runs_csv(tmp_path):
+    """CSV with runs spread over three days"""
+    path = str(tmp_path / "runs.csv")
+    _write_csv(path, [
+        _row('r1', '2026-03-01T08:15:00', duration=20.0),
+        _row('r2', '2026-03-01T09:30:00', status='user_stop', duration=40.0, program='Prog B'),
+        _row('r3', '2026-03-02T10:00:00', status='emergency_stop', duration=5.0, safety_code='DOOR'),
+        _row('r4', '2026-03-03T23:30:00', duration=100.0),
+    ])
+    return path
+
+
+class TestAggregateSummary:
+    """Summaries computed from aggregate buckets"""
+
+    def test_summary_all_runs(self, runs_csv):
+        """Whole-history summary should count every run"""
+        summary = AnalyticsAggregates(runs_csv).summarize()
+        assert summary['total_runs'] == 4
+        assert summary['success_count'] == 2
+        assert summary['success_rate'] == 50.0
+        assert summary['status_counts'] == {'success': 2, 'user_stop': 1, 'emergency_stop': 1}
+        assert summary['avg_duration'] == round(165.0 / 4, 1)
+        assert summary['duration_min'] == 5.0
+        assert summary['duration_max'] == 100.0
+        assert sum(summary['duration_histogram']) == 4
+        assert summary['most_run_program'] == ('Prog A', 3)
+        assert summary['most_common_safety'] == ('DOOR', 1)
+        assert summary['date_from'] == '2026-03-01T08:15:00'
+        assert summary['date_to'] == '2026-03-03T23:30:00'
+        assert len(summary['failed_runs']) == 2
+
+    def test_summary_whole_day_period(self, runs_csv):
+        """Day-aligned periods should use only the covered days"""
+        period = (datetime(2026, 3, 1), datetime(2026, 3, 2, 23, 59, 59))
+        summary = AnalyticsAggregates(runs_csv).summarize(period)
+        assert summary['total_runs'] == 3
+        assert summary['date_to'] == '2026-03-02T10:00:00'
+
+    def test_summary_partial_day_period(self, runs_csv):
+        """Partial days should fall back to hourly buckets"""
+        period = (datetime(2026, 3, 1, 9, 0), datetime(2026, 3, 1, 12, 0))
+        summary = AnalyticsAggregates(runs_csv).summarize(period)
+        assert summary['total_runs'] == 1
+        assert summary['status_counts'] == {'user_stop': 1}
+
+    def test_open_ended_period(self, runs_csv):
+        """A period with only a start bound should include everything after it"""
+        summary = AnalyticsAggregates(runs_csv).summarize((datetime(2026, 3, 2), None))
+        assert summary['total_runs'] == 2
+
+    def test_empty_period_returns_none(self, runs_csv):
+        """Periods without runs should return None"""
+        period = (datetime(2020, 1, 1), datetime(2020, 1, 2))
+        assert AnalyticsAggregates(runs_csv).summarize(period) is None
+
+    def test_program_breakdown(self, runs_csv):
+        """Per-program stats should be merged across buckets"""
+        summary = AnalyticsAggregates(runs_csv).summarize()
+        breakdown = {p['name']: p for p in summary['program_breakdown']}
+        assert breakdown['Prog A']['run_count'] == 3
+        assert breakdown['Prog A']['fail_count'] == 1
+        assert breakdown['Prog A']['total_duration'] == 125.0
+        assert summary['program_breakdown'][0]['name'] == 'Prog A'
+
+
+class TestIncrementalUpdates:
+    """Incremental maintenance and staleness detection"""
+
+    def test_cache_file_created(self, runs_csv):
+        """Summarizing should persist the cache next to the CSV"""
+        AnalyticsAggregates(runs_csv).summarize()
+        assert get_aggregates_path(runs_csv).endswith('runs_aggregates.json')
+        with open(get_aggregates_path(runs_csv), encoding='utf-8') as f:
+            assert f.read()
+
+    def test_record_run_matches_rebuild(self, runs_csv):
+        """Incremental update should produce the same summary as a rebuild"""
+        aggregates = AnalyticsAggregates(runs_csv)
+        aggregates.summarize()
+
+        row = _row('r5', '2026-03-03T12:00:00', status='error', duration=7.5)
+        before = aggregates.csv_signature()
+        _append_csv(runs_csv, row)
+        aggregates.record_run(row, before)
+
+        incremental = aggregates.summarize()
+        rebuilt = AnalyticsAggregates(runs_csv)
+        rebuilt.rebuild()
+        assert incremental == rebuilt.summarize()
+        assert incremental['total_runs'] == 5
+
+    def test_stale_cache_rebuilt_after_csv_change(self, runs_csv):
+        """Rewriting the CSV outside the collector should invalidate the cache"""
+        aggregates = AnalyticsAggregates(runs_csv)
+        assert aggregates.summarize()['total_runs'] == 4
+
+        _write_csv(runs_csv, [_row('x1', '2026-04-01T10:00:00')])
+        summary = aggregates.summarize()
+        assert summary['total_runs'] == 1
+        assert summary['date_from'] == '2026-04-01T10:00:00'
+
+
+class TestStreamingReader:
+    """Period-bounded row streaming"""
+
+    def test_offsets_resume_mid_file(self, runs_csv):
+        """Seeking to a record offset should stream from that record on"""
+        records = list(iter_csv_records(runs_csv))
+        assert [r['run_id'] for _, _, r in records] == ['r1', 'r2', 'r3', 'r4']
+
+        offset = records[2][0]
+        tail = [r['run_id'] for _, _, r in iter_csv_records(runs_csv, start_offset=offset)]
+        assert tail == ['r3', 'r4']
+
+    def test_embedded_newlines(self, tmp_path):
+        """Quoted fields spanning lines should come back as one row"""
+        path = str(tmp_path / "runs.csv")
+        row = _row('r1', '2026-03-01T08:15:00', status='error')
+        row['error_message'] = 'line one\nline two'
+        _write_csv(path, [row, _row('r2', '2026-03-01T09:00:00')])
+
+        rows = list(iter_rows(path))
+        assert [r['run_id'] for r in rows] == ['r1', 'r2']
+        assert rows[0]['error_message'] == 'line one\nline two'
+
+    def test_iter_rows_period(self, runs_csv):
+        """Only rows inside the period should be yielded"""
+        aggregates = AnalyticsAggregates(runs_csv)
+        period = (datetime(2026, 3, 1, 9, 0), datetime(2026, 3, 2, 23, 59, 59))
+        assert [r['run_id'] for r in aggregates.iter_rows(period)] == ['r2', 'r3']
+        assert list(aggregates.iter_rows((datetime(2020, 1, 1), datetime(2020, 1, 2)))) == []
+        assert len(list(aggregates.iter_rows())) == 4
+
+    def test_iter_rows_after_incremental_append(self, runs_csv):
+        """Rows recorded incrementally should be reachable through the day index"""
+        aggregates = AnalyticsAggregates(runs_csv)
+        aggregates.summarize()
+
+        row = _row('r5', '2026-03-05T12:00:00')
+        before = aggregates.csv_signature()
+        _append_csv(runs_csv, row)
+        aggregates.record_run(row, before)
+
+        rows = list(aggregates.iter_rows((datetime(2026, 3, 5), datetime(2026, 3, 5, 23, 59, 59))))
+        assert [r['run_id'] for r in rows] == ['r5']
+
+    def test_summarize_rows_matches_aggregates(self, runs_csv):
+        """Single-pass summary over streamed rows should equal the cached summary"""
+        period = (datetime(2026, 3, 1), datetime(2026, 3, 2, 23, 59, 59))
+        streamed = summarize_rows(iter_rows(runs_csv, period))
+        assert streamed == AnalyticsAggregates(runs_csv).summarize(period)
+        assert summarize_rows(iter([])) is None
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+
+import csv
+import time
+import pytest
+from core.analytics_telemetry import RunTelemetry, write_telemetry, TELEMETRY_COLUMNS
+
+
+class FakeEngine:
+    """Minimal engine stand-in exposing the step list"""
+
+    def __init__(self, steps):
+        self.steps = steps
+
+
+@pytest.fixture
+def engine():
+    return FakeEngine([
+        {'operation': 'move_y', 'parameters': {'position': 20.0}, 'description': 'Move Y'},
+        {'operation': 'wait_sensor', 'parameters': {'sensor': 'y_top'}, 'description': 'Wait'},
+        {'operation': 'tool_action', 'parameters': {'tool': 'line_marker', 'action': 'down'}, 'description': 'Mark'},
+    ])
+
+
+def _events(records, event):
+    return [r for r in records if r['event'] == event]
+
+
+class TestRunTelemetry:
+    """Span recording from status events"""
+
+    def test_step_spans(self, engine):
+        """Every step_executing/step_completed pair should produce a step span"""
+        telemetry = RunTelemetry('run-1')
+        for index in range(3):
+            telemetry.on_status('step_executing', {'step_index': index}, engine)
+            telemetry.on_status('step_completed', {'step_index': index}, engine)
+
+        steps = _events(telemetry.close(), 'step')
+        assert [s['step_index'] for s in steps] == [0, 1, 2]
+        assert [s['operation'] for s in steps] == ['move_y', 'wait_sensor', 'tool_action']
+        assert steps[2]['detail'] == 'line_marker:down'
+        assert all(s['run_id'] == 'run-1' for s in steps)
+
+    def test_sensor_wait_span(self, engine):
+        """Sensor wait should span waiting_sensor until the step completes"""
+        telemetry = RunTelemetry('run-1')
+        telemetry.on_status('step_executing', {'step_index': 1}, engine)
+        telemetry.on_status('waiting_sensor', {'sensor': 'y_top'}, engine)
+        time.sleep(0.02)
+        telemetry.on_status('step_completed', {'step_index': 1}, engine)
+
+        waits = _events(telemetry.close(), 'sensor_wait')
+        assert len(waits) == 1
+        assert waits[0]['detail'] == 'y_top'
+        assert waits[0]['step_index'] == 1
+        assert waits[0]['duration_seconds'] >= 0.02
+
+    def test_safety_wait_and_transition_spans(self, engine):
+        """Safety waits and transition dialogs should be recorded separately"""
+        telemetry = RunTelemetry('run-1')
+        telemetry.on_status('step_executing', {'step_index': 0}, engine)
+        telemetry.on_status('safety_waiting', {'safety_code': 'DOOR_OPEN'}, engine)
+        telemetry.on_status('running', {}, engine)
+        telemetry.on_status('transition_alert', {}, engine)
+        telemetry.on_status('transition_complete', {}, engine)
+
+        records = telemetry.close()
+        assert _events(records, 'safety_wait')[0]['detail'] == 'DOOR_OPEN'
+        assert len(_events(records, 'transition')) == 1
+
+    def test_monitor_pause_span(self, engine):
+        """Real-time monitor pauses should span until recovery"""
+        telemetry = RunTelemetry('run-1')
+        telemetry.on_status('emergency_stop', {'safety_code': 'R1', 'monitor_type': 'real_time'}, engine)
+        telemetry.on_status('safety_recovered', {}, engine)
+        assert _events(telemetry.close(), 'safety_pause')[0]['detail'] == 'R1'
+
+    def test_close_ends_open_spans(self, engine):
+        """Spans still open when the run ends should be closed and returned"""
+        telemetry = RunTelemetry('run-1')
+        telemetry.on_status('step_executing', {'step_index': 1}, engine)
+        telemetry.on_status('waiting_sensor', {'sensor': 'x_left'}, engine)
+
+        records = telemetry.close()
+        assert len(_events(records, 'sensor_wait')) == 1
+        assert len(_events(records, 'step')) == 1
+        assert telemetry.close() == []
+
+
+class TestWriteTelemetry:
+    """Telemetry CSV output"""
+
+    def test_writes_header_and_rows(self, tmp_path, engine):
+        """Records should be appended with a single header"""
+        path = str(tmp_path / "telemetry" / "steps.csv")
+
+        for run_id in ('run-a', 'run-b'):
+            telemetry = RunTelemetry(run_id)
+            telemetry.on_status('step_executing', {'step_index': 0}, engine)
+            telemetry.on_status('step_completed', {'step_index': 0}, engine)
+            write_telemetry(path, telemetry.close())
+
+        with open(path, newline='', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            assert reader.fieldnames == TELEMETRY_COLUMNS
+            rows = list(reader)
+        assert [r['run_id'] for r in rows] == ['run-a', 'run-b']
+        assert rows[0]['operation'] == 'move_y'
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+
+import csv
+import os
+import threading
+import time
+import pytest
+import core.analytics as analytics
+from core.analytics import AnalyticsCollector, CSV_COLUMNS
+from core.analytics_writer import AnalyticsWriter
+
+
+class TestAnalyticsWriter:
+    """Background job queue"""
+
+    def test_jobs_run_in_order(self):
+        """Jobs should run on the writer thread in submission order"""
+        writer = AnalyticsWriter()
+        results = []
+        for i in range(5):
+            writer.submit(lambda i=i: results.append((i, threading.current_thread().name)))
+        assert writer.flush(timeout=2.0)
+        assert [i for i, _ in results] == [0, 1, 2, 3, 4]
+        assert all(name == "AnalyticsWriter" for _, name in results)
+
+    def test_submit_never_blocks_when_full(self):
+        """A full queue should drop the job instead of blocking the caller"""
+        writer = AnalyticsWriter(max_queue_size=1)
+        release = threading.Event()
+        writer.submit(release.wait)        # occupies the writer thread
+        time.sleep(0.05)
+        assert writer.submit(lambda: None) is True   # fills the queue
+
+        start = time.time()
+        assert writer.submit(lambda: None) is False
+        assert time.time() - start < 0.1
+
+        release.set()
+        assert writer.flush(timeout=2.0)
+
+    def test_failing_job_does_not_stop_writer(self):
+        """Exceptions in a job should be logged and later jobs still run"""
+        writer = AnalyticsWriter()
+        results = []
+        writer.submit(lambda: 1 / 0)
+        writer.submit(lambda: results.append('ok'))
+        assert writer.flush(timeout=2.0)
+        assert results == ['ok']
+
+    def test_flush_idle_writer(self):
+        """Flushing a writer that never ran should return immediately"""
+        assert AnalyticsWriter().flush(timeout=0.1) is True
+
+
+class FakeEngine:
+    """Engine stand-in with the attributes the collector reads"""
+
+    def __init__(self):
+        self.status_callback = None
+        self.hardware = None
+        self.steps = [{'operation': 'program_start'}]
+        self.step_results = [{'result': {'success': True}}]
+
+    def get_execution_summary(self):
+        return {'total_steps': 1, 'completed_steps': 1, 'successful_steps': 1, 'failed_steps': 0}
+
+
+class TestCollectorPersistence:
+    """Collector hands file I/O to the writer"""
+
+    def test_run_row_written_via_writer(self, tmp_path, monkeypatch):
+        """Finishing a run should queue the CSV write and not touch disk inline"""
+        csv_path = str(tmp_path / "runs.csv")
+        collector = AnalyticsCollector()
+        monkeypatch.setattr(collector, '_get_settings', lambda: {'csv_file_path': csv_path})
+
+        writer = AnalyticsWriter()
+        monkeypatch.setattr(analytics, 'get_analytics_writer', lambda: writer)
+
+        release = threading.Event()
+        writer.submit(release.wait)  # hold the writer so the row stays queued
+
+        engine = FakeEngine()
+        forwarded = []
+        engine.status_callback = lambda status, info: forwarded.append(status)
+        collector.attach_to_engine(engine, None)
+        engine.status_callback('started', None)
+        engine.status_callback('completed', None)
+
+        assert forwarded == ['started', 'completed']
+        assert not (tmp_path / "runs.csv").exists()
+
+        release.set()
+        assert writer.flush(timeout=2.0)
+        with open(csv_path, newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        assert len(rows) == 1
+        assert rows[0]['completion_status'] == 'success'
+        assert list(rows[0].keys()) == CSV_COLUMNS
+
+
+class TestSettingsCache:
+    """Settings are re-read only when settings.json changes"""
+
+    def test_reload_on_mtime_change(self, tmp_path, monkeypatch):
+        """Cached dict should be reused until the file's mtime changes"""
+        path = tmp_path / "settings.json"
+        path.write_text('{"analytics": {"enabled": true}}')
+        monkeypatch.setattr(analytics, 'SETTINGS_PATH', str(path))
+        monkeypatch.setitem(analytics._settings_cache, 'mtime', None)
+        monkeypatch.setitem(analytics._settings_cache, 'data', {})
+
+        first = analytics._load_settings()
+        assert analytics._load_settings() is first
+
+        path.write_text('{"analytics": {"enabled": false}}')
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        assert analytics._load_settings()['analytics']['enabled'] is False
+
+
+class TestCollectorSafetyPause:
+    """Real-time monitor pauses inside a run"""
+
+    def test_monitor_stop_does_not_end_run(self, tmp_path, monkeypatch):
+        """A monitor emergency_stop should be measured as a pause and the run continue"""
+        collector = AnalyticsCollector()
+        monkeypatch.setattr(collector, '_get_settings', lambda: {
+            'csv_file_path': str(tmp_path / "runs.csv"),
+            'telemetry_enabled': True,
+            'telemetry_file_path': str(tmp_path / "telemetry.csv"),
+        })
+        writer = AnalyticsWriter()
+        monkeypatch.setattr(analytics, 'get_analytics_writer', lambda: writer)
+
+        engine = FakeEngine()
+        engine.steps = [{'operation': 'move_y'}, {'operation': 'move_x'}]
+        forwarded = []
+        engine.status_callback = lambda status, info: forwarded.append(status)
+        collector.attach_to_engine(engine, None)
+        engine.status_callback('started', None)
+        engine.status_callback('step_executing', {'step_index': 0})
+        engine.status_callback('emergency_stop', {'safety_code': 'DOOR', 'monitor_type': 'real_time'})
+        time.sleep(0.3)
+        engine.status_callback('safety_recovered', {})
+        engine.status_callback('step_completed', {'step_index': 0})
+        engine.status_callback('step_executing', {'step_index': 1})
+        engine.status_callback('step_completed', {'step_index': 1})
+        engine.status_callback('completed', None)
+
+        assert forwarded[-1] == 'completed'
+        assert engine.status_callback is not collector._on_status
+        assert writer.flush(timeout=2.0)
+        with open(tmp_path / "telemetry.csv", newline='', encoding='utf-8') as f:
+            spans = [(row['event'], float(row['duration_seconds'])) for row in csv.DictReader(f)]
+        assert spans[0][0] == 'safety_pause' and spans[0][1] >= 0.3
+        assert [event for event, _ in spans].count('step') == 2
+        with open(tmp_path / "runs.csv", newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        assert rows[0]['completion_status'] == 'success'
+        assert rows[0]['safety_code'] == 'DOOR'
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+
+import threading
+import time
+import pytest
+from hardware.implementations.real.raspberry_pi import raspberry_pi_gpio
+from hardware.implementations.real.raspberry_pi.raspberry_pi_gpio import RaspberryPiGPIO
+from hardware.implementations.real.real_hardware import RealHardware
+from core.logger import get_logger
+
+EDGE_PINS = {"x_left_edge": 4, "x_right_edge": 17, "y_top_edge": 27, "y_bottom_edge": 22}
+
+
+class EdgeGPIO:
+    """RPi.GPIO stand-in with inputs the test drives and edge-detect callbacks"""
+    BOTH = "BOTH"
+
+    def __init__(self):
+        self.levels = {}
+        self.callbacks = {}
+
+    def input(self, pin):
+        return self.levels.get(pin, False)
+
+    def add_event_detect(self, pin, edge, callback=None):
+        self.callbacks[pin] = callback
+
+    def remove_event_detect(self, pin):
+        self.callbacks.pop(pin, None)
+
+    def set_level(self, pin, level):
+        self.levels[pin] = level
+        if pin in self.callbacks:
+            self.callbacks[pin](pin)
+
+
+@pytest.fixture
+def gpio(monkeypatch):
+    fake = EdgeGPIO()
+    monkeypatch.setattr(raspberry_pi_gpio, "GPIO", fake)
+    gpio = RaspberryPiGPIO()
+    gpio.direct_sensor_pins = dict(EDGE_PINS)
+    gpio.rs485 = None
+    gpio.rs485_config = {}
+    gpio.limit_switch_pins = {}
+    gpio.is_initialized = True
+    gpio.fake = fake
+    yield gpio
+    gpio.stop_switch_polling()
+
+
+@pytest.fixture
+def hardware(gpio):
+    hardware = RealHardware.__new__(RealHardware)
+    hardware.logger = get_logger()
+    hardware.gpio = gpio
+    hardware.grbl = None
+    hardware.is_initialized = True
+    hardware.execution_engine = None
+    hardware._stop_sensor_wait = threading.Event()
+    hardware.sensor_poll_interval = 0.05
+    hardware.sensor_wait_timeout = 5.0
+    return hardware
+
+
+def wait_in_thread(target):
+    result = {}
+    thread = threading.Thread(target=lambda: result.setdefault('value', target()))
+    thread.start()
+    time.sleep(0.05)  # let the waiter block
+    return thread, result
+
+
+class TestEdgeDetection:
+    """Edge switches reported by GPIO interrupts"""
+
+    def test_interrupts_replace_polling(self, gpio):
+        """With edge detection the polling thread should not read the edge pins"""
+        gpio.start_switch_polling()
+        assert set(gpio.fake.callbacks) == set(EDGE_PINS.values())
+        gpio.fake.set_level(EDGE_PINS["y_top_edge"], True)
+        assert gpio.get_y_top_edge_sensor() is True
+        gpio.stop_switch_polling()
+        assert gpio.fake.callbacks == {}
+
+    def test_polling_fallback(self, gpio):
+        """Without edge detection the polling thread should pick up the change"""
+        gpio._edge_detection = False
+        gpio.start_switch_polling()
+        assert gpio.fake.callbacks == {}
+        version = gpio.switch_version()
+        gpio.fake.levels[EDGE_PINS["x_right_edge"]] = True
+        gpio.wait_for_switch_change(version, timeout=1.0)
+        assert gpio.get_x_right_edge_sensor() is True
+
+
+class TestEventDrivenWaits:
+    """RealHardware sensor waits block on switch-change notifications"""
+
+    def test_wait_returns_on_edge(self, hardware, gpio):
+        """The wait should return as soon as the edge callback fires"""
+        gpio.start_switch_polling()
+        hardware.sensor_poll_interval = 10.0  # a polled wait would not return in time
+        thread, result = wait_in_thread(hardware.wait_for_x_sensor)
+        gpio.fake.set_level(EDGE_PINS["x_right_edge"], True)
+        thread.join(timeout=0.2)
+        assert not thread.is_alive()
+        assert result['value'] == 'right'
+
+    def test_stop_wakes_wait(self, hardware, gpio):
+        """signal_all_sensor_events should abort a blocked wait and release the fast edge rate"""
+        gpio.start_switch_polling()
+        thread, result = wait_in_thread(hardware.wait_for_y_bottom_sensor)
+        assert gpio.poll_scheduler.is_active("edge")
+        hardware.signal_all_sensor_events()
+        thread.join(timeout=0.2)
+        assert not thread.is_alive()
+        assert result['value'] is None
+        assert not gpio.poll_scheduler.is_active("edge")
+
+    def test_timeout(self, hardware, gpio):
+        """A wait with no edge should give up after sensor_wait_timeout"""
+        gpio.start_switch_polling()
+        hardware.sensor_wait_timeout = 0.1
+        assert hardware.wait_for_x_left_sensor() is None
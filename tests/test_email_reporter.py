@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+
+import csv
+import threading
+import pytest
+from datetime import datetime
+from core.analytics import CSV_COLUMNS
+from core.email_reporter import EmailReporter
+from core.report_outbox import ReportOutbox
+
+
+def _write_runs(path):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS)
+        writer.writeheader()
+        for run_id, ts in (('r1', '2026-03-01T08:00:00'), ('r2', '2026-03-02T09:00:00')):
+            writer.writerow({
+                'run_id': run_id, 'timestamp_start': ts, 'timestamp_end': ts,
+                'duration_seconds': 12.0, 'program_name': 'Prog', 'program_number': 1,
+                'completion_status': 'success', 'total_steps': 4, 'completed_steps': 4,
+                'successful_steps': 4, 'failed_steps': 0, 'hardware_mode': 'mock',
+            })
+
+
+def _run_job(outbox, attempt):
+    """Enqueue attempt and wait for the final outcome"""
+    done = threading.Event()
+    result = []
+    outbox.enqueue(attempt, on_done=lambda ok, err: (result.append((ok, err)), done.set()))
+    assert done.wait(2.0)
+    return result[0]
+
+
+class TestReportOutbox:
+    """Background delivery with retry back-off"""
+
+    def test_retries_until_success(self):
+        """Transient failures should be retried"""
+        outbox = ReportOutbox(retry_delays=(0.01, 0.01, 0.01))
+        attempts = []
+
+        def attempt():
+            attempts.append(1)
+            if len(attempts) < 3:
+                return False, 'server busy', True
+            return True, '', False
+
+        assert _run_job(outbox, attempt) == (True, '')
+        assert len(attempts) == 3
+        assert outbox.pending() == 0
+
+    def test_gives_up_after_last_delay(self):
+        """A job should be attempted once plus once per retry delay"""
+        outbox = ReportOutbox(retry_delays=(0.01, 0.01))
+        attempts = []
+
+        def attempt():
+            attempts.append(1)
+            raise OSError('network down')
+
+        assert _run_job(outbox, attempt) == (False, 'network down')
+        assert len(attempts) == 3
+
+    def test_permanent_failure_not_retried(self):
+        """Non-retryable failures should be reported straight away"""
+        outbox = ReportOutbox(retry_delays=(0.01,))
+        attempts = []
+
+        def attempt():
+            attempts.append(1)
+            return False, 'auth failed', False
+
+        assert _run_job(outbox, attempt) == (False, 'auth failed')
+        assert len(attempts) == 1
+
+    def test_retry_reported_before_final_outcome(self):
+        """Each failed attempt that will be retried should be reported right away"""
+        outbox = ReportOutbox(retry_delays=(0.01, 0.01))
+        retries = []
+        done = threading.Event()
+
+        def attempt():
+            return (True, '', False) if len(retries) == 2 else (False, 'server busy', True)
+
+        outbox.enqueue(attempt, on_done=lambda ok, err: done.set(),
+                       on_retry=lambda err, delay: retries.append((err, delay, done.is_set())))
+        assert done.wait(2.0)
+        assert retries == [('server busy', 0.01, False), ('server busy', 0.01, False)]
+
+
+class TestReportRendering:
+    """Rendered report caching"""
+
+    @pytest.fixture
+    def reporter(self, tmp_path, monkeypatch):
+        csv_path = str(tmp_path / "runs.csv")
+        _write_runs(csv_path)
+        reporter = EmailReporter()
+        monkeypatch.setattr(reporter, '_get_email_settings', lambda: {'schedule_frequency': 'daily'})
+        monkeypatch.setattr(reporter, '_get_csv_path', lambda: csv_path)
+
+        builds = []
+        original = reporter._build_hebrew_html
+        monkeypatch.setattr(reporter, '_build_hebrew_html',
+                            lambda summary: builds.append(1) or original(summary))
+        reporter.builds = builds
+        return reporter
+
+    def test_same_period_rendered_once(self, reporter, tmp_path):
+        """Repeated renders of a period should come from the disk cache"""
+        period = (datetime(2026, 3, 1), datetime(2026, 3, 1, 23, 59, 59))
+        first, _ = reporter.render_report(period=period)
+        second, _ = reporter.render_report(period=period)
+        assert first == second
+        assert len(reporter.builds) == 1
+        assert len(list((tmp_path / "reports").glob("*.html"))) == 1
+
+        reporter.render_report(period=(datetime(2026, 3, 2), datetime(2026, 3, 2, 23, 59, 59)))
+        assert len(reporter.builds) == 2
+
+    def test_empty_period(self, reporter):
+        """Periods without runs should not render"""
+        html, error = reporter.render_report(period=(datetime(2020, 1, 1), datetime(2020, 1, 1, 23, 59)))
+        assert html is None
+        assert error == 'No analytics data available'
+
+    def test_queue_report_requires_configuration(self, reporter):
+        """Queueing should fail fast when email is not configured"""
+        assert reporter.queue_report() == (False, 'Email reporting is disabled')
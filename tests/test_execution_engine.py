@@ -369,6 +369,37 @@ class TestExecuteStep:
         assert result_up['success'] is True
         assert hw.get_line_marker_state() == 'up'
 
+    def test_execute_tool_group(self):
+        """A tool_group step should move every tool in it"""
+        _ensure_safety_clear()
+        engine = ExecutionEngine()
+        hw = engine.hardware
+
+        step = {'operation': 'tool_group',
+                'parameters': {'actions': [{'tool': 'line_marker', 'action': 'down'},
+                                           {'tool': 'row_cutter', 'action': 'down'}]},
+                'description': 'Lower line marker + row cutter'}
+        result = engine._execute_step(step)
+
+        assert result['success'] is True
+        assert hw.get_line_marker_state() == 'down'
+        assert hw.get_row_cutter_state() == 'down'
+
+        step['parameters']['actions'] = [{'tool': 'line_marker', 'action': 'up'},
+                                         {'tool': 'row_cutter', 'action': 'up'}]
+        assert engine._execute_step(step)['success'] is True
+        assert hw.get_line_marker_state() == 'up'
+
+    def test_execute_tool_group_unknown_tool(self):
+        """A tool_group naming an unknown tool should fail"""
+        _ensure_safety_clear()
+        engine = ExecutionEngine()
+        step = {'operation': 'tool_group',
+                'parameters': {'actions': [{'tool': 'line_marker', 'action': 'down'},
+                                           {'tool': 'laser', 'action': 'down'}]},
+                'description': 'Bad group'}
+        assert engine._execute_step(step)['success'] is False
+
     def test_execute_tool_action_line_cutter(self):
         """Should execute line cutter tool actions"""
         _ensure_safety_clear()
@@ -598,6 +629,161 @@ class TestExecutionLoop:
         assert len(engine.step_results) < len(steps)
 
 
+class TestStreamedMoves:
+    def test_consecutive_moves_streamed(self):
+        """Consecutive moves should go to stream_moves together and complete per step"""
+        _ensure_safety_clear()
+        engine = ExecutionEngine()
+        calls = []
+
+        def stream_moves(moves, on_move_complete=None, cancel_event=None):
+            calls.append(moves)
+            for index in range(len(moves)):
+                on_move_complete(index)
+            return True
+
+        engine.hardware.stream_moves = stream_moves
+        steps = [
+            {'operation': 'move_y', 'parameters': {'position': 5.0}, 'description': 'Move Y'},
+            {'operation': 'move_y', 'parameters': {'position': 10.0}, 'description': 'Move Y'},
+            {'operation': 'tool_action', 'parameters': {'tool': 'line_marker', 'action': 'up'},
+             'description': 'Raise marker'}
+        ]
+        engine.load_steps(steps)
+        engine.start_execution()
+
+        start = time.time()
+        while engine.is_running and (time.time() - start) < 10.0:
+            time.sleep(0.05)
+
+        assert engine.execution_completed is True
+        assert calls == [[('move_y', 5.0), ('move_y', 10.0)]]
+        assert [r['step_index'] for r in engine.step_results] == [0, 1, 2]
+        assert all(r['result']['success'] for r in engine.step_results)
+
+    def test_run_stops_at_lines_to_rows_transition(self):
+        """A run may span the init X/Y pair but not the lines -> rows transition"""
+        engine = ExecutionEngine()
+        engine.hardware.stream_moves = lambda moves, on_move_complete=None, cancel_event=None: True
+        engine.load_steps([
+            {'operation': 'move_x', 'parameters': {'position': 0.0},
+             'description': 'Init: Move rows motor to home position (X=0)'},
+            {'operation': 'move_y', 'parameters': {'position': 0.0},
+             'description': 'Init: Move lines motor to home position (Y=0)'},
+            {'operation': 'move_x', 'parameters': {'position': 50.0},
+             'description': 'Cut RIGHT paper edge: Move to 50cm'},
+        ])
+        engine.current_operation_type = 'rows'
+        run = engine._collect_move_run(engine.steps[0])
+        assert run == engine.steps[:2]
+
+    def test_stop_during_streamed_run(self):
+        """Stop should cancel the stream and no step should complete after 'stopped'"""
+        _ensure_safety_clear()
+        engine = ExecutionEngine()
+        statuses = []
+        engine.set_status_callback(lambda status, info=None: statuses.append(status))
+        cancelled = []
+
+        def stream_moves(moves, on_move_complete=None, cancel_event=None):
+            on_move_complete(0)
+            # The machine keeps reporting targets until the cancel is seen
+            cancel_event.wait(5.0)
+            on_move_complete(1)
+            time.sleep(0.2)  # feed hold and planner flush
+            cancelled.append(True)
+            return False
+
+        engine.hardware.stream_moves = stream_moves
+        engine.load_steps([
+            {'operation': 'move_y', 'parameters': {'position': float(position)}, 'description': 'Move Y'}
+            for position in (5, 10, 15, 20)
+        ])
+        engine.start_execution()
+        time.sleep(0.3)
+
+        assert engine.stop_execution() is True
+        assert cancelled == [True]
+        assert statuses[-1] == 'stopped'
+        assert [r['step_index'] for r in engine.step_results] == [0]
+        time.sleep(0.2)
+        assert statuses[-1] == 'stopped'
+        assert engine.execution_completed is False
+
+    def test_run_previewed_at_projected_position(self):
+        """Later moves should be checked where earlier moves leave the machine, without logging"""
+        from core import safety_system as safety
+        engine = ExecutionEngine()
+        engine.hardware.stream_moves = lambda moves, on_move_complete=None, cancel_event=None: True
+        engine.load_steps([
+            {'operation': 'move_y', 'parameters': {'position': float(position)}, 'description': 'Move Y'}
+            for position in (5, 10, 15)
+        ])
+        seen = []
+
+        def preview(step, positions=None):
+            seen.append(dict(positions or {}))
+            return (step['parameters']['position'] < 15.0), None
+
+        original = safety.safety_system.preview_step_safety
+        safety.safety_system.preview_step_safety = preview
+        logged = len(safety.safety_system.violations_log)
+        try:
+            run = engine._collect_move_run(engine.steps[0])
+        finally:
+            safety.safety_system.preview_step_safety = original
+        assert run == engine.steps[:2]
+        assert seen == [{}, {'y_position': 5.0}, {'y_position': 10.0}]
+        assert len(safety.safety_system.violations_log) == logged
+
+    def test_single_move_not_streamed(self):
+        """A lone move should use the normal per-step path"""
+        engine = ExecutionEngine()
+        engine.hardware.stream_moves = lambda moves, on_move_complete=None, cancel_event=None: True
+        engine.load_steps([
+            {'operation': 'move_x', 'parameters': {'position': 10.0}, 'description': 'Move X'},
+            {'operation': 'program_complete', 'parameters': {}, 'description': 'Complete'}
+        ])
+        assert engine._collect_move_run(engine.steps[0]) is None
+
+
+class TestAsyncMoves:
+    def test_async_move_used_when_available(self):
+        """Moves should run through move_x_async and succeed when the handle resolves True"""
+        from hardware.interfaces.motion_handle import MotionHandle
+        engine = ExecutionEngine()
+
+        def move_x_async(position):
+            handle = MotionHandle(position, 0.0)
+            threading.Timer(0.1, handle.finish, args=(True,)).start()
+            return handle
+
+        engine.hardware.move_x_async = move_x_async
+        result = engine._execute_step(
+            {'operation': 'move_x', 'parameters': {'position': 10.0}, 'description': 'Move X'})
+        assert result == {'success': True, 'position': 10.0}
+
+    def test_stop_cancels_async_move(self):
+        """A stop request during an async move should cancel it"""
+        from hardware.interfaces.motion_handle import MotionHandle
+        engine = ExecutionEngine()
+        handles = []
+
+        def move_y_async(position):
+            handle = MotionHandle(0.0, position)
+            threading.Thread(target=lambda: (handle.cancel_event.wait(5.0), handle.finish(False)),
+                             daemon=True).start()
+            handles.append(handle)
+            return handle
+
+        engine.hardware.move_y_async = move_y_async
+        threading.Timer(0.2, engine.stop_event.set).start()
+        result = engine._execute_step(
+            {'operation': 'move_y', 'parameters': {'position': 20.0}, 'description': 'Move Y'})
+        assert result['success'] is False
+        assert handles[0].cancel_requested
+
+
 class TestExecutionStatus:
     def test_get_execution_status_fields(self):
         """Should return all status fields"""
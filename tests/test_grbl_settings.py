@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+
+import time
+import pytest
+from hardware.implementations.real.arduino_grbl.grbl_settings import (
+    GrblSettingsSync, parse_settings, settings_equal, format_setting,
+)
+from hardware.implementations.real.arduino_grbl.grbl_transport import GrblTransport
+from tests.test_grbl_transport import FakeSerial
+
+SETTINGS_DUMP = ["$0=10", "$1=25", "$22=1", "$100=14.740", "$110=2000.000", "ok"]
+
+
+@pytest.fixture
+def fake_serial():
+    fake = FakeSerial()
+    fake.responses["$$"] = SETTINGS_DUMP
+    return fake
+
+
+@pytest.fixture
+def sync(fake_serial):
+    transport = GrblTransport(fake_serial)
+    transport.start()
+    sync = GrblSettingsSync(lambda command: transport.send_command(command, 1.0))
+    sync.attach(transport)
+    yield sync
+    transport.stop()
+
+
+def written_lines(fake_serial):
+    return [data.decode().strip() for data in fake_serial.written if data.endswith(b"\n")]
+
+
+class TestSettingsParsing:
+    """Typed settings map"""
+
+    def test_parse_typed(self):
+        """Flags and masks should parse as int, rates as float"""
+        settings = parse_settings("\n".join(SETTINGS_DUMP))
+        assert settings == {"$0": 10, "$1": 25, "$22": 1, "$100": 14.74, "$110": 2000.0}
+        assert isinstance(settings["$22"], int)
+        assert isinstance(settings["$110"], float)
+
+    def test_equality_and_format(self):
+        """Values should compare by type with GRBL's 3-decimal precision"""
+        assert settings_equal("$100", 14.74, "14.740")
+        assert not settings_equal("$100", 14.74, 14.75)
+        assert settings_equal("$22", 1, "1")
+        assert not settings_equal("$110", None, 2000)
+        assert format_setting("$110", 2000) == "$110=2000.000"
+        assert format_setting("$22", "1") == "$22=1"
+
+
+class TestSettingsSync:
+    """Diff-based writes and the cached snapshot"""
+
+    def test_apply_writes_only_changed_keys(self, sync, fake_serial):
+        """Unchanged keys should be skipped and the cache updated from the acks"""
+        result = sync.apply({"$0": 10, "$100": "14.74", "$110": 2500, "$22": 0})
+        assert result.ok
+        assert result.written == ["$22", "$110"]
+        assert result.unchanged == ["$0", "$100"]
+        assert written_lines(fake_serial) == ["$$", "$22=0", "$110=2500.000"]
+        assert sync.read() == {"$0": 10, "$1": 25, "$22": 0, "$100": 14.74, "$110": 2500.0}
+        assert written_lines(fake_serial).count("$$") == 1
+
+    def test_rejected_write_reported(self, sync, fake_serial):
+        """A key GRBL rejects should be listed with its response and keep its cached value"""
+        fake_serial.responses["$110=-1.000"] = ["error:3"]
+        result = sync.apply({"$110": -1})
+        assert not result.ok
+        assert result.failed == {"$110": "error:3"}
+        assert sync.snapshot()["$110"] == 2000.0
+
+    def test_reset_invalidates_cache(self, sync, fake_serial):
+        """A welcome banner should force the next read to query GRBL again"""
+        sync.read()
+        fake_serial.feed(b"Grbl 1.1h ['$' for help]\r\n")
+        deadline = time.monotonic() + 1.0
+        while sync.snapshot() is not None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert sync.snapshot() is None
+        sync.read()
+        assert written_lines(fake_serial).count("$$") == 2
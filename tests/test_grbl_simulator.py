@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+
+import time
+import pytest
+from hardware.implementations.real.arduino_grbl.arduino_grbl import ArduinoGRBL
+from hardware.implementations.real.arduino_grbl.grbl_simulator import GrblSimulator, SimulatedSerial
+from hardware.implementations.real.arduino_grbl.grbl_status import parse_status
+from hardware.implementations.real.arduino_grbl.grbl_transport import GrblTransport
+
+FAST_SETTINGS = {"$22": 1, "$25": 6000, "$110": 6000, "$111": 6000, "$120": 500, "$121": 500}
+
+
+def read_lines(port, until=None, timeout=2.0):
+    """Read lines until one equals `until` (or nothing more arrives when until is None)"""
+    lines = []
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        line = port.readline().decode().strip()
+        if not line:
+            if until is None:
+                return lines
+            continue
+        lines.append(line)
+        if line == until:
+            return lines
+    return lines
+
+
+def query(port):
+    port.write(b"?")
+    for line in read_lines(port, timeout=0.5):
+        if line.startswith('<'):
+            return parse_status(line)
+    return None
+
+
+def wait_state(port, state, timeout=3.0, moved=False):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status = query(port)
+        if status and status.state == state and (not moved or status.mpos[:2] != (0.0, 0.0)):
+            return status
+        time.sleep(0.01)
+    raise AssertionError(f"simulator never reached {state}")
+
+
+@pytest.fixture
+def port():
+    port = SimulatedSerial(timeout=0.05, settings=FAST_SETTINGS, time_scale=5.0)
+    read_lines(port)  # boot banner
+    port.write(b"$X\n")
+    read_lines(port, until="ok")
+    yield port
+    port.close()
+
+
+class TestSimulatorProtocol:
+    """Line responses and status reports"""
+
+    def test_boots_locked_when_homing_enabled(self):
+        """With $22=1 the simulator should boot in Alarm and reject G-code until unlocked"""
+        port = SimulatedSerial(timeout=0.05, settings={"$22": 1})
+        try:
+            assert read_lines(port)[0].startswith("Grbl 1.1")
+            port.write(b"G0 X10\n")
+            assert read_lines(port, until="error:9")[-1] == "error:9"
+            port.write(b"$X\n")
+            assert read_lines(port, until="ok") == ["[MSG:Caution: Unlocked]", "ok"]
+        finally:
+            port.close()
+
+    def test_command_errors(self, port):
+        """Missing feed rate, unsupported commands and bad settings should be rejected"""
+        port.write(b"G1 X10\nG38.2 X1\n$Q\n")
+        assert read_lines(port, timeout=0.5) == ["error:22", "error:20", "error:3"]
+
+    def test_settings_write_and_dump(self, port):
+        """$N=value should be stored and appear in the $$ dump"""
+        port.write(b"$110=1234.5\n$$\n")
+        lines = read_lines(port, timeout=0.5)
+        assert lines[0] == "ok"
+        assert "$110=1234.500" in lines
+
+    def test_work_offset_reported(self, port):
+        """G10 L20 should set the WCO, which is sent in the next report"""
+        port.write(b"G0 X5 Y5\n")
+        read_lines(port, until="ok")
+        wait_state(port, 'Idle', moved=True)
+        port.write(b"G10 L20 P1 X0 Y0\n")
+        assert read_lines(port, until="ok")[-1] == "ok"
+        status = query(port)
+        assert status.mpos[:2] == (5.0, 5.0)
+        assert status.wco[:2] == (5.0, 5.0)
+
+
+class TestSimulatorMotion:
+    """Kinematics, feed hold, reset and homing"""
+
+    def test_move_accelerates_to_target(self, port):
+        """A move should pass through Run with intermediate positions and end at the target"""
+        port.write(b"N3 G1 X20 F600\n")
+        read_lines(port, until="ok")
+        status = wait_state(port, 'Run', moved=True)
+        assert 0.0 < status.mpos[0] < 20.0
+        assert status.line == 3
+        status = wait_state(port, 'Idle')
+        assert status.mpos[:2] == (20.0, 0.0)
+
+    def test_feed_hold_and_resume(self, port):
+        """'!' should decelerate to Hold:0 short of the target; '~' should finish the move"""
+        port.write(b"G1 X50 F1200\n")
+        read_lines(port, until="ok")
+        wait_state(port, 'Run')
+        port.write(b"!")
+        held = wait_state(port, 'Hold:0')
+        time.sleep(0.1)
+        assert query(port).mpos[0] == held.mpos[0] < 50.0
+        port.write(b"~")
+        assert wait_state(port, 'Idle').mpos[0] == 50.0
+
+    def test_reset_while_moving_alarms(self, port):
+        """Ctrl-X during motion should report ALARM:3, flush the planner and reboot"""
+        port.write(b"G1 X50 F600\nG1 Y50 F600\n")
+        read_lines(port, until="ok")
+        port.write(b"\x18")
+        lines = read_lines(port, timeout=0.5)
+        assert "ALARM:3" in lines
+        assert any(line.startswith("Grbl 1.1") for line in lines)
+        status = query(port)
+        assert status.state == 'Alarm'
+        assert status.mpos[1] == 0.0
+
+    def test_homing_returns_to_origin(self, port):
+        """$H should run in the Home state and finish at machine zero"""
+        port.write(b"G0 X10 Y10\n")
+        read_lines(port, until="ok")
+        wait_state(port, 'Idle', moved=True)
+        port.write(b"$H\n")
+        assert read_lines(port, until="ok")[-1] == "ok"
+        assert query(port).mpos[:2] == (0.0, 0.0)
+
+    def test_streaming_respects_rx_buffer(self):
+        """Character-counted streaming should never overflow the 128-byte RX buffer"""
+        simulator = GrblSimulator(FAST_SETTINGS, time_scale=5.0)
+        port = SimulatedSerial(timeout=0.05, simulator=simulator)
+        transport = GrblTransport(port)
+        transport.start()
+        try:
+            transport.send_command("$X", timeout=1.0)
+            futures = [transport.send_streamed(f"N{i} G1 X{i}.000 Y{i}.000 F6000", timeout=5.0)
+                       for i in range(1, 40)]
+            assert all(future.result(timeout=10.0).endswith("ok") for future in futures)
+            assert simulator.rx_overflows == 0
+        finally:
+            transport.stop()
+            port.close()
+
+
+class TestArduinoGRBLSimulated:
+    """ArduinoGRBL driven end to end against the simulator"""
+
+    @pytest.fixture
+    def grbl(self):
+        grbl = ArduinoGRBL()
+        grbl.serial_port = "sim://grbl"
+        grbl.connection_timeout = 0.05
+        grbl._grbl_init_delay = 0
+        grbl.simulator = GrblSimulator(FAST_SETTINGS, time_scale=20.0)  # connect() applies settings.json rates
+        assert grbl.connect()
+        yield grbl
+        grbl.disconnect()
+
+    def test_connect_unlocks_and_moves(self, grbl):
+        """connect() should clear the boot alarm and move_to should reach the target"""
+        assert "$X" in grbl.simulator.commands
+        assert grbl.move_to(3.0, 2.0)
+        status = grbl.get_status()
+        assert status['state'] == 'Idle'
+        assert (status['x'], status['y']) == (3.0, 2.0)
+        assert grbl.simulator.mpos == (30.0, 20.0)
+
+    def test_stream_moves(self, grbl):
+        """Streamed moves should all be reported reached, in order"""
+        reached = []
+        assert grbl.stream_moves([(1.0, None), (None, 1.0), (2.0, 2.0)], on_target_reached=reached.append)
+        assert reached == [0, 1, 2]
+        assert grbl.simulator.mpos == (20.0, 20.0)
+
+    def test_stream_moves_cancel(self, grbl):
+        """A set cancel_event should stop the machine short of the remaining targets"""
+        import threading
+        cancel = threading.Event()
+        reached = []
+        timer = threading.Timer(0.1, cancel.set)
+        timer.start()
+        assert grbl.stream_moves([(50.0, None), (50.0, 50.0), (0.0, 50.0)], on_target_reached=reached.append,
+                                 cancel_event=cancel) is False
+        timer.join()
+        assert reached == []
+        assert grbl.get_status()['state'] == 'Idle'
+        assert grbl.simulator.mpos[0] < 500.0
+
+
+class TestDriverImport:
+    """The production driver should not pull in the simulator"""
+
+    def test_simulator_loaded_lazily(self):
+        """Importing ArduinoGRBL alone should not import grbl_simulator"""
+        import subprocess
+        import sys
+        code = ("import sys; import hardware.implementations.real.arduino_grbl.arduino_grbl; "
+                "print('hardware.implementations.real.arduino_grbl.grbl_simulator' in sys.modules)")
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, timeout=60)
+        assert result.stdout.strip().splitlines()[-1] == "False"
+
+    def test_simulator_open_failure_reported(self, monkeypatch):
+        """A failure while opening a sim:// port should surface as the driver's own error"""
+        grbl = ArduinoGRBL()
+        grbl.serial_port = "sim://grbl"
+
+        def fail():
+            raise OSError("simulator failed")
+        monkeypatch.setattr(grbl, "_open_serial", fail)
+        with pytest.raises(RuntimeError, match="simulator failed"):
+            grbl.connect()
+
+
+class Pistons:
+    """Hardware interface stand-in: piston calls are recorded and confirmed unless listed as failing"""
+
+    def __init__(self, failing=()):
+        self.calls = []
+        self.failing = set(failing)
+
+    def get_door_sensor(self):
+        return False
+
+    def __getattr__(self, name):
+        return lambda: self.calls.append(name) or name not in self.failing
+
+
+class TestWarmStart:
+    """Banner-driven readiness, cached settings and skipping homing"""
+
+    @pytest.fixture
+    def grbl(self):
+        grbl = ArduinoGRBL()
+        grbl.serial_port = "sim://grbl"
+        grbl.connection_timeout = 0.05
+        grbl._grbl_init_delay = 5.0
+        grbl._grbl_reset_delay = 5.0
+        grbl.simulator = GrblSimulator(FAST_SETTINGS, time_scale=50.0)
+        yield grbl
+        grbl.disconnect()
+
+    def test_connect_does_not_wait_full_delay(self, grbl):
+        """connect() should finish on GRBL's banner, not after grbl_initialization_delay"""
+        start = time.monotonic()
+        assert grbl.connect()
+        assert time.monotonic() - start < 2.0
+
+    def test_unchanged_settings_not_rewritten(self, grbl):
+        """A second apply should read nothing new and write no '$' settings"""
+        assert grbl.connect()
+        writes = [c for c in grbl.simulator.commands if '=' in c]
+        assert writes  # the first apply brings GRBL up to settings.json
+        assert grbl.apply_grbl_configuration()
+        assert [c for c in grbl.simulator.commands if '=' in c] == writes
+        assert grbl.simulator.commands.count('$$') == 1
+
+    def test_skip_homing_when_homed(self, grbl):
+        """With the option on, a homed and idle machine should not be homed again"""
+        assert grbl.connect()
+        assert not grbl.is_homed()
+        assert grbl.perform_complete_homing_sequence() == (True, "")
+        assert grbl.is_homed()
+        grbl.skip_homing_when_homed = True
+        grbl.simulator.commands.clear()
+        assert grbl.perform_complete_homing_sequence() == (True, "")
+        assert "$H" not in grbl.simulator.commands
+
+    def test_warm_start_lowers_line_motor_piston(self, grbl):
+        """A warm start should leave the pistons as the full sequence does and report skips honestly"""
+        assert grbl.connect()
+        assert grbl.perform_complete_homing_sequence() == (True, "")
+        grbl.skip_homing_when_homed = True
+        pistons = Pistons()
+        progress = []
+        assert grbl.perform_complete_homing_sequence(
+            hardware_interface=pistons,
+            progress_callback=lambda step, name, status, message=None: progress.append((step, status))) == (True, "")
+        assert pistons.calls[-1] == "line_motor_piston_down"
+        assert "line_motor_piston_up" not in pistons.calls
+        final = dict(progress)
+        assert [step for step in range(1, 10) if final[step] == "skipped"] == [2, 4, 5, 6, 7]
+        assert final[8] == "done"
+
+    def test_homing_has_no_fixed_piston_waits(self, grbl):
+        """Confirmed piston moves should let the full sequence finish without sleeping for them"""
+        assert grbl.connect()
+        pistons = Pistons()
+        start = time.monotonic()
+        assert grbl.perform_complete_homing_sequence(hardware_interface=pistons) == (True, "")
+        assert time.monotonic() - start < 2.0
+        assert pistons.calls.index("line_motor_piston_up") < pistons.calls.index("line_motor_piston_down")
+
+    def test_unconfirmed_piston_fails_step(self, grbl):
+        """A tool piston that does not reach UP should fail its step instead of being waited out"""
+        assert grbl.connect()
+        pistons = Pistons(failing=("row_cutter_piston_up",))
+        progress = []
+        ok, error = grbl.perform_complete_homing_sequence(
+            hardware_interface=pistons,
+            progress_callback=lambda step, name, status, message=None: progress.append((step, status)))
+        assert not ok and "row_cutter" in error
+        assert progress[-1] == (3, "error")
+        assert "line_motor_piston_up" not in pistons.calls
+
+    def test_alarm_clears_homed_state(self, grbl):
+        """An alarm means GRBL lost its position, so homing must run again"""
+        assert grbl.connect()
+        assert grbl.perform_complete_homing_sequence() == (True, "")
+        grbl.simulator.trigger_alarm(1)
+        deadline = time.monotonic() + 1.0
+        while grbl._homed and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert not grbl.is_homed()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+
+import threading
+import time
+import pytest
+from hardware.implementations.real.arduino_grbl.arduino_grbl import ArduinoGRBL
+from hardware.implementations.real.arduino_grbl.grbl_status import GrblStatusScheduler, parse_status
+from hardware.implementations.real.arduino_grbl.grbl_transport import GrblTransport
+from tests.test_grbl_transport import FakeSerial, STATUS_LINE
+
+
+@pytest.fixture
+def fake_serial():
+    return FakeSerial()
+
+
+@pytest.fixture
+def transport(fake_serial):
+    transport = GrblTransport(fake_serial)
+    transport.start()
+    yield transport
+    transport.stop()
+
+
+class TestParseStatus:
+    """Single-pass status report parser"""
+
+    def test_parse_fields(self):
+        """State, positions, pins, line number and feed should be parsed"""
+        status = parse_status("<Run|MPos:12.500,3.000,0.000|FS:1000,0|Pn:XY|Ln:7|WCO:1.000,2.000,0.000>")
+        assert status.state == 'Run'
+        assert status.mpos == (12.5, 3.0, 0.0)
+        assert status.wco == (1.0, 2.0, 0.0)
+        assert status.pins == 'XY'
+        assert status.line == 7
+        assert status.feed == 1000.0
+        assert status.wpos is None
+
+    def test_substate_and_malformed(self):
+        """Hold substates are kept whole; malformed reports return None"""
+        assert parse_status("<Hold:0|WPos:1.000,2.000,0.000>").state == 'Hold:0'
+        assert parse_status("<Idle|MPos:abc,0,0>") is None
+        assert parse_status("ok") is None
+
+
+class TestStatusScheduler:
+    """Reports requested at a fixed rate and shared with subscribers"""
+
+    def test_reports_published_to_subscribers(self, transport):
+        """Each subscriber should receive parsed reports"""
+        received = threading.Event()
+        seen = []
+        scheduler = GrblStatusScheduler(transport, idle_rate_hz=50, run_rate_hz=100)
+        scheduler.subscribe(lambda status: (seen.append(status), received.set()))
+        scheduler.start()
+        try:
+            assert received.wait(1.0)
+            assert seen[0].state == 'Idle'
+            assert scheduler.latest(max_age=1.0) is not None
+        finally:
+            scheduler.stop()
+
+    def test_faster_rate_while_moving(self, transport, fake_serial):
+        """The request interval should shorten once GRBL reports Run"""
+        fake_serial.status_reports = [b"<Run|MPos:0.000,0.000,0.000>\r\n"]
+        scheduler = GrblStatusScheduler(transport, idle_rate_hz=5, run_rate_hz=50)
+        assert scheduler.interval() == pytest.approx(0.2)
+        scheduler.start()
+        try:
+            assert scheduler.wait_for_update(1.0).state == 'Run'
+            assert scheduler.interval() == pytest.approx(0.02)
+        finally:
+            scheduler.stop()
+
+
+class TestArduinoGRBLStatusStream:
+    """ArduinoGRBL reads the shared stream instead of querying"""
+
+    @pytest.fixture
+    def grbl(self, settings_file, fake_serial):
+        grbl = ArduinoGRBL(settings_file)
+        grbl.status_report_rate = 50
+        grbl.serial_connection = fake_serial
+        grbl._start_transport()
+        grbl.is_connected = True
+        yield grbl
+        grbl.disconnect()
+
+    def test_get_status_uses_pushed_report(self, grbl, fake_serial):
+        """get_status should not send its own query while reports are fresh"""
+        assert grbl.status_scheduler.wait_for_update(1.0) is not None
+        written_before = len(fake_serial.written)
+        status = grbl.get_status(log_changes_only=False)
+        assert (status['x'], status['y']) == (10.0, 5.0)
+        assert len(fake_serial.written) - written_before <= 1  # at most the scheduler's own tick
+
+    def test_subscribers_get_work_position(self, grbl):
+        """Subscribers should receive positions converted to cm"""
+        received = threading.Event()
+        seen = []
+        grbl.subscribe_status(lambda status: (seen.append((status.x, status.y)), received.set()))
+        assert received.wait(1.0)
+        assert seen[0] == (10.0, 5.0)
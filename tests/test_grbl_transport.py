@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+
+import queue
+import threading
+import time
+import pytest
+from hardware.implementations.real.arduino_grbl.arduino_grbl import ArduinoGRBL
+from hardware.implementations.real.arduino_grbl.grbl_transport import (
+    GrblTransport, GrblCommandError, classify_line,
+    LINE_OK, LINE_ERROR, LINE_STATUS, LINE_ALARM, LINE_MESSAGE, LINE_WELCOME, LINE_DATA,
+)
+
+
+STATUS_LINE = b"<Idle|MPos:100.000,50.000,0.000|FS:0,0|WCO:0.000,0.000,0.000>\r\n"
+
+
+class FakeSerial:
+    """Serial stand-in that answers like GRBL.
+
+    Line commands are acknowledged with 'ok' (or the scripted response)
+    unless manual_acks is set, in which case ack() releases them.
+    """
+
+    def __init__(self, manual_acks=False):
+        self.manual_acks = manual_acks
+        self.responses = {}          # command -> list of response lines
+        self.status_reports = [STATUS_LINE]  # answered in turn; the last one repeats
+        self.written = []
+        self._rx = queue.Queue()
+        self._unacked = []
+
+    def feed(self, data):
+        self._rx.put(data)
+
+    def ack(self):
+        for lines in self._unacked:
+            for line in lines:
+                self.feed(line.encode() + b"\r\n")
+        self._unacked = []
+
+    def write(self, data):
+        self.written.append(data)
+        if data == b"?":
+            report = self.status_reports.pop(0) if len(self.status_reports) > 1 else self.status_reports[0]
+            self.feed(report)
+        elif data == b"\x18":
+            self.feed(b"Grbl 1.1h ['$' for help]\r\n")
+        elif data.endswith(b"\n"):
+            command = data.decode().strip()
+            lines = self.responses.get(command, ["ok"])
+            if self.manual_acks:
+                self._unacked.append(lines)
+            else:
+                for line in lines:
+                    self.feed(line.encode() + b"\r\n")
+        return len(data)
+
+    def readline(self):
+        try:
+            data = self._rx.get(timeout=0.02)
+        except queue.Empty:
+            return b""
+        if isinstance(data, Exception):
+            raise data
+        return data
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def fake_serial():
+    return FakeSerial()
+
+
+@pytest.fixture
+def transport(fake_serial):
+    transport = GrblTransport(fake_serial)
+    transport.start()
+    yield transport
+    transport.stop()
+
+
+class TestClassifyLine:
+    """Incoming line classification"""
+
+    def test_line_classes(self):
+        """Each GRBL line type should be recognised"""
+        assert classify_line("ok") == LINE_OK
+        assert classify_line("error:20") == LINE_ERROR
+        assert classify_line("<Idle|MPos:0.000,0.000,0.000>") == LINE_STATUS
+        assert classify_line("ALARM:1") == LINE_ALARM
+        assert classify_line("[MSG:'$H'|'$X' to unlock]") == LINE_MESSAGE
+        assert classify_line("Grbl 1.1h ['$' for help]") == LINE_WELCOME
+        assert classify_line("$100=80.000") == LINE_DATA
+
+
+class TestCommandDemux:
+    """Acknowledgements resolve pending commands in FIFO order"""
+
+    def test_acks_resolve_in_order(self, transport, fake_serial):
+        """Each ok should resolve the oldest outstanding command"""
+        fake_serial.manual_acks = True
+        futures = [transport.send_command_async(f"G1 X{i}") for i in range(3)]
+        assert not any(f.done() for f in futures)
+
+        fake_serial.ack()
+        assert [f.result(timeout=1.0) for f in futures] == ["ok", "ok", "ok"]
+        assert transport.pending_count() == 0
+
+    def test_data_lines_attached_to_command(self, transport, fake_serial):
+        """Response data should be returned with the command's ok"""
+        fake_serial.responses["$$"] = ["$0=10", "$1=25", "ok"]
+        assert transport.send_command("$$", timeout=1.0) == "$0=10\n$1=25\nok"
+
+    def test_error_response(self, transport, fake_serial):
+        """error:N should resolve the command with the error text"""
+        fake_serial.responses["G99"] = ["error:20"]
+        assert transport.send_command("G99", timeout=1.0) == "error:20"
+
+    def test_partial_lines_reassembled(self, transport, fake_serial):
+        """A line split across reads should be dispatched once complete"""
+        fake_serial.manual_acks = True
+        future = transport.send_command_async("G90")
+        fake_serial.feed(b"o")
+        time.sleep(0.05)
+        assert not future.done()
+        fake_serial.feed(b"k\r\n")
+        assert future.result(timeout=1.0) == "ok"
+
+    def test_timeout_keeps_fifo_aligned(self, transport, fake_serial):
+        """A late ok should be credited to the timed-out command, not the next one"""
+        fake_serial.manual_acks = True
+        assert transport.send_command("G4 P1", timeout=0.05) is None
+        second = transport.send_command_async("G90")
+        fake_serial.ack()
+        assert second.result(timeout=1.0) == "ok"
+
+
+class TestCharacterCounting:
+    """Streamed lines are limited by GRBL's RX buffer"""
+
+    def test_streamed_line_waits_for_buffer_space(self, transport, fake_serial):
+        """A line that does not fit should be written only after an ack frees space"""
+        fake_serial.manual_acks = True
+        transport.rx_buffer_size = 20
+        transport.send_streamed("G1 X1.000", timeout=1.0)   # 10 bytes
+        transport.send_streamed("G1 X2.000", timeout=1.0)   # 20 bytes - buffer full
+        assert transport.inflight_bytes() == 20
+
+        sender = threading.Thread(target=transport.send_streamed, args=("G1 X3.000", 2.0))
+        sender.start()
+        time.sleep(0.1)
+        assert b"G1 X3.000\n" not in fake_serial.written
+
+        fake_serial.ack()
+        sender.join(timeout=1.0)
+        assert b"G1 X3.000\n" in fake_serial.written
+
+    def test_buffer_full_timeout(self, transport, fake_serial):
+        """Waiting for buffer space should give up after the timeout"""
+        fake_serial.manual_acks = True
+        transport.rx_buffer_size = 10
+        transport.send_streamed("G1 X1.000", timeout=1.0)
+        with pytest.raises(TimeoutError):
+            transport.send_streamed("G1 X2.000", timeout=0.05)
+
+
+class TestStatusQueries:
+    """Status reports bypass the command queue"""
+
+    def test_status_while_command_pending(self, transport, fake_serial):
+        """A '?' query should answer even while a motion command waits for its ok"""
+        fake_serial.manual_acks = True
+        pending = transport.send_command_async("G1 X100 F1000")
+
+        start = time.monotonic()
+        status = transport.query_status(timeout=1.0)
+        assert status.startswith("<Idle|")
+        assert time.monotonic() - start < 0.5
+        assert not pending.done()
+
+        line, received = transport.latest_status()
+        assert line == status
+        assert received > 0
+
+    def test_status_is_realtime_byte(self, transport, fake_serial):
+        """Status queries should send a bare '?' that GRBL never acknowledges with ok"""
+        transport.query_status(timeout=1.0)
+        assert b"?" in fake_serial.written
+        assert b"?\n" not in fake_serial.written
+
+
+class TestResetAndFailure:
+    """Reset and link failure handling"""
+
+    def test_soft_reset_fails_pending(self, transport, fake_serial):
+        """Soft reset should fail outstanding commands"""
+        fake_serial.manual_acks = True
+        future = transport.send_command_async("G1 X10")
+        transport.soft_reset()
+        with pytest.raises(GrblCommandError):
+            future.result(timeout=1.0)
+
+    def test_ready_on_banner_after_reset(self, transport, fake_serial):
+        """wait_for_ready should return as soon as the post-reset banner arrives"""
+        start = time.monotonic()
+        transport.soft_reset()
+        assert transport.wait_for_ready(timeout=2.0, banner_only=True)
+        assert time.monotonic() - start < 0.5
+
+    def test_ready_on_status_without_banner(self, transport, fake_serial):
+        """A controller that was not reset is ready once it answers a status query"""
+        assert transport.welcome_banner is None
+        assert transport.wait_for_ready(timeout=2.0)
+        assert b"?" in fake_serial.written
+
+    def test_alarm_recorded(self, transport, fake_serial):
+        """ALARM lines should be stored and passed to listeners"""
+        seen = []
+        received = threading.Event()
+        transport.add_listener(lambda kind, line: (seen.append((kind, line)), received.set()))
+        fake_serial.feed(b"ALARM:1\r\n")
+        assert received.wait(1.0)
+        assert transport.last_alarm == "ALARM:1"
+        assert seen == [(LINE_ALARM, "ALARM:1")]
+
+    def test_link_error_fails_pending(self, transport, fake_serial):
+        """A serial read error should stop the reader and fail pending commands"""
+        fake_serial.manual_acks = True
+        future = transport.send_command_async("G1 X10")
+        fake_serial.feed(OSError("device disconnected"))
+        with pytest.raises(OSError):
+            future.result(timeout=1.0)
+        assert isinstance(transport.link_error, OSError)
+        assert not transport.is_running
+
+
+class TestArduinoGRBLTransport:
+    """ArduinoGRBL command path over the transport"""
+
+    @pytest.fixture
+    def grbl(self, settings_file, fake_serial):
+        grbl = ArduinoGRBL(settings_file)
+        grbl.status_report_rate = 0  # query on demand so scripted reports are read in order
+        grbl.serial_connection = fake_serial
+        grbl._start_transport()
+        grbl.is_connected = True
+        yield grbl
+        grbl.disconnect()
+
+    def test_send_command_and_status(self, grbl):
+        """Commands and status queries should both work through the reader thread"""
+        assert grbl._send_command("G90") == "ok"
+        status = grbl.get_status(log_changes_only=False)
+        assert status['state'] == 'Idle'
+        assert status['x'] == 10.0
+        assert status['y'] == 5.0
+
+    def test_disconnect_stops_reader(self, grbl):
+        """Disconnecting should stop the reader thread"""
+        transport = grbl.transport
+        grbl.disconnect()
+        assert grbl.transport is None
+        assert not transport.is_running
+
+    def test_stream_moves_reports_targets_in_order(self, grbl, fake_serial):
+        """Streamed targets should be reported in order, using Ln while running"""
+        fake_serial.status_reports = [
+            b"<Run|MPos:80.000,0.000,0.000|Ln:2|FS:1000,0>\r\n",
+            STATUS_LINE,
+        ]
+        grbl.movement_poll_interval = 0.01
+        reached = []
+
+        assert grbl.stream_moves([(10.0, 0.0), (10.0, 5.0)], on_target_reached=reached.append)
+        assert reached == [0, 1]
+        assert (grbl.current_x, grbl.current_y) == (10.0, 5.0)
+        streamed = [w for w in fake_serial.written if w.startswith(b"N")]
+        assert streamed[0].startswith(b"N1 G1 X100.000 Y0.000")
+        assert streamed[1].startswith(b"N2 G1 X100.000 Y50.000")
+
+    def test_stream_moves_rejected_line(self, grbl, fake_serial):
+        """An error response to a streamed line should fail the sequence"""
+        fake_serial.responses[f"N1 G1 X100.000 Y0.000 F{grbl.feed_rate}"] = ["error:33"]
+        grbl.movement_poll_interval = 0.01
+        assert grbl.stream_moves([(10.0, 0.0), (10.0, 5.0)]) is False
+
+    def test_move_to_async_reaches_target(self, grbl):
+        """An async move should resolve True and update the position once GRBL arrives"""
+        grbl.movement_poll_interval = 0.01
+        handle = grbl.move_to_async(10.0, 5.0)
+        assert handle.result(timeout=2.0) is True
+        assert (grbl.current_x, grbl.current_y) == (10.0, 5.0)
+
+    def test_move_to_async_cancel(self, grbl, fake_serial):
+        """Cancelling should feed-hold and flush GRBL, then resolve False"""
+        grbl.movement_poll_interval = 0.01
+        fake_serial.status_reports = [b"<Run|MPos:100.000,50.000,0.000|FS:1000,0>\r\n"]
+        handle = grbl.move_to_async(20.0, 5.0)
+        time.sleep(0.1)
+        handle.cancel()
+        fake_serial.status_reports = [STATUS_LINE]
+        assert handle.result(timeout=5.0) is False
+        assert b"!" in fake_serial.written
+        assert b"\x18" in fake_serial.written
+        assert grbl.current_x == 10.0
+
+    def test_cancel_keeps_homed_state(self, grbl, fake_serial):
+        """A cancel whose hold completes resets GRBL without forgetting the homing"""
+        grbl.movement_poll_interval = 0.01
+        grbl._homed = True
+        fake_serial.status_reports = [b"<Hold:0|MPos:100.000,50.000,0.000|FS:0,0>\r\n", STATUS_LINE]
+        assert grbl._cancel_motion(settle_timeout=1.0) is True
+        assert b"\x18" in fake_serial.written
+        assert grbl._homed is True
+
+    def test_cancel_without_hold_does_not_reset(self, grbl, fake_serial):
+        """No soft reset while the axes are still moving - that would lose the position"""
+        grbl.movement_poll_interval = 0.01
+        fake_serial.status_reports = [b"<Run|MPos:100.000,50.000,0.000|FS:1000,0>\r\n"]
+        assert grbl._cancel_motion(settle_timeout=0.2) is False
+        assert b"!" in fake_serial.written
+        assert b"\x18" not in fake_serial.written
+
+    def test_cancel_reports_alarm_after_reset(self, grbl, fake_serial):
+        """An Alarm after the reset should fail the cancel at once instead of waiting for Idle"""
+        grbl.movement_poll_interval = 0.01
+        fake_serial.status_reports = [b"<Hold:0|MPos:100.000,50.000,0.000|FS:0,0>\r\n",
+                                      b"<Alarm|MPos:100.000,50.000,0.000|FS:0,0>\r\n"]
+        started = time.monotonic()
+        assert grbl._cancel_motion(settle_timeout=2.0) is False
+        assert time.monotonic() - started < 1.0
+
+    def test_axis_only_move(self, grbl, fake_serial):
+        """A move with one axis omitted should not command the other axis"""
+        grbl.movement_poll_interval = 0.01
+        assert grbl.move_to(10.0, None, rapid=True)
+        assert b"G0 X100.000\n" in fake_serial.written
+        assert (grbl.current_x, grbl.current_y) == (10.0, 5.0)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+
+import csv
+import pytest
+from core.analytics_health import HEALTH_COLUMNS, health_records, load_baselines, write_health
+from hardware.implementations.real.raspberry_pi.hardware_health import (
+    BASELINE_SAMPLES,
+    HardwareHealthMonitor,
+    RollingHistogram,
+)
+from hardware.implementations.real.raspberry_pi.piston_actuation import PistonActuation, PistonActuationMonitor
+
+
+class TestRollingHistogram:
+    """Bucketed percentiles over a bounded window"""
+
+    def test_percentiles(self):
+        """Percentiles should report the upper edge of the bucket holding them"""
+        histogram = RollingHistogram((10, 50, 100), window=100)
+        for value in [5] * 90 + [80] * 10:
+            histogram.add(value)
+        assert histogram.percentile(50) == 10
+        assert histogram.percentile(95) == 100
+        assert histogram.buckets() == [("<=10", 90), ("<=50", 0), ("<=100", 10), (">100", 0)]
+
+    def test_window_evicts_oldest(self):
+        """Only the last `window` values should be counted"""
+        histogram = RollingHistogram((10, 50), window=3)
+        for value in (5, 5, 5, 40, 40, 40):
+            histogram.add(value)
+        assert histogram.count == 3
+        assert histogram.counts == [0, 3, 0]
+
+
+class TestHardwareHealthMonitor:
+    """Piston drift alerts and sensor bounce counters"""
+
+    def test_drift_alert(self):
+        """A piston whose p95 grows past baseline * ratio should be reported"""
+        health = HardwareHealthMonitor(window=20, drift_ratio=1.5)
+        for _ in range(BASELINE_SAMPLES):
+            health.record_actuation("row_cutter_piston", "down", 0.045, True)
+        assert health.snapshot()["pistons"]["row_cutter_piston:down"]["baseline_p95_ms"] == 50
+        assert health.alerts() == []
+
+        for _ in range(5):
+            health.record_actuation("row_cutter_piston", "down", 0.180, True)
+        alerts = health.alerts()
+        assert alerts == [{'piston': 'row_cutter_piston', 'state': 'down', 'p95_ms': 200, 'baseline_p95_ms': 50}]
+
+    def test_seeded_baseline_survives_restart(self):
+        """A piston that slowed down since its recorded baseline should alert after a restart"""
+        first = HardwareHealthMonitor(window=20, drift_ratio=1.5)
+        for _ in range(BASELINE_SAMPLES):
+            first.record_actuation("row_cutter_piston", "down", 0.045, True)
+        records = health_records("run-1", first.snapshot())
+
+        restarted = HardwareHealthMonitor(window=20, drift_ratio=1.5)
+        restarted.seed_baselines({r['name']: r['baseline_p95_ms'] for r in records})
+        for _ in range(BASELINE_SAMPLES - 1):
+            restarted.record_actuation("row_cutter_piston", "down", 0.180, True)
+        assert restarted.alerts() == []      # too few samples for a p95 yet
+        restarted.record_actuation("row_cutter_piston", "down", 0.180, True)
+        assert restarted.alerts() == [{'piston': 'row_cutter_piston', 'state': 'down',
+                                       'p95_ms': 200, 'baseline_p95_ms': 50}]
+
+    def test_timeouts_and_sensors(self):
+        """Timeouts, transitions and glitches should be counted separately"""
+        health = HardwareHealthMonitor()
+        health.record_actuation("line_marker_piston", "up", None, False)
+        health.record_sensor("line_marker_up_sensor", 0, True)
+        health.record_sensor("line_marker_up_sensor", 2, False)
+        snapshot = health.snapshot()
+        assert snapshot["pistons"]["line_marker_piston:up"]["timeouts"] == 1
+        assert snapshot["pistons"]["line_marker_piston:up"]["samples"] == 0
+        sensor = snapshot["sensors"]["line_marker_up_sensor"]
+        assert (sensor["transitions"], sensor["glitches"], sensor["bounces"]) == (1, 1, 2)
+
+    def test_fed_by_actuation_monitor(self):
+        """Resolved piston commands should reach the health monitor"""
+        health = HardwareHealthMonitor()
+        monitor = PistonActuationMonitor(health=health)
+        monitor.rs485 = object()
+        handle = PistonActuation("line_marker_piston", "down", "line_marker_down_sensor", 0.0, 1.0)
+        handle.result, handle.actuation_time = True, 0.08
+        monitor._record(handle)
+        piston = health.snapshot()["pistons"]["line_marker_piston:down"]
+        assert (piston["commands"], piston["samples"], piston["p50_ms"]) == (1, 1, 100)
+
+
+class TestHealthRecords:
+    """hardware_health.csv rows"""
+
+    def test_write_rows(self, tmp_path):
+        """A snapshot should produce one row per piston direction and sensor"""
+        health = HardwareHealthMonitor()
+        health.record_actuation("line_marker_piston", "down", 0.03, True)
+        health.record_sensor("row_cutter_down_sensor", 1, True)
+        records = health_records("run-1", health.snapshot())
+        path = tmp_path / "hardware_health.csv"
+        write_health(str(path), records)
+
+        with open(path, newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        assert list(rows[0]) == HEALTH_COLUMNS
+        assert [(r['kind'], r['name']) for r in rows] == [
+            ('piston', 'line_marker_piston:down'), ('sensor', 'row_cutter_down_sensor')]
+        assert rows[0]['p95_ms'] == '30'
+        assert rows[1]['bounces'] == '1'
+
+    def test_load_baselines(self, tmp_path):
+        """The last recorded baseline of each piston direction should be read back"""
+        path = tmp_path / "hardware_health.csv"
+        assert load_baselines(str(path)) == {}
+        health = HardwareHealthMonitor()
+        for actuation_time in (0.04, 0.09):
+            for _ in range(BASELINE_SAMPLES):
+                health.record_actuation("line_marker_piston", "down", actuation_time, True)
+            write_health(str(path), health_records("run", health.snapshot()))
+            health = HardwareHealthMonitor()
+        health.record_sensor("row_cutter_down_sensor", 1, True)
+        write_health(str(path), health_records("run", health.snapshot()))
+        assert load_baselines(str(path)) == {"line_marker_piston:down": 100.0}
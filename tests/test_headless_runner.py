@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+
+from core.headless_runner import run_csv, run_program
+from core.csv_parser import CSVParser
+from hardware.implementations.mock.operator_model import FixedDelayOperator
+from hardware.implementations.mock.simulated_desk import InstantClock
+from hardware.interfaces.hardware_factory import get_hardware_interface
+
+
+class TestHeadlessRunner:
+    """CSV programs executed end to end with a simulated operator"""
+
+    def test_program_completes_in_virtual_time(self, csv_file):
+        """Sensor waits and the rows door should be answered without a human"""
+        programs, errors = CSVParser().load_programs_from_csv(csv_file)
+        assert not errors
+        report = run_program(programs[0], FixedDelayOperator(2.0), time_scale=0, timeout=120.0)
+        assert report['completed'] is True
+        assert report['completed_steps'] == report['steps']
+        assert report['sensor_waits'] > 0
+        assert report['simulated_seconds'] >= 2.0 * report['sensor_waits']
+        assert report['operations']['wait_sensor']['count'] == report['sensor_waits']
+        desk = get_hardware_interface().desk
+        assert desk.operator is None and not isinstance(desk.clock, InstantClock)
+
+    def test_run_csv_selects_and_repeats(self, csv_file):
+        """Program selection and repeat should give one report per run"""
+        reports = run_csv(csv_file, FixedDelayOperator(0.5), program_numbers=[2], repeat=2,
+                          time_scale=0, timeout=120.0)
+        assert [report['program_number'] for report in reports] == [2, 2]
+        assert all(report['completed'] for report in reports)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+
+import pytest
+from hardware.implementations.real.raspberry_pi import raspberry_pi_gpio
+from hardware.implementations.real.raspberry_pi.input_debounce import BitmaskDebouncer
+from hardware.implementations.real.raspberry_pi.raspberry_pi_gpio import RaspberryPiGPIO
+
+DOOR = 1 << 15
+MARKER = 1 << 27
+
+
+class TestBitmaskDebouncer:
+    """Shift-register debounce over a packed input mask"""
+
+    def test_threshold_per_input(self):
+        """Each input should take a new value only after its own number of equal samples"""
+        debouncer = BitmaskDebouncer({"door_sensor": 15, "line_marker_down_sensor": 27},
+                                     thresholds={"door_sensor": 3}, default_threshold=2)
+        first = debouncer.update(0)
+        assert first.initialized == 0
+        assert debouncer.update(0).initialized == MARKER
+        assert debouncer.update(0).initialized == DOOR
+
+        assert debouncer.update(DOOR | MARKER).changed == 0
+        assert debouncer.update(DOOR | MARKER).changed == MARKER
+        assert debouncer.state_of("door_sensor") is False
+        assert debouncer.update(DOOR | MARKER).changed == DOOR
+        assert debouncer.state_of("door_sensor") is True
+
+    def test_glitch_rejected_and_counted(self):
+        """A one-sample glitch should not change the state but be reported as bounces"""
+        debouncer = BitmaskDebouncer({"line_marker_down_sensor": 27}, default_threshold=2)
+        debouncer.update(0)
+        debouncer.update(0)
+        assert debouncer.update(MARKER).changed == 0
+        update = debouncer.update(0)
+        assert update.changed == 0
+        assert update.settles == ()
+        update = debouncer.update(0)
+        assert update.settles == (("line_marker_down_sensor", 2, False),)
+        assert debouncer.state_of("line_marker_down_sensor") is False
+
+    def test_clean_change_has_no_bounces(self):
+        """A change without intermediate flips should settle with zero bounces"""
+        debouncer = BitmaskDebouncer({"line_marker_down_sensor": 27}, default_threshold=2)
+        debouncer.update(0)
+        debouncer.update(0)
+        debouncer.update(MARKER)
+        update = debouncer.update(MARKER)
+        assert update.changed == MARKER
+        assert update.settles == (("line_marker_down_sensor", 0, True),)
+
+    def test_unmapped_bits_ignored(self):
+        """Inputs without a name should never be reported"""
+        debouncer = BitmaskDebouncer({"door_sensor": 15}, default_threshold=1)
+        update = debouncer.update(0xFFFF0000)
+        assert list(debouncer.names(update.initialized)) == ["door_sensor"]
+        assert debouncer.state_of("door_sensor") is False
+        assert debouncer.state == 0
+
+
+class TestPollingBanks:
+    """RaspberryPiGPIO polling thread reading debounced masks"""
+
+    def test_rs485_bank_publishes_after_threshold(self, rs485_interface):
+        """switch_states should follow an RS485 sensor only after debounce_count new samples"""
+        rs485 = rs485_interface({"line_marker_down_sensor": 27})
+        rs485.bulk_read_max_age = 0
+        gpio = RaspberryPiGPIO()
+        gpio.rs485 = rs485
+        gpio._debounce_count = 2
+        bank = gpio._build_rs485_banks()["main/piston"]
+
+        gpio._poll_rs485_bank(bank, 1)
+        gpio._poll_rs485_bank(bank, 2)
+        assert gpio.switch_states["rs485_line_marker_down_sensor"] is False
+
+        rs485.client.bits = MARKER
+        gpio._poll_rs485_bank(bank, 3)
+        assert gpio.switch_states["rs485_line_marker_down_sensor"] is False
+        gpio._poll_rs485_bank(bank, 4)
+        assert gpio.switch_states["rs485_line_marker_down_sensor"] is True
+        sensor = gpio.hardware_health()["sensors"]["line_marker_down_sensor"]
+        assert (sensor["transitions"], sensor["bounces"]) == (1, 0)
+
+    def test_rs485_banks_follow_group_rates(self, rs485_interface):
+        """Each switch group of a device should get its own bank, and the device should poll at its groups' rate"""
+        rs485 = rs485_interface({"door_sensor": 15, "line_marker_down_sensor": 27})
+        gpio = RaspberryPiGPIO()
+        gpio.rs485 = rs485
+        banks = gpio._build_rs485_banks()
+        assert set(banks) == {"main/other", "main/piston"}
+        assert set(banks["main/piston"]["debouncer"].bits) == {"line_marker_down_sensor"}
+
+        gpio._apply_rs485_poll_rates(banks)
+        idle = rs485.bus.devices["main"].min_interval
+        assert idle == gpio.poll_scheduler.interval("other") > gpio.poll_scheduler.active_intervals["piston"]
+        gpio.poll_scheduler.boost("piston", 1.0)
+        gpio._apply_rs485_poll_rates(banks)
+        assert rs485.bus.devices["main"].min_interval == gpio.poll_scheduler.active_intervals["piston"]
+
+    def test_gpio_limit_bank(self, monkeypatch):
+        """Limit switches should be read active LOW and debounced with their configured threshold"""
+        levels = {4: True}
+
+        class InputGPIO:
+            def input(self, pin):
+                return levels[pin]
+
+        monkeypatch.setattr(raspberry_pi_gpio, "GPIO", InputGPIO())
+        gpio = RaspberryPiGPIO()
+        gpio.direct_sensor_pins = {}
+        gpio.limit_switch_pins = {"rows": 4}
+        gpio.gpio_config = {"debounce_thresholds": {"rows": 2}}
+        bank = gpio._build_gpio_banks()["limit"]
+
+        gpio._poll_gpio_bank(bank, 1)
+        gpio._poll_gpio_bank(bank, 2)
+        assert gpio.switch_states["limit_rows"] is False
+        levels[4] = False
+        gpio._poll_gpio_bank(bank, 3)
+        assert gpio.switch_states["limit_rows"] is False
+        gpio._poll_gpio_bank(bank, 4)
+        assert gpio.switch_states["limit_rows"] is True
@@ -5,6 +5,8 @@ import threading
 import time
 from hardware.implementations.mock import mock_hardware
 from hardware.implementations.mock.mock_hardware import MockHardware
+from hardware.implementations.mock.operator_model import FixedDelayOperator, SampledDelayOperator
+from hardware.implementations.mock.simulated_desk import InstantClock, RealTimeClock, SimulatedDesk, make_clock
 
 
 class TestMovement:
@@ -403,3 +405,96 @@ class TestMockHardwareClass:
         # Test piston control
         hw.line_marker_down()
         assert mock_hardware.line_marker_piston == "down"
+
+
+class TestModuleState:
+    """Module-level variables of the default desk"""
+
+    def test_assignment_reaches_default_desk(self):
+        """Assigning a module variable should change the default desk, not shadow it"""
+        desk = mock_hardware.get_default_desk()
+        mock_hardware.current_execution_engine = "engine"
+        try:
+            assert desk.current_execution_engine == "engine"
+            assert "current_execution_engine" not in vars(mock_hardware)
+        finally:
+            mock_hardware.current_execution_engine = None
+
+
+class TestSimulatedDesk:
+    """Independent desks driven by an injectable clock"""
+
+    SETTINGS = {
+        "hardware_limits": {"max_x_position": 120.0, "max_y_position": 80.0},
+        "timing": {"motor_movement_delay_per_cm": 0.1, "max_motor_movement_delay": 5.0,
+                   "tool_action_delay": 1.0, "sensor_wait_timeout": 30.0, "sensor_poll_timeout": 0.5},
+    }
+
+    def test_instant_clock_advances_virtual_time(self):
+        """Travel and piston times should advance the clock without sleeping"""
+        clock = InstantClock(start=0.0)
+        desk = SimulatedDesk(self.SETTINGS, clock)
+        started = time.monotonic()
+        desk.move_x(40.0)
+        desk.line_marker_down()
+        assert time.monotonic() - started < 0.5
+        assert clock.now() == pytest.approx(5.0)
+        assert desk.get_current_x() == 40.0
+        assert desk.get_line_marker_down_sensor() is True
+
+    def test_desks_are_independent(self):
+        """Two desks and the shared module desk should not see each other's state"""
+        first = MockHardware(clock=InstantClock())
+        second = MockHardware(clock=InstantClock())
+        first.move_y(30.0)
+        first.row_cutter_down()
+        assert second.get_current_y() == 0.0
+        assert second.get_row_cutter_piston_state() == "up"
+        assert mock_hardware.get_current_y() == 0.0
+
+    def test_sensor_timeout_in_clock_time(self):
+        """A sensor wait should time out after sensor_wait_timeout of virtual time"""
+        desk = SimulatedDesk(self.SETTINGS, InstantClock(start=0.0))
+        assert desk.wait_for_x_left_sensor() is None
+        assert desk.clock.now() > 30.0
+
+    def test_trigger_wakes_wait(self):
+        """A trigger from another thread should end the wait with the sensor result"""
+        desk = SimulatedDesk(self.SETTINGS, InstantClock())
+        timer = threading.Timer(0.05, desk.trigger_y_bottom_sensor)
+        timer.start()
+        assert desk.wait_for_y_sensor() == "bottom"
+        timer.join()
+
+    def test_make_clock(self):
+        """time_scale should select the clock type"""
+        assert isinstance(make_clock(0), InstantClock)
+        assert isinstance(make_clock(1.0), RealTimeClock)
+        assert make_clock(4.0).scale == 4.0
+
+
+class TestOperatorModel:
+    """Simulated operator answering sensor waits"""
+
+    def test_fixed_delay_triggers_sensor(self):
+        """The operator should trigger the awaited sensor after its reaction time"""
+        desk = SimulatedDesk(TestSimulatedDesk.SETTINGS, InstantClock(start=0.0))
+        desk.operator = FixedDelayOperator(2.0, {'y': 3.0})
+        assert desk.wait_for_x_left_sensor() == "left"
+        assert desk.clock.now() == pytest.approx(2.0, abs=0.1)
+        assert desk.wait_for_y_sensor() == "top"
+        assert desk.clock.now() == pytest.approx(5.0, abs=0.1)
+
+    def test_sampled_delays_from_telemetry(self, tmp_path):
+        """Reaction times should be drawn from sensor_wait and transition spans"""
+        path = tmp_path / "step_telemetry.csv"
+        path.write_text(
+            "run_id,timestamp,step_index,operation,event,duration_seconds,detail\n"
+            "r1,0,3,wait_sensor,sensor_wait,1.5,x_left\n"
+            "r1,0,9,transition,transition,7.0,\n"
+            "r1,0,4,move_x,step,0.2,\n", encoding="utf-8")
+        operator = SampledDelayOperator.from_telemetry(str(path), default=9.0, seed=1)
+        assert operator.reaction_time('x_left') == 1.5
+        assert operator.reaction_time('y_top') == 1.5
+        assert operator.reaction_time('rows_door') == 7.0
+        assert SampledDelayOperator.from_telemetry(str(tmp_path / "missing.csv"), default=9.0).reaction_time('x') == 9.0
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+
+import pytest
+from hardware.implementations.real.raspberry_pi.modbus_rtu import (
+    ModbusRTUClient, ModbusRTUError, build_read_holding_registers, check_crc, crc16, silent_interval,
+)
+from hardware.implementations.real.raspberry_pi.n4dih32_simulator import N4DIH32Simulator, SimulatedModbusSerial
+from hardware.implementations.real.raspberry_pi.rs485_modbus import RS485ModbusInterface
+
+
+@pytest.fixture
+def port():
+    port = SimulatedModbusSerial(baudrate=115200, timeout=0.05)
+    yield port
+    port.close()
+
+
+@pytest.fixture
+def client(port):
+    client = ModbusRTUClient(port.port, baudrate=115200, timeout=0.05, serial_port=port)
+    client.connect()
+    return client
+
+
+class TestFraming:
+    """Frame building, CRC and timing constants"""
+
+    def test_request_frame_and_crc(self):
+        """The FC03 request should match the Modbus reference frame, CRC low byte first"""
+        assert build_read_holding_registers(1, 0, 10) == bytes.fromhex("01030000000ac5cd")
+        assert crc16(bytes.fromhex("01030000000a")) == 0xCDC5
+        assert check_crc(build_read_holding_registers(1, 192, 2))
+
+    def test_silent_interval(self):
+        """t3.5 should be 3.5 characters up to 19200 baud and 1.75 ms above"""
+        assert silent_interval(9600) == pytest.approx(3.5 * 10 / 9600)
+        assert silent_interval(115200) == 0.00175
+
+
+class TestClient:
+    """Built-in client against the simulated N4DIH32"""
+
+    def test_read_registers(self, client, port):
+        """Inputs X00-X15 and X16-X31 should come back as the two registers"""
+        port.simulator.set_input(3, True)
+        port.simulator.set_input(17, True)
+        response = client.read_holding_registers(address=192, count=2, device_id=1)
+        assert not response.isError()
+        assert response.registers == [1 << 3, 1 << 1]
+        assert client.last_round_trip > 0
+
+    def test_exception_response(self, client):
+        """A register outside the input block should return exception 02"""
+        response = client.read_holding_registers(address=0, count=2, device_id=1)
+        assert response.isError()
+        assert response.exception_code == 2
+
+    def test_timeout_and_crc_error(self, client, port):
+        """No reply and a corrupt reply should raise; the next read should still work"""
+        with pytest.raises(ModbusRTUError):
+            client.read_holding_registers(address=192, count=2, device_id=7)
+        port.simulator.corrupt_next = True
+        with pytest.raises(ModbusRTUError):
+            client.read_holding_registers(address=192, count=2, device_id=1)
+        assert not client.read_holding_registers(address=192, count=2, device_id=1).isError()
+
+    def test_wire_timing(self):
+        """A round trip at 9600 baud should take at least the time both frames need on the wire"""
+        port = SimulatedModbusSerial(baudrate=9600, timeout=0.5)
+        client = ModbusRTUClient(port.port, baudrate=9600, timeout=0.5, serial_port=port)
+        client.read_holding_registers(address=192, count=2, device_id=1)
+        assert client.last_round_trip >= (8 + 9) * 10 / 9600
+
+
+class TestRS485Simulated:
+    """RS485ModbusInterface on a sim:// port, without pymodbus"""
+
+    def test_sensor_read(self):
+        """Sensors should be read through the built-in client and the simulator"""
+        rs485 = RS485ModbusInterface(port="sim://n4dih32", baudrate=115200, timeout=0.05,
+                                     sensor_addresses={"x_left_edge": 14, "door_sensor": 15},
+                                     nc_sensors=["x_left_edge"])
+        rs485.simulator = N4DIH32Simulator()
+        rs485.simulator.set_input(15, True)
+        try:
+            assert rs485.connect()
+            assert rs485.read_sensor("door_sensor") is True
+            assert rs485.read_sensor("x_left_edge") is True
+            rs485.simulator.set_input(14, True)
+            assert rs485.refresh_bulk_cache()
+            assert rs485.read_sensor("x_left_edge") is False
+        finally:
+            rs485.disconnect()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+
+from hardware.implementations.real.arduino_grbl.motion_planner import format_motion_command, plan_moves
+
+
+class TestFormatMotionCommand:
+    """G-code for planned segments"""
+
+    def test_axis_only_travel(self):
+        """Travel should use G0 and name only the commanded axis"""
+        assert format_motion_command(12.5, None, True, 1000) == "G0 X125.000"
+
+    def test_working_move(self):
+        """A working move should use G1 with the feed rate"""
+        assert format_motion_command(None, 3.0, False, 1000) == "G1 Y30.000 F1000"
+
+
+class TestPlanMoves:
+    """Coalescing of adjacent single-axis moves"""
+
+    def test_x_then_y_becomes_diagonal(self):
+        """Adjacent X and Y travel should merge into one segment"""
+        segments = plan_moves([('move_x', 0.0), ('move_y', 0.0)], rapid=True)
+        assert len(segments) == 1
+        assert (segments[0].x, segments[0].y) == (0.0, 0.0)
+        assert segments[0].move_indices == [0, 1]
+
+    def test_repeated_axis_keeps_last_target(self):
+        """Repeated travel on one axis should collapse to the last target"""
+        segments = plan_moves([('move_y', 0.0), ('move_y', 15.0)], rapid=True)
+        assert len(segments) == 1
+        assert (segments[0].x, segments[0].y) == (None, 15.0)
+
+    def test_corner_preserved(self):
+        """X, Y, X travel should keep the planned corner"""
+        segments = plan_moves([('move_x', 10.0), ('move_y', 5.0), ('move_x', 0.0)], rapid=True)
+        assert [(s.x, s.y) for s in segments] == [(10.0, 5.0), (0.0, None)]
+
+    def test_working_moves_not_coalesced(self):
+        """With a tool engaged every move should stay its own G1 segment"""
+        segments = plan_moves([('move_x', 10.0), ('move_y', 5.0)], rapid=False)
+        assert len(segments) == 2
+        assert not any(s.rapid for s in segments)
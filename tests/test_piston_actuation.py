@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+
+import threading
+import time
+import pytest
+from hardware.implementations.real.raspberry_pi import raspberry_pi_gpio
+from hardware.implementations.real.raspberry_pi.piston_actuation import PistonActuationMonitor
+from hardware.implementations.real.raspberry_pi.raspberry_pi_gpio import RaspberryPiGPIO
+from hardware.implementations.real.real_hardware import RealHardware
+from core.logger import get_logger
+
+SENSORS = {"line_marker_up_sensor": 28, "line_marker_down_sensor": 27, "row_cutter_down_sensor": 26}
+
+
+class OutputGPIO:
+    HIGH = True
+    LOW = False
+
+    def output(self, pin, state):
+        pass
+
+
+@pytest.fixture
+def rs485(rs485_interface, modbus_client):
+    modbus_client.bits = 1 << SENSORS["line_marker_up_sensor"]
+    return rs485_interface(SENSORS)
+
+
+def move_after(rs485, delay, sensor):
+    """Switch the inputs to `sensor` only, `delay` seconds from now"""
+    threading.Timer(delay, lambda: setattr(rs485.client, 'bits', 1 << SENSORS[sensor])).start()
+
+
+class TestActuationMonitor:
+    """Handles resolved by RS485 snapshots"""
+
+    def test_confirmed_on_sample(self, rs485):
+        """The handle should resolve on the first sample showing the sensor, with the time recorded"""
+        rs485.start_sampler(interval=0.005)
+        monitor = PistonActuationMonitor(settling_time=0.02, timeout=1.0)
+        monitor.attach(rs485)
+        move_after(rs485, 0.1, "line_marker_down_sensor")
+        handle = monitor.command("line_marker_piston", "down", "line_marker_down_sensor")
+        assert handle.wait() is True
+        assert 0.09 <= handle.actuation_time < 0.3
+        stats = monitor.stats()["line_marker_piston:down"]
+        assert stats["commands"] == 1 and stats["samples"] == 1
+        assert stats["settling_ms"] == pytest.approx(handle.actuation_time * 500)
+
+    def test_timeout(self, rs485):
+        """A sensor that never becomes active should fail the handle after the timeout"""
+        rs485.start_sampler(interval=0.005)
+        monitor = PistonActuationMonitor(settling_time=0.0, timeout=0.1)
+        monitor.attach(rs485)
+        started = time.time()
+        assert monitor.command("line_marker_piston", "down", "line_marker_down_sensor").wait() is False
+        assert time.time() - started < 0.5
+        assert monitor.stats()["line_marker_piston:down"]["timeouts"] == 1
+
+    def test_already_in_position(self, rs485):
+        """A sensor already active should confirm after the settling window without recording a time"""
+        monitor = PistonActuationMonitor(settling_time=0.05, timeout=1.0)
+        monitor.attach(rs485)
+        handle = monitor.command("line_marker_piston", "up", "line_marker_up_sensor")
+        assert handle.wait() is True
+        assert time.time() - handle.issued >= 0.05
+        assert handle.actuation_time is None
+
+    def test_unmapped_piston(self):
+        """Without RS485 or a sensor there is nothing to verify"""
+        monitor = PistonActuationMonitor()
+        handle = monitor.command("air_pressure_valve", "down", None)
+        assert handle.done() and handle.wait() is True
+
+
+class TestSetPiston:
+    """RaspberryPiGPIO piston commands"""
+
+    def test_command_piston_returns_handle(self, rs485, monkeypatch):
+        """command_piston should return at once; set_piston should wait for the sensor"""
+        monkeypatch.setattr(raspberry_pi_gpio, "GPIO", OutputGPIO())
+        gpio = RaspberryPiGPIO()
+        gpio.piston_pins = {"line_marker_piston": 11}
+        gpio.rs485 = rs485
+        gpio.is_initialized = True
+        gpio.actuation_monitor.configure(settling_time=0.0, timeout=1.0)
+        gpio.actuation_monitor.attach(rs485)
+        rs485.start_sampler(interval=0.005)
+
+        move_after(rs485, 0.1, "line_marker_down_sensor")
+        handle = gpio.command_piston("line_marker_piston", "down")
+        assert not handle.done()
+        assert handle.wait() is True
+        assert gpio.get_piston_pin_state("line_marker_piston") == "down"
+        assert gpio.set_piston("line_marker_piston", "down") is True
+        assert gpio.piston_actuation_stats()["line_marker_piston:down"]["commands"] == 2
+
+    def test_set_pistons_waits_together(self, rs485, monkeypatch):
+        """set_pistons should drive both outputs first, taking the slowest piston's time, not the sum"""
+        monkeypatch.setattr(raspberry_pi_gpio, "GPIO", OutputGPIO())
+        gpio = RaspberryPiGPIO()
+        gpio.piston_pins = {"line_marker_piston": 11, "row_cutter_piston": 12}
+        gpio.rs485 = rs485
+        gpio.is_initialized = True
+        gpio.actuation_monitor.configure(settling_time=0.0, timeout=1.0)
+        gpio.actuation_monitor.attach(rs485)
+        rs485.start_sampler(interval=0.005)
+
+        both = (1 << SENSORS["line_marker_down_sensor"]) | (1 << SENSORS["row_cutter_down_sensor"])
+        threading.Timer(0.15, lambda: setattr(rs485.client, 'bits', both)).start()
+        started = time.time()
+        assert gpio.set_pistons({"line_marker_piston": "down", "row_cutter_piston": "down"}) is True
+        assert time.time() - started < 0.28
+        assert gpio.get_piston_pin_state("row_cutter_piston") == "down"
+
+
+class RecordingGPIO:
+    """Records grouped and single piston commands in order"""
+
+    def __init__(self):
+        self.calls = []
+
+    def set_pistons(self, states):
+        self.calls.append(dict(states))
+        return True
+
+    def line_motor_piston_up(self):
+        self.calls.append("line_motor_piston:up")
+        return True
+
+    def line_motor_piston_down(self):
+        self.calls.append("line_motor_piston:down")
+        return True
+
+
+class TestGroupedTools:
+    """RealHardware tool groups"""
+
+    @pytest.fixture
+    def hardware(self):
+        hardware = RealHardware.__new__(RealHardware)
+        hardware.logger = get_logger()
+        hardware.gpio = RecordingGPIO()
+        hardware.is_initialized = True
+        return hardware
+
+    def test_line_motor_piston_moved_alone(self, hardware):
+        """Line tool groups should move marker and cutter together and the motor piston after them"""
+        assert hardware.lower_line_tools() is True
+        assert hardware.lift_line_tools() is True
+        hardware.reset_hardware()
+        assert hardware.gpio.calls == [
+            {"line_marker_piston": "down", "line_cutter_piston": "down"}, "line_motor_piston:down",
+            {"line_marker_piston": "up", "line_cutter_piston": "up"}, "line_motor_piston:up",
+            {"line_marker_piston": "up", "line_cutter_piston": "up",
+             "row_marker_piston": "up", "row_cutter_piston": "up"}, "line_motor_piston:up",
+        ]
+
+    def test_set_tools_rejects_line_motor_piston(self, hardware):
+        """set_tools should refuse line_motor_piston instead of driving it with other pistons"""
+        assert hardware.set_tools({"line_marker": "up", "line_motor_piston": "up"}) is False
+        assert hardware.gpio.calls == []
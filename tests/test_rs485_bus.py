@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+
+import pytest
+from hardware.implementations.real.raspberry_pi.rs485_bus import ModbusDevice, RS485BusScheduler
+
+
+def make_bus(inputs=None, fail=()):
+    """Scheduler over a fast main module and a slow expansion module, reads recorded in bus.read_order"""
+    main = ModbusDevice("main", 1, {"x_left_edge": 14, "door_sensor": 15}, nc_sensors=["x_left_edge"],
+                        interval=0.01, priority=0)
+    extra = ModbusDevice("extra", 2, {"tool_sensor": 3}, interval=0.1, priority=1)
+    inputs = inputs if inputs is not None else {}
+    read_order = []
+
+    def read_bits(device):
+        read_order.append(device.name)
+        if device.name in fail:
+            return None
+        return inputs.get(device.name, 0)
+
+    bus = RS485BusScheduler(read_bits, [main, extra])
+    bus.read_order = read_order
+    return bus
+
+
+class TestScheduling:
+    """Priority and per-device rates"""
+
+    def test_priority_first_then_rates(self):
+        """The main module should be read first and at its own rate; the slow module only when due"""
+        bus = make_bus()
+        assert bus.poll_once(now=0.0).name == "main"
+        assert bus.poll_once(now=0.0).name == "extra"
+        assert bus.poll_once(now=0.005) is None
+        for step in range(1, 10):
+            assert bus.poll_once(now=step * 0.01 + 0.001).name == "main"
+        assert bus.poll_once(now=0.101).name == "main"      # both due: priority wins
+        assert bus.poll_once(now=0.101).name == "extra"
+        assert bus.read_order.count("main") == 11
+        assert bus.read_order.count("extra") == 2
+
+    def test_time_until_due(self):
+        """The thread should sleep until the earliest device is due"""
+        bus = make_bus()
+        bus.poll_once(now=0.0)
+        bus.poll_once(now=0.0)
+        assert bus.time_until_due(0.004) == pytest.approx(0.006)
+
+    def test_min_interval_slows_idle_device(self):
+        """An idle device should be read at its minimum interval and read at once when it speeds up again"""
+        bus = make_bus()
+        bus.set_min_interval("main", 0.05)
+        t = 0.0
+        while t < 0.1:
+            bus.poll_once(now=t)
+            t += 0.001
+        assert bus.read_order.count("main") == 2
+        bus.set_min_interval("main", 0.0)
+        assert bus.next_device(t).name == "main"
+
+
+class TestMergedSnapshot:
+    """One named-sensor view over all devices"""
+
+    def test_read_all_across_devices(self):
+        """Sensors of both devices should resolve by name, with NC inversion per device"""
+        bus = make_bus({"main": 1 << 15, "extra": 1 << 3})
+        bus.poll_once(now=0.0)
+        bus.poll_once(now=0.0)
+        assert bus.read_all() == {"x_left_edge": True, "door_sensor": True, "tool_sensor": True}
+        assert bus.device_for("tool_sensor") == ("extra", 3)
+
+    def test_failing_device_isolated(self):
+        """A failing module should only blank its own sensors and count its errors"""
+        bus = make_bus({"main": 1 << 15}, fail=("extra",))
+        bus.poll_once(now=0.0)
+        bus.poll_once(now=0.0)
+        assert bus.read_sensor("door_sensor") is True
+        assert bus.read_sensor("tool_sensor") is None
+        stats = bus.stats()
+        assert stats["main"]["errors"] == 0 and stats["main"]["reads"] == 1
+        assert stats["extra"]["errors"] == 1 and stats["extra"]["consecutive_errors"] == 1
+        assert stats["extra"]["last_latency_ms"] is not None
+
+
+class TestInterfaceDevices:
+    """RS485ModbusInterface with additional_devices"""
+
+    def test_sensor_on_additional_device(self, rs485_interface, modbus_client):
+        """read_sensor should read a sensor from the module it is configured on"""
+        rs485 = rs485_interface(
+            {"door_sensor": 15},
+            additional_devices=[{"name": "tools", "modbus_device_id": 2, "sensor_addresses": {"tool_sensor": 17},
+                                 "nc_sensors": ["tool_sensor"], "poll_interval_ms": 100}],
+        )
+        modbus_client.set_bits(1, 1 << 15)
+        modbus_client.set_bits(2, 0)
+        assert rs485.read_sensor("door_sensor") is True
+        assert rs485.read_sensor("tool_sensor") is True       # NC input open
+        modbus_client.set_bits(2, 1 << 17)
+        rs485.bulk_read_max_age = 0
+        assert rs485.read_sensor("tool_sensor") is False
+        assert set(rs485.bus_stats()) == {"main", "tools"}
+        assert rs485.devices[1].interval == pytest.approx(0.1)
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+
+import pytest
+
+SENSORS = {"row_marker_up_sensor": 2, "x_left_edge": 14, "door_sensor": 20}
+
+
+@pytest.fixture
+def rs485(rs485_interface):
+    return rs485_interface(SENSORS, nc_sensors=["x_left_edge"])
+
+
+class TestInputBitmask:
+    """Registers packed into one mask with NC inversion"""
+
+    def test_bits_and_nc_inversion(self, rs485):
+        """Bits 0-15 come from the first register, 16-31 from the second; NC sensors are inverted"""
+        rs485.client.bits = (1 << 2) | (1 << 20)
+        assert rs485.read_input_bits() == (1 << 2) | (1 << 20)
+        assert rs485.read_sensor("row_marker_up_sensor") is True
+        assert rs485.read_sensor("door_sensor") is True
+        assert rs485.read_sensor("x_left_edge") is True      # NC input open -> triggered
+        assert rs485.read_all_inputs_bulk()[20] is True
+
+    def test_lazy_cache_without_sampler(self, rs485):
+        """Without the sampler, reads within the cache age should share one bus transaction"""
+        rs485.bulk_read_max_age = 10.0
+        for name in SENSORS:
+            rs485.read_sensor(name)
+        assert rs485.client.reads == 1
+
+
+class TestSampler:
+    """Dedicated sampler thread"""
+
+    def test_readers_never_touch_bus(self, rs485):
+        """With the sampler running, sensor reads should come from its snapshot only"""
+        rs485.start_sampler(interval=10.0)   # one read now, the next one much later
+        assert rs485.wait_for_sample(0, timeout=1.0) is not None
+        for _ in range(50):
+            rs485.read_sensor("row_marker_up_sensor")
+        assert rs485.client.reads == 1
+
+    def test_new_samples_published(self, rs485):
+        """A changed input should appear in a later snapshot with a higher sequence"""
+        rs485.start_sampler(interval=0.005)
+        snapshot = rs485.wait_for_sample(0, timeout=1.0)
+        assert rs485.read_sensor("row_marker_up_sensor") is False
+        rs485.client.bits = 1 << 2
+        newer = rs485.wait_for_sample(snapshot.sequence, timeout=1.0)
+        while newer is not None and not newer.raw_bits:
+            newer = rs485.wait_for_sample(newer.sequence, timeout=1.0)
+        assert newer.sequence > snapshot.sequence
+        assert rs485.read_sensor("row_marker_up_sensor") is True
+
+    def test_failed_read_clears_snapshot(self, rs485):
+        """A bus failure should make reads return None rather than stale states"""
+        rs485.start_sampler(interval=0.005)
+        rs485.wait_for_sample(0, timeout=1.0)
+        rs485.client.fail = True
+        rs485.client.read_event.clear()
+        assert rs485.client.read_event.wait(1.0)
+        rs485.client.read_event.clear()
+        assert rs485.client.read_event.wait(1.0)
+        assert rs485.read_sensor("door_sensor") is None
@@ -525,6 +525,39 @@ class TestCheckOperationBlocked:
         assert result is True
 
 
+class TestToolActionsIndependent:
+    """Tests for SafetyRulesManager.tool_actions_independent"""
+
+    def _manager(self, rules):
+        manager = SafetyRulesManager(get_hardware_interface())
+        manager.rules = rules
+        manager._rules_file_mtime = os.path.getmtime(manager.RULES_FILE)
+        return manager
+
+    def test_unrelated_tools_independent(self):
+        """Tools with no rule linking them may be grouped"""
+        manager = self._manager([])
+        assert manager.tool_actions_independent(["line_marker", "row_cutter"]) is True
+
+    def test_rule_linking_tools(self):
+        """A rule blocking one tool on another tool's state keeps them apart"""
+        rule = {
+            "enabled": True,
+            "conditions": {"operator": "AND", "items": [
+                {"type": "sensor", "source": "line_marker_down_sensor", "operator": "equals", "value": True}]},
+            "blocked_operations": [{"operation": "tool_action", "tools": ["line_cutter"]}],
+        }
+        manager = self._manager([rule])
+        assert manager.tool_actions_independent(["line_marker", "line_cutter"]) is False
+        assert manager.tool_actions_independent(["line_marker", "row_cutter"]) is True
+
+    def test_line_motor_and_duplicates(self):
+        """The line motor piston and repeated tools are never grouped"""
+        manager = self._manager([])
+        assert manager.tool_actions_independent(["line_marker", "line_motor_piston"]) is False
+        assert manager.tool_actions_independent(["row_marker", "row_marker"]) is False
+
+
 # ==================== TestSafetySystem ====================
 
 class TestSafetySystem:
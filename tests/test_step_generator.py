@@ -10,6 +10,7 @@ import unittest
 from core.program_model import ScratchDeskProgram
 from core.step_generator import (
     create_step,
+    compact_tool_steps,
     generate_lines_marking_steps,
     generate_row_marking_steps,
     generate_complete_program_steps,
@@ -660,5 +661,35 @@ class TestGetStepCountSummary(unittest.TestCase):
         self.assertEqual(summary['actual_paper_height'], expected_height)
 
 
+class TestCompactToolSteps(unittest.TestCase):
+    """Tests for compact_tool_steps function"""
+
+    def _tool(self, tool, action):
+        return create_step('tool_action', {'tool': tool, 'action': action}, f"{tool} {action}")
+
+    def test_adjacent_independent_actions_grouped(self):
+        """Adjacent tool actions merge into one tool_group step, other steps untouched"""
+        steps = [create_step('move_x', {'position': 10.0}),
+                 self._tool('line_marker', 'up'), self._tool('row_cutter', 'up'),
+                 create_step('move_y', {'position': 5.0})]
+        compacted = compact_tool_steps(steps, tools_independent=lambda tools: True)
+        self.assertEqual([s['operation'] for s in compacted], ['move_x', 'tool_group', 'move_y'])
+        self.assertEqual(compacted[1]['parameters']['actions'],
+                         [{'tool': 'line_marker', 'action': 'up'}, {'tool': 'row_cutter', 'action': 'up'}])
+        self.assertEqual(compacted[1]['description'], "line_marker up + row_cutter up")
+
+    def test_dependent_actions_kept_apart(self):
+        """Actions the check rejects stay separate steps in their original order"""
+        steps = [self._tool('line_marker', 'down'), self._tool('line_cutter', 'down')]
+        compacted = compact_tool_steps(steps, tools_independent=lambda tools: False)
+        self.assertEqual(compacted, steps)
+
+    def test_line_motor_never_grouped(self):
+        """The default safety-rule check should not group the line motor piston"""
+        steps = [self._tool('line_marker', 'up'), self._tool('line_motor_piston', 'up')]
+        compacted = compact_tool_steps(steps)
+        self.assertEqual([s['operation'] for s in compacted], ['tool_action', 'tool_action'])
+
+
 if __name__ == '__main__':
     unittest.main()
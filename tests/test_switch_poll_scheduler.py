@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+
+import threading
+import time
+from hardware.implementations.real.raspberry_pi.switch_poll_scheduler import (
+    SwitchPollScheduler, sensor_group, GROUP_EDGE, GROUP_PISTON, GROUP_LIMIT, GROUP_OTHER,
+)
+
+INTERVALS = {GROUP_EDGE: 0.01, GROUP_PISTON: 0.01, GROUP_LIMIT: 0.02, GROUP_OTHER: 0.01}
+
+
+def make_scheduler(**kwargs):
+    return SwitchPollScheduler(INTERVALS, idle_interval=0.5, **kwargs)
+
+
+class TestSwitchPollScheduler:
+    """Per-group poll rates"""
+
+    def test_sensor_groups(self):
+        """Sensors should be grouped by role from their names"""
+        assert sensor_group("x_left_edge") == GROUP_EDGE
+        assert sensor_group("row_marker_down_sensor") == GROUP_PISTON
+        assert sensor_group("door_sensor") == GROUP_OTHER
+
+    def test_idle_groups_back_off(self):
+        """Unused groups should use their idle interval; only limit switches never back off"""
+        scheduler = make_scheduler(idle_intervals={GROUP_OTHER: 0.1})
+        assert scheduler.due_groups(now=100.0) == {GROUP_EDGE, GROUP_PISTON, GROUP_LIMIT, GROUP_OTHER}
+        assert scheduler.due_groups(now=100.05) == {GROUP_LIMIT}
+        assert scheduler.due_groups(now=100.11) == {GROUP_LIMIT, GROUP_OTHER}
+        assert scheduler.due_groups(now=100.6) == {GROUP_EDGE, GROUP_PISTON, GROUP_LIMIT, GROUP_OTHER}
+
+    def test_only_configured_groups_scheduled(self):
+        """Groups without switches should neither be due nor shorten the polling thread's sleep"""
+        scheduler = make_scheduler()
+        scheduler.set_groups([GROUP_OTHER, GROUP_PISTON])
+        assert scheduler.due_groups(now=100.0) == {GROUP_OTHER, GROUP_PISTON}
+        assert scheduler.time_until_due(now=100.0) == 0.5
+
+    def test_hold_and_boost(self):
+        """A held or boosted group should be polled at once and then at its active rate"""
+        scheduler = make_scheduler()
+        now = time.monotonic()
+        scheduler.due_groups(now=now)
+        with scheduler.hold(GROUP_EDGE):
+            assert GROUP_EDGE in scheduler.due_groups(now=now + 0.001)
+            assert scheduler.interval(GROUP_EDGE) == 0.01
+        assert scheduler.interval(GROUP_EDGE) == 0.5
+        scheduler.boost(GROUP_PISTON, 0.05)
+        assert scheduler.is_active(GROUP_PISTON)
+        assert not scheduler.is_active(GROUP_PISTON, now=time.monotonic() + 0.1)
+
+    def test_not_adaptive(self):
+        """With adaptive polling off every group should stay at its active interval"""
+        scheduler = make_scheduler(adaptive=False)
+        assert scheduler.interval(GROUP_EDGE) == 0.01
+        assert scheduler.interval(GROUP_PISTON) == 0.01
+
+    def test_activation_wakes_wait(self):
+        """Activating a group should end the polling thread's idle sleep"""
+        scheduler = make_scheduler(always_active=())
+        scheduler.due_groups()
+        woke = threading.Event()
+        thread = threading.Thread(target=lambda: (scheduler.wait(), woke.set()))
+        thread.start()
+        time.sleep(0.05)
+        assert not woke.is_set()
+        scheduler.boost(GROUP_PISTON, 1.0)
+        assert woke.wait(0.2)
+        thread.join()
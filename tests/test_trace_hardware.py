@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+
+import threading
+import time
+import pytest
+from hardware.implementations.trace.trace_hardware import (
+    RecordingHardware,
+    ReplayHardware,
+    load_trace,
+    summarize_trace,
+)
+from hardware.interfaces.motion_handle import MotionHandle
+
+
+class FakeHardware:
+    """Minimal hardware interface with a position, a stream and an async move"""
+
+    def __init__(self):
+        self.x = 0.0
+
+    def move_x(self, position):
+        time.sleep(0.02)
+        self.x = position
+        return True
+
+    def get_current_x(self):
+        return self.x
+
+    def stream_moves(self, moves, on_move_complete=None):
+        for index, (axis, position) in enumerate(moves):
+            self.x = position
+            if on_move_complete:
+                on_move_complete(index)
+        return True
+
+    def move_x_async(self, position):
+        handle = MotionHandle(position, 0.0)
+
+        def run():
+            time.sleep(0.02)
+            self.x = position
+            handle.finish(True)
+        threading.Thread(target=run, daemon=True).start()
+        return handle
+
+
+def _record(path):
+    hardware = RecordingHardware(FakeHardware(), str(path))
+    for _ in range(3):
+        hardware.get_current_x()
+    hardware.move_x(12.5)
+    hardware.get_current_x()
+    completed = []
+    hardware.stream_moves([("x", 1.0), ("x", 2.0)], on_move_complete=completed.append)
+    assert hardware.move_x_async(4.0).wait(timeout=1.0)
+    hardware.close_trace()
+    return completed
+
+
+class TestRecording:
+    """Trace file written by RecordingHardware"""
+
+    def test_events(self, tmp_path):
+        """Calls, changed query values, callbacks and motion completion should be recorded"""
+        path = tmp_path / "run.jsonl.gz"
+        assert _record(path) == [0, 1]
+        header, events = load_trace(str(path))
+        assert header["hardware"] == "FakeHardware"
+        assert [e["m"] for e in events if e["k"] == "q"] == ["get_current_x", "get_current_x"]
+        calls = [e for e in events if e["k"] == "call"]
+        assert [c["m"] for c in calls] == ["move_x", "stream_moves", "move_x_async"]
+        assert calls[0]["a"] == [12.5] and calls[0]["r"] is True and calls[0]["d"] >= 0.02
+        assert calls[1]["kw"] == {"on_move_complete": "<callback>"}
+        assert [e["a"] for e in events if e["k"] == "cb"] == [[0], [1]]
+        assert [e["r"] for e in events if e["k"] == "done"] == [True]
+        assert summarize_trace(str(path))["calls"] == {"move_x": 1, "move_x_async": 1, "stream_moves": 1}
+
+    def test_isinstance_passes_through(self, tmp_path):
+        """The proxy should still look like the wrapped interface"""
+        hardware = RecordingHardware(FakeHardware(), str(tmp_path / "t.jsonl.gz"))
+        assert isinstance(hardware, FakeHardware)
+        assert hardware.x == 0.0
+        hardware.close_trace()
+
+    def test_unclosed_trace_readable(self, tmp_path):
+        """Events should reach the file without close_trace(), and a cut-off tail should be ignored"""
+        path = tmp_path / "crash.jsonl.gz"
+        fake = FakeHardware()
+        hardware = RecordingHardware(fake, str(path), flush_interval=0.01)
+        for i in range(50):
+            fake.x = float(i)
+            hardware.get_current_x()
+        deadline = time.monotonic() + 2.0
+        while len(load_trace(str(path))[1]) < 50 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        header, events = load_trace(str(path))
+        assert len(events) == 50
+
+        data = path.read_bytes()
+        path.write_bytes(data[:-7])   # process killed while writing the last batch
+        assert load_trace(str(path))[0]["format"] == header["format"]
+        hardware.close_trace()
+        hardware.close_trace()
+
+
+class TestReplay:
+    """ReplayHardware answering from a trace"""
+
+    def test_replay_matches_recording(self, tmp_path):
+        """Results, query values and callbacks should come back in recorded order"""
+        path = tmp_path / "run.jsonl.gz"
+        _record(path)
+        replay = ReplayHardware(str(path), speed=0)
+
+        assert replay.get_current_x() == 0.0
+        assert replay.move_x(12.5) is True
+        assert replay.get_current_x() == 12.5
+        completed = []
+        assert replay.stream_moves([("x", 1.0), ("x", 2.0)], on_move_complete=completed.append) is True
+        assert completed == [0, 1]
+        handle = replay.move_x_async(4.0)
+        assert handle.wait(timeout=1.0) and handle.result() is True
+        assert replay.divergences == []
+        assert replay.remaining_calls() == {}
+
+    def test_divergence_reported(self, tmp_path):
+        """Different arguments or extra calls should be listed, not raised"""
+        path = tmp_path / "run.jsonl.gz"
+        _record(path)
+        replay = ReplayHardware(str(path), speed=0)
+        assert replay.move_x(3.0) is True
+        assert replay.move_x(12.5) is True
+        assert [d["reason"].split(" ")[0] for d in replay.divergences] == ["recorded", "more"]
+        with pytest.raises(AttributeError):
+            replay.move_y(1.0)
+
+    def test_time_compression(self, tmp_path):
+        """speed should scale the recorded durations"""
+        path = tmp_path / "run.jsonl.gz"
+        hardware = RecordingHardware(FakeHardware(), str(path))
+        hardware.move_x(1.0)
+        hardware.close_trace()
+        start = time.monotonic()
+        ReplayHardware(str(path), speed=0).move_x(1.0)
+        assert time.monotonic() - start < 0.015